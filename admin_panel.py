@@ -6,8 +6,8 @@ Role-based administrative interface for user and system management
 import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
-from auth import require_admin, get_current_user, is_admin, generate_password_hash
-from db import get_conn, get_all_users, query_logs
+from auth import require_admin, get_current_user, generate_password_hash
+from db import get_pool, get_read_cache_stats, get_write_queue_stats, read_connection, get_migration_report, query_logs, count_logs, read_logs_frame, log_records_frame
 
 def show_admin_panel():
     """Display the admin panel interface"""
@@ -94,12 +94,16 @@ def show_user_management():
     
     # User activity
     with st.expander("📈 User Activity"):
-        conn = get_conn()
         try:
             # Get activity data
-            logs = query_logs(conn, start_date=date.today() - timedelta(days=30))
+            with read_connection() as conn:
+                logs = query_logs(
+                    conn,
+                    start_date=date.today() - timedelta(days=30),
+                    columns=['date', 'operator', 'event_type', 'cell_line'],
+                )
             if logs:
-                df_logs = pd.DataFrame(logs)
+                df_logs = log_records_frame(logs)
                 
                 # Activity by user
                 if 'operator' in df_logs.columns:
@@ -119,15 +123,14 @@ def show_system_analytics():
     """System analytics and monitoring"""
     st.subheader("📊 System Analytics")
     
-    conn = get_conn()
-    
     try:
         # Database statistics
         col1, col2, col3 = st.columns(3)
         
         with col1:
             # Total entries
-            logs = query_logs(conn)
+            with read_connection() as conn:
+                logs = query_logs(conn, columns=['date', 'event_type', 'cell_line', 'thaw_id'])
             st.metric("Total Log Entries", len(logs))
         
         with col2:
@@ -148,7 +151,7 @@ def show_system_analytics():
         
         # Usage trends
         if logs:
-            df_logs = pd.DataFrame(logs)
+            df_logs = log_records_frame(logs)
             df_logs['date'] = pd.to_datetime(df_logs['date'])
             
             # Daily activity chart
@@ -189,7 +192,64 @@ def show_data_management():
                     st.error(f"Backup failed: {e}")
         
         with col2:
+            if st.button("Verify Backups"):
+                import os
+                from db import verify_backups
+                results = verify_backups()
+                if not results:
+                    st.info("No backups found")
+                for result in results:
+                    name = os.path.basename(result['archive'])
+                    if result['ok']:
+                        st.success(f"{name}: integrity ok")
+                    else:
+                        st.error(f"{name}: {result['detail']}")
+        
+        from db import list_backups
+        backups = list_backups()
+        if backups:
+            st.dataframe(pd.DataFrame([
+                {"Archive": b['name'], "Created (UTC)": b['created_at'], "Size (KB)": round(b['size_bytes'] / 1024, 1)}
+                for b in backups
+            ]), use_container_width=True)
+        else:
             st.info("Regular backups are recommended weekly")
+
+        from db import list_image_backups
+        image_generations = list_image_backups()
+        if image_generations:
+            st.caption(
+                f"Image generations: {len(image_generations)} "
+                f"(latest {image_generations[0]['name']}). "
+                "Restore one with: python db.py restore-images --generation <name> --target <dir>"
+            )
+
+    # GitHub backup worker
+    with st.expander("☁️ GitHub Backup"):
+        from github_backup import get_backup_system
+        backup_stats = get_backup_system().stats()
+        if not backup_stats['running']:
+            st.caption("Background worker not running (starts automatically on Streamlit Cloud)")
+        if backup_stats['last_run_at']:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Snapshot", f"{backup_stats['snapshot_ms']} ms")
+            with col2:
+                st.metric("Delta", f"{backup_stats['delta_ms']} ms")
+            with col3:
+                st.metric("Git", f"{backup_stats['git_ms']} ms")
+            with col4:
+                st.metric("Total", f"{backup_stats['total_ms']} ms")
+            st.caption(
+                f"Last run: {backup_stats['last_run_at']} ({backup_stats['last_result']}) · "
+                f"Changes: {backup_stats['changes']} · Size: {round(backup_stats['bytes'] / 1024, 1)} KB · "
+                f"Change seq: {backup_stats['last_seq']} ({backup_stats['compacted']} compacted) · Runs: {backup_stats['runs']} "
+                f"({backup_stats['failures']} failed)"
+            )
+            if backup_stats['last_error']:
+                st.error(f"Last backup failed: {backup_stats['last_error']}")
+        else:
+            st.info("No GitHub backup has run in this session yet")
     
     # Data export
     with st.expander("📤 Data Export"):
@@ -198,15 +258,13 @@ def show_data_management():
         
         if st.button("Export Data"):
             try:
-                conn = get_conn()
-                if len(date_range) == 2:
-                    logs = query_logs(conn, start_date=date_range[0], end_date=date_range[1])
-                else:
-                    logs = query_logs(conn)
+                with read_connection() as conn:
+                    if len(date_range) == 2:
+                        df = read_logs_frame(conn, {'start_date': date_range[0], 'end_date': date_range[1]})
+                    else:
+                        df = read_logs_frame(conn)
                 
-                if logs:
-                    df = pd.DataFrame(logs)
-                    
+                if not df.empty:
                     if export_format == "Excel":
                         # Create Excel export
                         from io import BytesIO
@@ -253,10 +311,10 @@ def show_data_management():
         
         if st.button("Preview Cleanup", key="preview_cleanup"):
             try:
-                conn = get_conn()
                 cutoff_date = date.today() - timedelta(days=cleanup_days)
-                logs = query_logs(conn, end_date=cutoff_date)
-                st.info(f"Would delete {len(logs)} entries older than {cutoff_date}")
+                with read_connection() as conn:
+                    old_entries = count_logs(conn, end_date=cutoff_date)
+                st.info(f"Would delete {old_entries} entries older than {cutoff_date}")
             except Exception as e:
                 st.error(f"Preview failed: {e}")
 
@@ -308,6 +366,84 @@ def show_system_settings():
         except Exception as e:
             st.error(f"Error reading database settings: {e}")
     
+    # Database performance
+    with st.expander("📈 Database Performance"):
+        try:
+            pool_stats = get_pool().stats()
+            st.write("**Connection Pool**")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Reader Checkouts", pool_stats['reader_checkouts'])
+            with col2:
+                st.metric("Reader Returns", pool_stats['reader_returns'])
+            with col3:
+                st.metric("Readers In Use", f"{pool_stats['readers_in_use']}/{pool_stats['max_readers']}")
+            with col4:
+                st.metric("Reader Waits", pool_stats['reader_waits'])
+            st.caption(
+                f"Open readers: {pool_stats['open_readers']} (peak in use {pool_stats['peak_readers_in_use']}) · "
+                f"Reader timeouts: {pool_stats['reader_timeouts']} · "
+                f"Writer checkouts: {pool_stats['writer_checkouts']} · "
+                f"Writer wait: {pool_stats['writer_wait_ms']} ms"
+            )
+            
+            cache_stats = get_read_cache_stats()
+            st.write("**Read Cache**")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Cache Hits", cache_stats['hits'])
+            with col2:
+                st.metric("Cache Misses", cache_stats['misses'])
+            with col3:
+                st.metric("Hit Rate", f"{cache_stats['hit_rate']}%")
+            with col4:
+                st.metric("Cached Entries", cache_stats['entries'])
+            st.caption(
+                f"Bypassed (uncacheable arguments or open transaction): {cache_stats['bypassed']} · "
+                f"Evictions: {cache_stats['evictions']}"
+            )
+            
+            queue_stats = get_write_queue_stats()
+            st.write("**Write Queue**")
+            if queue_stats is None:
+                st.caption("Disabled: writes run directly on the writer connection (set DB_WRITE_QUEUE=1 to enable)")
+            else:
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Queue Depth", queue_stats['queue_depth'], help=f"Peak: {queue_stats['peak_queue_depth']}")
+                with col2:
+                    st.metric("Avg Commit", f"{queue_stats['avg_commit_ms']} ms")
+                with col3:
+                    st.metric("Writes / Commit", queue_stats['avg_group_size'])
+                with col4:
+                    st.metric("Failed Writes", queue_stats['failed'])
+                st.caption(
+                    f"Writes: {queue_stats['completed']} committed in {queue_stats['groups']} groups · "
+                    f"Last commit: {queue_stats['last_commit_ms']} ms (max {queue_stats['max_commit_ms']} ms) · "
+                    f"Avg time queued: {queue_stats['avg_wait_ms']} ms"
+                )
+            
+            migration_report = get_migration_report()
+            st.write("**Schema**")
+            st.caption(
+                f"Schema version: {migration_report['schema_version']} · "
+                f"Last init_db check: {migration_report['check_ms']} ms"
+            )
+            if migration_report['applied']:
+                st.dataframe(pd.DataFrame(migration_report['applied']), use_container_width=True)
+        except Exception as e:
+            st.error(f"Error reading database performance: {e}")
+
+    # Fragment rerun timings
+    with st.expander("⏱️ Section Timing"):
+        from sections import fragment_timings
+        timings = fragment_timings()
+        if timings:
+            st.dataframe(pd.DataFrame(timings), use_container_width=True)
+            st.caption("Each row is an interactive region that reruns on its own; times cover every run in this server process")
+        else:
+            st.info("No section regions have run yet")
+
     # Feature flags
     with st.expander("🚩 Feature Configuration"):
         st.write("Configure optional features:")
@@ -332,5 +468,9 @@ def show_system_settings():
         except:
             st.write("**Streamlit Version:** Unknown")
 
+def render(conn=None):
+    """Section entry point for the app navigation; reads check out their own pooled readers"""
+    show_admin_panel()
+
 if __name__ == "__main__":
     show_admin_panel()
\ No newline at end of file
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dict-per-row log results vs LogRecord rows
+
+Builds a synthetic logs table in a temporary database and compares the
+time and memory of loading every row as dicts (the old query_logs result)
+with query_logs' LogRecords, and of turning each into a DataFrame.
+
+Usage: python bench_log_records.py [--rows 100000]
+"""
+
+import argparse
+import gc
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from contextlib import closing
+from datetime import date, datetime, timedelta
+
+import db
+
+
+def synthetic_payloads(n_rows):
+    events = ["Observation", "Media Change", "Split", "Thawing", "Cryopreservation"]
+    start = date(2024, 1, 1)
+    for i in range(n_rows):
+        yield {
+            "date": (start + timedelta(days=i % 600)).isoformat(),
+            "cell_line": f"iPSC-{i % 25:02d}",
+            "event_type": events[i % len(events)],
+            "passage": i % 30,
+            "vessel": "6-well" if i % 2 else "T25",
+            "location": f"Incubator {i % 4 + 1}",
+            "medium": "mTeSR1" if i % 3 else "E8",
+            "notes": f"Synthetic entry {i}: colonies look healthy",
+            "operator": f"user{i % 12}",
+            "thaw_id": f"TH-BENCH-{i % 2000:04d}",
+            "created_by": f"user{i % 12}",
+            "created_at": (datetime(2024, 1, 1) + timedelta(seconds=i)).isoformat(),
+        }
+
+
+def measure(label, fn):
+    """Run fn once under tracemalloc, then time its best of three runs."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    timings = []
+    for _ in range(3):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    print(f"{label:<32} {min(timings) * 1000:9.1f} ms {retained / 2**20:9.1f} MiB {peak / 2**20:9.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        pool = db.ConnectionPool(path, readers=0)
+        db.init_db(pool.writer_connection)
+        t0 = time.perf_counter()
+        report = db.insert_logs_many(pool.writer_connection, list(synthetic_payloads(args.rows)), batch_size=5000)
+        print(f"Seeded {report['inserted']} rows in {time.perf_counter() - t0:.1f} s")
+        pool.close()
+
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+
+        def dict_rows():
+            with closing(conn.cursor()) as cur:
+                cur.execute(f"SELECT {', '.join(db.LOG_COLUMNS)} FROM logs ORDER BY date ASC, created_at ASC")
+                return [dict(r) for r in cur.fetchall()]
+
+        def record_rows():
+            return db.query_logs(conn)
+
+        print(f"{'':<32} {'best time':>12} {'retained':>13} {'peak':>13}")
+        measure("rows as dicts", dict_rows)
+        measure("rows as LogRecords", record_rows)
+
+        try:
+            import pandas as pd
+        except ImportError:
+            print("pandas not installed; skipping DataFrame conversion")
+        else:
+            dicts, records = dict_rows(), record_rows()
+            measure("DataFrame from dicts", lambda: pd.DataFrame(dicts))
+            measure("DataFrame from LogRecords", lambda: db.log_records_frame(records))
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,23 @@
+import copy
+import functools
+import hashlib
+import json
 import os
+import queue
+import re
 import shutil
 import sqlite3
-from contextlib import closing
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from datetime import datetime, date
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.request import pathname2url
 
 
 # Allow overriding storage root (for server deployments with persistent disks)
@@ -16,338 +30,1268 @@ def ensure_dirs() -> None:
     os.makedirs(IMAGES_DIR, exist_ok=True)
 
 
-def get_conn(db_path: Optional[str] = None) -> sqlite3.Connection:
-    path = db_path or DB_PATH
-    conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    # Improve reliability for concurrent reads
-    try:
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA foreign_keys=ON")
-    except Exception:
-        pass
-    return conn
+# Backup settings: archives directory, backup API throttling and retention generations
+DB_BACKUP_DIR = os.environ.get("DB_BACKUP_DIR", os.path.join(DATA_ROOT, "backups"))
+DB_BACKUP_PAGES_PER_STEP = int(os.environ.get("DB_BACKUP_PAGES_PER_STEP", "256"))
+DB_BACKUP_STEP_SLEEP_MS = float(os.environ.get("DB_BACKUP_STEP_SLEEP_MS", "10"))
+DB_BACKUP_KEEP_HOURLY = int(os.environ.get("DB_BACKUP_KEEP_HOURLY", "24"))
+DB_BACKUP_KEEP_DAILY = int(os.environ.get("DB_BACKUP_KEEP_DAILY", "7"))
+DB_BACKUP_KEEP_WEEKLY = int(os.environ.get("DB_BACKUP_KEEP_WEEKLY", "4"))
+DB_BACKUP_HASH_WORKERS = int(os.environ.get("DB_BACKUP_HASH_WORKERS", str(min(8, os.cpu_count() or 4))))
 
 
-def init_db(conn: sqlite3.Connection) -> None:
-    with closing(conn.cursor()) as cur:
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                display_name TEXT,
-                created_at TEXT NOT NULL
-            )
-            """
+# Connection pool settings (one shared writer plus read-only readers per process)
+DB_POOL_READERS = int(os.environ.get("DB_POOL_READERS", "4"))
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", "5000"))
+# How long reader() waits for a free reader before raising instead of hanging
+DB_READER_TIMEOUT_MS = int(os.environ.get("DB_READER_TIMEOUT_MS", "30000"))
+DB_STATEMENT_CACHE_SIZE = 256
+DB_READ_CACHE_SIZE = int(os.environ.get("DB_READ_CACHE_SIZE", "1024"))
+# Route app writes through a single background writer thread (see WriteQueue)
+DB_WRITE_QUEUE = os.environ.get("DB_WRITE_QUEUE", "0").lower() in ("1", "true", "yes")
+DB_WRITE_QUEUE_MAX_GROUP = int(os.environ.get("DB_WRITE_QUEUE_MAX_GROUP", "64"))
+DB_WRITE_QUEUE_LINGER_MS = float(os.environ.get("DB_WRITE_QUEUE_LINGER_MS", "2"))
+
+
+class _PooledConnection(sqlite3.Connection):
+    """Connection owned by a ConnectionPool; close() from callers is a no-op.
+
+    On the writer connection, statements, commit() and rollback() from a thread
+    other than the one holding the writer raise instead of joining, committing
+    or rolling back that thread's transaction.
+    """
+
+    _released = False
+    _is_writer = False
+    # Thread running a WriteQueue group; its commit()/rollback() act on the current write only
+    _group_thread: Optional[int] = None
+
+    def close(self) -> None:
+        if self._released:
+            super().close()
+
+    def _check_owner(self) -> None:
+        if self._is_writer:
+            owner = self._pool._writer_owner
+            if owner is not None and owner != threading.get_ident():
+                raise sqlite3.ProgrammingError(
+                    "the writer connection is held by another thread; use pool.writer() or pool.run_write()"
+                )
+
+    def cursor(self, *args, **kwargs) -> sqlite3.Cursor:
+        self._check_owner()
+        return super().cursor(*args, **kwargs)
+
+    def execute(self, *args, **kwargs) -> sqlite3.Cursor:
+        self._check_owner()
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs) -> sqlite3.Cursor:
+        self._check_owner()
+        return super().executemany(*args, **kwargs)
+
+    def executescript(self, *args, **kwargs) -> sqlite3.Cursor:
+        self._check_owner()
+        return super().executescript(*args, **kwargs)
+
+    def commit(self) -> None:
+        self._check_owner()
+        if self._group_thread == threading.get_ident():
+            return
+        super().commit()
+
+    def rollback(self) -> None:
+        self._check_owner()
+        if self._group_thread == threading.get_ident():
+            self.execute("ROLLBACK TO SAVEPOINT write_intent")
+        else:
+            super().rollback()
+
+
+class _ReadCache:
+    """LRU of read-function results, each stored with the generation token it was read at."""
+
+    def __init__(self, max_entries: int = DB_READ_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Tuple[Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "evictions": 0}
+
+    def lookup(self, key: Any, token: Any) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == token:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return True, entry[1]
+            self._stats["misses"] += 1
+            return False, None
+
+    def store(self, key: Any, token: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (token, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def bypass(self) -> None:
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups * 100, 1) if lookups else 0.0
+        return stats
+
+
+class ConnectionPool:
+    """Per-process SQLite connections: one serialized writer and N read-only readers.
+
+    Every connection keeps a prepared-statement cache and a busy_timeout, and the
+    PRAGMAs run once when it is opened instead of on every Streamlit rerun.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = DB_POOL_READERS,
+        busy_timeout_ms: int = DB_BUSY_TIMEOUT_MS,
+        statement_cache_size: int = DB_STATEMENT_CACHE_SIZE,
+        use_write_queue: bool = DB_WRITE_QUEUE,
+        reader_timeout_ms: int = DB_READER_TIMEOUT_MS,
+    ) -> None:
+        self.db_path = db_path
+        # An in-memory database cannot be shared with separate reader connections
+        self.max_readers = 0 if db_path == ":memory:" else max(0, readers)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.reader_timeout_ms = reader_timeout_ms
+        self.statement_cache_size = statement_cache_size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._readers: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        # Thread holding _write_lock (writer() or a WriteQueue group), and how deeply
+        self._writer_owner: Optional[int] = None
+        self._writer_depth = 0
+        # Reader checked out by the current thread, so nested reader() blocks share it
+        self._local = threading.local()
+        self._stats = {
+            "reader_checkouts": 0,
+            "reader_returns": 0,
+            "reader_waits": 0,
+            "reader_timeouts": 0,
+            "readers_in_use": 0,
+            "peak_readers_in_use": 0,
+            "writer_checkouts": 0,
+            "writer_wait_ms": 0.0,
+        }
+        self.writer_connection = self._connect(readonly=False)
+        self.writer_connection._is_writer = True
+        # Dedicated connection whose PRAGMA data_version moves on every commit by any other connection
+        self._version_conn = None if db_path == ":memory:" else self._connect(readonly=True)
+        self._version_lock = threading.Lock()
+        self.read_cache = _ReadCache()
+        self.use_write_queue = use_write_queue
+        self._write_queue: Optional["WriteQueue"] = None
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        if readonly:
+            target = "file:" + pathname2url(os.path.abspath(self.db_path)) + "?mode=ro"
+        else:
+            target = self.db_path
+        conn = sqlite3.connect(
+            target,
+            uri=readonly,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.statement_cache_size,
+            factory=_PooledConnection,
         )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL,
-                cell_line TEXT,
-                event_type TEXT,
-                passage INTEGER,
-                vessel TEXT,
-                location TEXT,
-                medium TEXT,
-                cell_type TEXT,
-                notes TEXT,
-                operator TEXT,
-                thaw_id TEXT,
-                cryo_vial_position TEXT,
-                image_path TEXT,
-                assigned_to TEXT,
-                next_action_date TEXT,
-                created_by TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                volume REAL,
-                experiment_type TEXT,
-                experiment_stage TEXT,
-                experimental_conditions TEXT,
-                protocol_reference TEXT,
-                outcome_status TEXT,
-                success_metrics TEXT,
-                linked_thaw_id TEXT
+        conn.row_factory = sqlite3.Row
+        conn._pool = self
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            if readonly:
+                conn.execute("PRAGMA query_only = ON")
+            else:
+                # Improve reliability for concurrent reads
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA foreign_keys=ON")
+        except Exception:
+            pass
+        return conn
+
+    def _bump(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection for the duration of the block.
+
+        Nested reader() blocks on the same thread get the same connection, so a
+        fragment rerun checks out its own reader while a full run shares the page's.
+        """
+        held = getattr(self._local, "reader", None)
+        if held is not None:
+            yield held
+            return
+        if self.max_readers == 0:
+            with self.writer() as conn:
+                yield conn
+            return
+        conn = self._checkout_reader()
+        self._local.reader = conn
+        try:
+            yield conn
+        finally:
+            self._local.reader = None
+            self._return_reader(conn)
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = len(self._readers) < self.max_readers
+                if create:
+                    conn = self._connect(readonly=True)
+                    self._readers.append(conn)
+            if conn is None:
+                self._bump("reader_waits")
+                try:
+                    conn = self._idle.get(timeout=self.reader_timeout_ms / 1000)
+                except queue.Empty:
+                    self._bump("reader_timeouts")
+                    raise sqlite3.OperationalError(
+                        f"no pooled reader became free within {self.reader_timeout_ms} ms "
+                        f"(all {self.max_readers} in use); raise DB_POOL_READERS or DB_READER_TIMEOUT_MS"
+                    ) from None
+        with self._lock:
+            self._stats["reader_checkouts"] += 1
+            self._stats["readers_in_use"] += 1
+            self._stats["peak_readers_in_use"] = max(
+                self._stats["peak_readers_in_use"], self._stats["readers_in_use"]
             )
-            """
+        return conn
+
+    def _return_reader(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._stats["reader_returns"] += 1
+            self._stats["readers_in_use"] -= 1
+        self._idle.put(conn)
+
+    @contextmanager
+    def _hold_writer(self) -> Iterator[sqlite3.Connection]:
+        """Take the write lock and mark this thread as the writer connection's owner."""
+        with self._write_lock:
+            self._writer_owner = threading.get_ident()
+            self._writer_depth += 1
+            try:
+                yield self.writer_connection
+            finally:
+                self._writer_depth -= 1
+                if self._writer_depth == 0:
+                    self._writer_owner = None
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer connection exclusively; commits on success, rolls back on error."""
+        started = time.perf_counter()
+        with self._hold_writer() as conn:
+            self._bump("writer_checkouts")
+            self._bump("writer_wait_ms", (time.perf_counter() - started) * 1000)
+            try:
+                yield conn
+                if conn.in_transaction:
+                    conn.commit()
+            except BaseException:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+    def write_queue(self) -> "WriteQueue":
+        """The pool's background write queue, started on first use."""
+        with self._lock:
+            if self._write_queue is None:
+                self._write_queue = WriteQueue(self)
+            return self._write_queue
+
+    def run_write(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a write function such as insert_log(conn, ...) and return its result.
+
+        With use_write_queue the call is queued for the writer thread and this
+        waits for its group to commit; otherwise it runs here under writer().
+        """
+        if self.use_write_queue:
+            return self.write_queue().submit(func, *args, **kwargs).result()
+        with self.writer() as conn:
+            return func(conn, *args, **kwargs)
+
+    def data_generation(self) -> Tuple[int, int]:
+        """Cheap token that changes whenever the database content may have changed.
+
+        data_version catches commits from other connections and processes;
+        total_changes catches this process's writes on the writer connection.
+        """
+        version = 0
+        if self._version_conn is not None:
+            with self._version_lock:
+                version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+        return version, self.writer_connection.total_changes
+
+    def stats(self) -> Dict[str, Any]:
+        """Checkout/return counters plus current reader usage."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open_readers"] = len(self._readers)
+        stats["max_readers"] = self.max_readers
+        stats["idle_readers"] = self._idle.qsize()
+        stats["writer_wait_ms"] = round(stats["writer_wait_ms"], 2)
+        return stats
+
+    def close(self) -> None:
+        if self._write_queue is not None:
+            self._write_queue.close()
+        with self._lock:
+            connections = [self.writer_connection] + self._readers
+            if self._version_conn is not None:
+                connections.append(self._version_conn)
+            self._readers = []
+        self.read_cache.clear()
+        for conn in connections:
+            conn._released = True
+            conn.close()
+
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Write-behind executor: one thread applies queued writes on the pool's writer.
+
+    Each submitted write function runs as func(conn, *args, **kwargs) inside a
+    savepoint, so a failing write is undone alone. Writes waiting in the queue
+    are applied in one BEGIN IMMEDIATE transaction (one commit and fsync per
+    group); futures resolve with each function's return value once its group
+    has committed. Functions that open their own transaction with BEGIN
+    (insert_logs_many) cannot be queued.
+    """
+
+    def __init__(
+        self,
+        pool: "ConnectionPool",
+        max_group: int = DB_WRITE_QUEUE_MAX_GROUP,
+        linger_ms: float = DB_WRITE_QUEUE_LINGER_MS,
+    ) -> None:
+        self.pool = pool
+        self.max_group = max(1, max_group)
+        self.linger_ms = linger_ms
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "groups": 0,
+            "peak_queue_depth": 0,
+            "last_group_size": 0,
+            "max_group_size": 0,
+            "last_commit_ms": 0.0,
+            "max_commit_ms": 0.0,
+            "total_commit_ms": 0.0,
+            "total_wait_ms": 0.0,
+        }
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Queue func(conn, *args, **kwargs); the future resolves after its group commits."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("write queue is closed")
+            self._queue.put((future, func, args, kwargs, time.perf_counter()))
+            self._stats["submitted"] += 1
+            self._stats["peak_queue_depth"] = max(self._stats["peak_queue_depth"], self._queue.qsize())
+        return future
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Apply everything already queued, then stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            group = [item]
+            stop = False
+            deadline = time.perf_counter() + self.linger_ms / 1000
+            while len(group) < self.max_group:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                group.append(item)
+            self._apply(group)
+            if stop:
+                return
+
+    def _apply(self, group: List[Tuple[Future, Callable, tuple, dict, float]]) -> None:
+        pool = self.pool
+        conn = pool.writer_connection
+        outcomes: List[Tuple[Future, bool, Any]] = []
+        started = time.perf_counter()
+        with pool._hold_writer():
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn._group_thread = threading.get_ident()
+                try:
+                    for future, func, args, kwargs, _ in group:
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        conn.execute("SAVEPOINT write_intent")
+                        try:
+                            result = func(conn, *args, **kwargs)
+                        except Exception as exc:
+                            conn.execute("ROLLBACK TO SAVEPOINT write_intent")
+                            outcomes.append((future, False, exc))
+                        else:
+                            outcomes.append((future, True, result))
+                        conn.execute("RELEASE SAVEPOINT write_intent")
+                finally:
+                    conn._group_thread = None
+                conn.commit()
+            except Exception as exc:
+                # The transaction itself failed (lock timeout, disk error): every write in it is lost
+                if conn.in_transaction:
+                    conn.rollback()
+                for future, *_ in group:
+                    if not future.done():
+                        future.set_exception(exc)
+                self._bump_group(group, started, failed=len(group))
+                return
+        self._bump_group(group, started, failed=sum(1 for _, ok, _ in outcomes if not ok))
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _bump_group(self, group: list, started: float, failed: int) -> None:
+        commit_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self._stats
+            stats["groups"] += 1
+            stats["completed"] += len(group) - failed
+            stats["failed"] += failed
+            stats["last_group_size"] = len(group)
+            stats["max_group_size"] = max(stats["max_group_size"], len(group))
+            stats["last_commit_ms"] = commit_ms
+            stats["max_commit_ms"] = max(stats["max_commit_ms"], commit_ms)
+            stats["total_commit_ms"] += commit_ms
+            stats["total_wait_ms"] += sum((started - item[4]) * 1000 for item in group)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, group sizes, commit latency and time spent queued."""
+        with self._lock:
+            stats = dict(self._stats)
+        groups = stats["groups"]
+        applied = stats["completed"] + stats["failed"]
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_group_size"] = round(applied / groups, 2) if groups else 0.0
+        stats["avg_commit_ms"] = round(stats.pop("total_commit_ms") / groups, 2) if groups else 0.0
+        stats["avg_wait_ms"] = round(stats.pop("total_wait_ms") / applied, 2) if applied else 0.0
+        stats["last_commit_ms"] = round(stats["last_commit_ms"], 2)
+        stats["max_commit_ms"] = round(stats["max_commit_ms"], 2)
+        return stats
+
+
+_POOLS: Dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """Get the process-wide connection pool for a database path."""
+    path = db_path or DB_PATH
+    with _POOLS_LOCK:
+        pool = _POOLS.get(path)
+        if pool is None:
+            pool = ConnectionPool(path)
+            _POOLS[path] = pool
+    return pool
+
+
+def close_pools() -> None:
+    """Close every pooled connection (for scripts and shutdown)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def read_connection(db_path: Optional[str] = None):
+    """Context manager checking out a pooled read-only connection."""
+    return get_pool(db_path).reader()
+
+
+def cached_read(func: Callable) -> Callable:
+    """Cache a db read function per pool until the database changes.
+
+    The first argument must be a pooled connection. Results are keyed on the
+    function, its arguments and today's date, and are reused while
+    ConnectionPool.data_generation() is unchanged, so any committed write
+    (insert_log, update_log, delete_log, ref-value changes, other processes)
+    invalidates them. Callers get a copy they are free to mutate.
+    """
+    @functools.wraps(func)
+    def wrapper(conn: sqlite3.Connection, *args, **kwargs):
+        pool = getattr(conn, "_pool", None)
+        if pool is None:
+            return func(conn, *args, **kwargs)
+        key = (func.__name__, date.today(), args, frozenset(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        # Uncommitted writes are only visible to this connection; never cache them
+        if key is None or conn.in_transaction:
+            pool.read_cache.bypass()
+            return func(conn, *args, **kwargs)
+        token = pool.data_generation()
+        found, value = pool.read_cache.lookup(key, token)
+        if not found:
+            value = func(conn, *args, **kwargs)
+            pool.read_cache.store(key, token, value)
+        return copy.deepcopy(value)
+
+    return wrapper
+
+
+def get_read_cache_stats(db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Hit/miss counters of the cached_read layer for a database."""
+    return get_pool(db_path).read_cache.stats()
+
+
+def get_write_queue_stats(db_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Write queue metrics for a database, or None while its pool writes directly."""
+    pool = get_pool(db_path)
+    if not pool.use_write_queue:
+        return None
+    return pool.write_queue().stats()
+
+
+def _migrate_base_schema(cur: sqlite3.Cursor) -> None:
+    """Tables, late-added columns and indexes from before schema versioning."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            display_name TEXT,
+            created_at TEXT NOT NULL
         )
-        
-        # Experimental workflows table
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS experimental_workflows (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                workflow_name TEXT UNIQUE NOT NULL,
-                description TEXT,
-                typical_stages TEXT,
-                expected_duration_days INTEGER,
-                success_criteria TEXT,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            cell_line TEXT,
+            event_type TEXT,
+            passage INTEGER,
+            vessel TEXT,
+            location TEXT,
+            medium TEXT,
+            cell_type TEXT,
+            notes TEXT,
+            operator TEXT,
+            thaw_id TEXT,
+            cryo_vial_position TEXT,
+            image_path TEXT,
+            assigned_to TEXT,
+            next_action_date TEXT,
+            created_by TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            volume REAL,
+            experiment_type TEXT,
+            experiment_stage TEXT,
+            experimental_conditions TEXT,
+            protocol_reference TEXT,
+            outcome_status TEXT,
+            success_metrics TEXT,
+            linked_thaw_id TEXT
         )
-        
-        # Reference tables for dropdowns
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS cell_lines (
-                name TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+
+    # Experimental workflows table
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS experimental_workflows (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            workflow_name TEXT UNIQUE NOT NULL,
+            description TEXT,
+            typical_stages TEXT,
+            expected_duration_days INTEGER,
+            success_criteria TEXT,
+            created_at TEXT NOT NULL
         )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS event_types (
-                name TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+
+    # Reference tables for dropdowns
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cell_lines (
+            name TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL
         )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS vessels (
-                name TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS event_types (
+            name TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL
         )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS locations (
-                name TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vessels (
+            name TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL
         )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS cell_types (
-                name TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS locations (
+            name TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL
         )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS culture_media (
-                name TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cell_types (
+            name TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL
         )
-        
-        # New reference tables for experimental workflows
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS experiment_types (
-                name TEXT PRIMARY KEY,
-                category TEXT,
-                description TEXT,
-                typical_duration_days INTEGER,
-                success_criteria TEXT,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS culture_media (
+            name TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL
         )
-        
-        # Weekend planning tables
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS weekend_schedules (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                weekend_date TEXT NOT NULL,
-                assignee TEXT NOT NULL,
-                created_by TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                UNIQUE(weekend_date, assignee)
-            )
-            """
+        """
+    )
+
+    # New reference tables for experimental workflows
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS experiment_types (
+            name TEXT PRIMARY KEY,
+            category TEXT,
+            description TEXT,
+            typical_duration_days INTEGER,
+            success_criteria TEXT,
+            created_at TEXT NOT NULL
         )
-        
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS user_calibers (
-                username TEXT PRIMARY KEY,
-                caliber_level TEXT NOT NULL,
-                updated_by TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+
+    # Weekend planning tables
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS weekend_schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            weekend_date TEXT NOT NULL,
+            assignee TEXT NOT NULL,
+            created_by TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            UNIQUE(weekend_date, assignee)
         )
-        
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS custom_weekend_work (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                work_type TEXT NOT NULL,
-                description TEXT NOT NULL,
-                hours REAL NOT NULL,
-                assignee TEXT NOT NULL,
-                work_date TEXT NOT NULL,
-                priority TEXT NOT NULL,
-                created_by TEXT NOT NULL,
-                created_at TEXT NOT NULL
-            )
-            """
+        """
+    )
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_calibers (
+            username TEXT PRIMARY KEY,
+            caliber_level TEXT NOT NULL,
+            updated_by TEXT NOT NULL,
+            updated_at TEXT NOT NULL
         )
-        
-        # Migrations: add columns if missing (BEFORE creating indexes)
-        cur.execute("PRAGMA table_info(logs)")
-        cols = {row[1] for row in cur.fetchall()}
-        if "cell_type" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN cell_type TEXT")
-        if "assigned_to" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN assigned_to TEXT")
-        if "next_action_date" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN next_action_date TEXT")
-        if "volume" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN volume REAL")
-        if "experiment_type" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN experiment_type TEXT")
-        if "experiment_stage" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN experiment_stage TEXT")
-        if "experimental_conditions" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN experimental_conditions TEXT")
-        if "protocol_reference" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN protocol_reference TEXT")
-        if "outcome_status" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN outcome_status TEXT")
-        if "success_metrics" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN success_metrics TEXT")
-        if "linked_thaw_id" not in cols:
-            cur.execute("ALTER TABLE logs ADD COLUMN linked_thaw_id TEXT")
-        
-        # Migrate experiment_types table if needed
-        cur.execute("PRAGMA table_info(experiment_types)")
-        exp_cols = {row[1] for row in cur.fetchall()}
-        if "typical_duration_days" not in exp_cols:
-            cur.execute("ALTER TABLE experiment_types ADD COLUMN typical_duration_days INTEGER")
-        if "success_criteria" not in exp_cols:
-            cur.execute("ALTER TABLE experiment_types ADD COLUMN success_criteria TEXT")
-        
-        # Create indexes AFTER all columns exist
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_thaw_id ON logs (thaw_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_linked_thaw_id ON logs (linked_thaw_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_created_at ON logs (created_at)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_created_by ON logs (created_by)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_experiment_type ON logs (experiment_type)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_assigned_to ON logs (assigned_to)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_next_action_date ON logs (next_action_date)")
-        
-        conn.commit()
+        """
+    )
 
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS custom_weekend_work (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            work_type TEXT NOT NULL,
+            description TEXT NOT NULL,
+            hours REAL NOT NULL,
+            assignee TEXT NOT NULL,
+            work_date TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            created_by TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+
+    # Migrations: add columns if missing (BEFORE creating indexes)
+    cur.execute("PRAGMA table_info(logs)")
+    cols = {row[1] for row in cur.fetchall()}
+    if "cell_type" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN cell_type TEXT")
+    if "assigned_to" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN assigned_to TEXT")
+    if "next_action_date" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN next_action_date TEXT")
+    if "volume" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN volume REAL")
+    if "experiment_type" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN experiment_type TEXT")
+    if "experiment_stage" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN experiment_stage TEXT")
+    if "experimental_conditions" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN experimental_conditions TEXT")
+    if "protocol_reference" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN protocol_reference TEXT")
+    if "outcome_status" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN outcome_status TEXT")
+    if "success_metrics" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN success_metrics TEXT")
+    if "linked_thaw_id" not in cols:
+        cur.execute("ALTER TABLE logs ADD COLUMN linked_thaw_id TEXT")
+
+    # Migrate experiment_types table if needed
+    cur.execute("PRAGMA table_info(experiment_types)")
+    exp_cols = {row[1] for row in cur.fetchall()}
+    if "typical_duration_days" not in exp_cols:
+        cur.execute("ALTER TABLE experiment_types ADD COLUMN typical_duration_days INTEGER")
+    if "success_criteria" not in exp_cols:
+        cur.execute("ALTER TABLE experiment_types ADD COLUMN success_criteria TEXT")
+
+    # Create indexes AFTER all columns exist
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_thaw_id ON logs (thaw_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_linked_thaw_id ON logs (linked_thaw_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_created_at ON logs (created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_created_by ON logs (created_by)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_experiment_type ON logs (experiment_type)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_assigned_to ON logs (assigned_to)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_logs_next_action_date ON logs (next_action_date)")
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS entry_templates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            template_data TEXT NOT NULL,
+            created_by TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            usage_count INTEGER DEFAULT 0
+        )
+        """
+    )
+
+
+def _migrate_seed_defaults(cur: sqlite3.Cursor) -> None:
+    """Seed reference tables that are still empty."""
     # Seed default event types if empty
-    with closing(conn.cursor()) as cur:
-        cur.execute("SELECT COUNT(*) FROM event_types")
-        count = cur.fetchone()[0]
-        if count == 0:
-            defaults = [
-                "Observation",
-                "Media Change",
-                "Split",
-                "Thawing",
-                "Cryopreservation",
-                "Experimental Treatment",
-                "Protocol Start",
-                "Protocol Checkpoint",
-                "Protocol Completion",
-                "Quality Control",
-                "Harvest",
-                "Analysis",
-                "Other",
-            ]
-            now = datetime.utcnow().isoformat()
-            cur.executemany(
-                "INSERT OR IGNORE INTO event_types (name, created_at) VALUES (?, ?)",
-                [(d, now) for d in defaults],
-            )
-            conn.commit()
+    cur.execute("SELECT COUNT(*) FROM event_types")
+    count = cur.fetchone()[0]
+    if count == 0:
+        defaults = [
+            "Observation",
+            "Media Change",
+            "Split",
+            "Thawing",
+            "Cryopreservation",
+            "Experimental Treatment",
+            "Protocol Start",
+            "Protocol Checkpoint",
+            "Protocol Completion",
+            "Quality Control",
+            "Harvest",
+            "Analysis",
+            "Other",
+        ]
+        now = datetime.utcnow().isoformat()
+        cur.executemany(
+            "INSERT OR IGNORE INTO event_types (name, created_at) VALUES (?, ?)",
+            [(d, now) for d in defaults],
+        )
 
     # Seed default experiment types
-    with closing(conn.cursor()) as cur:
-        cur.execute("SELECT COUNT(*) FROM experiment_types")
-        exp_count = cur.fetchone()[0]
-        if exp_count == 0:
-            now = datetime.utcnow().isoformat()
-            experiment_defaults = [
-                ("Genome Editing", "Gene Modification", "CRISPR/Cas9, TALENs, or other genome editing approaches"),
-                ("Single Cell Cloning", "Cell Isolation", "Isolation and expansion of individual cell clones"),
-                ("Cardiac Differentiation", "Differentiation", "Differentiation of iPSCs into cardiomyocytes"),
-                ("Neural Differentiation", "Differentiation", "Differentiation into neural cell types"),
-                ("Hepatocyte Differentiation", "Differentiation", "Differentiation into liver cells"),
-                ("Organoid Formation", "3D Culture", "Generation of 3D tissue organoids"),
-                ("Drug Screening", "Pharmacology", "Compound testing and drug discovery"),
-                ("Disease Modeling", "Research", "Modeling disease conditions in vitro"),
-                ("Reprogramming", "Cell Conversion", "Converting cells to iPSCs or other cell types"),
-                ("Immunotherapy Prep", "Therapeutic", "Preparing cells for immunotherapy applications"),
-                ("Transplantation Prep", "Therapeutic", "Preparing cells for transplantation"),
-                ("Biomarker Analysis", "Analysis", "Expression analysis and biomarker studies"),
-                ("Electrophysiology", "Functional Analysis", "Electrical activity measurements"),
-                ("Metabolic Analysis", "Functional Analysis", "Metabolic profiling and analysis"),
-                ("Standard Maintenance", "Maintenance", "Regular culture maintenance without specific experimental goals")
-            ]
-            cur.executemany(
-                "INSERT OR IGNORE INTO experiment_types (name, category, description, created_at) VALUES (?, ?, ?, ?)",
-                [(name, cat, desc, now) for name, cat, desc in experiment_defaults],
-            )
-            conn.commit()
+    cur.execute("SELECT COUNT(*) FROM experiment_types")
+    exp_count = cur.fetchone()[0]
+    if exp_count == 0:
+        now = datetime.utcnow().isoformat()
+        experiment_defaults = [
+            ("Genome Editing", "Gene Modification", "CRISPR/Cas9, TALENs, or other genome editing approaches"),
+            ("Single Cell Cloning", "Cell Isolation", "Isolation and expansion of individual cell clones"),
+            ("Cardiac Differentiation", "Differentiation", "Differentiation of iPSCs into cardiomyocytes"),
+            ("Neural Differentiation", "Differentiation", "Differentiation into neural cell types"),
+            ("Hepatocyte Differentiation", "Differentiation", "Differentiation into liver cells"),
+            ("Organoid Formation", "3D Culture", "Generation of 3D tissue organoids"),
+            ("Drug Screening", "Pharmacology", "Compound testing and drug discovery"),
+            ("Disease Modeling", "Research", "Modeling disease conditions in vitro"),
+            ("Reprogramming", "Cell Conversion", "Converting cells to iPSCs or other cell types"),
+            ("Immunotherapy Prep", "Therapeutic", "Preparing cells for immunotherapy applications"),
+            ("Transplantation Prep", "Therapeutic", "Preparing cells for transplantation"),
+            ("Biomarker Analysis", "Analysis", "Expression analysis and biomarker studies"),
+            ("Electrophysiology", "Functional Analysis", "Electrical activity measurements"),
+            ("Metabolic Analysis", "Functional Analysis", "Metabolic profiling and analysis"),
+            ("Standard Maintenance", "Maintenance", "Regular culture maintenance without specific experimental goals")
+        ]
+        cur.executemany(
+            "INSERT OR IGNORE INTO experiment_types (name, category, description, created_at) VALUES (?, ?, ?, ?)",
+            [(name, cat, desc, now) for name, cat, desc in experiment_defaults],
+        )
 
     # Seed default experimental workflows
-    with closing(conn.cursor()) as cur:
-        cur.execute("SELECT COUNT(*) FROM experimental_workflows")
-        workflow_count = cur.fetchone()[0]
-        if workflow_count == 0:
-            now = datetime.utcnow().isoformat()
-            workflow_defaults = [
-                ("CRISPR Genome Editing", "Complete CRISPR/Cas9 editing workflow", "Transfection,Selection,Screening,Validation,Expansion", 21, "Successful editing confirmed by sequencing"),
-                ("Cardiac Differentiation Protocol", "iPSC to cardiomyocyte differentiation", "Mesoderm Induction,Cardiac Specification,Maturation,Characterization", 30, "Beating cardiomyocytes with cardiac markers"),
-                ("Single Cell Cloning", "Isolation and expansion of clones", "Single Cell Isolation,Clone Expansion,Screening,Validation", 28, "Stable clonal lines established"),
-                ("Neural Differentiation", "iPSC to neural cell differentiation", "Neural Induction,Patterning,Maturation,Analysis", 35, "Neural markers positive, functional activity"),
-                ("Organoid Formation", "3D organoid generation", "Aggregation,Differentiation,Maturation,Analysis", 45, "Organized tissue structure with appropriate markers"),
-                ("Drug Screening Protocol", "Compound testing workflow", "Cell Preparation,Treatment,Analysis,Validation", 14, "Dose-response curves and statistical significance"),
-            ]
-            cur.executemany(
-                "INSERT OR IGNORE INTO experimental_workflows (workflow_name, description, typical_stages, expected_duration_days, success_criteria, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-                [(name, desc, stages, duration, criteria, now) for name, desc, stages, duration, criteria in workflow_defaults],
-            )
-            conn.commit()
+    cur.execute("SELECT COUNT(*) FROM experimental_workflows")
+    workflow_count = cur.fetchone()[0]
+    if workflow_count == 0:
+        now = datetime.utcnow().isoformat()
+        workflow_defaults = [
+            ("CRISPR Genome Editing", "Complete CRISPR/Cas9 editing workflow", "Transfection,Selection,Screening,Validation,Expansion", 21, "Successful editing confirmed by sequencing"),
+            ("Cardiac Differentiation Protocol", "iPSC to cardiomyocyte differentiation", "Mesoderm Induction,Cardiac Specification,Maturation,Characterization", 30, "Beating cardiomyocytes with cardiac markers"),
+            ("Single Cell Cloning", "Isolation and expansion of clones", "Single Cell Isolation,Clone Expansion,Screening,Validation", 28, "Stable clonal lines established"),
+            ("Neural Differentiation", "iPSC to neural cell differentiation", "Neural Induction,Patterning,Maturation,Analysis", 35, "Neural markers positive, functional activity"),
+            ("Organoid Formation", "3D organoid generation", "Aggregation,Differentiation,Maturation,Analysis", 45, "Organized tissue structure with appropriate markers"),
+            ("Drug Screening Protocol", "Compound testing workflow", "Cell Preparation,Treatment,Analysis,Validation", 14, "Dose-response curves and statistical significance"),
+        ]
+        cur.executemany(
+            "INSERT OR IGNORE INTO experimental_workflows (workflow_name, description, typical_stages, expected_duration_days, success_criteria, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [(name, desc, stages, duration, criteria, now) for name, desc, stages, duration, criteria in workflow_defaults],
+        )
 
     # Seed default cell types if empty
-    with closing(conn.cursor()) as cur:
-        cur.execute("SELECT COUNT(*) FROM cell_types")
-        ct_count = cur.fetchone()[0]
-        if ct_count == 0:
-            now = datetime.utcnow().isoformat()
-            cell_type_defaults = [
-                "iPSC", "NPC", "Cardiomyocyte", "Neuron", "Hepatocyte", 
-                "Astrocyte", "Oligodendrocyte", "Endothelial", "Fibroblast",
-                "Mesenchymal Stem Cell", "Organoid", "Mixed Population"
-            ]
-            cur.executemany(
-                "INSERT OR IGNORE INTO cell_types (name, created_at) VALUES (?, ?)",
-                [(d, now) for d in cell_type_defaults],
-            )
-            conn.commit()
+    cur.execute("SELECT COUNT(*) FROM cell_types")
+    ct_count = cur.fetchone()[0]
+    if ct_count == 0:
+        now = datetime.utcnow().isoformat()
+        cell_type_defaults = [
+            "iPSC", "NPC", "Cardiomyocyte", "Neuron", "Hepatocyte", 
+            "Astrocyte", "Oligodendrocyte", "Endothelial", "Fibroblast",
+            "Mesenchymal Stem Cell", "Organoid", "Mixed Population"
+        ]
+        cur.executemany(
+            "INSERT OR IGNORE INTO cell_types (name, created_at) VALUES (?, ?)",
+            [(d, now) for d in cell_type_defaults],
+        )
 
     # Seed default culture media if empty
-    with closing(conn.cursor()) as cur:
-        cur.execute("SELECT COUNT(*) FROM culture_media")
-        cm_count = cur.fetchone()[0]
-        if cm_count == 0:
-            now = datetime.utcnow().isoformat()
-            media_defaults = [
-                "StemFlex", "mTeSR1", "E8", "E6", "RPMI1640", "DMEM", "Neurobasal",
-                "Cardiac Differentiation Medium", "Neural Induction Medium", 
-                "Organoid Medium", "Maintenance Medium", "Selection Medium"
-            ]
-            cur.executemany(
-                "INSERT OR IGNORE INTO culture_media (name, created_at) VALUES (?, ?)",
-                [(d, now) for d in media_defaults],
+    cur.execute("SELECT COUNT(*) FROM culture_media")
+    cm_count = cur.fetchone()[0]
+    if cm_count == 0:
+        now = datetime.utcnow().isoformat()
+        media_defaults = [
+            "StemFlex", "mTeSR1", "E8", "E6", "RPMI1640", "DMEM", "Neurobasal",
+            "Cardiac Differentiation Medium", "Neural Induction Medium", 
+            "Organoid Medium", "Maintenance Medium", "Selection Medium"
+        ]
+        cur.executemany(
+            "INSERT OR IGNORE INTO culture_media (name, created_at) VALUES (?, ?)",
+            [(d, now) for d in media_defaults],
+        )
+
+
+def _migrate_vial_state(cur: sqlite3.Cursor) -> None:
+    """Materialized per-vial summary kept current by triggers on logs."""
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'vial_state'")
+    vial_state_missing = cur.fetchone() is None
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vial_state (
+            thaw_id TEXT PRIMARY KEY,
+            cell_line TEXT,
+            thaw_date TEXT,
+            latest_event TEXT,
+            latest_date TEXT,
+            current_passage INTEGER,
+            current_vessel TEXT,
+            current_medium TEXT,
+            current_location TEXT,
+            split_count INTEGER NOT NULL DEFAULT 0,
+            total_events INTEGER NOT NULL DEFAULT 0,
+            has_recent_observation INTEGER NOT NULL DEFAULT 0,
+            last_cryo_date TEXT,
+            culture_days INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_vial_state_thaw_date ON vial_state (thaw_date)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_vial_state_cell_line ON vial_state (cell_line, thaw_date)")
+    for trigger_sql in _vial_state_trigger_sql(_VIAL_STATE_REFRESH_SQL_V3, deferrable=False):
+        cur.execute(trigger_sql)
+    if vial_state_missing:
+        cur.execute(_VIAL_STATE_REFRESH_SQL_V3.format(where="thaw_id IS NOT NULL AND thaw_id != ''"))
+
+
+def _migrate_thaw_id_sequences(cur: sqlite3.Cursor) -> None:
+    """Per-prefix thaw ID counters, backfilled from the IDs already in logs."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS thaw_id_sequences (
+            prefix TEXT PRIMARY KEY,
+            next_value INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute("SELECT DISTINCT thaw_id FROM logs WHERE thaw_id LIKE 'TH-%'")
+    for (thaw_id,) in cur.fetchall():
+        _observe_thaw_id(cur, thaw_id)
+
+
+def _migrate_vial_state_last_known(cur: sqlite3.Cursor) -> None:
+    """Latest non-empty passage/vessel/medium/location per vial for task annotation."""
+    cur.execute("PRAGMA table_info(vial_state)")
+    existing = {r[1] for r in cur.fetchall()}
+    for column, decl in (
+        ("first_date", "TEXT"),
+        ("last_passage", "INTEGER"),
+        ("last_vessel", "TEXT"),
+        ("last_medium", "TEXT"),
+        ("last_location", "TEXT"),
+    ):
+        if column not in existing:
+            cur.execute(f"ALTER TABLE vial_state ADD COLUMN {column} {decl}")
+    # Trigger bodies embed the refresh statement, so recreate them with the new columns
+    for name in ("trg_logs_vial_state_insert", "trg_logs_vial_state_update", "trg_logs_vial_state_delete"):
+        cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for trigger_sql in _vial_state_trigger_sql(_VIAL_STATE_REFRESH_SQL_V6, deferrable=False):
+        cur.execute(trigger_sql)
+    cur.execute("DELETE FROM vial_state")
+    cur.execute(_VIAL_STATE_REFRESH_SQL_V6.format(where="thaw_id IS NOT NULL AND thaw_id != ''"))
+
+
+# Text columns covered by the logs_fts full-text index
+LOG_FTS_COLUMNS = ("notes", "experimental_conditions", "success_metrics", "protocol_reference", "cell_line")
+
+
+def _logs_fts_trigger_sql() -> List[str]:
+    """CREATE TRIGGER statements keeping the external-content logs_fts index in sync."""
+    cols = ", ".join(LOG_FTS_COLUMNS)
+    new_values = ", ".join(f"NEW.{c}" for c in LOG_FTS_COLUMNS)
+    old_values = ", ".join(f"OLD.{c}" for c in LOG_FTS_COLUMNS)
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_logs_fts_insert AFTER INSERT ON logs BEGIN
+            INSERT INTO logs_fts (rowid, {cols}) VALUES (NEW.id, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_logs_fts_delete AFTER DELETE ON logs BEGIN
+            INSERT INTO logs_fts (logs_fts, rowid, {cols}) VALUES ('delete', OLD.id, {old_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_logs_fts_update AFTER UPDATE OF {cols} ON logs BEGIN
+            INSERT INTO logs_fts (logs_fts, rowid, {cols}) VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO logs_fts (rowid, {cols}) VALUES (NEW.id, {new_values});
+        END
+        """,
+    ]
+
+
+def _migrate_logs_fts(cur: sqlite3.Cursor) -> None:
+    """FTS5 index over the free-text log columns, content stored in logs itself."""
+    cur.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(
+            {", ".join(LOG_FTS_COLUMNS)},
+            content = 'logs',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        """
+    )
+    for trigger_sql in _logs_fts_trigger_sql():
+        cur.execute(trigger_sql)
+    cur.execute("INSERT INTO logs_fts (logs_fts) VALUES ('rebuild')")
+
+
+# Composite indexes shaped after the WHERE/ORDER BY clauses in this module; the
+# implicit trailing rowid makes (..., date, created_at) serve "(date, created_at, id)" orderings.
+_QUERY_INDEXES = (
+    ("idx_logs_thaw_date", "logs (thaw_id, date, created_at)"),
+    ("idx_logs_date", "logs (date, created_at)"),
+    ("idx_logs_cell_line_date", "logs (cell_line, date, created_at)"),
+    ("idx_logs_line_event_date", "logs (cell_line, event_type, date, created_at)"),
+    ("idx_logs_event_date", "logs (event_type, date, created_at)"),
+    ("idx_logs_event_thaw_date", "logs (event_type, thaw_id, date, created_at)"),
+    ("idx_logs_created_by_date", "logs (created_by, date, created_at)"),
+    ("idx_logs_operator_date", "logs (operator, date, created_at)"),
+    ("idx_logs_assigned_next_action", "logs (assigned_to, next_action_date)"),
+    ("idx_logs_experiment_thaw", "logs (experiment_type, thaw_id, date, created_at)"),
+    ("idx_vial_state_thaw_order", "vial_state (thaw_date, thaw_id)"),
+    ("idx_vial_state_cell_line_thaw", "vial_state (cell_line, thaw_date, thaw_id)"),
+    ("idx_custom_weekend_work_date", "custom_weekend_work (work_date)"),
+)
+# Single-column indexes made redundant by a composite index with the same prefix
+_SUPERSEDED_INDEXES = (
+    "idx_logs_thaw_id",
+    "idx_logs_created_by",
+    "idx_logs_assigned_to",
+    "idx_logs_experiment_type",
+    "idx_vial_state_thaw_date",
+    "idx_vial_state_cell_line",
+)
+
+
+def _migrate_query_indexes(cur: sqlite3.Cursor) -> None:
+    """Replace single-column indexes with composite ones matching the hot queries."""
+    for name, target in _QUERY_INDEXES:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    for name in _SUPERSEDED_INDEXES:
+        cur.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+# Day numbers for date arithmetic: whole Julian days, so differences are day counts
+# and a timestamp falls on the same day as its date. NULL for unparseable dates.
+def _julian_day_sql(expr: str) -> str:
+    return f"CAST(JULIANDAY({expr}, 'start of day') AS INTEGER)"
+
+
+_LOG_DAY_COLUMNS = (("date_jd", "date"), ("next_action_jd", "next_action_date"))
+# Task windows are day ranges, so next-action lookups move to the day column
+_DAY_COLUMN_INDEXES = (
+    ("idx_logs_next_action_jd", "logs (next_action_jd)"),
+    ("idx_logs_assigned_next_action_jd", "logs (assigned_to, next_action_jd)"),
+)
+_SUPERSEDED_DAY_INDEXES = ("idx_logs_next_action_date", "idx_logs_assigned_next_action")
+
+
+def _migrate_log_day_columns(cur: sqlite3.Cursor) -> None:
+    """Add generated Julian day columns to logs and index the task-date one."""
+    cur.execute("PRAGMA table_xinfo(logs)")
+    cols = {row[1] for row in cur.fetchall()}
+    for name, source in _LOG_DAY_COLUMNS:
+        if name not in cols:
+            cur.execute(
+                f"ALTER TABLE logs ADD COLUMN {name} INTEGER "
+                f"GENERATED ALWAYS AS ({_julian_day_sql(source)}) VIRTUAL"
             )
-            conn.commit()
+    for name, target in _DAY_COLUMN_INDEXES:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    for name in _SUPERSEDED_DAY_INDEXES:
+        cur.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+# Change data capture: every insert/update/delete on these tables appends a row
+# to `changes` (from triggers), so consumers can follow the database by sequence
+CHANGE_TRACKED_TABLES = (
+    "logs",
+    "cell_lines",
+    "event_types",
+    "vessels",
+    "locations",
+    "cell_types",
+    "culture_media",
+    "experiment_types",
+    "weekend_schedules",
+    "custom_weekend_work",
+    "entry_templates",
+)
+_CHANGE_OPS = ("insert", "update", "delete")
+
+
+def _change_trigger_sql(cur: sqlite3.Cursor, table: str) -> List[str]:
+    """CREATE TRIGGER statements recording `table` row changes in `changes`.
+
+    The payload lists the stored columns that exist now, so a migration adding
+    columns to a tracked table must reinstall these (_install_change_triggers).
+    An update that changes the key is recorded as a delete plus an insert.
+    """
+    cur.execute(f"PRAGMA table_info({table})")
+    info = cur.fetchall()
+    columns = [r[1] for r in info]
+    key = next((r[1] for r in info if r[5]), "rowid")
+    new_row = "json_object(" + ", ".join(f"'{c}', NEW.{c}" for c in columns) + ")"
+    old_row = "json_object(" + ", ".join(f"'{c}', OLD.{c}" for c in columns) + ")"
+    insert = "INSERT INTO changes (table_name, op, row_id, changed_at, payload_json)"
+    now = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_insert AFTER INSERT ON {table} BEGIN
+            {insert} VALUES ('{table}', 'insert', NEW.{key}, {now}, {new_row});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_update AFTER UPDATE ON {table} BEGIN
+            {insert} SELECT '{table}', 'delete', OLD.{key}, {now}, {old_row} WHERE OLD.{key} IS NOT NEW.{key};
+            {insert} VALUES (
+                '{table}', CASE WHEN OLD.{key} IS NEW.{key} THEN 'update' ELSE 'insert' END,
+                NEW.{key}, {now}, {new_row}
+            );
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_delete AFTER DELETE ON {table} BEGIN
+            {insert} VALUES ('{table}', 'delete', OLD.{key}, {now}, {old_row});
+        END
+        """,
+    ]
+
+
+def _install_change_triggers(cur: sqlite3.Cursor) -> None:
+    for table in CHANGE_TRACKED_TABLES:
+        for op in _CHANGE_OPS:
+            cur.execute(f"DROP TRIGGER IF EXISTS trg_{table}_changes_{op}")
+        for trigger_sql in _change_trigger_sql(cur, table):
+            cur.execute(trigger_sql)
+
+
+def _migrate_changes(cur: sqlite3.Cursor) -> None:
+    """Trigger-maintained change log for logs, reference and planning tables."""
+    # AUTOINCREMENT so sequence numbers are never reused after compaction
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+            row_id,
+            changed_at TEXT NOT NULL,
+            payload_json TEXT
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_changes_row ON changes (table_name, row_id, seq)")
+    _install_change_triggers(cur)
+
+
+# History filters on culture conditions: equality on the column, date order within it
+_HISTORY_INDEXES = (
+    ("idx_logs_medium_date", "logs (medium, date, created_at)"),
+    ("idx_logs_location_date", "logs (location, date, created_at)"),
+    ("idx_logs_vessel_date", "logs (vessel, date, created_at)"),
+)
+
+
+def _migrate_history_indexes(cur: sqlite3.Cursor) -> None:
+    """Indexes for the History tab's medium, location and vessel filters."""
+    for name, target in _HISTORY_INDEXES:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+# History sorts read pages in index order; passage is the only sort column without one
+_HISTORY_SORT_INDEXES = (
+    ("idx_logs_passage_date", "logs (passage, date, created_at)"),
+)
+
+
+def _migrate_history_sort_indexes(cur: sqlite3.Cursor) -> None:
+    """Index for paging History sorted by passage."""
+    for name, target in _HISTORY_SORT_INDEXES:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _migrate_vial_state_deferral(cur: sqlite3.Cursor) -> None:
+    """Flag row letting bulk inserts skip the per-row vial_state refresh without DDL."""
+    cur.execute("CREATE TABLE IF NOT EXISTS vial_state_deferred (id INTEGER PRIMARY KEY CHECK (id = 1))")
+    cur.execute("DROP TRIGGER IF EXISTS trg_logs_vial_state_insert")
+    cur.execute(_vial_state_trigger_sql(_VIAL_STATE_REFRESH_SQL_V6, deferrable=True)[0])
+
+
+# Numbered schema migrations; PRAGMA user_version records the last one applied.
+# Append new steps here (never edit or reorder applied ones).
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "base schema", _migrate_base_schema),
+    (2, "seed reference defaults", _migrate_seed_defaults),
+    (3, "vial_state summary", _migrate_vial_state),
+    (4, "thaw ID sequences", _migrate_thaw_id_sequences),
+    (5, "logs full-text index", _migrate_logs_fts),
+    (6, "vial_state last-known conditions", _migrate_vial_state_last_known),
+    (7, "composite query indexes", _migrate_query_indexes),
+    (8, "log Julian day columns", _migrate_log_day_columns),
+    (9, "change data capture", _migrate_changes),
+    (10, "history filter indexes", _migrate_history_indexes),
+    (11, "history sort indexes", _migrate_history_sort_indexes),
+    (12, "vial_state bulk-insert deferral", _migrate_vial_state_deferral),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_migration_report: Dict[str, Any] = {"schema_version": None, "applied": [], "check_ms": None}
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def get_migration_report() -> Dict[str, Any]:
+    """Schema version, last init_db check time and migrations applied in this process."""
+    return dict(_migration_report)
+
+
+def init_db(conn: sqlite3.Connection) -> None:
+    """Bring the schema up to SCHEMA_VERSION.
+
+    On an up-to-date database this is a single PRAGMA user_version read.
+    """
+    started = time.perf_counter()
+    version = get_schema_version(conn)
+    if version < SCHEMA_VERSION:
+        _run_migrations(conn)
+        version = get_schema_version(conn)
+    _migration_report["schema_version"] = version
+    _migration_report["check_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def _run_migrations(conn: sqlite3.Connection) -> None:
+    applied = []
+    for number, name, migrate in MIGRATIONS:
+        step_started = time.perf_counter()
+        with closing(conn.cursor()) as cur:
+            # BEGIN IMMEDIATE so concurrent processes apply each step once
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                if get_schema_version(conn) >= number:
+                    conn.rollback()
+                    continue
+                migrate(cur)
+                cur.execute(f"PRAGMA user_version = {number}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        elapsed_ms = round((time.perf_counter() - step_started) * 1000, 2)
+        applied.append({"version": number, "name": name, "ms": elapsed_ms})
+    _migration_report["applied"] = applied
 
 
 def get_or_create_user(conn: sqlite3.Connection, username: str, display_name: Optional[str] = None) -> Dict[str, Any]:
@@ -381,6 +1325,7 @@ def delete_user(conn: sqlite3.Connection, username: str) -> None:
         conn.commit()
 
 
+@cached_read
 def get_all_users(conn: sqlite3.Connection) -> List[str]:
     """Get all usernames from the users table"""
     try:
@@ -394,14 +1339,7 @@ def get_all_users(conn: sqlite3.Connection) -> List[str]:
 
 def generate_thaw_id_for_date(conn: sqlite3.Connection, d: date) -> str:
     """Generate simple thaw ID for backward compatibility"""
-    day = d.strftime("%Y%m%d")
-    with closing(conn.cursor()) as cur:
-        cur.execute(
-            "SELECT COUNT(*) FROM logs WHERE event_type = 'Thawing' AND date = ?",
-            (d.isoformat(),),
-        )
-        count = cur.fetchone()[0] or 0
-    return f"TH-{day}-{count + 1:03d}"
+    return _preview_thaw_id(conn, thaw_id_prefix(d))
 
 
 def generate_enhanced_thaw_id(conn: sqlite3.Connection, d: date, operator: str = "", cell_type: str = "") -> str:
@@ -412,7 +1350,15 @@ def generate_enhanced_thaw_id(conn: sqlite3.Connection, d: date, operator: str =
     - TH-20251025-JD-iPSC-001  (John Doe, iPSC)
     - TH-20251025-AS-FIBRO-002 (Anna Smith, Fibroblast)
     - TH-20251025-001 (fallback if no operator/cell_type)
+
+    This is a preview of the next free number. The number is only reserved
+    when insert_log() saves a payload carrying "thaw_id_prefix".
     """
+    return _preview_thaw_id(conn, thaw_id_prefix(d, operator, cell_type))
+
+
+def thaw_id_prefix(d: date, operator: str = "", cell_type: str = "") -> str:
+    """Thaw ID without its sequence number, e.g. TH-20251025-JD-iPSC."""
     day = d.strftime("%Y%m%d")
     
     # Create operator initials (first letter of each word, max 3 chars)
@@ -447,107 +1393,764 @@ def generate_enhanced_thaw_id(conn: sqlite3.Connection, d: date, operator: str =
             cell_type_code = cell_type_clean[:5]
     
     # Build the base ID pattern
-    if operator_code and cell_type_code:
-        base_pattern = f"TH-{day}-{operator_code}-{cell_type_code}"
-        search_pattern = f"{base_pattern}-%"
-    elif operator_code:
-        base_pattern = f"TH-{day}-{operator_code}"
-        search_pattern = f"{base_pattern}-%"
-    elif cell_type_code:
-        base_pattern = f"TH-{day}-{cell_type_code}"
-        search_pattern = f"{base_pattern}-%"
-    else:
-        # Fallback to simple format
-        return generate_thaw_id_for_date(conn, d)
-    
-    # Count existing thaw IDs with this pattern
+    parts = [f"TH-{day}"] + [code for code in (operator_code, cell_type_code) if code]
+    return "-".join(parts)
+
+
+def _preview_thaw_id(conn: sqlite3.Connection, prefix: str) -> str:
     with closing(conn.cursor()) as cur:
-        cur.execute(
-            "SELECT COUNT(*) FROM logs WHERE event_type = 'Thawing' AND date = ? AND thaw_id LIKE ?",
-            (d.isoformat(), search_pattern),
-        )
-        count = cur.fetchone()[0] or 0
-    
-    return f"{base_pattern}-{count + 1:03d}"
+        cur.execute("SELECT next_value FROM thaw_id_sequences WHERE prefix = ?", (prefix,))
+        row = cur.fetchone()
+    return f"{prefix}-{(row[0] if row else 1):03d}"
+
+
+def _allocate_thaw_id(cur: sqlite3.Cursor, prefix: str) -> str:
+    """Reserve the next number for `prefix`; atomic within the caller's write transaction."""
+    cur.execute(
+        """
+        INSERT INTO thaw_id_sequences (prefix, next_value) VALUES (?, 2)
+        ON CONFLICT (prefix) DO UPDATE SET next_value = next_value + 1
+        RETURNING next_value - 1
+        """,
+        (prefix,),
+    )
+    return f"{prefix}-{cur.fetchone()[0]:03d}"
+
+
+def _observe_thaw_id(cur: sqlite3.Cursor, thaw_id: str) -> None:
+    """Move the sequence for an explicitly supplied thaw ID past its number."""
+    prefix, _, number = (thaw_id or "").rpartition("-")
+    if not prefix.startswith("TH-") or not number.isdigit():
+        return
+    cur.execute(
+        """
+        INSERT INTO thaw_id_sequences (prefix, next_value) VALUES (?, ?)
+        ON CONFLICT (prefix) DO UPDATE SET next_value = MAX(next_value, excluded.next_value)
+        """,
+        (prefix, int(number) + 1),
+    )
+
+
+# Columns accepted in insert_log()/insert_logs_many() payloads
+LOG_INSERT_COLUMNS = (
+    "date",
+    "cell_line",
+    "event_type",
+    "passage",
+    "vessel",
+    "location",
+    "medium",
+    "cell_type",
+    "notes",
+    "operator",
+    "thaw_id",
+    "cryo_vial_position",
+    "image_path",
+    "assigned_to",
+    "next_action_date",
+    "volume",
+    "experiment_type",
+    "experiment_stage",
+    "experimental_conditions",
+    "protocol_reference",
+    "outcome_status",
+    "success_metrics",
+    "linked_thaw_id",
+    "created_by",
+    "created_at",
+)
+LOG_REQUIRED_COLUMNS = ("date", "created_by", "created_at")
+_LOG_INSERT_SQL = (
+    f"INSERT INTO logs ({', '.join(LOG_INSERT_COLUMNS)})"
+    f" VALUES ({', '.join(['?'] * len(LOG_INSERT_COLUMNS))})"
+)
 
 
 def insert_log(conn: sqlite3.Connection, payload: Dict[str, Any]) -> int:
-    cols = [
-        "date",
-        "cell_line",
-        "event_type",
-        "passage",
-        "vessel",
-        "location",
-        "medium",
-        "cell_type",
-        "notes",
-        "operator",
-        "thaw_id",
-        "cryo_vial_position",
-        "image_path",
-        "assigned_to",
-        "next_action_date",
-        "volume",
-        "experiment_type",
-        "experiment_stage",
-        "experimental_conditions",
-        "protocol_reference",
-        "outcome_status",
-        "success_metrics",
-        "linked_thaw_id",
-        "created_by",
-        "created_at",
-    ]
-    values = [payload.get(c) for c in cols]
+    """Insert one log entry and return its id.
+
+    When the payload carries "thaw_id_prefix" (see thaw_id_prefix()), the thaw ID
+    is allocated in the same transaction as the insert; read it back with
+    get_log_by_id(). The caller's payload is left unchanged.
+    """
+    payload = dict(payload)
     with closing(conn.cursor()) as cur:
-        cur.execute(
-            f"INSERT INTO logs ({', '.join(cols)}) VALUES ({', '.join(['?']*len(cols))})",
-            values,
-        )
-        conn.commit()
+        try:
+            if payload.get("thaw_id_prefix"):
+                payload["thaw_id"] = _allocate_thaw_id(cur, payload["thaw_id_prefix"])
+            elif payload.get("event_type") == "Thawing" and payload.get("thaw_id"):
+                _observe_thaw_id(cur, payload["thaw_id"])
+            cur.execute(_LOG_INSERT_SQL, [payload.get(c) for c in LOG_INSERT_COLUMNS])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
         return cur.lastrowid
 
 
-def query_logs(
+# Value types SQLite can bind (dates through the default adapters)
+_LOG_VALUE_TYPES = (str, int, float, bytes, date)
+
+
+def _validate_log_payload(payload: Any) -> Optional[str]:
+    """Why `payload` cannot be inserted into logs, or None if it can."""
+    if not isinstance(payload, dict):
+        return "payload is not a dict"
+    unknown = [k for k in payload if k not in LOG_INSERT_COLUMNS and k != "thaw_id_prefix"]
+    if unknown:
+        return f"unknown columns: {', '.join(sorted(unknown))}"
+    missing = [c for c in LOG_REQUIRED_COLUMNS if payload.get(c) in (None, "")]
+    if missing:
+        return f"missing required columns: {', '.join(missing)}"
+    unbindable = [k for k, v in payload.items() if v is not None and not isinstance(v, _LOG_VALUE_TYPES)]
+    if unbindable:
+        return f"unsupported values for: {', '.join(sorted(unbindable))}"
+    return None
+
+
+def insert_logs_many(
     conn: sqlite3.Connection,
-    *,
+    payloads: List[Dict[str, Any]],
+    batch_size: int = 1000,
+) -> Dict[str, Any]:
+    """Insert many log entries with one transaction per batch.
+
+    Payloads use the same columns as insert_log(), including "thaw_id_prefix".
+    vial_state is refreshed once per batch for the affected thaw IDs instead of
+    per row. A row hitting a database error is rejected on its own; if a
+    batch's transaction is lost (I/O error, lock timeout) every row of that
+    batch is reported as failed and the next batch is still attempted.
+
+    Returns {"ids": [...], "errors": [{"index", "error"}], "inserted": n}; ids
+    lines up with payloads and holds None for rejected rows. The payloads are
+    left unchanged. Each batch commits on its own, so `conn` must not be inside
+    a transaction (sqlite3.ProgrammingError otherwise).
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    if conn.in_transaction:
+        raise sqlite3.ProgrammingError(
+            "insert_logs_many() commits each batch itself; commit or roll back the open transaction first"
+        )
+    ids: List[Optional[int]] = [None] * len(payloads)
+    errors: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    for index, payload in enumerate(payloads):
+        problem = _validate_log_payload(payload)
+        if problem:
+            errors.append({"index": index, "error": problem})
+        else:
+            # Thaw ID allocation fills in a copy, not the caller's dict
+            valid.append((index, dict(payload)))
+
+    for offset in range(0, len(valid), batch_size):
+        batch = valid[offset:offset + batch_size]
+        try:
+            _insert_log_batch(conn, batch, ids, errors)
+        except sqlite3.Error as e:
+            errors.extend({"index": index, "error": str(e)} for index, _ in batch)
+
+    errors.sort(key=lambda e: e["index"])
+    return {"ids": ids, "errors": errors, "inserted": sum(1 for i in ids if i is not None)}
+
+
+def _insert_log_batch(
+    conn: sqlite3.Connection,
+    batch: List[Tuple[int, Dict[str, Any]]],
+    ids: List[Optional[int]],
+    errors: List[Dict[str, Any]],
+) -> None:
+    """Insert one batch in one transaction; ids and errors are filled in once it commits."""
+    inserted: List[Tuple[int, int]] = []
+    rejected: List[Dict[str, Any]] = []
+    with closing(conn.cursor()) as cur:
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            # The flag row turns the per-row vial_state trigger off inside this transaction only
+            cur.execute("INSERT INTO vial_state_deferred (id) VALUES (1)")
+            _assign_batch_thaw_ids(cur, [p for _, p in batch])
+            thaw_ids = set()
+            for index, payload in batch:
+                try:
+                    cur.execute(_LOG_INSERT_SQL, [payload.get(c) for c in LOG_INSERT_COLUMNS])
+                except (sqlite3.Error, OverflowError) as e:
+                    # A failed statement is undone alone unless it took the transaction with it
+                    if not conn.in_transaction:
+                        raise
+                    rejected.append({"index": index, "error": str(e)})
+                    continue
+                inserted.append((index, cur.lastrowid))
+                if payload.get("thaw_id"):
+                    thaw_ids.add(payload["thaw_id"])
+            if thaw_ids:
+                cur.execute(
+                    _VIAL_STATE_REFRESH_SQL.format(where="thaw_id IN (SELECT value FROM json_each(?))"),
+                    (json.dumps(sorted(thaw_ids)),),
+                )
+            cur.execute("DELETE FROM vial_state_deferred")
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+    for index, log_id in inserted:
+        ids[index] = log_id
+    errors.extend(rejected)
+
+
+def _assign_batch_thaw_ids(cur: sqlite3.Cursor, payloads: List[Dict[str, Any]]) -> None:
+    """Allocate thaw IDs for a batch with one sequence update per prefix."""
+    by_prefix: Dict[str, List[Dict[str, Any]]] = {}
+    for payload in payloads:
+        if payload.get("thaw_id_prefix"):
+            by_prefix.setdefault(payload["thaw_id_prefix"], []).append(payload)
+        elif payload.get("event_type") == "Thawing" and payload.get("thaw_id"):
+            _observe_thaw_id(cur, payload["thaw_id"])
+    for prefix, group in by_prefix.items():
+        cur.execute(
+            """
+            INSERT INTO thaw_id_sequences (prefix, next_value) VALUES (?, ?)
+            ON CONFLICT (prefix) DO UPDATE SET next_value = next_value + excluded.next_value - 1
+            RETURNING next_value - ?
+            """,
+            (prefix, len(group) + 1, len(group)),
+        )
+        first = cur.fetchone()[0]
+        for position, payload in enumerate(group):
+            payload["thaw_id"] = f"{prefix}-{first + position:03d}"
+
+
+# Every column of logs, in table order
+LOG_COLUMNS = (
+    "id", "date", "cell_line", "event_type", "passage", "vessel", "location", "medium",
+    "cell_type", "notes", "operator", "thaw_id", "cryo_vial_position", "image_path",
+    "assigned_to", "next_action_date", "created_by", "created_at", "volume",
+    "experiment_type", "experiment_stage", "experimental_conditions", "protocol_reference",
+    "outcome_status", "success_metrics", "linked_thaw_id",
+)
+
+# Explicit select list for whole rows, keeping the generated day columns out of row dicts
+_LOG_SELECT_ALL = ", ".join(LOG_COLUMNS)
+
+# Keyset for paginated log reads: (date, created_at, id) is unique and totally ordered
+LOG_KEYSET = ("date", "created_at", "id")
+
+
+class LogRecord(Mapping):
+    """One log row: a tuple of values plus a field map shared by all rows of a query.
+
+    Reads like a read-only dict (`rec["date"]`, `rec.get(...)`, `dict(rec)`,
+    `pd.DataFrame(records)`) or by attribute (`rec.date`) without a hash table
+    per row. Use log_records_frame() to build a DataFrame straight from the values.
+    """
+
+    __slots__ = ("_values",)
+    _fields: Tuple[str, ...] = ()
+    _index: Dict[str, int] = {}
+
+    def __init__(self, values: Tuple[Any, ...]):
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._values[self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._index.get(key)
+        return default if i is None else self._values[i]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self._values))
+
+    def __reduce__(self):
+        return _make_log_record, (self._fields, self._values)
+
+    def __repr__(self) -> str:
+        return f"LogRecord({self.to_dict()!r})"
+
+
+@functools.lru_cache(maxsize=256)
+def _log_record_type(fields: Tuple[str, ...]) -> type:
+    """LogRecord subclass carrying the field map for one column list."""
+    index = {name: i for i, name in enumerate(fields)}
+    attrs = {"__slots__": (), "__module__": __name__, "_fields": fields, "_index": index}
+    return type("LogRecord", (LogRecord,), attrs)
+
+
+def _make_log_record(fields: Tuple[str, ...], values: Tuple[Any, ...]) -> LogRecord:
+    return _log_record_type(fields)(values)
+
+
+def log_record_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> LogRecord:
+    """Row factory producing LogRecords (set on a connection or a single cursor)."""
+    return _log_record_type(tuple(col[0] for col in cursor.description))(row)
+
+
+def _fetch_log_records(cur: sqlite3.Cursor, rows: List[Tuple[Any, ...]]) -> List[LogRecord]:
+    """Wrap plain tuple rows (cursor row_factory None) from `cur` as LogRecords."""
+    record = _log_record_type(tuple(col[0] for col in cur.description))
+    return list(map(record, rows))
+
+
+def log_records_frame(records: List[LogRecord], columns: Optional[List[str]] = None):
+    """DataFrame built from the records' value tuples, without per-row dicts."""
+    import pandas as pd
+
+    if not records:
+        return pd.DataFrame(columns=list(columns) if columns is not None else list(LOG_COLUMNS))
+    frame = pd.DataFrame.from_records([r._values for r in records], columns=list(records[0]._fields))
+    return frame[list(columns)] if columns is not None else frame
+
+
+def _log_select_list(columns: Optional[List[str]], required: Tuple[str, ...] = ()) -> str:
+    """Validated SELECT list for logs (all columns when `columns` is None)."""
+    if columns is None:
+        return _LOG_SELECT_ALL
+    unknown = [c for c in columns if c not in LOG_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unsupported log columns: {', '.join(unknown)}")
+    selected = list(dict.fromkeys(list(columns) + [c for c in required if c not in columns]))
+    return ", ".join(selected)
+
+
+def _distinct_values_like_sql(column: str) -> str:
+    """Subquery of the distinct values of an indexed logs column that match a LIKE pattern.
+
+    The values are walked with one index seek each (a loose index scan), so a
+    "contains" filter costs one seek per distinct cell line or assignee and
+    then index lookups, instead of testing LIKE against every row.
+    """
+    return (
+        f"WITH RECURSIVE distinct_values(value) AS ("
+        f"SELECT MIN({column}) FROM logs "
+        f"UNION ALL SELECT (SELECT MIN({column}) FROM logs WHERE {column} > distinct_values.value) "
+        f"FROM distinct_values WHERE distinct_values.value IS NOT NULL"
+        f") SELECT value FROM distinct_values WHERE LOWER(value) LIKE ?"
+    )
+
+
+def _log_filters(
     user: Optional[str] = None,
     event_type: Optional[str] = None,
     thaw_id: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     cell_line_contains: Optional[str] = None,
-) -> List[Dict[str, Any]]:
+    text: Optional[str] = None,
+    operator: Optional[str] = None,
+    assigned_to_contains: Optional[str] = None,
+    medium: Optional[str] = None,
+    location: Optional[str] = None,
+    vessel: Optional[str] = None,
+    min_passage: Optional[int] = None,
+    max_passage: Optional[int] = None,
+    exclude_event_type: Optional[str] = None,
+    text_column: Optional[str] = None,
+    alias: str = "",
+) -> Tuple[List[str], List[Any]]:
+    """WHERE conditions and parameters shared by the log query functions.
+
+    `text` is a full-text query (see search_logs), matched only in
+    `text_column` when given; `alias` qualifies the
+    column names when logs is joined under another name. The passage range
+    treats a missing passage as 0, like the History tab always has.
+    """
+    t = f"{alias}." if alias else ""
     where: List[str] = []
     params: List[Any] = []
     if user:
-        where.append("created_by = ?")
+        where.append(f"{t}created_by = ?")
         params.append(user)
     if event_type and event_type != "(any)":
-        where.append("event_type = ?")
+        where.append(f"{t}event_type = ?")
         params.append(event_type)
     if thaw_id:
-        where.append("thaw_id = ?")
+        where.append(f"{t}thaw_id = ?")
         params.append(thaw_id)
     if start_date:
-        where.append("date >= ?")
+        where.append(f"{t}date >= ?")
         params.append(start_date.isoformat())
     if end_date:
-        where.append("date <= ?")
+        where.append(f"{t}date <= ?")
         params.append(end_date.isoformat())
     if cell_line_contains:
-        where.append("LOWER(cell_line) LIKE ?")
+        where.append(f"{t}cell_line IN ({_distinct_values_like_sql('cell_line')})")
         params.append(f"%{cell_line_contains.lower()}%")
+    if text:
+        match = _fts_query(text, text_column)
+        if match:
+            where.append(f"{t}id IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)")
+            params.append(match)
+    if operator:
+        where.append(f"{t}operator = ?")
+        params.append(operator)
+    if assigned_to_contains:
+        where.append(f"{t}assigned_to IN ({_distinct_values_like_sql('assigned_to')})")
+        params.append(f"%{assigned_to_contains.lower()}%")
+    for column, value in (("medium", medium), ("location", location), ("vessel", vessel)):
+        if value and value != "(any)":
+            where.append(f"{t}{column} = ?")
+            params.append(value)
+    if min_passage is not None:
+        where.append(f"COALESCE({t}passage, 0) >= ?")
+        params.append(min_passage)
+    if max_passage is not None:
+        where.append(f"COALESCE({t}passage, 0) <= ?")
+        params.append(max_passage)
+    if exclude_event_type:
+        where.append(f"{t}event_type IS NOT ?")
+        params.append(exclude_event_type)
+    return where, params
+
+
+def _fts_query(text: str, column: Optional[str] = None) -> str:
+    """Turn free text into a safe FTS5 query: every word is a quoted prefix term.
+
+    Words are ANDed; upper-case OR / NOT between words are kept as operators.
+    With `column` (one of LOG_FTS_COLUMNS) the terms only match that column.
+    """
+    if column is not None and column not in LOG_FTS_COLUMNS:
+        raise ValueError(f"{column!r} is not a full-text indexed column")
+    terms: List[str] = []
+    for word in re.findall(r"\w+", text):
+        if word in ("OR", "NOT") and terms and terms[-1] not in ("OR", "NOT"):
+            terms.append(word)
+        else:
+            terms.append(f'"{word}"*')
+    while terms and terms[-1] in ("OR", "NOT"):
+        terms.pop()
+    if column and terms:
+        return f"{column} : ({' '.join(terms)})"
+    return " ".join(terms)
+
 
+def query_logs(
+    conn: sqlite3.Connection,
+    *,
+    user: Optional[str] = None,
+    event_type: Optional[str] = None,
+    thaw_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cell_line_contains: Optional[str] = None,
+    text: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+) -> List[LogRecord]:
+    """Get all matching logs oldest first; pass `columns` to fetch only those fields."""
+    where, params = _log_filters(user, event_type, thaw_id, start_date, end_date, cell_line_contains, text)
     where_sql = (" WHERE " + " AND ".join(where)) if where else ""
-    sql = "SELECT * FROM logs" + where_sql + " ORDER BY date ASC, created_at ASC"
+    sql = f"SELECT {_log_select_list(columns)} FROM logs" + where_sql + " ORDER BY date ASC, created_at ASC"
     with closing(conn.cursor()) as cur:
+        cur.row_factory = None
         cur.execute(sql, tuple(params))
-        rows = cur.fetchall()
-    return [dict(r) for r in rows]
+        return _fetch_log_records(cur, cur.fetchall())
+
+
+def count_logs(
+    conn: sqlite3.Connection,
+    *,
+    user: Optional[str] = None,
+    event_type: Optional[str] = None,
+    thaw_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cell_line_contains: Optional[str] = None,
+    text: Optional[str] = None,
+    text_column: Optional[str] = None,
+) -> int:
+    """Count logs matching the same filters as query_logs (`text` optionally in one column)."""
+    where, params = _log_filters(
+        user, event_type, thaw_id, start_date, end_date, cell_line_contains, text, text_column=text_column
+    )
+    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+    with closing(conn.cursor()) as cur:
+        cur.execute("SELECT COUNT(*) FROM logs" + where_sql, tuple(params))
+        return cur.fetchone()[0]
+
+
+def query_logs_page(
+    conn: sqlite3.Connection,
+    *,
+    columns: Optional[List[str]] = None,
+    page_size: int = 100,
+    cursor: Optional[Tuple[str, str, int]] = None,
+    descending: bool = False,
+    user: Optional[str] = None,
+    event_type: Optional[str] = None,
+    thaw_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cell_line_contains: Optional[str] = None,
+    text: Optional[str] = None,
+) -> Tuple[List[LogRecord], Optional[Tuple[str, str, int]]]:
+    """Get one page of logs ordered by (date, created_at, id).
+
+    `cursor` is the next_cursor returned by the previous page (None for the
+    first page). Rows always include the keyset columns besides `columns`.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be positive")
+    where, params = _log_filters(user, event_type, thaw_id, start_date, end_date, cell_line_contains, text)
+    direction = "DESC" if descending else "ASC"
+    if cursor is not None:
+        where.append(f"(date, created_at, id) {'<' if descending else '>'} (?, ?, ?)")
+        params.extend(cursor)
+    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+    sql = (
+        f"SELECT {_log_select_list(columns, LOG_KEYSET)} FROM logs{where_sql}"
+        f" ORDER BY date {direction}, created_at {direction}, id {direction} LIMIT ?"
+    )
+    # Fetch one extra row to know whether another page follows
+    params.append(page_size + 1)
+    with closing(conn.cursor()) as cur:
+        cur.row_factory = None
+        cur.execute(sql, tuple(params))
+        rows = _fetch_log_records(cur, cur.fetchall())
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = (last["date"], last["created_at"], last["id"])
+    return rows, next_cursor
+
+
+# History sort keys: the sort column, then the keyset columns so pages never overlap
+HISTORY_SORTS: Dict[str, Tuple[str, ...]] = {
+    "date": LOG_KEYSET,
+    "cell_line": ("cell_line",) + LOG_KEYSET,
+    "event_type": ("event_type",) + LOG_KEYSET,
+    "medium": ("medium",) + LOG_KEYSET,
+    "location": ("location",) + LOG_KEYSET,
+    "passage": ("passage",) + LOG_KEYSET,
+    "operator": ("operator",) + LOG_KEYSET,
+}
+
+
+def history_page(
+    conn: sqlite3.Connection,
+    filters: Optional[Dict[str, Any]] = None,
+    sort: str = "date",
+    descending: bool = True,
+    page: int = 0,
+    page_size: int = 50,
+    columns: Optional[List[str]] = None,
+    after: Optional[Tuple[Any, ...]] = None,
+) -> List[LogRecord]:
+    """One page (0-based) of logs matching `filters`, ordered by a HISTORY_SORTS key.
+
+    `filters` takes the keyword filters of _log_filters: the query_logs ones
+    plus operator, assigned_to_contains, medium, location, vessel,
+    min_passage, max_passage and exclude_event_type. Rows always include the
+    sort key columns besides `columns`.
+
+    `after` is history_sort_key() of the last row already shown; the page
+    then starts right after it by index seek instead of OFFSET, and `page` is
+    ignored.
+    """
+    if sort not in HISTORY_SORTS:
+        raise ValueError(f"Unsupported history sort: {sort}")
+    if page_size < 1 or page < 0:
+        raise ValueError("page must be >= 0 and page_size positive")
+    keys = HISTORY_SORTS[sort]
+    where, params = _log_filters(**(filters or {}))
+    direction = "DESC" if descending else "ASC"
+    select_sql = f"SELECT {_log_select_list(columns, keys)} FROM logs"
+    order_sql = " ORDER BY " + ", ".join(f"{c} {direction}" for c in keys)
+
+    if after is None:
+        segments = [([], [])]
+        params_tail = [page * page_size]
+        limit_sql = " LIMIT ? OFFSET ?"
+    else:
+        # SQLite sorts NULL first, so a sort column splits the order into a NULL
+        # run and a non-NULL run; each is read with its own seekable condition
+        compare = "<" if descending else ">"
+        keyset = f"({', '.join(LOG_KEYSET)}) {compare} (?, ?, ?)"
+        if keys == LOG_KEYSET:
+            segments = [([keyset], list(after))]
+        elif after[0] is None:
+            segments = [([f"{keys[0]} IS NULL", keyset], list(after[1:]))]
+            if not descending:
+                segments.append(([f"{keys[0]} IS NOT NULL"], []))
+        else:
+            segments = [([f"({', '.join(keys)}) {compare} (?, ?, ?, ?)"], list(after))]
+            if descending:
+                segments.append(([f"{keys[0]} IS NULL"], []))
+        params_tail = []
+        limit_sql = " LIMIT ?"
+
+    rows: List[LogRecord] = []
+    with closing(conn.cursor()) as cur:
+        cur.row_factory = None
+        for conditions, values in segments:
+            clauses = where + conditions
+            where_sql = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+            cur.execute(
+                select_sql + where_sql + order_sql + limit_sql,
+                tuple(params + values + [page_size - len(rows)] + params_tail),
+            )
+            rows.extend(_fetch_log_records(cur, cur.fetchall()))
+            if len(rows) >= page_size:
+                break
+    return rows
+
+
+def history_sort_key(record: LogRecord, sort: str) -> Tuple[Any, ...]:
+    """Keyset position of a history_page row, for history_page(after=...)."""
+    return tuple(record[c] for c in HISTORY_SORTS[sort])
+
+
+def history_summary(conn: sqlite3.Connection, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Totals for the History tab: matching rows, distinct cell lines and operators, date range."""
+    where, params = _log_filters(**(filters or {}))
+    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+    with closing(conn.cursor()) as cur:
+        cur.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT cell_line), COUNT(DISTINCT operator), MIN(date), MAX(date)"
+            f" FROM logs{where_sql}",
+            tuple(params),
+        )
+        total, cell_lines, operators, first_date, last_date = cur.fetchone()
+    return {
+        "total": total,
+        "cell_lines": cell_lines,
+        "operators": operators,
+        "first_date": first_date,
+        "last_date": last_date,
+    }
+
+
+# Low-cardinality text columns stored as pandas categoricals by read_logs_frame
+LOG_CATEGORICAL_COLUMNS = ("cell_line", "event_type", "operator", "medium", "location")
+
+
+def iter_logs(
+    conn: sqlite3.Connection,
+    filters: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 5000,
+    columns: Optional[List[str]] = None,
+) -> Iterator[List[LogRecord]]:
+    """Yield matching logs oldest first in batches of at most `chunk_size` rows.
+
+    `filters` takes the keyword filters of query_logs (user, event_type,
+    thaw_id, start_date, end_date, cell_line_contains, text).
+    """
+    yield from _iter_log_chunks(conn, filters, chunk_size, columns)
 
 
+def _iter_log_chunks(
+    conn: sqlite3.Connection,
+    filters: Optional[Dict[str, Any]],
+    chunk_size: int,
+    columns: Optional[List[str]],
+) -> Iterator[List[LogRecord]]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    where, params = _log_filters(**(filters or {}))
+    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+    sql = f"SELECT {_log_select_list(columns)} FROM logs" + where_sql + " ORDER BY date ASC, created_at ASC"
+    with closing(conn.cursor()) as cur:
+        cur.row_factory = None
+        cur.execute(sql, tuple(params))
+        while True:
+            chunk = cur.fetchmany(chunk_size)
+            if not chunk:
+                break
+            yield _fetch_log_records(cur, chunk)
+
+
+def read_logs_frame(
+    conn: sqlite3.Connection,
+    filters: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 5000,
+):
+    """Load matching logs into a pandas DataFrame chunk by chunk.
+
+    Each chunk is converted on arrival, so the full list of row dicts never
+    exists in memory. LOG_CATEGORICAL_COLUMNS become categoricals unless
+    `dtypes` overrides them; `dtypes` may also convert other columns.
+    """
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    names = list(columns) if columns is not None else list(LOG_COLUMNS)
+    _log_select_list(names)
+    dtype_map: Dict[str, Any] = {c: "category" for c in LOG_CATEGORICAL_COLUMNS if c in names}
+    dtype_map.update(dtypes or {})
+
+    frames = []
+    for chunk in _iter_log_chunks(conn, filters, chunk_size, names):
+        frame = pd.DataFrame.from_records([r._values for r in chunk], columns=names)
+        for col, dtype in dtype_map.items():
+            frame[col] = frame[col].astype(dtype)
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame({c: pd.Series(dtype=dtype_map.get(c, "object")) for c in names})
+
+    # Chunks see different category sets; align them so concat keeps the categorical dtype
+    for col, dtype in dtype_map.items():
+        if dtype == "category" and len(frames) > 1:
+            categories = union_categoricals([f[col] for f in frames]).categories
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def search_logs(
+    conn: sqlite3.Connection,
+    query: str,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = 50,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Full-text search over notes, conditions, metrics, protocol and cell line.
+
+    Best matches first (BM25, cell line and notes weighted highest). Each row
+    carries `snippet` (matched terms wrapped in **) and `score`. `filters`
+    takes the keyword filters of query_logs.
+    """
+    match = _fts_query(query or "")
+    if not match:
+        return []
+    select_list = ", ".join(f"l.{c}" for c in _log_select_list(columns, ("id",)).split(", "))
+    where, params = _log_filters(**(filters or {}), alias="l")
+    where_sql = "".join(f" AND {w}" for w in where)
+    sql = f"""
+        SELECT {select_list},
+               snippet(logs_fts, -1, '**', '**', '…', 12) AS snippet,
+               bm25(logs_fts, 2.0, 1.0, 1.0, 1.0, 3.0) AS score
+        FROM logs_fts
+        JOIN logs l ON l.id = logs_fts.rowid
+        WHERE logs_fts MATCH ?{where_sql}
+        ORDER BY score
+        LIMIT ?
+    """
+    with closing(conn.cursor()) as cur:
+        cur.execute(sql, (match, *params, limit))
+        return [dict(r) for r in cur.fetchall()]
+
+
+@cached_read
 def list_distinct_thaw_ids(conn: sqlite3.Connection) -> List[str]:
     with closing(conn.cursor()) as cur:
         cur.execute("SELECT DISTINCT thaw_id FROM logs WHERE thaw_id IS NOT NULL AND thaw_id <> '' ORDER BY thaw_id")
@@ -555,69 +2158,37 @@ def list_distinct_thaw_ids(conn: sqlite3.Connection) -> List[str]:
     return [r[0] for r in rows]
 
 
+@cached_read
 def get_active_thaw_options(conn: sqlite3.Connection, cell_line: str = "") -> List[Dict[str, Any]]:
     """Get active thaw IDs with current status for linking to new entries
     
     Returns list of dictionaries with thaw_id, cell_line, current_passage, 
     last_event, last_date, days_since_thaw, and status information
     """
-    with closing(conn.cursor()) as cur:
-        if cell_line:
-            # Get thaw IDs for specific cell line
-            query = """
-                SELECT DISTINCT t.thaw_id, t.cell_line, t.date as thaw_date,
-                       l.passage as current_passage, l.event_type as last_event, 
-                       l.date as last_date, l.vessel, l.location
-                FROM logs t
-                LEFT JOIN (
-                    SELECT thaw_id, passage, event_type, date, vessel, location,
-                           ROW_NUMBER() OVER (PARTITION BY thaw_id ORDER BY date DESC, id DESC) as rn
-                    FROM logs 
-                    WHERE thaw_id IS NOT NULL AND thaw_id != ''
-                ) l ON t.thaw_id = l.thaw_id AND l.rn = 1
-                WHERE t.thaw_id IS NOT NULL AND t.thaw_id != '' 
-                  AND t.event_type = 'Thawing' 
-                  AND t.cell_line = ?
-                ORDER BY t.date DESC, t.thaw_id DESC
-                LIMIT 10
-            """
-            cur.execute(query, (cell_line,))
-        else:
-            # Get all recent thaw IDs
-            query = """
-                SELECT DISTINCT t.thaw_id, t.cell_line, t.date as thaw_date,
-                       l.passage as current_passage, l.event_type as last_event, 
-                       l.date as last_date, l.vessel, l.location
-                FROM logs t
-                LEFT JOIN (
-                    SELECT thaw_id, passage, event_type, date, vessel, location,
-                           ROW_NUMBER() OVER (PARTITION BY thaw_id ORDER BY date DESC, id DESC) as rn
-                    FROM logs 
-                    WHERE thaw_id IS NOT NULL AND thaw_id != ''
-                ) l ON t.thaw_id = l.thaw_id AND l.rn = 1
-                WHERE t.thaw_id IS NOT NULL AND t.thaw_id != '' 
-                  AND t.event_type = 'Thawing'
-                ORDER BY t.date DESC, t.thaw_id DESC
-                LIMIT 20
-            """
-            cur.execute(query)
-        
+    where = "WHERE thaw_date IS NOT NULL"
+    params: List[Any] = []
+    if cell_line:
+        where += " AND cell_line = ?"
+        params.append(cell_line)
+    limit = 10 if cell_line else 20
+    with closing(conn.cursor()) as cur:
+        cur.execute(
+            f"""
+            SELECT thaw_id, cell_line, thaw_date, current_passage, latest_event,
+                   latest_date, current_vessel, current_location,
+                   COALESCE({_julian_day_sql("?")} - {_julian_day_sql("thaw_date")}, 0) AS days_since
+            FROM vial_state
+            {where}
+            ORDER BY thaw_date DESC, thaw_id DESC
+            LIMIT {limit}
+            """,
+            (date.today().isoformat(), *params),
+        )
         rows = cur.fetchall()
         
         results = []
         for row in rows:
-            thaw_id, cell_line_db, thaw_date, current_passage, last_event, last_date, vessel, location = row
-            
-            # Calculate days since thaw
-            try:
-                from datetime import datetime, date
-                if isinstance(thaw_date, str):
-                    thaw_dt = datetime.fromisoformat(thaw_date).date()
-                else:
-                    thaw_dt = thaw_date
-                days_since = (date.today() - thaw_dt).days
-            except:
-                days_since = 0
+            thaw_id, cell_line_db, thaw_date, current_passage, last_event, last_date, vessel, location, days_since = row
             
             # Determine status
             status = "Active"
@@ -644,6 +2215,7 @@ def get_active_thaw_options(conn: sqlite3.Connection, cell_line: str = "") -> Li
         return results
 
 
+@cached_read
 def get_thaw_latest_info(conn: sqlite3.Connection, thaw_id: str) -> Dict[str, Any]:
     """Get the latest entry information for a specific thaw ID for auto-filling forms
     
@@ -659,7 +2231,7 @@ def get_thaw_latest_info(conn: sqlite3.Connection, thaw_id: str) -> Dict[str, An
                    experiment_type, experiment_stage, outcome_status
             FROM logs 
             WHERE thaw_id = ? 
-            ORDER BY date DESC, id DESC 
+            ORDER BY date DESC, created_at DESC, id DESC 
             LIMIT 1
         """
         cur.execute(query, (thaw_id,))
@@ -735,6 +2307,7 @@ def _ref_table_for(kind: str) -> str:
     return mapping[kind]
 
 
+@cached_read
 def get_ref_values(conn: sqlite3.Connection, kind: str) -> List[str]:
     table = _ref_table_for(kind)
     with closing(conn.cursor()) as cur:
@@ -770,38 +2343,528 @@ def rename_ref_value(conn: sqlite3.Connection, kind: str, old_name: str, new_nam
         conn.commit()
 
 
-def backup_now(dest_root: Optional[str] = None) -> str:
-    """Create a timestamped backup of the DB and images directory.
+def latest_change_seq(conn: sqlite3.Connection) -> int:
+    """Sequence number of the newest recorded change (0 if none)."""
+    with closing(conn.cursor()) as cur:
+        cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'")
+        row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def changes_since(
+    conn: sqlite3.Connection,
+    seq: int = 0,
+    tables: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Changes recorded after `seq`, oldest first, with the payload decoded.
+
+    Pass the last seq seen to resume; call latest_change_seq() before a full
+    snapshot to know where following changes start.
+    """
+    where = ["seq > ?"]
+    params: List[Any] = [seq]
+    if tables:
+        where.append(f"table_name IN ({', '.join('?' for _ in tables)})")
+        params.extend(tables)
+    sql = (
+        "SELECT seq, table_name, op, row_id, changed_at, payload_json FROM changes "
+        f"WHERE {' AND '.join(where)} ORDER BY seq ASC"
+    )
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    with closing(conn.cursor()) as cur:
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+    return [
+        {
+            "seq": r[0],
+            "table": r[1],
+            "op": r[2],
+            "row_id": r[3],
+            "changed_at": r[4],
+            "payload": json.loads(r[5]) if r[5] is not None else None,
+        }
+        for r in rows
+    ]
+
+
+def compact_changes(conn: sqlite3.Connection, through_seq: Optional[int] = None, purge: bool = False) -> int:
+    """Shrink the change log up to and including `through_seq` (default: all of it).
+
+    Compaction keeps only the newest change per row, which still replays to the
+    same final state. With purge=True every change in the range is deleted;
+    use that once all consumers have read past `through_seq`. Returns the
+    number of changes removed.
+    """
+    if through_seq is None:
+        through_seq = latest_change_seq(conn)
+    with closing(conn.cursor()) as cur:
+        if purge:
+            cur.execute("DELETE FROM changes WHERE seq <= ?", (through_seq,))
+        else:
+            cur.execute(
+                """
+                DELETE FROM changes
+                WHERE seq <= ?
+                  AND seq < (
+                      SELECT MAX(c.seq) FROM changes AS c
+                      WHERE c.table_name = changes.table_name
+                        AND c.row_id IS changes.row_id
+                        AND c.seq <= ?
+                  )
+                """,
+                (through_seq, through_seq),
+            )
+        removed = cur.rowcount
+        conn.commit()
+    return removed
+
+
+# Archives made within the same second get a -N suffix, in creation order
+_BACKUP_NAME = re.compile(r"^(?P<stem>.+)-(?P<ts>\d{8}T\d{6})Z(?:-(?P<n>\d+))?\.zip$")
+
+
+def _same_second_index(name: str, pattern: "re.Pattern[str]") -> int:
+    return int(pattern.match(name).group("n") or 0)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_database(
+    target_path: str,
+    db_path: Optional[str] = None,
+    pages_per_step: int = DB_BACKUP_PAGES_PER_STEP,
+    step_sleep_ms: float = DB_BACKUP_STEP_SLEEP_MS,
+    source: Optional[sqlite3.Connection] = None,
+) -> Dict[str, Any]:
+    """Copy the live database to `target_path` with the SQLite online backup API.
+
+    Copies from the pool's writer connection unless `source` is given. With
+    pages_per_step <= 0 the copy is a single step under one read transaction.
+    Returns page count, page size, schema version and timing.
+    """
+    started = time.perf_counter()
+    if source is None:
+        source = get_pool(db_path or DB_PATH).writer_connection
+    steps = 0
+
+    def throttle(status: int, remaining: int, total: int) -> None:
+        nonlocal steps
+        steps += 1
+        if remaining and step_sleep_ms > 0:
+            time.sleep(step_sleep_ms / 1000)
+
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target, pages=pages_per_step if pages_per_step > 0 else -1, progress=throttle)
+        page_count = target.execute("PRAGMA page_count").fetchone()[0]
+        page_size = target.execute("PRAGMA page_size").fetchone()[0]
+        schema_version = get_schema_version(target)
+    finally:
+        target.close()
+    return {
+        "page_count": page_count,
+        "page_size": page_size,
+        "schema_version": schema_version,
+        "steps": steps,
+        "copy_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
 
-    Returns the backup folder path.
+def backup_database(
+    dest_root: Optional[str] = None,
+    db_path: Optional[str] = None,
+    pages_per_step: int = DB_BACKUP_PAGES_PER_STEP,
+    step_sleep_ms: float = DB_BACKUP_STEP_SLEEP_MS,
+    prune: bool = True,
+) -> Dict[str, Any]:
+    """Back up the live database into a compressed, checksummed archive.
+
+    Uses the SQLite online backup API from the pool's writer connection, so the
+    copy is consistent with WAL content and the app's own writes during the
+    backup are carried over instead of restarting it. Pages are copied
+    `pages_per_step` at a time with a pause between steps. The archive is a
+    zip holding the database and manifest.json (SHA-256, page count, schema
+    version). Old archives are pruned to the retention generations afterwards.
+    Returns the manifest plus the archive path and timing.
     """
-    root = dest_root or os.path.join(os.path.dirname(__file__), "backups")
+    path = db_path or DB_PATH
+    root = dest_root or DB_BACKUP_DIR
     os.makedirs(root, exist_ok=True)
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    out_dir = os.path.join(root, f"backup_{ts}")
-    os.makedirs(out_dir, exist_ok=True)
-    # Copy DB
-    if os.path.exists(DB_PATH):
-        shutil.copy2(DB_PATH, os.path.join(out_dir, os.path.basename(DB_PATH)))
-    # Copy images (shallow copy maintaining structure)
-    if os.path.isdir(IMAGES_DIR):
-        img_out = os.path.join(out_dir, "images")
-        os.makedirs(img_out, exist_ok=True)
-        for root_dir, dirs, files in os.walk(IMAGES_DIR):
-            rel = os.path.relpath(root_dir, IMAGES_DIR)
-            target_dir = os.path.join(img_out, rel if rel != "." else "")
-            os.makedirs(target_dir, exist_ok=True)
-            for f in files:
-                src = os.path.join(root_dir, f)
-                dst = os.path.join(target_dir, f)
+    created = datetime.utcnow()
+    stem = os.path.splitext(os.path.basename(path))[0]
+    archive = os.path.join(root, f"{stem}-{created:%Y%m%dT%H%M%S}Z.zip")
+    n = 1
+    while os.path.exists(archive):
+        archive = os.path.join(root, f"{stem}-{created:%Y%m%dT%H%M%S}Z-{n}.zip")
+        n += 1
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(dir=root) as tmp:
+        snapshot = os.path.join(tmp, os.path.basename(path))
+        copied = snapshot_database(snapshot, path, max(1, pages_per_step), step_sleep_ms)
+        manifest = {
+            "database": os.path.basename(path),
+            "created_at": created.isoformat(timespec="seconds") + "Z",
+            "sha256": _file_sha256(snapshot),
+            "size_bytes": os.path.getsize(snapshot),
+            "page_count": copied["page_count"],
+            "page_size": copied["page_size"],
+            "schema_version": copied["schema_version"],
+        }
+        partial = archive + ".part"
+        with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+            zf.write(snapshot, arcname=manifest["database"])
+            zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+        os.replace(partial, archive)
+
+    report = dict(manifest)
+    report.update({
+        "archive": archive,
+        "archive_bytes": os.path.getsize(archive),
+        "steps": copied["steps"],
+        "copy_ms": copied["copy_ms"],
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "pruned": prune_backups(root) if prune else [],
+    })
+    return report
+
+
+def list_backups(dest_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Backup archives in `dest_root`, newest first, with their UTC timestamps."""
+    root = dest_root or DB_BACKUP_DIR
+    if not os.path.isdir(root):
+        return []
+    backups = []
+    for name in os.listdir(root):
+        match = _BACKUP_NAME.match(name)
+        if not match:
+            continue
+        full = os.path.join(root, name)
+        backups.append({
+            "archive": full,
+            "name": name,
+            "created_at": datetime.strptime(match.group("ts"), "%Y%m%dT%H%M%S"),
+            "size_bytes": os.path.getsize(full),
+        })
+    backups.sort(key=lambda b: (b["created_at"], _same_second_index(b["name"], _BACKUP_NAME)), reverse=True)
+    return backups
+
+
+def prune_backups(
+    dest_root: Optional[str] = None,
+    hourly: int = DB_BACKUP_KEEP_HOURLY,
+    daily: int = DB_BACKUP_KEEP_DAILY,
+    weekly: int = DB_BACKUP_KEEP_WEEKLY,
+) -> List[str]:
+    """Apply the retention policy and return the archives removed.
+
+    Keeps the newest archive of each of the last `hourly` hours, `daily` days
+    and `weekly` ISO weeks that have backups; the newest archive is always kept.
+    """
+    backups = list_backups(dest_root)
+    keep = _retained_generations([b["created_at"] for b in backups], hourly, daily, weekly)
+    removed = []
+    for i, b in enumerate(backups):
+        if i not in keep:
+            os.remove(b["archive"])
+            removed.append(b["archive"])
+    return removed
+
+
+def _retained_generations(timestamps: List[datetime], hourly: int, daily: int, weekly: int) -> set:
+    """Indexes (into newest-first `timestamps`) that the retention policy keeps."""
+    keep = {0} if timestamps else set()
+    generations = (
+        (hourly, lambda ts: ts.strftime("%Y%m%d%H")),
+        (daily, lambda ts: ts.strftime("%Y%m%d")),
+        (weekly, lambda ts: ts.isocalendar()[:2]),
+    )
+    for count, bucket_of in generations:
+        seen = set()
+        for i, ts in enumerate(timestamps):
+            bucket = bucket_of(ts)
+            if bucket in seen:
+                continue
+            if len(seen) >= count:
+                break
+            seen.add(bucket)
+            keep.add(i)
+    return keep
+
+
+def verify_backup(archive: str) -> Dict[str, Any]:
+    """Check one archive: zip CRCs, the manifest SHA-256 and PRAGMA integrity_check."""
+    result: Dict[str, Any] = {"archive": archive, "ok": False}
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            bad_member = zf.testzip()
+            if bad_member:
+                result["detail"] = f"CRC mismatch in {bad_member}"
+                return result
+            manifest = json.loads(zf.read("manifest.json"))
+            with tempfile.TemporaryDirectory() as tmp:
+                snapshot = zf.extract(manifest["database"], tmp)
+                if _file_sha256(snapshot) != manifest["sha256"]:
+                    result["detail"] = "SHA-256 does not match manifest"
+                    return result
+                check = sqlite3.connect(snapshot)
                 try:
-                    shutil.copy2(src, dst)
-                except Exception:
-                    # Skip unreadable files
-                    pass
-    return out_dir
+                    rows = [r[0] for r in check.execute("PRAGMA integrity_check")]
+                finally:
+                    check.close()
+        result["ok"] = rows == ["ok"]
+        result["detail"] = "ok" if result["ok"] else "; ".join(rows[:5])
+        result["created_at"] = manifest.get("created_at")
+    except Exception as e:
+        result["detail"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def verify_backups(dest_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """verify_backup() for every archive in `dest_root`, newest first."""
+    return [verify_backup(b["archive"]) for b in list_backups(dest_root)]
+
+
+# Image backups: a content-addressed store of objects keyed by SHA-256 plus one
+# JSON manifest per generation mapping relative paths to hashes
+_IMAGE_MANIFEST_NAME = re.compile(r"^images-(?P<ts>\d{8}T\d{6})Z(?:-(?P<n>\d+))?\.json$")
+# Held by backup_images and prune_image_backups: a backup in progress may be
+# copying or reusing objects that no manifest references yet
+_IMAGE_STORE_LOCK = threading.RLock()
+
+
+def _image_store(dest_root: Optional[str]) -> Tuple[str, str]:
+    root = os.path.join(dest_root or DB_BACKUP_DIR, "images")
+    return os.path.join(root, "objects"), os.path.join(root, "manifests")
+
+
+def _image_object_path(objects_dir: str, sha256: str) -> str:
+    return os.path.join(objects_dir, sha256[:2], sha256)
+
+
+def list_image_backups(dest_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Image backup generations (manifests), newest first."""
+    _, manifests_dir = _image_store(dest_root)
+    if not os.path.isdir(manifests_dir):
+        return []
+    generations = []
+    for name in os.listdir(manifests_dir):
+        match = _IMAGE_MANIFEST_NAME.match(name)
+        if match:
+            generations.append({
+                "manifest": os.path.join(manifests_dir, name),
+                "name": name,
+                "created_at": datetime.strptime(match.group("ts"), "%Y%m%dT%H%M%S"),
+            })
+    generations.sort(key=lambda g: (g["created_at"], _same_second_index(g["name"], _IMAGE_MANIFEST_NAME)), reverse=True)
+    return generations
+
+
+def backup_images(
+    dest_root: Optional[str] = None,
+    images_dir: Optional[str] = None,
+    workers: int = DB_BACKUP_HASH_WORKERS,
+    prune: bool = True,
+) -> Dict[str, Any]:
+    """Incrementally back up the images directory into the content-addressed store.
+
+    Files whose size and mtime match the previous generation reuse its hash;
+    the rest are hashed on a thread pool. Only objects not yet in the store are
+    copied, and a new manifest records every file of this generation. Runs
+    under the image store lock, so a concurrent prune waits for the manifest.
+    """
+    with _IMAGE_STORE_LOCK:
+        source = images_dir or IMAGES_DIR
+        objects_dir, manifests_dir = _image_store(dest_root)
+        os.makedirs(objects_dir, exist_ok=True)
+        os.makedirs(manifests_dir, exist_ok=True)
+        started = time.perf_counter()
+        created = datetime.utcnow()
+
+        previous: Dict[str, Dict[str, Any]] = {}
+        generations = list_image_backups(dest_root)
+        if generations:
+            with open(generations[0]["manifest"], encoding="utf-8") as fh:
+                previous = json.load(fh)["files"]
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        to_hash: List[Tuple[str, str]] = []
+        if os.path.isdir(source):
+            for root_dir, dirs, files in os.walk(source):
+                for f in files:
+                    full = os.path.join(root_dir, f)
+                    rel = os.path.relpath(full, source).replace(os.sep, "/")
+                    try:
+                        st = os.stat(full)
+                    except OSError:
+                        continue
+                    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+                    known = previous.get(rel)
+                    if (
+                        known
+                        and known["size"] == st.st_size
+                        and known["mtime_ns"] == st.st_mtime_ns
+                        and os.path.exists(_image_object_path(objects_dir, known["sha256"]))
+                    ):
+                        entry["sha256"] = known["sha256"]
+                    else:
+                        to_hash.append((rel, full))
+                    entries[rel] = entry
+
+        def store(item: Tuple[str, str]) -> Tuple[str, Optional[str], int]:
+            rel, full = item
+            try:
+                sha256 = _file_sha256(full)
+                target = _image_object_path(objects_dir, sha256)
+                if os.path.exists(target):
+                    return rel, sha256, 0
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                fd, partial = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".part")
+                os.close(fd)
+                shutil.copyfile(full, partial)
+                os.replace(partial, target)
+                return rel, sha256, os.path.getsize(target)
+            except OSError:
+                # Skip unreadable files
+                return rel, None, 0
+
+        copied_objects = copied_bytes = 0
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                for rel, sha256, copied in pool.map(store, to_hash):
+                    if sha256 is None:
+                        del entries[rel]
+                        continue
+                    entries[rel]["sha256"] = sha256
+                    if copied:
+                        copied_objects += 1
+                        copied_bytes += copied
+
+        manifest_path = os.path.join(manifests_dir, f"images-{created:%Y%m%dT%H%M%S}Z.json")
+        n = 1
+        while os.path.exists(manifest_path):
+            manifest_path = os.path.join(manifests_dir, f"images-{created:%Y%m%dT%H%M%S}Z-{n}.json")
+            n += 1
+        manifest = {
+            "created_at": created.isoformat(timespec="seconds") + "Z",
+            "source": os.path.abspath(source),
+            "files": entries,
+        }
+        with open(manifest_path + ".part", "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, indent=1, sort_keys=True)
+        os.replace(manifest_path + ".part", manifest_path)
+
+        return {
+            "manifest": manifest_path,
+            "files": len(entries),
+            "hashed": len(to_hash),
+            "new_objects": copied_objects,
+            "bytes_copied": copied_bytes,
+            "total_bytes": sum(e["size"] for e in entries.values()),
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "pruned": prune_image_backups(dest_root) if prune else [],
+        }
+
+
+def prune_image_backups(
+    dest_root: Optional[str] = None,
+    hourly: int = DB_BACKUP_KEEP_HOURLY,
+    daily: int = DB_BACKUP_KEEP_DAILY,
+    weekly: int = DB_BACKUP_KEEP_WEEKLY,
+) -> List[str]:
+    """Drop image generations outside the retention policy, then unreferenced objects.
+
+    Waits for any backup_images() in this process, whose new objects are not in
+    a manifest until it finishes, and leaves objects newer than the newest
+    manifest to the backup in another process that is writing them.
+    """
+    with _IMAGE_STORE_LOCK:
+        objects_dir, _ = _image_store(dest_root)
+        generations = list_image_backups(dest_root)
+        keep = _retained_generations([g["created_at"] for g in generations], hourly, daily, weekly)
+        removed = []
+        referenced = set()
+        for i, g in enumerate(generations):
+            if i in keep:
+                with open(g["manifest"], encoding="utf-8") as fh:
+                    referenced.update(e["sha256"] for e in json.load(fh)["files"].values())
+            else:
+                os.remove(g["manifest"])
+                removed.append(g["manifest"])
+        if removed and os.path.isdir(objects_dir):
+            # Objects written after the newest manifest, and partial copies, belong to
+            # a backup still running (possibly in another process)
+            settled_before = os.path.getmtime(generations[0]["manifest"])
+            for root_dir, dirs, files in os.walk(objects_dir):
+                for f in files:
+                    path = os.path.join(root_dir, f)
+                    if f in referenced or f.endswith(".part") or os.path.getmtime(path) > settled_before:
+                        continue
+                    os.remove(path)
+        return removed
+
+
+def restore_images(target_dir: str, generation: str = "latest", dest_root: Optional[str] = None) -> Dict[str, Any]:
+    """Rebuild an image backup generation into `target_dir`.
+
+    `generation` is a manifest name (images-<timestamp>Z.json) or "latest".
+    Each restored file is checked against its SHA-256; files that already
+    match are left alone.
+    """
+    objects_dir, manifests_dir = _image_store(dest_root)
+    if generation == "latest":
+        generations = list_image_backups(dest_root)
+        if not generations:
+            raise FileNotFoundError("No image backups found")
+        manifest_path = generations[0]["manifest"]
+    else:
+        manifest_path = os.path.join(manifests_dir, os.path.basename(generation))
+    with open(manifest_path, encoding="utf-8") as fh:
+        files = json.load(fh)["files"]
+
+    restored = unchanged = 0
+    missing: List[str] = []
+    for rel, entry in files.items():
+        target = os.path.join(target_dir, *rel.split("/"))
+        if os.path.exists(target) and os.path.getsize(target) == entry["size"] and _file_sha256(target) == entry["sha256"]:
+            unchanged += 1
+            continue
+        obj = _image_object_path(objects_dir, entry["sha256"])
+        if not os.path.exists(obj) or _file_sha256(obj) != entry["sha256"]:
+            missing.append(rel)
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(obj, target)
+        os.utime(target, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        restored += 1
+    return {
+        "manifest": manifest_path,
+        "restored": restored,
+        "unchanged": unchanged,
+        "missing": missing,
+    }
+
+
+def backup_now(dest_root: Optional[str] = None) -> str:
+    """Back up the DB (backup_database) and the images (backup_images).
+
+    Returns the database archive path.
+    """
+    report = backup_database(dest_root)
+    backup_images(dest_root)
+    return report["archive"]
 
 
+@cached_read
 def list_distinct_values(
     conn: sqlite3.Connection,
     column: str,
@@ -835,7 +2898,7 @@ def list_distinct_values(
 def get_last_log_for_cell_line(conn: sqlite3.Connection, cell_line: str) -> Optional[Dict[str, Any]]:
     with closing(conn.cursor()) as cur:
         cur.execute(
-            "SELECT * FROM logs WHERE cell_line = ? ORDER BY date DESC, created_at DESC LIMIT 1",
+            f"SELECT {_LOG_SELECT_ALL} FROM logs WHERE cell_line = ? ORDER BY date DESC, created_at DESC LIMIT 1",
             (cell_line,),
         )
         row = cur.fetchone()
@@ -845,8 +2908,8 @@ def get_last_log_for_cell_line(conn: sqlite3.Connection, cell_line: str) -> Opti
 def get_last_log_for_line_event(conn: sqlite3.Connection, cell_line: str, event_type: str) -> Optional[Dict[str, Any]]:
     with closing(conn.cursor()) as cur:
         cur.execute(
-            """
-            SELECT * FROM logs
+            f"""
+            SELECT {_LOG_SELECT_ALL} FROM logs
             WHERE cell_line = ? AND event_type = ?
             ORDER BY date DESC, created_at DESC
             LIMIT 1
@@ -864,8 +2927,8 @@ def get_recent_logs_for_cell_line(
 ) -> List[Dict[str, Any]]:
     with closing(conn.cursor()) as cur:
         cur.execute(
-            """
-            SELECT * FROM logs
+            f"""
+            SELECT {_LOG_SELECT_ALL} FROM logs
             WHERE cell_line = ?
             ORDER BY date DESC, created_at DESC
             LIMIT ?
@@ -978,7 +3041,7 @@ def update_log(conn: sqlite3.Connection, log_id: int, payload: Dict[str, Any]) -
 def get_log_by_id(conn: sqlite3.Connection, log_id: int) -> Optional[Dict[str, Any]]:
     """Get a single log entry by ID."""
     with closing(conn.cursor()) as cur:
-        cur.execute("SELECT * FROM logs WHERE id = ?", (log_id,))
+        cur.execute(f"SELECT {_LOG_SELECT_ALL} FROM logs WHERE id = ?", (log_id,))
         row = cur.fetchone()
     return dict(row) if row else None
 
@@ -1000,7 +3063,7 @@ def get_template_entries(conn: sqlite3.Connection, cell_line: Optional[str] = No
     
     # Get most recent entries grouped by common field combinations
     sql = f"""
-    SELECT *, COUNT(*) as usage_count 
+    SELECT {_LOG_SELECT_ALL}, COUNT(*) as usage_count 
     FROM logs {where_clause}
     GROUP BY cell_line, event_type, vessel, location, medium, cell_type
     ORDER BY usage_count DESC, date DESC
@@ -1018,7 +3081,7 @@ def get_recent_entries_by_operator(conn: sqlite3.Connection, operator: str, limi
     """Get recent entries by a specific operator for copying personal patterns."""
     with closing(conn.cursor()) as cur:
         cur.execute(
-            "SELECT * FROM logs WHERE operator = ? ORDER BY date DESC, created_at DESC LIMIT ?",
+            f"SELECT {_LOG_SELECT_ALL} FROM logs WHERE operator = ? ORDER BY date DESC, created_at DESC LIMIT ?",
             (operator, limit)
         )
         rows = cur.fetchall()
@@ -1039,7 +3102,7 @@ def get_entries_by_pattern(conn: sqlite3.Connection, **pattern_filters) -> List[
         return []
     
     where_clause = " WHERE " + " AND ".join(where_conditions)
-    sql = f"SELECT * FROM logs {where_clause} ORDER BY date DESC LIMIT 20"
+    sql = f"SELECT {_LOG_SELECT_ALL} FROM logs {where_clause} ORDER BY date DESC LIMIT 20"
     
     with closing(conn.cursor()) as cur:
         cur.execute(sql, params)
@@ -1050,18 +3113,6 @@ def get_entries_by_pattern(conn: sqlite3.Connection, **pattern_filters) -> List[
 def save_entry_template(conn: sqlite3.Connection, name: str, template_data: Dict[str, Any], created_by: str) -> None:
     """Save an entry template for future reuse."""
     with closing(conn.cursor()) as cur:
-        # First create templates table if it doesn't exist
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS entry_templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                template_data TEXT NOT NULL,
-                created_by TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                usage_count INTEGER DEFAULT 0
-            )
-        """)
-        
         import json
         cur.execute(
             "INSERT OR REPLACE INTO entry_templates (name, template_data, created_by, created_at, usage_count) VALUES (?, ?, ?, ?, COALESCE((SELECT usage_count FROM entry_templates WHERE name = ?), 0))",
@@ -1070,25 +3121,10 @@ def save_entry_template(conn: sqlite3.Connection, name: str, template_data: Dict
         conn.commit()
 
 
+@cached_read
 def get_entry_templates(conn: sqlite3.Connection, created_by: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get saved entry templates."""
     with closing(conn.cursor()) as cur:
-        # Create table if it doesn't exist
-        try:
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS entry_templates (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    template_data TEXT NOT NULL,
-                    created_by TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    usage_count INTEGER DEFAULT 0
-                )
-            """)
-            conn.commit()
-        except:
-            pass
-        
         if created_by:
             cur.execute("SELECT * FROM entry_templates WHERE created_by = ? ORDER BY usage_count DESC, created_at DESC", (created_by,))
         else:
@@ -1127,8 +3163,8 @@ def get_vial_lifecycle(conn: sqlite3.Connection, thaw_id: str) -> Dict[str, Any]
     """Get complete lifecycle information for a vial (thaw ID)."""
     with closing(conn.cursor()) as cur:
         # Get all events for this thaw ID, ordered chronologically
-        cur.execute("""
-            SELECT * FROM logs 
+        cur.execute(f"""
+            SELECT {_LOG_SELECT_ALL}, date_jd FROM logs 
             WHERE thaw_id = ? 
             ORDER BY date ASC, created_at ASC
         """, (thaw_id,))
@@ -1142,11 +3178,15 @@ def get_vial_lifecycle(conn: sqlite3.Connection, thaw_id: str) -> Dict[str, Any]
         latest_event = None
         passage_progression = []
         culture_days = 0
+        thaw_jd = latest_jd = None
         
         for event in events:
+            event_jd = event.pop('date_jd')
             if event.get('event_type') == 'Thawing':
                 thaw_event = event
+                thaw_jd = event_jd
             latest_event = event
+            latest_jd = event_jd
             
             if event.get('passage'):
                 passage_progression.append({
@@ -1158,14 +3198,8 @@ def get_vial_lifecycle(conn: sqlite3.Connection, thaw_id: str) -> Dict[str, Any]
                 })
         
         # Calculate culture duration
-        if thaw_event and latest_event:
-            from datetime import datetime
-            try:
-                thaw_date = datetime.fromisoformat(thaw_event.get('date'))
-                latest_date = datetime.fromisoformat(latest_event.get('date'))
-                culture_days = (latest_date - thaw_date).days
-            except:
-                culture_days = 0
+        if thaw_jd is not None and latest_jd is not None:
+            culture_days = latest_jd - thaw_jd
         
         return {
             'thaw_id': thaw_id,
@@ -1190,21 +3224,17 @@ def get_vial_analytics(conn: sqlite3.Connection, thaw_id: str) -> Dict[str, Any]
     
     events = lifecycle['events']
     
-    # Analyze passage intervals
-    passage_intervals = []
-    split_events = [e for e in events if e.get('event_type') == 'Split' and e.get('passage')]
-    
-    for i in range(1, len(split_events)):
-        prev_event = split_events[i-1]
-        curr_event = split_events[i]
-        try:
-            from datetime import datetime
-            prev_date = datetime.fromisoformat(prev_event.get('date'))
-            curr_date = datetime.fromisoformat(curr_event.get('date'))
-            interval = (curr_date - prev_date).days
-            passage_intervals.append(interval)
-        except:
-            continue
+    # Analyze passage intervals (days between consecutive passaged splits)
+    with closing(conn.cursor()) as cur:
+        cur.execute("""
+            SELECT interval FROM (
+                SELECT date_jd - LAG(date_jd) OVER (ORDER BY date, created_at) AS interval
+                FROM logs
+                WHERE thaw_id = ? AND event_type = 'Split' AND passage IS NOT NULL AND passage != 0
+            )
+            WHERE interval IS NOT NULL
+        """, (thaw_id,))
+        passage_intervals = [row[0] for row in cur.fetchall()]
     
     # Analyze culture conditions
     media_used = list(set([e.get('medium') for e in events if e.get('medium')]))
@@ -1231,57 +3261,239 @@ def get_vial_analytics(conn: sqlite3.Connection, thaw_id: str) -> Dict[str, Any]
     }
 
 
+# Vial state summary (one row per thaw ID, maintained by triggers on logs)
+
+# Rebuilds the vial_state rows selected by {where}; "latest" follows the same
+# date/created_at ordering as get_vial_lifecycle. Migration steps embed these in
+# triggers, so each version is frozen with the step that installed it: change the
+# refresh by adding a _V<n> copy and a migration step that recreates the triggers.
+
+# As installed by migration 3 (vial_state summary)
+_VIAL_STATE_REFRESH_SQL_V3 = """
+    INSERT OR REPLACE INTO vial_state (
+        thaw_id, cell_line, thaw_date, latest_event, latest_date,
+        current_passage, current_vessel, current_medium, current_location,
+        split_count, total_events, has_recent_observation, last_cryo_date, culture_days
+    )
+    SELECT agg.thaw_id, th.cell_line, th.date, lt.event_type, lt.date,
+           lt.passage, lt.vessel, lt.medium, lt.location,
+           agg.split_count, agg.total_events,
+           EXISTS (
+               SELECT 1 FROM (
+                   SELECT event_type FROM logs
+                   WHERE thaw_id = agg.thaw_id
+                   ORDER BY date DESC, created_at DESC, id DESC
+                   LIMIT 3
+               ) WHERE event_type = 'Observation'
+           ),
+           agg.last_cryo_date,
+           COALESCE(CAST(JULIANDAY(lt.date) - JULIANDAY(th.date) AS INTEGER), 0)
+    FROM (
+        SELECT thaw_id,
+               SUM(event_type = 'Split') AS split_count,
+               COUNT(*) AS total_events,
+               MAX(CASE WHEN event_type = 'Cryopreservation' THEN date END) AS last_cryo_date
+        FROM logs
+        WHERE {where}
+        GROUP BY thaw_id
+    ) agg
+    JOIN logs lt ON lt.id = (
+        SELECT id FROM logs WHERE thaw_id = agg.thaw_id
+        ORDER BY date DESC, created_at DESC, id DESC LIMIT 1
+    )
+    LEFT JOIN logs th ON th.id = (
+        SELECT id FROM logs WHERE thaw_id = agg.thaw_id AND event_type = 'Thawing'
+        ORDER BY date DESC, created_at DESC, id DESC LIMIT 1
+    )
+"""
+
+# As installed by migration 6 (vial_state last-known conditions)
+_VIAL_STATE_REFRESH_SQL_V6 = """
+    INSERT OR REPLACE INTO vial_state (
+        thaw_id, cell_line, thaw_date, latest_event, latest_date,
+        current_passage, current_vessel, current_medium, current_location,
+        split_count, total_events, has_recent_observation, last_cryo_date, culture_days,
+        first_date, last_passage, last_vessel, last_medium, last_location
+    )
+    SELECT agg.thaw_id, th.cell_line, th.date, lt.event_type, lt.date,
+           lt.passage, lt.vessel, lt.medium, lt.location,
+           agg.split_count, agg.total_events,
+           EXISTS (
+               SELECT 1 FROM (
+                   SELECT event_type FROM logs
+                   WHERE thaw_id = agg.thaw_id
+                   ORDER BY date DESC, created_at DESC, id DESC
+                   LIMIT 3
+               ) WHERE event_type = 'Observation'
+           ),
+           agg.last_cryo_date,
+           COALESCE(CAST(JULIANDAY(lt.date) - JULIANDAY(th.date) AS INTEGER), 0),
+           agg.first_date,
+           (SELECT passage FROM logs WHERE thaw_id = agg.thaw_id AND passage IS NOT NULL
+            ORDER BY date DESC, created_at DESC, id DESC LIMIT 1),
+           (SELECT vessel FROM logs WHERE thaw_id = agg.thaw_id AND vessel IS NOT NULL AND vessel != ''
+            ORDER BY date DESC, created_at DESC, id DESC LIMIT 1),
+           (SELECT medium FROM logs WHERE thaw_id = agg.thaw_id AND medium IS NOT NULL AND medium != ''
+            ORDER BY date DESC, created_at DESC, id DESC LIMIT 1),
+           (SELECT location FROM logs WHERE thaw_id = agg.thaw_id AND location IS NOT NULL AND location != ''
+            ORDER BY date DESC, created_at DESC, id DESC LIMIT 1)
+    FROM (
+        SELECT thaw_id,
+               SUM(event_type = 'Split') AS split_count,
+               COUNT(*) AS total_events,
+               MAX(CASE WHEN event_type = 'Cryopreservation' THEN date END) AS last_cryo_date,
+               MIN(date) AS first_date
+        FROM logs
+        WHERE {where}
+        GROUP BY thaw_id
+    ) agg
+    JOIN logs lt ON lt.id = (
+        SELECT id FROM logs WHERE thaw_id = agg.thaw_id
+        ORDER BY date DESC, created_at DESC, id DESC LIMIT 1
+    )
+    LEFT JOIN logs th ON th.id = (
+        SELECT id FROM logs WHERE thaw_id = agg.thaw_id AND event_type = 'Thawing'
+        ORDER BY date DESC, created_at DESC, id DESC LIMIT 1
+    )
+"""
+
+# The refresh the installed triggers run, for bulk paths and rebuild_vial_state
+_VIAL_STATE_REFRESH_SQL = _VIAL_STATE_REFRESH_SQL_V6
+
+
+def _vial_state_refresh_statements(refresh_sql: str, key: str) -> List[str]:
+    """Statements that recompute the vial_state row for the thaw ID expression `key`."""
+    return [
+        f"DELETE FROM vial_state WHERE thaw_id = {key};",
+        refresh_sql.format(where=f"thaw_id = {key} AND thaw_id != ''").rstrip() + ";",
+    ]
+
+
+def _vial_state_trigger_sql(refresh_sql: str, deferrable: bool) -> List[str]:
+    """CREATE TRIGGER statements keeping vial_state in sync with logs.
+
+    With `deferrable`, the insert trigger is skipped while vial_state_deferred
+    holds its flag row (migration 12 onwards).
+    """
+    tracked_cols = "thaw_id, date, created_at, event_type, cell_line, passage, vessel, medium, location"
+    insert_body = "\n".join(_vial_state_refresh_statements(refresh_sql, "NEW.thaw_id"))
+    delete_body = "\n".join(_vial_state_refresh_statements(refresh_sql, "OLD.thaw_id"))
+    update_body = "\n".join(
+        _vial_state_refresh_statements(refresh_sql, "OLD.thaw_id")
+        + _vial_state_refresh_statements(refresh_sql, "NEW.thaw_id")
+    )
+    insert_when = "NEW.thaw_id IS NOT NULL AND NEW.thaw_id != ''"
+    if deferrable:
+        insert_when += "\n            AND NOT EXISTS (SELECT 1 FROM vial_state_deferred)"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_logs_vial_state_insert
+        AFTER INSERT ON logs
+        WHEN {insert_when}
+        BEGIN
+        {insert_body}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_logs_vial_state_update
+        AFTER UPDATE OF {tracked_cols} ON logs
+        BEGIN
+        {update_body}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_logs_vial_state_delete
+        AFTER DELETE ON logs
+        WHEN OLD.thaw_id IS NOT NULL AND OLD.thaw_id != ''
+        BEGIN
+        {delete_body}
+        END
+        """,
+    ]
+
+
+def rebuild_vial_state(conn: sqlite3.Connection, commit: bool = True) -> int:
+    """Recompute vial_state from scratch (for existing databases). Returns the row count."""
+    with closing(conn.cursor()) as cur:
+        cur.execute("DELETE FROM vial_state")
+        cur.execute(_VIAL_STATE_REFRESH_SQL.format(where="thaw_id IS NOT NULL AND thaw_id != ''"))
+        cur.execute("SELECT COUNT(*) FROM vial_state")
+        count = cur.fetchone()[0]
+        if commit:
+            conn.commit()
+    return count
+
+
+def _vial_from_state(row: sqlite3.Row) -> Dict[str, Any]:
+    """Shape a vial_state row like the summary keys of get_vial_lifecycle."""
+    vial = dict(row)
+    vial['thaw_event'] = {
+        'thaw_id': vial['thaw_id'],
+        'event_type': 'Thawing',
+        'cell_line': vial['cell_line'],
+        'date': vial['thaw_date'],
+    } if vial['thaw_date'] else None
+    vial['latest_event'] = {
+        'thaw_id': vial['thaw_id'],
+        'event_type': vial['latest_event'],
+        'date': vial['latest_date'],
+        'passage': vial['current_passage'],
+        'vessel': vial['current_vessel'],
+        'medium': vial['current_medium'],
+        'location': vial['current_location'],
+    }
+    vial['has_recent_observation'] = bool(vial['has_recent_observation'])
+    return vial
+
+
+def get_vial_state(conn: sqlite3.Connection, thaw_id: str) -> Dict[str, Any]:
+    """Get the materialized summary for a single vial, or {} if unknown."""
+    with closing(conn.cursor()) as cur:
+        cur.execute("SELECT * FROM vial_state WHERE thaw_id = ?", (thaw_id,))
+        row = cur.fetchone()
+    return _vial_from_state(row) if row else {}
+
+
+@cached_read
 def get_active_vials(conn: sqlite3.Connection, days_threshold: int = 30) -> List[Dict[str, Any]]:
-    """Get all active vials (thawed but not cryopreserved within threshold days)."""
+    """Get all active vials (thawed but not cryopreserved within threshold days).
+
+    Reads the vial_state summary; the returned dicts carry the same summary keys as
+    get_vial_lifecycle (without the per-event list).
+    """
     with closing(conn.cursor()) as cur:
-        # Get all thaw IDs that have thawing events
-        cur.execute("""
-            SELECT DISTINCT thaw_id FROM logs 
-            WHERE event_type = 'Thawing' AND thaw_id IS NOT NULL AND thaw_id != ''
-        """)
-        thaw_ids = [row[0] for row in cur.fetchall()]
-        
-        active_vials = []
-        for thaw_id in thaw_ids:
-            lifecycle = get_vial_lifecycle(conn, thaw_id)
-            if not lifecycle:
-                continue
-                
-            # Check if vial is still active (no recent cryopreservation)
-            latest_event = lifecycle['latest_event']
-            is_active = True
-            
-            # Check for cryopreservation events
-            cryo_events = [e for e in lifecycle['events'] if e.get('event_type') == 'Cryopreservation']
-            if cryo_events:
-                # If there's a recent cryopreservation, consider it inactive
-                latest_cryo = max(cryo_events, key=lambda x: x.get('date', ''))
-                try:
-                    from datetime import datetime, timedelta
-                    cryo_date = datetime.fromisoformat(latest_cryo.get('date'))
-                    cutoff_date = datetime.now() - timedelta(days=days_threshold)
-                    if cryo_date > cutoff_date:
-                        is_active = False
-                except:
-                    pass
-            
-            if is_active:
-                active_vials.append(lifecycle)
-        
-        return active_vials
+        cur.execute(
+            """
+            SELECT * FROM vial_state
+            WHERE thaw_date IS NOT NULL
+              AND (last_cryo_date IS NULL
+                   OR JULIANDAY(last_cryo_date) IS NULL
+                   OR JULIANDAY(last_cryo_date) <= JULIANDAY('now', 'localtime') - ?)
+            ORDER BY thaw_date, thaw_id
+            """,
+            (days_threshold,),
+        )
+        rows = cur.fetchall()
+    return [_vial_from_state(r) for r in rows]
 
 
 def get_vial_alerts(conn: sqlite3.Connection, thaw_id: str) -> List[Dict[str, str]]:
     """Generate alerts and recommendations for a vial."""
-    lifecycle = get_vial_lifecycle(conn, thaw_id)
-    analytics = get_vial_analytics(conn, thaw_id)
+    return evaluate_alerts(conn, [thaw_id]).get(thaw_id, [])
+
+
+def _build_vial_alerts(
+    current_passage: Optional[int],
+    split_count: int,
+    culture_days: int,
+    avg_interval: float,
+    total_events: int,
+    has_recent_observation: bool,
+) -> List[Dict[str, str]]:
+    """Apply the vial alert rules to one vial's summary values."""
     alerts = []
     
-    if not lifecycle:
-        return alerts
-    
     # Check for overdue splits (high passage number)
-    current_passage = lifecycle.get('current_passage')
     if current_passage and current_passage > 10:
         alerts.append({
             'type': 'warning',
@@ -1289,7 +3501,6 @@ def get_vial_alerts(conn: sqlite3.Connection, thaw_id: str) -> List[Dict[str, st
         })
     
     # Check for excessive splits since thawing - genetic stability alert
-    split_count = sum(1 for e in lifecycle.get('events', []) if e.get('event_type') == 'Split')
     if split_count > 10:
         alerts.append({
             'type': 'critical',
@@ -1302,20 +3513,14 @@ def get_vial_alerts(conn: sqlite3.Connection, thaw_id: str) -> List[Dict[str, st
         })
     
     # Check for long culture periods without splits
-    avg_interval = analytics.get('avg_passage_interval', 0)
-    culture_days = lifecycle.get('culture_days', 0)
-    
     if avg_interval > 0 and culture_days > avg_interval * 1.5:
         alerts.append({
             'type': 'info',
             'message': f'Culture duration ({culture_days} days) exceeds average split interval. Consider splitting.'
         })
     
-    # Check for missing recent observations
-    recent_events = [e for e in lifecycle['events'][-3:]]  # Last 3 events
-    has_recent_observation = any(e.get('event_type') == 'Observation' for e in recent_events)
-    
-    if not has_recent_observation and lifecycle['total_events'] > 2:
+    # Check for missing recent observations (last 3 events)
+    if not has_recent_observation and total_events > 2:
         alerts.append({
             'type': 'info',
             'message': 'No recent observations recorded. Consider adding culture status update.'
@@ -1324,6 +3529,61 @@ def get_vial_alerts(conn: sqlite3.Connection, thaw_id: str) -> List[Dict[str, st
     return alerts
 
 
+def evaluate_alerts(conn: sqlite3.Connection, thaw_ids: Optional[List[str]] = None) -> Dict[str, List[Dict[str, str]]]:
+    """Evaluate the vial alert rules for many vials in one query.
+
+    Returns a mapping of thaw_id -> alerts (same shape as get_vial_alerts) for
+    every vial in `thaw_ids`, or for all known vials when thaw_ids is None.
+    Vials without alerts map to an empty list.
+    """
+    if thaw_ids is not None and not thaw_ids:
+        return {}
+    id_filter = ""
+    state_filter = ""
+    params: List[Any] = []
+    if thaw_ids is not None:
+        placeholders = ", ".join("?" * len(thaw_ids))
+        id_filter = f" AND thaw_id IN ({placeholders})"
+        state_filter = f"WHERE vs.thaw_id IN ({placeholders})"
+        params = list(thaw_ids) * 2
+    
+    # Average split interval per vial. The gaps between consecutive splits sum to
+    # last - first, so the mean is that span over (splits - 1); grouping straight
+    # off idx_logs_event_thaw_date avoids a window pass and a sort.
+    sql = f"""
+        SELECT vs.thaw_id, vs.current_passage, vs.split_count, vs.culture_days,
+               vs.total_events, vs.has_recent_observation,
+               COALESCE(si.avg_interval, 0) AS avg_interval
+        FROM vial_state vs
+        LEFT JOIN (
+            SELECT thaw_id,
+                   (JULIANDAY(MAX(date)) - JULIANDAY(MIN(date))) / (COUNT(*) - 1) AS avg_interval
+            FROM logs
+            WHERE event_type = 'Split' AND passage IS NOT NULL AND passage != 0
+              AND thaw_id IS NOT NULL AND thaw_id != ''{id_filter}
+            GROUP BY thaw_id
+            HAVING COUNT(*) > 1
+        ) si ON si.thaw_id = vs.thaw_id
+        {state_filter}
+    """
+    with closing(conn.cursor()) as cur:
+        cur.execute(sql, tuple(params))
+        rows = cur.fetchall()
+    
+    return {
+        row['thaw_id']: _build_vial_alerts(
+            row['current_passage'],
+            row['split_count'],
+            row['culture_days'],
+            row['avg_interval'],
+            row['total_events'],
+            bool(row['has_recent_observation']),
+        )
+        for row in rows
+    }
+
+
+@cached_read
 def get_experimental_workflows(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
     """Get all available experimental workflows."""
     with closing(conn.cursor()) as cur:
@@ -1332,6 +3592,7 @@ def get_experimental_workflows(conn: sqlite3.Connection) -> List[Dict[str, Any]]
     return [dict(r) for r in rows]
 
 
+@cached_read
 def get_experiment_types(conn: sqlite3.Connection, category: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get available experiment types, optionally filtered by category."""
     with closing(conn.cursor()) as cur:
@@ -1364,19 +3625,22 @@ def get_experimental_journey(conn: sqlite3.Connection, thaw_id: str) -> Dict[str
         else:
             maintenance_events.append(event)
     
+    # Phase durations in days, first to last event of each experiment type
+    with closing(conn.cursor()) as cur:
+        cur.execute("""
+            SELECT experiment_type, MAX(date_jd) - MIN(date_jd)
+            FROM logs
+            WHERE thaw_id = ? AND experiment_type IS NOT NULL AND experiment_type != ''
+            GROUP BY experiment_type
+        """, (thaw_id,))
+        durations = {row[0]: row[1] or 0 for row in cur.fetchall()}
+    
     # Analyze each experimental phase
     phase_analysis = {}
     for exp_type, phase_events in experimental_phases.items():
         phase_start = min(phase_events, key=lambda x: x.get('date', ''))
         phase_end = max(phase_events, key=lambda x: x.get('date', ''))
-        
-        # Calculate phase duration
-        try:
-            start_date = datetime.fromisoformat(phase_start.get('date'))
-            end_date = datetime.fromisoformat(phase_end.get('date'))
-            duration = (end_date - start_date).days
-        except:
-            duration = 0
+        duration = durations.get(exp_type, 0)
         
         # Get unique stages in this phase
         stages = list(set([e.get('experiment_stage') for e in phase_events if e.get('experiment_stage')]))
@@ -1408,43 +3672,100 @@ def get_experimental_journey(conn: sqlite3.Connection, thaw_id: str) -> Dict[str
     }
 
 
+@cached_read
+def get_experiment_statistics(
+    conn: sqlite3.Connection,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """KPIs for every experiment type in one aggregate query, keyed by type.
+
+    An attempt is one (experiment_type, thaw_id) phase; it is completed once it
+    has a Protocol Completion event, and its duration runs from its first to
+    its last event. Only events inside the optional date window are counted.
+    """
+    where = ["experiment_type IS NOT NULL", "experiment_type != ''", "thaw_id IS NOT NULL", "thaw_id != ''"]
+    params: List[Any] = []
+    if start_date:
+        where.append("date >= ?")
+        params.append(start_date.isoformat())
+    if end_date:
+        where.append("date <= ?")
+        params.append(end_date.isoformat())
+    sql = f"""
+        SELECT experiment_type,
+               COUNT(*) AS total_attempts,
+               SUM(is_completed) AS successful_completions,
+               AVG(CASE WHEN is_completed THEN duration_days END) AS average_duration_days,
+               SUM(total_events) AS total_events,
+               SUM(outcome_successful) AS outcome_successful,
+               SUM(outcome_failed) AS outcome_failed,
+               SUM(outcome_in_progress) AS outcome_in_progress,
+               json_group_array(json(success_metrics)) FILTER (WHERE is_completed) AS success_metrics
+        FROM (
+            SELECT experiment_type, thaw_id,
+                   MAX(event_type = 'Protocol Completion') AS is_completed,
+                   COALESCE(CAST(JULIANDAY(MAX(date)) - JULIANDAY(MIN(date)) AS INTEGER), 0) AS duration_days,
+                   COUNT(*) AS total_events,
+                   SUM(outcome_status = 'Successful') AS outcome_successful,
+                   SUM(outcome_status = 'Failed') AS outcome_failed,
+                   SUM(outcome_status = 'In Progress') AS outcome_in_progress,
+                   json_group_array(success_metrics)
+                       FILTER (WHERE success_metrics IS NOT NULL AND success_metrics != '') AS success_metrics
+            -- Walking this index groups each phase and keeps its metrics in date order
+            FROM logs INDEXED BY idx_logs_experiment_thaw
+            WHERE {" AND ".join(where)}
+            GROUP BY experiment_type, thaw_id
+        )
+        GROUP BY experiment_type
+        ORDER BY experiment_type
+    """
+    with closing(conn.cursor()) as cur:
+        cur.execute(sql, tuple(params))
+        rows = cur.fetchall()
+    stats: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        attempts = row["total_attempts"]
+        completions = row["successful_completions"] or 0
+        stats[row["experiment_type"]] = {
+            "experiment_type": row["experiment_type"],
+            "total_attempts": attempts,
+            "successful_completions": completions,
+            "in_progress": attempts - completions,
+            "success_rate_percent": completions / attempts * 100 if attempts else 0,
+            "average_duration_days": row["average_duration_days"] or 0,
+            "total_events": row["total_events"],
+            "outcome_successful": row["outcome_successful"] or 0,
+            "outcome_failed": row["outcome_failed"] or 0,
+            "outcome_in_progress": row["outcome_in_progress"] or 0,
+            "success_metrics": [m for phase in json.loads(row["success_metrics"]) for m in phase],
+        }
+    return stats
+
+
 def get_experiment_success_rate(conn: sqlite3.Connection, experiment_type: str) -> Dict[str, Any]:
     """Calculate success rates and metrics for a specific experiment type."""
+    stats = get_experiment_statistics(conn).get(experiment_type)
+    if not stats:
+        return {'experiment_type': experiment_type, 'total_attempts': 0}
+    return {
+        'experiment_type': experiment_type,
+        'total_attempts': stats['total_attempts'],
+        'successful_completions': stats['successful_completions'],
+        'success_rate_percent': stats['success_rate_percent'],
+        'average_duration_days': stats['average_duration_days'],
+        'success_metrics': stats['success_metrics']
+    }
+
+
+def add_experiment_type(conn: sqlite3.Connection, name: str, category: str, description: str, duration: int, criteria: str) -> None:
+    """Add a new experiment type."""
     with closing(conn.cursor()) as cur:
-        # Get all vials that have attempted this experiment
-        cur.execute("""
-            SELECT DISTINCT thaw_id FROM logs 
-            WHERE experiment_type = ? AND thaw_id IS NOT NULL AND thaw_id != ''
-        """, (experiment_type,))
-        thaw_ids = [row[0] for row in cur.fetchall()]
-        
-        if not thaw_ids:
-            return {'experiment_type': experiment_type, 'total_attempts': 0}
-        
-        successful_experiments = 0
-        total_duration = 0
-        success_metrics_list = []
-        
-        for thaw_id in thaw_ids:
-            journey = get_experimental_journey(conn, thaw_id)
-            if experiment_type in journey.get('experimental_phases', {}):
-                phase_data = journey['experimental_phases'][experiment_type]
-                if phase_data['is_completed']:
-                    successful_experiments += 1
-                    total_duration += phase_data['duration_days']
-                    success_metrics_list.extend(phase_data['success_metrics'])
-        
-        success_rate = (successful_experiments / len(thaw_ids)) * 100 if thaw_ids else 0
-        avg_duration = total_duration / successful_experiments if successful_experiments > 0 else 0
-        
-        return {
-            'experiment_type': experiment_type,
-            'total_attempts': len(thaw_ids),
-            'successful_completions': successful_experiments,
-            'success_rate_percent': success_rate,
-            'average_duration_days': avg_duration,
-            'success_metrics': success_metrics_list
-        }
+        cur.execute(
+            "INSERT INTO experiment_types (name, category, description, typical_duration_days, success_criteria, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, category, description, duration, criteria, datetime.utcnow().isoformat())
+        )
+        conn.commit()
 
 
 def add_experimental_workflow(conn: sqlite3.Connection, name: str, description: str, stages: str, duration: int, criteria: str) -> None:
@@ -1519,47 +3840,102 @@ def get_experiment_recommendations(conn: sqlite3.Connection, thaw_id: str) -> Li
     return recommendations
 
 
+# Columns the task lists show, and rows per list: the Dashboard reads at most
+# TASK_WINDOW_LIMIT index entries per list however large logs grows
+TASK_WINDOW_COLUMNS = ("id", "cell_line", "event_type", "assigned_to", "next_action_date", "notes")
+TASK_WINDOW_LIMIT = 50
+
+
+def get_task_window(
+    conn: sqlite3.Connection,
+    start: Any,
+    end: Any = None,
+    assigned_to: Optional[str] = None,
+    include_overdue: bool = True,
+    limit: int = TASK_WINDOW_LIMIT,
+) -> Dict[str, Any]:
+    """Tasks due between start and end (open-ended when end is None), plus overdue ones.
+
+    Returns {"upcoming": [...], "overdue": [...], "upcoming_total": n,
+    "overdue_total": n}: upcoming soonest first, overdue (due before start)
+    most recently due first, each capped at limit; the totals count every
+    match, so a capped list can say how many it left out. All reads are
+    range reads on the next_action_jd indexes.
+    """
+    day = _julian_day_sql("?")
+    where_owner = ""
+    owner_params: List[Any] = []
+    if assigned_to:
+        where_owner = " AND assigned_to = ?"
+        owner_params.append(assigned_to)
+    columns = ", ".join(TASK_WINDOW_COLUMNS)
+    upcoming_where = f"next_action_jd >= {day}"
+    upcoming_params: List[Any] = [str(start)]
+    if end is not None:
+        upcoming_where += f" AND next_action_jd <= {day}"
+        upcoming_params.append(str(end))
+    with closing(conn.cursor()) as cur:
+        cur.execute(f"""
+            SELECT {columns} FROM logs
+            WHERE {upcoming_where}{where_owner}
+            ORDER BY next_action_jd, id
+            LIMIT ?
+        """, tuple(upcoming_params + owner_params + [limit]))
+        upcoming = [dict(r) for r in cur.fetchall()]
+        upcoming_total = len(upcoming)
+        if upcoming_total == limit:
+            cur.execute(
+                f"SELECT COUNT(*) FROM logs WHERE {upcoming_where}{where_owner}",
+                tuple(upcoming_params + owner_params),
+            )
+            upcoming_total = cur.fetchone()[0]
+        overdue: List[Dict[str, Any]] = []
+        overdue_total = 0
+        if include_overdue:
+            overdue_params = [str(start)] + owner_params
+            cur.execute(f"""
+                SELECT {columns} FROM logs
+                WHERE next_action_jd < {day}{where_owner}
+                ORDER BY next_action_jd DESC, id DESC
+                LIMIT ?
+            """, tuple(overdue_params + [limit]))
+            overdue = [dict(r) for r in cur.fetchall()]
+            overdue_total = len(overdue)
+            if overdue_total == limit:
+                cur.execute(
+                    f"SELECT COUNT(*) FROM logs WHERE next_action_jd < {day}{where_owner}",
+                    tuple(overdue_params),
+                )
+                overdue_total = cur.fetchone()[0]
+    return {"upcoming": upcoming, "overdue": overdue, "upcoming_total": upcoming_total, "overdue_total": overdue_total}
+
+
 def get_weekend_tasks(conn: sqlite3.Connection, start_date: str, end_date: str, assigned_to: Optional[str] = None) -> List[Dict[str, Any]]:
-    """Get all weekend tasks between start_date and end_date, optionally filtered by assignee."""
+    """Get all weekend tasks between start_date and end_date, optionally filtered by assignee.
+
+    Tasks are annotated from vial_state with the vial's latest non-empty
+    vessel, medium, location and passage, and whole days since its first event.
+    """
+    where = f"l.next_action_jd BETWEEN {_julian_day_sql('?')} AND {_julian_day_sql('?')}"
+    params: List[Any] = [start_date, end_date]
+    order = "l.next_action_date, l.assigned_to, l.cell_line"
+    if assigned_to:
+        where += " AND l.assigned_to = ?"
+        params.append(assigned_to)
+        order = "l.next_action_date, l.cell_line"
     with closing(conn.cursor()) as cur:
-        if assigned_to:
-            cur.execute("""
-                SELECT l.*, v.current_vessel, v.current_medium, v.current_location, v.culture_days, v.current_passage
-                FROM logs l
-                LEFT JOIN (
-                    SELECT thaw_id,
-                           MAX(CASE WHEN vessel IS NOT NULL AND vessel != '' THEN vessel END) as current_vessel,
-                           MAX(CASE WHEN medium IS NOT NULL AND medium != '' THEN medium END) as current_medium,
-                           MAX(CASE WHEN location IS NOT NULL AND location != '' THEN location END) as current_location,
-                           JULIANDAY('now') - JULIANDAY(MIN(date)) as culture_days,
-                           MAX(CASE WHEN passage IS NOT NULL THEN passage END) as current_passage
-                    FROM logs 
-                    WHERE thaw_id IS NOT NULL AND thaw_id != ''
-                    GROUP BY thaw_id
-                ) v ON l.thaw_id = v.thaw_id
-                WHERE l.next_action_date BETWEEN ? AND ? 
-                AND l.assigned_to = ?
-                ORDER BY l.next_action_date, l.cell_line
-            """, (start_date, end_date, assigned_to))
-        else:
-            cur.execute("""
-                SELECT l.*, v.current_vessel, v.current_medium, v.current_location, v.culture_days, v.current_passage
-                FROM logs l
-                LEFT JOIN (
-                    SELECT thaw_id,
-                           MAX(CASE WHEN vessel IS NOT NULL AND vessel != '' THEN vessel END) as current_vessel,
-                           MAX(CASE WHEN medium IS NOT NULL AND medium != '' THEN medium END) as current_medium,
-                           MAX(CASE WHEN location IS NOT NULL AND location != '' THEN location END) as current_location,
-                           JULIANDAY('now') - JULIANDAY(MIN(date)) as culture_days,
-                           MAX(CASE WHEN passage IS NOT NULL THEN passage END) as current_passage
-                    FROM logs 
-                    WHERE thaw_id IS NOT NULL AND thaw_id != ''
-                    GROUP BY thaw_id
-                ) v ON l.thaw_id = v.thaw_id
-                WHERE l.next_action_date BETWEEN ? AND ?
-                ORDER BY l.next_action_date, l.assigned_to, l.cell_line
-            """, (start_date, end_date))
-        
+        cur.execute(f"""
+            SELECT {", ".join(f"l.{c}" for c in LOG_COLUMNS)},
+                   v.last_vessel AS current_vessel,
+                   v.last_medium AS current_medium,
+                   v.last_location AS current_location,
+                   CAST(JULIANDAY('now') - JULIANDAY(v.first_date) AS INTEGER) AS culture_days,
+                   v.last_passage AS current_passage
+            FROM logs l
+            LEFT JOIN vial_state v ON v.thaw_id = l.thaw_id
+            WHERE {where}
+            ORDER BY {order}
+        """, tuple(params))
         rows = cur.fetchall()
     return [dict(r) for r in rows]
 
@@ -1857,6 +4233,7 @@ def delete_weekend_schedule(conn: sqlite3.Connection, weekend_date: str) -> bool
         return False
 
 
+@cached_read
 def get_weekend_schedules(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
     """Get all weekend schedule assignments"""
     try:
@@ -1883,6 +4260,7 @@ def get_weekend_schedules(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
         return []
 
 
+@cached_read
 def get_weekend_assignee(conn: sqlite3.Connection, weekend_date: str) -> Optional[str]:
     """Get the assignee for a specific weekend date"""
     try:
@@ -1917,6 +4295,7 @@ def save_user_caliber(conn: sqlite3.Connection, username: str, caliber_level: st
         return False
 
 
+@cached_read
 def get_user_calibers(conn: sqlite3.Connection) -> Dict[str, str]:
     """Get all user caliber levels"""
     try:
@@ -1957,6 +4336,7 @@ def save_custom_weekend_work(conn: sqlite3.Connection, work_data: Dict[str, Any]
         return False
 
 
+@cached_read
 def get_custom_weekend_work(conn: sqlite3.Connection, start_date: str = None, end_date: str = None) -> List[Dict[str, Any]]:
     """Get custom weekend work entries, optionally filtered by date range"""
     try:
@@ -2188,46 +4568,107 @@ def import_from_excel(conn: sqlite3.Connection, filename: str) -> dict:
     try:
         # Read the main logs sheet
         logs_df = pd.read_excel(filename, sheet_name='Culture_Logs')
+        logs_df = logs_df.astype(object).where(logs_df.notna(), None)
         
         with closing(conn.cursor()) as cur:
-            for _, row in logs_df.iterrows():
-                try:
-                    # Check if entry already exists (by ID or unique combination)
-                    cur.execute("SELECT id FROM logs WHERE id = ?", (row['id'],))
-                    if cur.fetchone():
-                        results['skipped'] += 1
-                        continue
-                    
-                    # Insert new entry
-                    cur.execute("""
-                        INSERT INTO logs (
-                            thaw_id, cell_line, event_type, passage, vessel, medium,
-                            location, operator, log_date, notes, image_path, created_at,
-                            linked_thaw_id, experiment_type, experiment_stage,
-                            experimental_conditions, protocol_reference, outcome_status,
-                            success_metrics
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        row.get('thaw_id'), row.get('cell_line'), row.get('event_type'),
-                        row.get('passage'), row.get('vessel'), row.get('medium'),
-                        row.get('location'), row.get('operator'), row.get('log_date'),
-                        row.get('notes'), row.get('image_path'), row.get('created_at'),
-                        row.get('linked_thaw_id'), row.get('experiment_type'),
-                        row.get('experiment_stage'), row.get('experimental_conditions'),
-                        row.get('protocol_reference'), row.get('outcome_status'),
-                        row.get('success_metrics')
-                    ))
-                    results['imported'] += 1
-                    
-                except Exception as e:
-                    results['errors'] += 1
-                    results['messages'].append(f"Error importing row {row.get('id', 'unknown')}: {str(e)}")
-            
-            conn.commit()
-            results['messages'].append(f"Import completed: {results['imported']} imported, {results['skipped']} skipped, {results['errors']} errors")
+            cur.execute("SELECT id FROM logs")
+            existing_ids = {r[0] for r in cur.fetchall()}
+        
+        payloads = []
+        source_ids = []
+        now = datetime.now().isoformat()
+        for record in logs_df.to_dict('records'):
+            # Skip entries that already exist (by ID)
+            if record.get('id') is not None and int(record['id']) in existing_ids:
+                results['skipped'] += 1
+                continue
+            payload = {}
+            for col in LOG_INSERT_COLUMNS:
+                value = record.get('log_date' if col == 'date' else col, record.get(col))
+                if isinstance(value, datetime):
+                    value = value.date().isoformat() if col == 'date' else value.isoformat()
+                elif isinstance(value, date):
+                    value = value.isoformat()
+                elif hasattr(value, 'item'):
+                    value = value.item()  # numpy scalar
+                payload[col] = value
+            payload['created_by'] = payload.get('created_by') or payload.get('operator') or 'import'
+            payload['created_at'] = payload.get('created_at') or now
+            payloads.append(payload)
+            source_ids.append(record.get('id', 'unknown'))
+        
+        report = insert_logs_many(conn, payloads)
+        results['imported'] = report['inserted']
+        results['errors'] = len(report['errors'])
+        for error in report['errors']:
+            results['messages'].append(f"Error importing row {source_ids[error['index']]}: {error['error']}")
+        results['messages'].append(f"Import completed: {results['imported']} imported, {results['skipped']} skipped, {results['errors']} errors")
         
     except Exception as e:
         results['messages'].append(f"Error reading Excel file: {str(e)}")
         results['errors'] += 1
     
     return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="iPSC Tracker database maintenance")
+    parser.add_argument(
+        "command",
+        choices=["rebuild-vial-state", "backup", "verify-backups", "restore-images", "compact-changes"],
+        help="Maintenance task to run",
+    )
+    parser.add_argument("--db", default=None, help="Database path (defaults to DB_PATH)")
+    parser.add_argument("--dest", default=None, help="Backup directory (defaults to DB_BACKUP_DIR)")
+    parser.add_argument("--images-dir", default=None, help="Images directory to back up (defaults to IMAGES_DIR)")
+    parser.add_argument("--generation", default="latest", help="Image manifest to restore (restore-images)")
+    parser.add_argument("--target", default=None, help="Directory to restore images into (restore-images)")
+    parser.add_argument("--through", type=int, default=None, help="Last change seq to compact (compact-changes)")
+    parser.add_argument("--purge", action="store_true", help="Delete changes instead of collapsing them (compact-changes)")
+    args = parser.parse_args()
+
+    if args.command == "restore-images":
+        if not args.target:
+            parser.error("restore-images requires --target")
+        result = restore_images(args.target, args.generation, args.dest)
+        print(
+            f"✅ Restored {result['restored']} images ({result['unchanged']} already up to date) "
+            f"from {os.path.basename(result['manifest'])} into {args.target}"
+        )
+        for rel in result["missing"]:
+            print(f"❌ Missing or damaged object for {rel}")
+        raise SystemExit(1 if result["missing"] else 0)
+
+    if args.command == "verify-backups":
+        results = verify_backups(args.dest)
+        for result in results:
+            print(f"{'✅' if result['ok'] else '❌'} {os.path.basename(result['archive'])}: {result['detail']}")
+        if not results:
+            print("No backups found")
+        raise SystemExit(0 if all(r["ok"] for r in results) else 1)
+
+    maintenance_pool = get_pool(args.db)
+    with maintenance_pool.writer() as maintenance_conn:
+        init_db(maintenance_conn)
+    if args.command == "rebuild-vial-state":
+        rebuilt = maintenance_pool.run_write(rebuild_vial_state)
+        print(f"✅ Rebuilt vial_state: {rebuilt} vials")
+    elif args.command == "backup":
+        report = backup_database(args.dest, args.db)
+        print(
+            f"✅ Backed up {report['page_count']} pages to {report['archive']} "
+            f"({report['archive_bytes']} bytes) in {report['total_ms']} ms; "
+            f"pruned {len(report['pruned'])} old archives"
+        )
+        images = backup_images(args.dest, args.images_dir)
+        print(
+            f"✅ Backed up {images['files']} images ({images['new_objects']} new objects, "
+            f"{images['bytes_copied']} bytes copied) in {images['total_ms']} ms"
+        )
+    elif args.command == "compact-changes":
+        removed = maintenance_pool.run_write(compact_changes, args.through, purge=args.purge)
+        with maintenance_pool.reader() as maintenance_conn:
+            print(f"✅ Removed {removed} change records (latest seq {latest_change_seq(maintenance_conn)})")
+    close_pools()
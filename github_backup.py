@@ -1,210 +1,548 @@
 """
 GitHub Auto-Backup System for iPSC Tracker
-Automatically backs up database to GitHub and restores on startup
+Backs up the database to a GitHub branch from a background worker and
+restores it on startup
+
+Each backup run snapshots the live database with the SQLite backup API and
+commits the rows changed since the previous run (read from the `changes`
+log) as a gzipped NDJSON delta. The commit happens in a scratch clone kept
+apart from the app's own working tree. A full NDJSON base is written on the
+first run, and again whenever the deltas can no longer be replayed on top of
+the current base. Once the branch holds a run, the live change log is purged
+through its sequence number, so the log only keeps what is not yet backed up.
 """
 
+import gzip
+import hashlib
+import json
 import os
+import shutil
+import sqlite3
 import subprocess
-import streamlit as st
+import tempfile
+import threading
+import time
 from datetime import datetime
-from pathlib import Path
-import shutil
+from typing import Any, Dict, Iterable, List, Optional
+
+from db import (
+    CHANGE_TRACKED_TABLES,
+    DB_BACKUP_DIR,
+    DB_PATH,
+    changes_since,
+    compact_changes,
+    get_pool,
+    get_schema_version,
+    init_db,
+    latest_change_seq,
+    snapshot_database,
+)
+
+GITHUB_BACKUP_REPO = os.environ.get("GITHUB_BACKUP_REPO", "https://github.com/Narasimhat/ipsc-tracker-daily-lab.git")
+GITHUB_BACKUP_BRANCH = os.environ.get("GITHUB_BACKUP_BRANCH", "db-backup")
+GITHUB_BACKUP_CLONE_DIR = os.environ.get("GITHUB_BACKUP_CLONE_DIR", os.path.join(DB_BACKUP_DIR, "github"))
+# Deltas committed on top of one base before the next run writes a fresh base
+GITHUB_BACKUP_REBASE_EVERY = int(os.environ.get("GITHUB_BACKUP_REBASE_EVERY", "100"))
+GITHUB_BACKUP_GIT_TIMEOUT = int(os.environ.get("GITHUB_BACKUP_GIT_TIMEOUT", "60"))
+
+# Small tables outside the change log, copied whole into every delta
+SNAPSHOT_TABLES = ("users", "user_calibers", "experimental_workflows", "thaw_id_sequences")
+STATE_FILE = "BACKUP.json"
+BASE_FILE = "base.ndjson.gz"
+DELTA_DIR = "deltas"
+# Earlier backups committed the database file itself at this path
+LEGACY_DB_FILE = "data/ipsc_tracker.db"
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    # table_info leaves out generated columns, which cannot be inserted
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _table_key(conn: sqlite3.Connection, table: str) -> str:
+    return next((r[1] for r in conn.execute(f"PRAGMA table_info({table})") if r[5]), "rowid")
+
+
+def _table_rows(conn: sqlite3.Connection, table: str) -> List[Dict[str, Any]]:
+    columns = _table_columns(conn, table)
+    cur = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {_table_key(conn, table)}")
+    return [dict(zip(columns, row)) for row in cur]
+
+
+def _write_ndjson(path: str, records: Iterable[Dict[str, Any]]) -> None:
+    # mtime=0 keeps the gzip bytes identical for identical content
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as fh:
+        for record in records:
+            fh.write(json.dumps(record, sort_keys=True, separators=(",", ":")).encode("utf-8") + b"\n")
+
+
+def _read_ndjson(path: str) -> Iterable[Dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _upsert(conn: sqlite3.Connection, table: str, row: Dict[str, Any], columns: Dict[str, List[str]]) -> None:
+    if table not in columns:
+        columns[table] = _table_columns(conn, table)
+    names = [c for c in columns[table] if c in row]
+    key = _table_key(conn, table)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in names if c != key)
+    sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})"
+    # An upsert rather than INSERT OR REPLACE so the logs triggers see an update
+    sql += f" ON CONFLICT({key}) DO UPDATE SET {updates}" if updates else f" ON CONFLICT({key}) DO NOTHING"
+    conn.execute(sql, [row[c] for c in names])
+
 
 class GitHubBackup:
     """Handles automatic GitHub backup and restore for database"""
-    
-    def __init__(self, db_path: str = "data/ipsc_tracker.db"):
-        self.db_path = db_path
-        self.backup_branch = "db-backup"
-        self.repo_url = "https://github.com/Narasimhat/ipsc-tracker-daily-lab.git"
-        
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        repo_url: Optional[str] = None,
+        branch: str = GITHUB_BACKUP_BRANCH,
+        clone_dir: Optional[str] = None,
+    ):
+        self.db_path = db_path or DB_PATH
+        self.repo_url = repo_url or GITHUB_BACKUP_REPO
+        self.backup_branch = branch
+        self.clone_dir = clone_dir or GITHUB_BACKUP_CLONE_DIR
+        self._run_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._interval_s = 3600.0
+        self._force_next = False
+        self._stats: Dict[str, Any] = {
+            "runs": 0,
+            "failures": 0,
+            "last_run_at": None,
+            "last_result": None,
+            "last_error": None,
+            "last_seq": None,
+            "changes": 0,
+            "compacted": 0,
+            "bytes": 0,
+            "snapshot_ms": None,
+            "delta_ms": None,
+            "git_ms": None,
+            "total_ms": None,
+        }
+
     def is_cloud_environment(self) -> bool:
         """Detect if running on Streamlit Cloud"""
         return os.path.exists("/mount/src") or "STREAMLIT_SHARING_MODE" in os.environ
-    
+
     def get_github_token(self) -> str:
         """Get GitHub token from Streamlit secrets"""
         try:
+            import streamlit as st
             if hasattr(st, 'secrets') and 'github' in st.secrets:
                 return st.secrets['github']['token']
-        except:
+        except Exception:
             pass
         return os.getenv('GITHUB_TOKEN', '')
-    
-    def setup_git_auth(self):
-        """Configure git with authentication"""
+
+    def _remote_url(self) -> Optional[str]:
+        """Repository URL with credentials; None when a GitHub token is required but missing"""
+        if not self.repo_url.startswith("https://"):
+            # Local paths and file:// or ssh URLs need no token (tests use a local bare repo)
+            return self.repo_url
         token = self.get_github_token()
         if not token:
+            return None
+        return self.repo_url.replace('https://', f'https://{token}@')
+
+    def _git(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        result = subprocess.run(
+            ["git", *args],
+            cwd=self.clone_dir,
+            capture_output=True,
+            text=True,
+            timeout=GITHUB_BACKUP_GIT_TIMEOUT,
+            env=env,
+        )
+        if check and result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result
+
+    def _sync_clone(self, remote_url: str) -> bool:
+        """Point the scratch clone at the remote backup branch; False if the branch does not exist yet"""
+        if not os.path.isdir(os.path.join(self.clone_dir, ".git")):
+            os.makedirs(self.clone_dir, exist_ok=True)
+            self._git("init", "-q")
+            self._git("config", "user.email", "ipsc-tracker@streamlit.app")
+            self._git("config", "user.name", "iPSC Tracker Bot")
+            self._git("remote", "add", "origin", remote_url)
+        else:
+            self._git("remote", "set-url", "origin", remote_url)
+
+        branch = self.backup_branch
+        heads = self._git("ls-remote", "--heads", "origin", branch).stdout.strip()
+        if heads:
+            self._git("fetch", "-q", "origin", f"+refs/heads/{branch}:refs/remotes/origin/{branch}")
+            self._git("checkout", "-q", "-B", branch, f"origin/{branch}")
+            self._git("reset", "-q", "--hard", f"origin/{branch}")
+            self._git("clean", "-fdxq")
+            return True
+        # First backup: start an empty, unborn branch
+        self._git("update-ref", "-d", f"refs/heads/{branch}", check=False)
+        self._git("symbolic-ref", "HEAD", f"refs/heads/{branch}")
+        self._git("read-tree", "--empty")
+        self._git("clean", "-fdxq")
+        return False
+
+    def _read_state(self) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.clone_dir, STATE_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def _write_backup_files(self, snap: sqlite3.Connection, state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Write a delta (or a new base) for the snapshot into the clone; returns the new state and run details"""
+        latest = latest_change_seq(snap)
+        schema_version = get_schema_version(snap)
+        snapshot_rows = {t: _table_rows(snap, t) for t in SNAPSHOT_TABLES}
+        snapshot_sha = hashlib.sha256(json.dumps(snapshot_rows, sort_keys=True).encode("utf-8")).hexdigest()
+        now = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+
+        rebase = state is None or state.get("schema_version") != schema_version or latest < state["last_seq"]
+        if not rebase:
+            oldest = snap.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+            # Changes purged before this backup read them cannot be replayed
+            rebase = (oldest is not None and oldest > state["last_seq"] + 1) or (
+                oldest is None and latest > state["last_seq"]
+            )
+            rebase = rebase or len(state["deltas"]) >= GITHUB_BACKUP_REBASE_EVERY
+
+        if rebase:
+            # Clear old deltas (and a legacy database file) from the tree
+            for entry in os.listdir(self.clone_dir):
+                if entry == ".git":
+                    continue
+                path = os.path.join(self.clone_dir, entry)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            base_tables = tuple(CHANGE_TRACKED_TABLES) + SNAPSHOT_TABLES
+            path = os.path.join(self.clone_dir, BASE_FILE)
+            _write_ndjson(path, ({"table": t, "row": row} for t in base_tables for row in _table_rows(snap, t)))
+            new_state = {
+                "format": 1,
+                "base": BASE_FILE,
+                "base_seq": latest,
+                "last_seq": latest,
+                "schema_version": schema_version,
+                "snapshot_sha256": snapshot_sha,
+                "deltas": [],
+                "updated_at": now,
+            }
+            return {"state": new_state, "kind": "base", "changes": 0, "bytes": os.path.getsize(path)}
+
+        changes = changes_since(snap, state["last_seq"])
+        if not changes and snapshot_sha == state.get("snapshot_sha256"):
+            return {"state": state, "kind": "unchanged", "changes": 0, "bytes": 0}
+
+        os.makedirs(os.path.join(self.clone_dir, DELTA_DIR), exist_ok=True)
+        name = f"{DELTA_DIR}/{state['last_seq'] + 1:012d}-{latest:012d}.ndjson.gz"
+        if name in state["deltas"]:
+            # Only the snapshot tables changed since a delta with the same range
+            name = name.replace(".ndjson.gz", f"-{len(state['deltas'])}.ndjson.gz")
+        path = os.path.join(self.clone_dir, *name.split("/"))
+        records: List[Dict[str, Any]] = [
+            {"seq": c["seq"], "table": c["table"], "op": c["op"], "row_id": c["row_id"], "row": c["payload"]}
+            for c in changes
+        ]
+        records.extend({"table": t, "op": "replace_all", "rows": rows} for t, rows in snapshot_rows.items())
+        _write_ndjson(path, records)
+        new_state = dict(state)
+        new_state.update({
+            "last_seq": latest,
+            "snapshot_sha256": snapshot_sha,
+            "deltas": state["deltas"] + [name],
+            "updated_at": now,
+        })
+        return {"state": new_state, "kind": "delta", "changes": len(changes), "bytes": os.path.getsize(path)}
+
+    def backup_to_github(self, force: bool = False) -> bool:
+        """Backup database to GitHub"""
+        if not self.is_cloud_environment() and not force:
+            print("📍 Local environment - skipping backup")
+            return False
+
+        if not os.path.exists(self.db_path):
+            print(f"⚠️  Database not found: {self.db_path}")
+            return False
+
+        remote_url = self._remote_url()
+        if remote_url is None:
             print("⚠️  No GitHub token found - backup disabled")
             return False
-        
-        # Set git config
-        try:
-            subprocess.run(['git', 'config', '--global', 'user.email', 'ipsc-tracker@streamlit.app'], 
-                         check=False, capture_output=True)
-            subprocess.run(['git', 'config', '--global', 'user.name', 'iPSC Tracker Bot'], 
-                         check=False, capture_output=True)
-            
-            # Set credential helper
-            auth_url = self.repo_url.replace('https://', f'https://{token}@')
-            subprocess.run(['git', 'remote', 'set-url', 'origin', auth_url], 
-                         check=False, capture_output=True)
+
+        with self._run_lock:
+            started = time.perf_counter()
+            timings = {"snapshot_ms": None, "delta_ms": None, "git_ms": 0.0}
+            try:
+                with tempfile.TemporaryDirectory() as tmp:
+                    snap_path = os.path.join(tmp, "snapshot.db")
+                    # A separate read connection copied in one step: a consistent
+                    # snapshot that never touches the app's own connections
+                    source = sqlite3.connect(self.db_path)
+                    try:
+                        snapshot_database(snap_path, source=source, pages_per_step=0)
+                    finally:
+                        source.close()
+                    timings["snapshot_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+                    snap = sqlite3.connect(snap_path)
+                    try:
+                        # A rejected push (another instance pushed first) gets one retry on the new tip
+                        for attempt in range(2):
+                            git_started = time.perf_counter()
+                            self._sync_clone(remote_url)
+                            timings["git_ms"] += (time.perf_counter() - git_started) * 1000
+
+                            delta_started = time.perf_counter()
+                            run = self._write_backup_files(snap, self._read_state())
+                            timings["delta_ms"] = round((time.perf_counter() - delta_started) * 1000, 1)
+                            if run["kind"] == "unchanged":
+                                print("ℹ️  No changes to backup")
+                                break
+
+                            git_started = time.perf_counter()
+                            with open(os.path.join(self.clone_dir, STATE_FILE), "w", encoding="utf-8") as fh:
+                                json.dump(run["state"], fh, indent=2, sort_keys=True)
+                            self._git("add", "-A")
+                            commit_msg = (
+                                f"Auto-backup ({run['kind']}, seq {run['state']['last_seq']}): "
+                                f"{datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}"
+                            )
+                            self._git("commit", "-q", "-m", commit_msg)
+                            push = self._git("push", "-q", "origin", f"HEAD:refs/heads/{self.backup_branch}", check=False)
+                            timings["git_ms"] += (time.perf_counter() - git_started) * 1000
+                            if push.returncode == 0:
+                                print(f"✅ Database backed up to GitHub: {commit_msg}")
+                                break
+                            if attempt == 1:
+                                raise RuntimeError(f"git push failed: {push.stderr.strip()}")
+                    finally:
+                        snap.close()
+            except Exception as e:
+                print(f"⚠️  Backup failed: {e}")
+                self._record(started, timings, result="error", error=str(e))
+                return False
+
+            run["compacted"] = self._compact_acknowledged(run["state"]["last_seq"])
+            self._record(started, timings, result=run["kind"], run=run)
             return True
-        except Exception as e:
-            print(f"⚠️  Git auth setup failed: {e}")
-            return False
-    
+
+    def _compact_acknowledged(self, through_seq: int) -> int:
+        """Drop change-log rows the backup branch now holds (through `through_seq`) from the live database"""
+        try:
+            return get_pool(self.db_path).run_write(compact_changes, through_seq, purge=True)
+        except sqlite3.Error as e:
+            # The next run just sees (and skips) the older rows again
+            print(f"⚠️  Change log compaction failed: {e}")
+            return 0
+
+    def _record(self, started: float, timings: Dict[str, Any], result: str,
+                run: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            stats = self._stats
+            stats["runs"] += 1
+            stats["last_run_at"] = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+            stats["last_result"] = result
+            stats["last_error"] = error
+            if error:
+                stats["failures"] += 1
+            if run:
+                stats["last_seq"] = run["state"]["last_seq"]
+                stats["changes"] = run["changes"]
+                stats["compacted"] = run.get("compacted", 0)
+                stats["bytes"] = run["bytes"]
+            stats["snapshot_ms"] = timings["snapshot_ms"]
+            stats["delta_ms"] = timings["delta_ms"]
+            stats["git_ms"] = round(timings["git_ms"], 1)
+            stats["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker state and timing of the last backup run"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["running"] = self._thread is not None and self._thread.is_alive()
+            stats["interval_minutes"] = round(self._interval_s / 60, 1)
+        return stats
+
+    def restore_snapshot(self, target_path: Optional[str] = None) -> Dict[str, Any]:
+        """Rebuild the database from the backup branch (base plus deltas) into `target_path`
+
+        The rebuilt file replaces `target_path` (default: the app database), so
+        call this before the app opens connections to it.
+        """
+        remote_url = self._remote_url()
+        if remote_url is None:
+            raise RuntimeError("No GitHub token found")
+        target = target_path or self.db_path
+        with self._run_lock:
+            started = time.perf_counter()
+            if not self._sync_clone(remote_url):
+                raise FileNotFoundError(f"Backup branch {self.backup_branch} not found")
+            state = self._read_state()
+            target_dir = os.path.dirname(os.path.abspath(target))
+            os.makedirs(target_dir, exist_ok=True)
+            if state is None:
+                legacy = os.path.join(self.clone_dir, *LEGACY_DB_FILE.split("/"))
+                if not os.path.exists(legacy):
+                    raise FileNotFoundError(f"{STATE_FILE} missing from {self.backup_branch}")
+                shutil.copyfile(legacy, target)
+                return {
+                    "database": target,
+                    "last_seq": None,
+                    "base_rows": None,
+                    "deltas": 0,
+                    "changes": 0,
+                    "total_ms": round((time.perf_counter() - started) * 1000, 1),
+                }
+
+            fd, partial = tempfile.mkstemp(dir=target_dir, suffix=".restore")
+            os.close(fd)
+            os.remove(partial)
+            conn = sqlite3.connect(partial)
+            try:
+                init_db(conn)
+                columns: Dict[str, List[str]] = {}
+                # Drop the seeded defaults so the base decides what exists
+                for table in tuple(CHANGE_TRACKED_TABLES) + SNAPSHOT_TABLES:
+                    conn.execute(f"DELETE FROM {table}")
+                rows = 0
+                for record in _read_ndjson(os.path.join(self.clone_dir, state["base"])):
+                    _upsert(conn, record["table"], record["row"], columns)
+                    rows += 1
+                changes = 0
+                for name in state["deltas"]:
+                    for record in _read_ndjson(os.path.join(self.clone_dir, *name.split("/"))):
+                        table = record["table"]
+                        if record["op"] == "replace_all":
+                            conn.execute(f"DELETE FROM {table}")
+                            for row in record["rows"]:
+                                _upsert(conn, table, row, columns)
+                        elif record["op"] == "delete":
+                            conn.execute(f"DELETE FROM {table} WHERE {_table_key(conn, table)} = ?", (record["row_id"],))
+                            changes += 1
+                        else:
+                            _upsert(conn, table, record["row"], columns)
+                            changes += 1
+                # Continue the change log where the backup left off, so the
+                # next backup run appends deltas instead of writing a new base
+                conn.execute("DELETE FROM changes")
+                cur = conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'changes'", (state["last_seq"],))
+                if cur.rowcount == 0:
+                    conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('changes', ?)", (state["last_seq"],))
+                conn.commit()
+            except Exception:
+                conn.close()
+                os.remove(partial)
+                raise
+            conn.close()
+
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(target + suffix):
+                    os.remove(target + suffix)
+            os.replace(partial, target)
+        return {
+            "database": target,
+            "last_seq": state["last_seq"],
+            "base_rows": rows,
+            "deltas": len(state["deltas"]),
+            "changes": changes,
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
     def restore_from_github(self):
         """Download and restore database from GitHub on startup"""
         if not self.is_cloud_environment():
             print("📍 Local environment - skipping restore")
             return
-        
+
+        if self._has_data():
+            print("📍 Database already present - skipping restore")
+            return False
+
         print("🔄 Restoring database from GitHub...")
-        
         try:
-            # Ensure data directory exists
-            os.makedirs("data", exist_ok=True)
-            
-            # Try to fetch latest backup
-            result = subprocess.run(
-                ['git', 'fetch', 'origin', f'{self.backup_branch}:{self.backup_branch}'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                # Checkout database file from backup branch
-                checkout_result = subprocess.run(
-                    ['git', 'checkout', self.backup_branch, '--', self.db_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if checkout_result.returncode == 0 and os.path.exists(self.db_path):
-                    print(f"✅ Database restored from GitHub: {self.db_path}")
-                    return True
-                else:
-                    print("⚠️  No backup found - starting with fresh database")
-            else:
-                print(f"⚠️  Backup branch not found - starting fresh")
-                
+            report = self.restore_snapshot()
+            print(f"✅ Database restored from GitHub: {self.db_path} (seq {report['last_seq']}, {report['total_ms']} ms)")
+            return True
+        except FileNotFoundError:
+            print("⚠️  No backup found - starting with fresh database")
         except subprocess.TimeoutExpired:
             print("⚠️  Restore timeout - using local database")
         except Exception as e:
             print(f"⚠️  Restore failed: {e}")
-        
+
         return False
-    
-    def backup_to_github(self, force: bool = False):
-        """Backup database to GitHub"""
-        if not self.is_cloud_environment() and not force:
-            print("📍 Local environment - skipping backup")
-            return False
-        
+
+    def _has_data(self) -> bool:
         if not os.path.exists(self.db_path):
-            print(f"⚠️  Database not found: {self.db_path}")
             return False
-        
-        if not self.setup_git_auth():
-            return False
-        
-        print("💾 Backing up database to GitHub...")
-        
         try:
-            # Check if backup branch exists, create if not
-            subprocess.run(['git', 'fetch', 'origin'], capture_output=True, timeout=30)
-            
-            branch_check = subprocess.run(
-                ['git', 'rev-parse', '--verify', f'origin/{self.backup_branch}'],
-                capture_output=True
-            )
-            
-            if branch_check.returncode != 0:
-                # Create new orphan branch for backups
-                print(f"📝 Creating new backup branch: {self.backup_branch}")
-                subprocess.run(['git', 'checkout', '--orphan', self.backup_branch], 
-                             capture_output=True)
-                subprocess.run(['git', 'rm', '-rf', '.'], capture_output=True)
-            else:
-                # Switch to backup branch
-                subprocess.run(['git', 'checkout', self.backup_branch], capture_output=True)
-                subprocess.run(['git', 'pull', 'origin', self.backup_branch], 
-                             capture_output=True, timeout=30)
-            
-            # Copy database to backup location
-            backup_dir = Path("data")
-            backup_dir.mkdir(exist_ok=True)
-            
-            # Add and commit database
-            subprocess.run(['git', 'add', self.db_path], check=True)
-            
-            commit_msg = f"Auto-backup: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}"
-            result = subprocess.run(
-                ['git', 'commit', '-m', commit_msg],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0 or 'nothing to commit' in result.stdout:
-                # Push to GitHub
-                push_result = subprocess.run(
-                    ['git', 'push', 'origin', self.backup_branch],
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                
-                if push_result.returncode == 0:
-                    print(f"✅ Database backed up to GitHub: {commit_msg}")
-                    
-                    # Return to main branch
-                    subprocess.run(['git', 'checkout', 'master'], capture_output=True)
-                    return True
-                else:
-                    print(f"⚠️  Push failed: {push_result.stderr}")
-            else:
-                print("ℹ️  No changes to backup")
-            
-            # Return to main branch
-            subprocess.run(['git', 'checkout', 'master'], capture_output=True)
-            
-        except subprocess.TimeoutExpired:
-            print("⚠️  Backup timeout")
-        except Exception as e:
-            print(f"⚠️  Backup failed: {e}")
-        
-        return False
-    
-    def schedule_backup(self, interval_minutes: int = 60):
-        """
-        Schedule periodic backups (to be called from main app)
-        Note: Streamlit Cloud may restart, so this is best-effort
-        """
-        import time
-        last_backup = getattr(st.session_state, 'last_backup_time', 0)
-        current_time = time.time()
-        
-        if current_time - last_backup > (interval_minutes * 60):
-            success = self.backup_to_github()
-            if success:
-                st.session_state.last_backup_time = current_time
-            return success
-        
-        return False
+            conn = sqlite3.connect(self.db_path)
+            try:
+                return conn.execute("SELECT EXISTS (SELECT 1 FROM logs)").fetchone()[0] == 1
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False
+
+    def start(self, interval_minutes: Optional[int] = None) -> None:
+        """Run backups every `interval_minutes` on a daemon thread (first run right away)"""
+        with self._lock:
+            if interval_minutes is not None:
+                self._interval_s = interval_minutes * 60
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="github-backup", daemon=True)
+            self._thread.start()
+
+    def request_backup(self) -> None:
+        """Wake the worker for an immediate backup, even outside the cloud environment"""
+        with self._lock:
+            self._force_next = True
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                force, self._force_next = self._force_next, False
+            self.backup_to_github(force=force)
+            self._wake.wait(self._interval_s)
+            self._wake.clear()
 
 
 # Singleton instance
 _backup_instance = None
+_backup_instance_lock = threading.Lock()
 
 def get_backup_system():
     """Get or create backup system singleton"""
     global _backup_instance
-    if _backup_instance is None:
-        _backup_instance = GitHubBackup()
-    return _backup_instance
+    with _backup_instance_lock:
+        if _backup_instance is None:
+            _backup_instance = GitHubBackup()
+        return _backup_instance
 
 
 def restore_database_on_startup():
@@ -214,12 +552,19 @@ def restore_database_on_startup():
 
 
 def backup_database_now(force: bool = False):
-    """Manually trigger a backup"""
+    """Queue an immediate backup on the background worker"""
     backup = get_backup_system()
-    return backup.backup_to_github(force=force)
+    if not backup.is_cloud_environment() and not force:
+        return False
+    backup.start()
+    backup.request_backup()
+    return True
 
 
 def auto_backup_if_needed(interval_minutes: int = 60):
-    """Call this periodically from your app to trigger auto-backups"""
+    """Start the background backup worker (cloud only); returns at once"""
     backup = get_backup_system()
-    return backup.schedule_backup(interval_minutes)
+    if not backup.is_cloud_environment():
+        return False
+    backup.start(interval_minutes)
+    return True
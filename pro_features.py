@@ -9,7 +9,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, date, timedelta
 from auth import require_pro, get_current_user, is_pro_user
-from db import get_conn, query_logs, get_vial_lifecycle, get_experimental_journey, get_experiment_types
+from db import read_connection, query_logs, read_logs_frame, count_logs, get_experimental_journey, get_experiment_types, get_experiment_statistics
 
 def show_pro_features():
     """Display pro features interface"""
@@ -42,8 +42,6 @@ def show_advanced_analytics():
     """Advanced analytics dashboard"""
     st.subheader("📊 Advanced Analytics Dashboard")
     
-    conn = get_conn()
-    
     # Time range selector
     col1, col2 = st.columns(2)
     with col1:
@@ -52,13 +50,13 @@ def show_advanced_analytics():
         end_date = st.date_input("End Date", value=date.today())
     
     # Get data
-    logs = query_logs(conn, start_date=start_date, end_date=end_date)
+    with read_connection() as conn:
+        df = read_logs_frame(conn, {'start_date': start_date, 'end_date': end_date})
     
-    if not logs:
+    if df.empty:
         st.warning("No data available for the selected date range")
         return
     
-    df = pd.DataFrame(logs)
     df['date'] = pd.to_datetime(df['date'])
     
     # Key metrics
@@ -148,7 +146,7 @@ def show_advanced_analytics():
         
         with col2:
             # Average passage by cell line
-            avg_passage = passage_data.groupby('cell_line')['passage'].mean().sort_values(ascending=False)
+            avg_passage = passage_data.groupby('cell_line', observed=True)['passage'].mean().sort_values(ascending=False)
             st.write("**Average Passage by Cell Line:**")
             for cell_line, avg_pass in avg_passage.head(10).items():
                 st.write(f"• {cell_line}: P{avg_pass:.1f}")
@@ -157,23 +155,25 @@ def show_experimental_tracking():
     """Advanced experimental tracking and analysis"""
     st.subheader("🧬 Experimental Tracking Dashboard")
     
-    conn = get_conn()
-    
     # Experiment type selector
     try:
-        experiment_types = get_experiment_types(conn)
+        with read_connection() as conn:
+            experiment_types = get_experiment_types(conn)
         exp_names = [exp['name'] for exp in experiment_types]
         
         selected_exp = st.selectbox("Select Experiment Type", options=["All"] + exp_names)
         
-        # Get experimental data
-        logs = query_logs(conn)
-        exp_logs = [log for log in logs if log.get('experiment_type')]
+        # KPIs for every experiment type in one query
+        with read_connection() as conn:
+            exp_stats = get_experiment_statistics(conn)
+            df_exp = read_logs_frame(conn, columns=['date', 'experiment_type', 'thaw_id', 'outcome_status'])
+        df_exp = df_exp[df_exp['experiment_type'].notna() & (df_exp['experiment_type'] != '')]
         
         if selected_exp != "All":
-            exp_logs = [log for log in exp_logs if log.get('experiment_type') == selected_exp]
+            exp_stats = {k: v for k, v in exp_stats.items() if k == selected_exp}
+            df_exp = df_exp[df_exp['experiment_type'] == selected_exp]
         
-        if not exp_logs:
+        if df_exp.empty:
             st.warning("No experimental data found")
             return
         
@@ -181,29 +181,45 @@ def show_experimental_tracking():
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_experiments = len(set(log.get('thaw_id') for log in exp_logs if log.get('thaw_id')))
+            total_experiments = df_exp.loc[df_exp['thaw_id'].notna() & (df_exp['thaw_id'] != ''), 'thaw_id'].nunique()
             st.metric("Active Experiments", total_experiments)
         
         with col2:
-            successful = len([log for log in exp_logs if log.get('outcome_status') == 'Successful'])
+            successful = int((df_exp['outcome_status'] == 'Successful').sum())
             st.metric("Successful", successful)
         
         with col3:
-            failed = len([log for log in exp_logs if log.get('outcome_status') == 'Failed'])
+            failed = int((df_exp['outcome_status'] == 'Failed').sum())
             st.metric("Failed", failed)
         
         with col4:
-            in_progress = len([log for log in exp_logs if log.get('outcome_status') == 'In Progress'])
+            in_progress = int((df_exp['outcome_status'] == 'In Progress').sum())
             st.metric("In Progress", in_progress)
         
+        # Per-type KPIs
+        if exp_stats:
+            st.subheader("📋 Experiment Type KPIs")
+            kpi_df = pd.DataFrame([
+                {
+                    'Experiment Type': s['experiment_type'],
+                    'Attempts': s['total_attempts'],
+                    'Completed': s['successful_completions'],
+                    'In Progress': s['in_progress'],
+                    'Success Rate (%)': round(s['success_rate_percent'], 1),
+                    'Avg Duration (days)': round(s['average_duration_days'], 1),
+                    'Events': s['total_events'],
+                }
+                for s in exp_stats.values()
+            ])
+            st.dataframe(kpi_df, width='stretch')
+        
         # Experimental timeline
         st.subheader("🕒 Experimental Timeline")
         
-        df_exp = pd.DataFrame(exp_logs)
         df_exp['date'] = pd.to_datetime(df_exp['date'])
         
         # Timeline chart
-        timeline_data = df_exp.groupby(['date', 'experiment_type']).size().unstack(fill_value=0)
+        timeline_data = df_exp.groupby(['date', 'experiment_type'], observed=True).size().unstack(fill_value=0)
         
         fig, ax = plt.subplots(figsize=(12, 6))
         timeline_data.plot(kind='line', ax=ax, marker='o')
@@ -218,13 +234,14 @@ def show_experimental_tracking():
         st.subheader("🗺️ Experimental Journeys")
         
         # Get unique thaw IDs with experiments
-        thaw_ids = list(set(log.get('thaw_id') for log in exp_logs if log.get('thaw_id')))
+        thaw_ids = sorted(t for t in df_exp['thaw_id'].dropna().unique() if t)
         
         if thaw_ids:
             selected_thaw = st.selectbox("Select Thaw ID for Detailed Journey", thaw_ids)
             
             if selected_thaw:
-                journey = get_experimental_journey(conn, selected_thaw)
+                with read_connection() as conn:
+                    journey = get_experimental_journey(conn, selected_thaw)
                 
                 if journey and journey.get('experimental_phases'):
                     for exp_type, phase_data in journey['experimental_phases'].items():
@@ -250,14 +267,17 @@ def show_performance_metrics():
     """Performance metrics and KPIs"""
     st.subheader("📈 Performance Metrics & KPIs")
     
-    conn = get_conn()
-    logs = query_logs(conn)
+    with read_connection() as conn:
+        df = read_logs_frame(conn, columns=['date', 'event_type', 'thaw_id', 'operator', 'cell_line'])
+        # Full-text lookup in the notes column instead of scanning every note in pandas;
+        # keywords match at the start of a word ("bacteria" also finds "bacterial")
+        contamination_keywords = ['contamination', 'contaminated', 'bacteria', 'fungus']
+        contaminated_count = count_logs(conn, text=" OR ".join(contamination_keywords), text_column="notes")
     
-    if not logs:
+    if df.empty:
         st.warning("No data available")
         return
     
-    df = pd.DataFrame(logs)
     df['date'] = pd.to_datetime(df['date'])
     
     # Performance metrics
@@ -289,7 +309,7 @@ def show_performance_metrics():
                 st.metric("Avg Split Interval (days)", f"{avg_interval:.1f}")
         
         # User productivity
-        user_productivity = df.groupby('operator').size().sort_values(ascending=False)
+        user_productivity = df.groupby('operator', observed=True).size().sort_values(ascending=False)
         st.write("**Top Contributors:**")
         for operator, count in user_productivity.head(5).items():
             st.write(f"• {operator}: {count} entries")
@@ -298,9 +318,7 @@ def show_performance_metrics():
         st.write("### 🧬 Culture Success Metrics")
         
         # Contamination rate (approximation)
-        contamination_keywords = ['contamination', 'contaminated', 'bacteria', 'fungus']
-        contaminated = df[df['notes'].str.contains('|'.join(contamination_keywords), case=False, na=False)]
-        contamination_rate = len(contaminated) / len(df) * 100
+        contamination_rate = contaminated_count / len(df) * 100
         st.metric("Contamination Rate", f"{contamination_rate:.2f}%")
         
         # Successful thaws
@@ -337,7 +355,7 @@ def show_performance_metrics():
     st.pyplot(fig)
     
     # Event type trends
-    event_trends = df.groupby([df['date'].dt.to_period('M'), 'event_type']).size().unstack(fill_value=0)
+    event_trends = df.groupby([df['date'].dt.to_period('M'), 'event_type'], observed=True).size().unstack(fill_value=0)
     
     fig, ax = plt.subplots(figsize=(12, 6))
     event_trends.plot(kind='area', ax=ax, alpha=0.7)
@@ -355,8 +373,6 @@ def show_bulk_operations():
     # Bulk export options
     st.write("### 📊 Advanced Export Options")
     
-    conn = get_conn()
-    
     # Export filters
     col1, col2 = st.columns(2)
     
@@ -366,7 +382,8 @@ def show_bulk_operations():
         export_end = st.date_input("Export End Date", value=date.today())
         
         # Cell line filter
-        logs = query_logs(conn)
+        with read_connection() as conn:
+            logs = query_logs(conn, columns=['cell_line', 'event_type'])
         cell_lines = sorted(set(log.get('cell_line', '') for log in logs if log.get('cell_line')))
         selected_lines = st.multiselect("Filter by Cell Lines", cell_lines)
     
@@ -388,19 +405,19 @@ def show_bulk_operations():
     if st.button("Generate Export"):
         try:
             # Apply filters
-            filtered_logs = query_logs(conn, start_date=export_start, end_date=export_end)
+            with read_connection() as conn:
+                df = read_logs_frame(conn, {'start_date': export_start, 'end_date': export_end})
             
             if selected_lines:
-                filtered_logs = [log for log in filtered_logs if log.get('cell_line') in selected_lines]
+                df = df[df['cell_line'].isin(selected_lines)]
             
             if selected_events:
-                filtered_logs = [log for log in filtered_logs if log.get('event_type') in selected_events]
+                df = df[df['event_type'].isin(selected_events)]
             
-            if not filtered_logs:
+            if df.empty:
                 st.warning("No data matches the selected filters")
                 return
             
-            df = pd.DataFrame(filtered_logs)
             
             # Generate export based on format
             if export_format == "Excel (Detailed)":
@@ -424,7 +441,7 @@ def show_bulk_operations():
                     
                     # Statistics sheet
                     if 'passage' in df.columns:
-                        passage_stats = df.groupby('cell_line')['passage'].agg(['count', 'mean', 'max']).reset_index()
+                        passage_stats = df.groupby('cell_line', observed=True)['passage'].agg(['count', 'mean', 'max']).reset_index()
                         passage_stats.to_excel(writer, sheet_name='Passage_Stats', index=False)
                 
                 st.download_button(
@@ -452,7 +469,7 @@ def show_bulk_operations():
                     mime="application/json"
                 )
             
-            st.success(f"Export generated with {len(filtered_logs)} entries")
+            st.success(f"Export generated with {len(df)} entries")
         
         except Exception as e:
             st.error(f"Export failed: {e}")
@@ -488,5 +505,9 @@ def show_bulk_operations():
                         st.write("Sample affected records:")
                         st.dataframe(sample_df[['date', 'cell_line', 'event_type', update_field]])
 
+def render(conn=None):
+    """Section entry point for the app navigation; reads check out their own pooled readers"""
+    show_pro_features()
+
 if __name__ == "__main__":
     show_pro_features()
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+App sections: one module per navigation entry, each exposing render(conn)
+Interactive regions inside a section are st.fragment functions built with timed_fragment
+render(conn) gets a pooled read-only connection; writes go through get_pool().run_write()
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Dict, List
+
+import streamlit as st
+
+_FRAGMENT_STATS: Dict[str, Dict[str, float]] = {}
+_FRAGMENT_STATS_LOCK = threading.Lock()
+
+
+def _record_fragment_run(name: str, elapsed_ms: float) -> None:
+    with _FRAGMENT_STATS_LOCK:
+        stats = _FRAGMENT_STATS.setdefault(name, {"runs": 0, "total_ms": 0.0, "last_ms": 0.0, "max_ms": 0.0})
+        stats["runs"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["last_ms"] = elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+
+def timed_fragment(name: str):
+    """Decorator: run the function as an st.fragment and record how long each run takes.
+
+    A widget inside the fragment reruns only that function; st.rerun() inside it
+    still reruns the whole app, which is what form pre-fills rely on. The first
+    argument is the section's pooled reader: a full run shares the page's
+    checkout, while a fragment-only rerun checks out a fresh one, since the
+    reader it was first called with has gone back to the pool.
+    """
+    def decorate(func):
+        @wraps(func)
+        def run(conn, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                with conn._pool.reader() as current:
+                    return func(current, *args, **kwargs)
+            finally:
+                _record_fragment_run(name, (time.perf_counter() - started) * 1000)
+        return st.fragment(run)
+    return decorate
+
+
+def fragment_timings() -> List[Dict[str, Any]]:
+    """Per-fragment run counts and durations in this process, slowest total first."""
+    with _FRAGMENT_STATS_LOCK:
+        snapshot = {name: dict(stats) for name, stats in _FRAGMENT_STATS.items()}
+    rows = []
+    for name, stats in snapshot.items():
+        rows.append({
+            "fragment": name,
+            "runs": int(stats["runs"]),
+            "avg_ms": round(stats["total_ms"] / stats["runs"], 2),
+            "last_ms": round(stats["last_ms"], 2),
+            "max_ms": round(stats["max_ms"], 2),
+            "total_ms": round(stats["total_ms"], 2),
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
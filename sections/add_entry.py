@@ -0,0 +1,1357 @@
+"""
+Add Entry section of the iPSC Tracker app
+New log entries: thaw IDs, autofill from earlier entries, templates and weekend assignment
+"""
+
+import os
+from datetime import date, datetime, timedelta
+
+import streamlit as st
+
+from db import (
+    add_ref_value,
+    evaluate_alerts,
+    generate_enhanced_thaw_id,
+    get_active_thaw_options,
+    get_active_vials,
+    get_entries_by_pattern,
+    get_entry_templates,
+    get_experiment_types,
+    get_last_log_for_cell_line,
+    get_log_by_id,
+    get_pool,
+    get_recent_entries_by_operator,
+    get_recent_logs_for_cell_line,
+    get_ref_values,
+    get_template_entries,
+    get_thaw_latest_info,
+    get_vial_state,
+    IMAGES_DIR,
+    increment_template_usage,
+    insert_log,
+    save_entry_template,
+    suggest_next_event,
+    thaw_id_prefix,
+    top_values,
+)
+from sections import timed_fragment
+
+
+@timed_fragment("add_entry.critical_alerts")
+def _critical_alerts(conn):
+    """Critical alert banner for vials with excessive splits"""
+    try:
+        active_vials = get_active_vials(conn, days_threshold=30)
+        vial_alerts = evaluate_alerts(conn, [v['thaw_id'] for v in active_vials])
+        critical_vials = []
+        for vial in active_vials:
+            alerts = vial_alerts.get(vial['thaw_id'], [])
+            critical_alerts = [a for a in alerts if a['type'] == 'critical']
+            if critical_alerts:
+                critical_vials.append((vial, critical_alerts[0]))
+        
+        if critical_vials:
+            st.error("🚨 **CRITICAL ALERTS** - Immediate attention required:")
+            for vial, alert in critical_vials[:3]:  # Show max 3 critical alerts
+                with st.expander(f"🚨 {vial['thaw_id']} - {vial.get('cell_line', 'Unknown')}", expanded=True):
+                    st.error(alert['message'])
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        if st.button(f"📝 Add Thawing Entry", key=f"thaw_{vial['thaw_id']}"):
+                            st.session_state.form_values = {
+                                'cell_line': vial.get('cell_line', ''),
+                                'event_type': 'Thawing',
+                                'passage': 1,
+                                'notes': f"Fresh vial - replacing {vial['thaw_id']} due to excessive splits"
+                            }
+                            st.success("✅ Form pre-filled for new thawing entry")
+                            st.rerun()
+                    with col2:
+                        if st.button(f"🧬 Karyotype Check", key=f"karyo_{vial['thaw_id']}"):
+                            st.session_state.form_values = {
+                                'cell_line': vial.get('cell_line', ''),
+                                'event_type': 'Other',
+                                'passage': vial.get('current_passage', 1),
+                                'thaw_id': vial['thaw_id'],
+                                'notes': 'Karyotype analysis - checking genetic stability after prolonged culture'
+                            }
+                            st.success("✅ Form pre-filled for karyotype entry")
+                            st.rerun()
+                    with col3:
+                        if st.button(f"❄️ Cryopreserve", key=f"cryo_{vial['thaw_id']}"):
+                            st.session_state.form_values = {
+                                'cell_line': vial.get('cell_line', ''),
+                                'event_type': 'Cryopreservation',
+                                'passage': vial.get('current_passage', 1),
+                                'thaw_id': vial['thaw_id'],
+                                'notes': 'Cryopreservation - preserving before genetic drift'
+                            }
+                            st.success("✅ Form pre-filled for cryopreservation")
+                            st.rerun()
+            st.markdown("---")
+    except Exception as e:
+        # Don't let alert checking break the app
+        pass
+
+
+@timed_fragment("add_entry.copy_reuse")
+def _copy_reuse_panel(conn, cell_line):
+    """Copy & Reuse options: recent entries, templates, pattern matches and my entries"""
+    pool = get_pool()
+    
+    # Create tabs for different copy methods
+    copy_tab1, copy_tab2, copy_tab3, copy_tab4 = st.columns(4)
+    
+    with copy_tab1:
+        enable_recent_copy = st.checkbox("📋 Copy Recent Entry", value=False, help="Copy from recent entries for this cell line")
+    
+    with copy_tab2:
+        enable_template_copy = st.checkbox("⭐ Use Template", value=False, help="Use saved templates or common patterns")
+    
+    with copy_tab3:
+        enable_pattern_copy = st.checkbox("🔍 Pattern Match", value=False, help="Copy from entries with similar conditions")
+    
+    with copy_tab4:
+        enable_my_entries = st.checkbox("👤 My Entries", value=False, help="Copy from your recent entries")
+
+    # Copy functionality sections
+    copied_data = None
+    
+    # Recent Entry Copy
+    if enable_recent_copy and cell_line:
+        with st.expander("📋 Recent Entries for " + cell_line, expanded=True):
+            recent = get_recent_logs_for_cell_line(conn, cell_line, limit=15)
+            if recent:
+                recent_options = []
+                for i, r in enumerate(recent):
+                    date_str = r.get('date', '')[:10]
+                    event_str = r.get('event_type', '')
+                    passage_str = f"P{r.get('passage', '')}" if r.get('passage') else ""
+                    vessel_str = r.get('vessel', '')
+                    medium_str = r.get('medium', '')
+                    notes_preview = (r.get('notes', '') or '')[:30] + "..." if len(r.get('notes', '') or '') > 30 else r.get('notes', '')
+                    display_text = f"{date_str} | {event_str} | {passage_str} | {vessel_str} | {medium_str}"
+                    if notes_preview:
+                        display_text += f" | {notes_preview}"
+                    recent_options.append(display_text)
+                
+                selected_recent = st.selectbox(
+                    "Choose an entry to copy:",
+                    options=list(range(len(recent_options))),
+                    format_func=lambda i: recent_options[i],
+                    key="recent_copy_select"
+                )
+                
+                if st.button("📋 Copy This Entry", key="copy_recent_btn"):
+                    copied_data = recent[selected_recent]
+                    st.session_state.form_values = copied_data.copy()
+                    st.success(f"✅ Copied entry from {recent[selected_recent].get('date', '')}")
+                    st.rerun()
+            else:
+                st.info("No previous entries for this cell line yet.")
+    
+    # Template Copy
+    if enable_template_copy:
+        with st.expander("⭐ Templates & Common Patterns", expanded=True):
+            template_type = st.radio(
+                "Template Type:",
+                ["Saved Templates", "Common Patterns", "Cell Line Patterns"],
+                horizontal=True,
+                key="template_type_radio"
+            )
+            
+            if template_type == "Saved Templates":
+                current_user = st.session_state.get("my_name", "Unknown")
+                templates = get_entry_templates(conn, created_by=current_user)
+                
+                if templates:
+                    template_names = [t['name'] for t in templates]
+                    selected_template_idx = st.selectbox(
+                        "Choose a saved template:",
+                        options=list(range(len(template_names))),
+                        format_func=lambda i: f"{template_names[i]} (used {templates[i]['usage_count']} times)",
+                        key="saved_template_select"
+                    )
+                    
+                    if st.button("⭐ Use Template", key="use_template_btn"):
+                        copied_data = templates[selected_template_idx]['template_data']
+                        st.session_state.form_values = copied_data.copy()
+                        pool.run_write(increment_template_usage, templates[selected_template_idx]['name'])
+                        st.success(f"✅ Loaded template: {templates[selected_template_idx]['name']}")
+                        st.rerun()
+                else:
+                    st.info("No saved templates yet. Create one by saving an entry as a template below.")
+            
+            elif template_type == "Common Patterns":
+                common_patterns = get_template_entries(conn, limit=10)
+                if common_patterns:
+                    pattern_options = []
+                    for p in common_patterns:
+                        pattern_text = f"{p.get('event_type', '')} | {p.get('vessel', '')} | {p.get('medium', '')} | {p.get('cell_type', '')} (used {p.get('usage_count', 1)} times)"
+                        pattern_options.append(pattern_text)
+                    
+                    selected_pattern = st.selectbox(
+                        "Common combinations:",
+                        options=list(range(len(pattern_options))),
+                        format_func=lambda i: pattern_options[i],
+                        key="common_pattern_select"
+                    )
+                    
+                    if st.button("🔄 Use Pattern", key="use_pattern_btn"):
+                        copied_data = common_patterns[selected_pattern]
+                        st.session_state.form_values = copied_data.copy()
+                        st.success("✅ Loaded common pattern")
+                        st.rerun()
+                else:
+                    st.info("No common patterns found yet.")
+            
+            elif template_type == "Cell Line Patterns":
+                if cell_line:
+                    line_patterns = get_template_entries(conn, cell_line=cell_line, limit=8)
+                    if line_patterns:
+                        line_pattern_options = []
+                        for p in line_patterns:
+                            pattern_text = f"{p.get('event_type', '')} | {p.get('vessel', '')} | {p.get('medium', '')} (used {p.get('usage_count', 1)} times)"
+                            line_pattern_options.append(pattern_text)
+                        
+                        selected_line_pattern = st.selectbox(
+                            f"Patterns for {cell_line}:",
+                            options=list(range(len(line_pattern_options))),
+                            format_func=lambda i: line_pattern_options[i],
+                            key="line_pattern_select"
+                        )
+                        
+                        if st.button("📊 Use Cell Line Pattern", key="use_line_pattern_btn"):
+                            copied_data = line_patterns[selected_line_pattern]
+                            st.session_state.form_values = copied_data.copy()
+                            st.success(f"✅ Loaded pattern for {cell_line}")
+                            st.rerun()
+                    else:
+                        st.info(f"No patterns found for {cell_line} yet.")
+                else:
+                    st.info("Select a cell line first to see its patterns.")
+    
+    # Pattern Matching Copy
+    if enable_pattern_copy:
+        with st.expander("🔍 Find Similar Entries", expanded=True):
+            st.write("Find entries matching specific criteria:")
+            
+            pcol1, pcol2 = st.columns(2)
+            with pcol1:
+                pattern_vessel = st.text_input("Vessel type:", placeholder="e.g., T25, 6-well", key="pattern_vessel")
+                pattern_medium = st.text_input("Medium:", placeholder="e.g., StemFlex", key="pattern_medium")
+            
+            with pcol2:
+                evt_values = get_ref_values(conn, "event_type")
+                pattern_event = st.selectbox("Event type:", [""] + (evt_values or ["Observation", "Media Change", "Split", "Thawing", "Cryopreservation", "Other"]), key="pattern_event")
+                pattern_cell_type = st.text_input("Cell type:", placeholder="e.g., iPSC", key="pattern_cell_type")
+            
+            if st.button("🔍 Find Matching Entries", key="find_pattern_btn"):
+                pattern_filters = {}
+                if pattern_vessel: pattern_filters['vessel'] = pattern_vessel
+                if pattern_medium: pattern_filters['medium'] = pattern_medium
+                if pattern_event: pattern_filters['event_type'] = pattern_event
+                if pattern_cell_type: pattern_filters['cell_type'] = pattern_cell_type
+                
+                if pattern_filters:
+                    matching_entries = get_entries_by_pattern(conn, **pattern_filters)
+                    if matching_entries:
+                        st.session_state['pattern_matches'] = matching_entries
+                        st.success(f"Found {len(matching_entries)} matching entries")
+                    else:
+                        st.info("No matching entries found")
+                else:
+                    st.warning("Enter at least one search criteria")
+            
+            if 'pattern_matches' in st.session_state and st.session_state['pattern_matches']:
+                matches = st.session_state['pattern_matches']
+                match_options = []
+                for m in matches:
+                    match_text = f"{m.get('date', '')[:10]} | {m.get('cell_line', '')} | {m.get('event_type', '')} | {m.get('vessel', '')} | {m.get('medium', '')}"
+                    match_options.append(match_text)
+                
+                selected_match = st.selectbox(
+                    "Matching entries:",
+                    options=list(range(len(match_options))),
+                    format_func=lambda i: match_options[i],
+                    key="pattern_match_select"
+                )
+                
+                if st.button("📋 Copy Match", key="copy_match_btn"):
+                    copied_data = matches[selected_match]
+                    st.session_state.form_values = copied_data.copy()
+                    st.success("✅ Copied matching entry")
+                    st.rerun()
+    
+    # My Entries Copy
+    if enable_my_entries and st.session_state.get("my_name"):
+        with st.expander("👤 My Recent Entries", expanded=True):
+            my_entries = get_recent_entries_by_operator(conn, st.session_state["my_name"], limit=15)
+            if my_entries:
+                my_options = []
+                for m in my_entries:
+                    my_text = f"{m.get('date', '')[:10]} | {m.get('cell_line', '')} | {m.get('event_type', '')} | {m.get('vessel', '')} | {m.get('medium', '')}"
+                    my_options.append(my_text)
+                
+                selected_my_entry = st.selectbox(
+                    "Your recent entries:",
+                    options=list(range(len(my_options))),
+                    format_func=lambda i: my_options[i],
+                    key="my_entry_select"
+                )
+                
+                if st.button("👤 Copy My Entry", key="copy_my_btn"):
+                    copied_data = my_entries[selected_my_entry]
+                    st.session_state.form_values = copied_data.copy()
+                    st.success("✅ Copied your entry")
+                    st.rerun()
+            else:
+                st.info("No entries found for you yet.")
+    elif enable_my_entries and not st.session_state.get("my_name"):
+        st.info("Set 'My name' at the top to see your entries.")
+
+    # Clear copied data button
+    if st.session_state.form_values:
+        if st.button("🗑️ Clear Copied Data", key="clear_copied_btn"):
+            st.session_state.form_values = {}
+            st.success("✅ Cleared copied data")
+            st.rerun()
+
+
+def render(conn):
+    """Render the Add Entry section"""
+    pool = get_pool()
+    st.subheader("📋 Add New Log Entry")
+
+    _critical_alerts(conn)
+
+    # Enhanced Copy/Reuse Section (OUTSIDE the form so it can work independently)
+    st.markdown("### 🔄 Copy & Reuse Options")
+    
+    # Initialize session state for form values if not exists
+    if "form_values" not in st.session_state:
+        st.session_state.form_values = {}
+
+    # Cell Line selection (needed for copy functionality and as the form default)
+    cl_values = get_ref_values(conn, "cell_line")
+    cell_line = st.selectbox("Select Cell Line for Copy/Reuse", options=[""] + cl_values if cl_values else [""], help="Select a cell line to see copy options")
+    _copy_reuse_panel(conn, cell_line)
+
+    st.markdown("---")
+    
+    # Pre-form thaw selection for auto-fill (outside the form to work properly)
+    selected_thaw_id = None
+    
+    # First, get cell line from previous form values or None for initial state
+    previous_cell_line = st.session_state.form_values.get('cell_line') if st.session_state.form_values else None
+    
+    # Quick cell line selection for thaw filtering (outside form)
+    cell_lines = get_ref_values(conn, "cell_line")
+    
+    # Get the cell line for thaw filtering - either from previous selection or first available
+    filter_cell_line = previous_cell_line if previous_cell_line in cell_lines else (cell_lines[0] if cell_lines else "")
+    
+    # Show thaw selection outside form for auto-fill functionality
+    st.markdown("### 🔗 Quick Thaw Selection (Auto-fill)")
+    st.caption("Select a thaw vial to auto-fill the form with its latest information")
+    
+    thaw_options = get_active_thaw_options(conn, filter_cell_line)
+    # If no thaw options for the chosen filter cell line, fall back to showing all recent thaws
+    fallback_all_thaws = False
+    if not thaw_options:
+        thaw_options = get_active_thaw_options(conn, "")
+        fallback_all_thaws = True
+
+    if thaw_options:
+        # Add refresh button
+        refresh_col1, refresh_col2 = st.columns([3, 1])
+        
+        with refresh_col2:
+            if st.button("🔄 Refresh", help="Refresh thaw options"):
+                st.rerun()
+        
+        with refresh_col1:
+            thaw_display_options = ["(none) - Manual entry"]
+            thaw_id_mapping = {"(none) - Manual entry": "(none)"}
+            
+            for opt in thaw_options:
+                status_emoji = {
+                    "Active": "🟢",
+                    "Aged": "🟡", 
+                    "Old": "🟠",
+                    "Cryopreserved": "❄️"
+                }.get(opt['status'], "⚪")
+                
+                display_text = f"{status_emoji} {opt['thaw_id']} (P{opt['current_passage']}) - {opt['cell_line']}"
+                thaw_display_options.append(display_text)
+                thaw_id_mapping[display_text] = opt['thaw_id']
+            
+            selected_thaw_display = st.selectbox(
+                "Choose thaw vial to auto-fill form:",
+                options=thaw_display_options,
+                index=0,
+                help="🟢=Active, 🟡=Aged, 🟠=Old, ❄️=Cryopreserved",
+                key="pre_form_thaw_selection"
+            )
+            # If we had to fallback to all thaws, show a hint so user knows we are showing all cell lines
+            if fallback_all_thaws:
+                st.caption("Showing recent thaw vials across all cell lines (no thaws found for current filter)")
+        
+        selected_thaw_id = thaw_id_mapping.get(selected_thaw_display, "(none)")
+        
+        # Auto-fill when thaw is selected
+        if selected_thaw_id != "(none)":
+            # Always show current thaw selection status
+            thaw_info = get_thaw_latest_info(conn, selected_thaw_id)
+            
+            # Show current thaw info
+            with st.expander(f"📋 Current Thaw Info: {selected_thaw_id}", expanded=False):
+                info_col1, info_col2 = st.columns(2)
+                with info_col1:
+                    st.write(f"**Cell Line:** {thaw_info['cell_line']}")
+                    st.write(f"**Passage:** {thaw_info['passage']}")
+                    st.write(f"**Vessel:** {thaw_info['vessel']}")
+                    st.write(f"**Location:** {thaw_info['location']}")
+                with info_col2:
+                    st.write(f"**Medium:** {thaw_info['medium']}")
+                    st.write(f"**Cell Type:** {thaw_info['cell_type']}")
+                    st.write(f"**Volume:** {thaw_info['volume']} mL")
+                    st.write(f"**Operator:** {thaw_info['operator']}")
+            
+            # Check if this is a new thaw selection or force refresh
+            current_form_thaw = st.session_state.get("current_form_thaw_id")
+            if current_form_thaw != selected_thaw_id:
+                # Store auto-filled values in session state
+                st.session_state.form_values = {
+                    'cell_line': thaw_info['cell_line'],
+                    'passage': thaw_info['passage'],
+                    'vessel': thaw_info['vessel'], 
+                    'location': thaw_info['location'],
+                    'medium': thaw_info['medium'],
+                    'cell_type': thaw_info['cell_type'],
+                    'volume': thaw_info['volume'],
+                    'operator': thaw_info['operator'],
+                    'experimental_conditions': thaw_info['experimental_conditions'],
+                    'protocol_reference': thaw_info['protocol_reference'],
+                    'success_metrics': thaw_info['success_metrics'],
+                    'experiment_type': thaw_info['experiment_type'],
+                    'experiment_stage': thaw_info['experiment_stage'],
+                    'outcome_status': thaw_info['outcome_status'],
+                    'linked_thaw_id': selected_thaw_id
+                }
+                
+                # Store the current thaw ID
+                st.session_state["current_form_thaw_id"] = selected_thaw_id
+                
+                # Show success message and rerun to refresh form
+                st.success(f"✅ Form auto-filled with data from {selected_thaw_id}")
+                st.rerun()  # Force refresh to show auto-filled values
+            else:
+                # Already loaded - show status
+                st.info(f"📋 Form is populated with data from {selected_thaw_id}")
+        else:
+            # Clear form values when no thaw selected
+            if st.session_state.get("current_form_thaw_id"):
+                st.session_state.form_values = None
+                st.session_state["current_form_thaw_id"] = None
+
+    st.markdown("---")
+
+    # Weekend Context Banner
+    weekend_assignee = st.session_state.get("selected_weekend_assignee")
+    if weekend_assignee:
+        today = date.today()
+        is_weekend = today.weekday() >= 5  # Saturday=5, Sunday=6
+        
+        if is_weekend:
+            st.info(f"🎯 **Weekend Mode**: Entries will auto-assign to **{weekend_assignee}** | [Change in Weekend Planning →]()")
+        else:
+            st.success(f"📋 **Weekend Planning Active**: Next entries will auto-assign to **{weekend_assignee}** | [Modify →]()")
+
+    # Main Entry Form with improved UX
+    with st.form("add_entry_form", clear_on_submit=False):
+        
+        # Get copied values from session state
+        prev = st.session_state.form_values if st.session_state.form_values else None
+        
+        # Initialize linked_thaw_id properly from session state
+        linked_thaw_id = prev.get("linked_thaw_id", "(none)") if prev else "(none)"
+        
+        # Show auto-fill status if values are present
+        if prev and prev.get("linked_thaw_id"):
+            with st.expander("📋 Auto-fill Status", expanded=False):
+                st.caption(f"**Form populated from:** {prev.get('linked_thaw_id')}")
+                filled_fields = [k for k, v in prev.items() if v and k != 'linked_thaw_id']
+                st.caption(f"**Auto-filled fields:** {', '.join(filled_fields)}")
+        
+        # Essential Information Section (always visible)
+        st.markdown("### ✏️ Essential Information")
+        
+        # Row 1: Cell Line, Event Type, and Thaw Link (most important fields)
+        ess_col1, ess_col2, ess_col3 = st.columns([1, 1, 1])
+        
+        with ess_col1:
+            cl_values = get_ref_values(conn, "cell_line")
+            if cl_values:
+                default_cell_line = ""
+                if prev and prev.get("cell_line") in cl_values:
+                    default_cell_line = prev.get("cell_line")
+                elif cell_line in cl_values:
+                    default_cell_line = cell_line
+                
+                cl_options = ["+ Add new cell line"] + cl_values
+                selected_cl_idx = cl_values.index(default_cell_line) + 1 if default_cell_line in cl_values else 0
+                
+                cell_line_selection = st.selectbox("Cell Line ID *", options=cl_options, index=selected_cl_idx)
+                
+                if cell_line_selection == "+ Add new cell line":
+                    cell_line_final = st.text_input("Enter new Cell Line ID *", 
+                                                  value="",
+                                                  placeholder="e.g., BIHi005-A-24",
+                                                  key="new_cell_line_manual")
+                    if cell_line_final and cell_line_final not in cl_values:
+                        st.caption(f"💡 Will add: {cell_line_final}")
+                else:
+                    cell_line_final = cell_line_selection
+            else:
+                cell_line_final = st.text_input("Cell Line ID *", 
+                                              value=prev.get("cell_line", "") if prev else "",
+                                              placeholder="e.g., BIHi005-A-24")
+        
+        with ess_col2:
+            evt_values = get_ref_values(conn, "event_type")
+            if evt_values:
+                default_event_idx = 0
+                if prev and prev.get("event_type") in evt_values:
+                    default_event_idx = evt_values.index(prev.get("event_type"))
+                
+                event_options = ["+ Add new event type"] + evt_values
+                event_selection = st.selectbox("Event Type *", options=event_options, index=default_event_idx + 1 if default_event_idx >= 0 else 0)
+                
+                if event_selection == "+ Add new event type":
+                    event_type = st.text_input("Enter new Event Type *", 
+                                             placeholder="e.g., Cell Sorting, Transfection",
+                                             key="new_event_type_manual")
+                    if event_type and event_type not in evt_values:
+                        st.caption(f"💡 Will add: {event_type}")
+                else:
+                    event_type = event_selection
+            else:
+                default_options = ["Observation", "Media Change", "Split", "Thawing", "Cryopreservation", "Other"]
+                default_event_idx = 0
+                if prev and prev.get("event_type") in default_options:
+                    default_event_idx = default_options.index(prev.get("event_type"))
+                event_type = st.selectbox("Event Type *", options=default_options, index=default_event_idx)
+
+        with ess_col3:
+            # Show linked thaw ID from pre-form selection
+            if event_type != "Thawing":
+                st.markdown("**🔗 Linked Thaw**")
+                if prev and prev.get("linked_thaw_id"):
+                    st.success(f"🔗 {prev.get('linked_thaw_id')}")
+                    linked_thaw_id = prev.get('linked_thaw_id')
+                    
+                    # Show auto-fill status
+                    if st.session_state.get("auto_filled_from_thaw"):
+                        auto_fill_info = st.session_state.get("auto_fill_source", linked_thaw_id)
+                        st.caption(f"✅ Auto-filled from {auto_fill_info}")
+                    
+                    # Show split counter for linked thaw vial
+                    try:
+                        vial_state = get_vial_state(conn, linked_thaw_id)
+                        if vial_state:
+                            split_count = vial_state['split_count']
+                            if split_count > 10:
+                                st.error(f"🚨 {split_count} splits - CRITICAL!")
+                            elif split_count > 8:
+                                st.warning(f"⚠️ {split_count} splits - approaching limit")
+                            elif split_count > 5:
+                                st.info(f"📊 {split_count} splits performed")
+                            else:
+                                st.success(f"📊 {split_count} splits performed")
+                    except Exception:
+                        pass
+                else:
+                    st.info("� Use thaw selection above to link")
+                    linked_thaw_id = "(none)"
+            else:
+                # For thawing events, show placeholder
+                st.markdown("**🧪 New Thaw**")
+                st.selectbox("Creating new thaw vial", options=["(auto-generated)"], index=0, disabled=True, key="thawing_placeholder")
+                st.caption("💡 Thaw ID will be auto-generated")
+                linked_thaw_id = ""
+
+        # Row 2: Basic culture details in compact layout
+        basic_col1, basic_col2, basic_col3, basic_col4 = st.columns(4)
+        
+        with basic_col1:
+            # Smart passage prediction based on event type
+            default_passage = 1
+            if cell_line_final:
+                last_for_line = get_last_log_for_cell_line(conn, cell_line_final)
+                if last_for_line and last_for_line.get("passage"):
+                    try:
+                        current_passage = int(last_for_line.get("passage"))
+                        # Only increment passage for Split events
+                        if event_type == "Split":
+                            default_passage = current_passage + 1
+                        else:
+                            # For all other events (Media Change, Observation, etc.), keep same passage
+                            default_passage = current_passage
+                    except Exception:
+                        default_passage = 1
+                else:
+                    # No previous entry, start with passage 1
+                    default_passage = 1
+            
+            # If auto-filled from thaw selection, use that passage number (may be overridden by event type logic above)
+            if prev and prev.get("passage"):
+                try:
+                    auto_fill_passage = int(prev.get("passage"))
+                    # Apply same logic to auto-filled values
+                    if event_type == "Split":
+                        default_passage = auto_fill_passage + 1
+                    else:
+                        default_passage = auto_fill_passage
+                except Exception:
+                    pass
+            
+            passage_no = st.number_input("Passage", min_value=1, step=1, value=default_passage)
+            
+            # Show helpful hint about passage numbering
+            if event_type == "Split":
+                st.caption("🔢 Passage will increment for split")
+            else:
+                st.caption("🔢 Passage stays same for this event")
+        
+        with basic_col2:
+            vessel_refs = get_ref_values(conn, "vessel")
+            if vessel_refs:
+                v_index = 0
+                if prev and prev.get("vessel") in vessel_refs:
+                    v_index = vessel_refs.index(prev.get("vessel"))
+                
+                vessel_options = ["+ Add new"] + vessel_refs
+                vessel_selection = st.selectbox("Vessel", options=vessel_options, index=v_index + 1 if v_index >= 0 else 0)
+                
+                if vessel_selection == "+ Add new":
+                    vessel = st.text_input("New Vessel", 
+                                         placeholder="T25, 6-well",
+                                         key="new_vessel_manual")
+                    if vessel and vessel not in vessel_refs:
+                        st.caption(f"💡 Will add: {vessel}")
+                else:
+                    vessel = vessel_selection
+            else:
+                vessel_default = prev.get("vessel") if prev and prev.get("vessel") else ""
+                vessel = st.text_input("Vessel", placeholder="T25, 6-well", value=vessel_default)
+        
+        with basic_col3:
+            cm_refs = get_ref_values(conn, "culture_medium")
+            if cm_refs:
+                m_index = 0
+                if prev and prev.get("medium") in cm_refs:
+                    m_index = cm_refs.index(prev.get("medium"))
+                
+                medium_options = ["+ Add new"] + cm_refs
+                medium_selection = st.selectbox("Medium", options=medium_options, index=m_index + 1 if m_index >= 0 else 0)
+                
+                if medium_selection == "+ Add new":
+                    medium = st.text_input("New Medium", 
+                                         placeholder="StemFlex",
+                                         key="new_medium_manual")
+                    if medium and medium not in cm_refs:
+                        st.caption(f"💡 Will add: {medium}")
+                else:
+                    medium = medium_selection
+            else:
+                med_default = prev.get("medium") if prev and prev.get("medium") else ""
+                medium = st.text_input("Medium", placeholder="StemFlex", value=med_default)
+        
+        with basic_col4:
+            default_volume = 0.0
+            if prev and prev.get("volume") is not None:
+                try:
+                    default_volume = float(prev.get("volume"))
+                except Exception:
+                    default_volume = 0.0
+            volume = st.number_input("Volume (mL)", min_value=0.0, step=0.5, value=default_volume)
+
+        # Suggestions row (compact)
+        if cell_line_final:
+            _med_sugs = top_values(conn, "medium", cell_line=cell_line_final)
+            _ct_sugs = top_values(conn, "cell_type", cell_line=cell_line_final)
+            hint_event = suggest_next_event(conn, cell_line_final)
+            
+            suggestions = []
+            if hint_event:
+                suggestions.append(f"Next: {hint_event}")
+            if _med_sugs:
+                suggestions.append(f"Medium: {', '.join(str(x) for x in _med_sugs[:2])}")
+            if _ct_sugs:
+                suggestions.append(f"Type: {', '.join(str(x) for x in _ct_sugs[:2])}")
+            
+            if suggestions:
+                st.caption("💡 " + " | ".join(suggestions))
+
+        # Auto-fill notice and controls
+        if st.session_state.get("auto_filled_from_thaw", False):
+            autofill_col1, autofill_col2 = st.columns([3, 1])
+            with autofill_col1:
+                auto_fill_info = st.session_state.get("auto_fill_source", "unknown thaw")
+                st.info(f"🎯 Form auto-filled from {auto_fill_info}. You can modify any field below, then change the Event Type to Split, Media Change, etc.")
+            with autofill_col2:
+                if st.button("🗑️ Clear Auto-fill", help="Clear auto-filled values and start fresh"):
+                    st.session_state.form_values = {}
+                    st.session_state["last_selected_thaw_id"] = None
+                    st.session_state["auto_filled_from_thaw"] = False
+                    st.session_state["auto_fill_source"] = None
+                    st.rerun()
+        
+        # Debug info (temporary - remove after testing)
+        if st.checkbox("🔧 Show Debug Info", help="Temporary debug information"):
+            st.write("**Session State Debug:**")
+            st.write(f"- auto_filled_from_thaw: {st.session_state.get('auto_filled_from_thaw', False)}")
+            st.write(f"- last_selected_thaw_id: {st.session_state.get('last_selected_thaw_id', 'None')}")
+            st.write(f"- auto_fill_source: {st.session_state.get('auto_fill_source', 'None')}")
+            if st.session_state.get('form_values'):
+                st.write(f"- form_values keys: {list(st.session_state.get('form_values', {}).keys())}")
+                st.write(f"- cell_line from form_values: {st.session_state.get('form_values', {}).get('cell_line', 'None')}")
+                st.write(f"- passage from form_values: {st.session_state.get('form_values', {}).get('passage', 'None')}")
+            else:
+                st.write("- form_values: Empty")
+
+        # More Thaw Options (expandable when needed)
+        if st.session_state.get("show_all_thaw_options", False) and event_type != "Thawing":
+            with st.expander("🔗 More Thaw Options", expanded=True):
+                st.markdown("**All Available Thawed Vials**")
+                
+                # Get all thaw options for this cell line
+                all_thaw_options = get_active_thaw_options(conn, cell_line_final if cell_line_final else "")
+                
+                if all_thaw_options:
+                    # Create detailed display options
+                    detailed_thaw_options = ["(none) - New independent culture"]
+                    detailed_thaw_mapping = {"(none) - New independent culture": "(none)"}
+                    
+                    for opt in all_thaw_options:
+                        status_emoji = {
+                            "Active": "🟢",
+                            "Aged": "🟡", 
+                            "Old": "🟠",
+                            "Cryopreserved": "❄️"
+                        }.get(opt['status'], "⚪")
+                        
+                        # Detailed display text
+                        display_text = f"{status_emoji} {opt['thaw_id']} | {opt['cell_line']} | P{opt['current_passage']} | {opt['last_event']} | {opt['days_since_thaw']}d ago"
+                        if opt['vessel']:
+                            display_text += f" | {opt['vessel']}"
+                        
+                        detailed_thaw_options.append(display_text)
+                        detailed_thaw_mapping[display_text] = opt['thaw_id']
+                    
+                    # Set default selection based on pre-form Quick Thaw Selection
+                    default_detailed_index = 0
+                    if linked_thaw_id and linked_thaw_id != "(none)":
+                        # Find the index of the pre-selected thaw
+                        for i, option in enumerate(detailed_thaw_options):
+                            if detailed_thaw_mapping.get(option) == linked_thaw_id:
+                                default_detailed_index = i
+                                break
+                    
+                    selected_detailed_thaw = st.selectbox(
+                        "Select thawed vial:",
+                        options=detailed_thaw_options,
+                        index=default_detailed_index,
+                        help="🟢=Active, 🟡=Aged, 🟠=Old, ❄️=Cryopreserved",
+                        key="detailed_thaw_select"
+                    )
+                    
+                    # Only override if user explicitly changed selection
+                    new_linked_thaw_id = detailed_thaw_mapping.get(selected_detailed_thaw, "(none)")
+                    if new_linked_thaw_id != linked_thaw_id:
+                        linked_thaw_id = new_linked_thaw_id
+                    
+                    # Auto-fill form with detailed thaw vial information
+                    if linked_thaw_id != "(none)":
+                        # Check if this is a new thaw selection (different from previous)
+                        if st.session_state.get("last_selected_thaw_id") != linked_thaw_id:
+                            # Get latest info for this thaw and auto-fill
+                            thaw_info = get_thaw_latest_info(conn, linked_thaw_id)
+                            
+                            # Store auto-filled values in session state
+                            st.session_state.form_values = {
+                                'cell_line': thaw_info['cell_line'],
+                                'passage': thaw_info['passage'],
+                                'vessel': thaw_info['vessel'], 
+                                'location': thaw_info['location'],
+                                'medium': thaw_info['medium'],
+                                'cell_type': thaw_info['cell_type'],
+                                'volume': thaw_info['volume'],
+                                'operator': thaw_info['operator'],
+                                'experimental_conditions': thaw_info['experimental_conditions'],
+                                'protocol_reference': thaw_info['protocol_reference'],
+                                'success_metrics': thaw_info['success_metrics'],
+                                'experiment_type': thaw_info['experiment_type'],
+                                'experiment_stage': thaw_info['experiment_stage'],
+                                'outcome_status': thaw_info['outcome_status']
+                            }
+                            
+                            # Remember this selection to avoid re-filling on form refresh
+                            st.session_state["last_selected_thaw_id"] = linked_thaw_id
+                            st.session_state["auto_filled_from_thaw"] = True
+                            st.session_state["auto_fill_source"] = f"{linked_thaw_id} (P{thaw_info['passage']}, {thaw_info['last_event']})"
+                            
+                            # Force a rerun to update the form with auto-filled values
+                            st.rerun()
+                        elif st.session_state.get("auto_filled_from_thaw"):
+                            # Show the auto-fill status if already filled
+                            auto_fill_info = st.session_state.get("auto_fill_source", linked_thaw_id)
+                            st.success(f"✅ Auto-filled from {auto_fill_info}")
+                        
+                        # Show additional info for selected thaw
+                        selected_opt = next((opt for opt in all_thaw_options if opt['thaw_id'] == linked_thaw_id), None)
+                        if selected_opt:
+                            info_col1, info_col2 = st.columns(2)
+                            with info_col1:
+                                st.caption(f"📅 Thawed: {selected_opt['thaw_date']}")
+                                st.caption(f"🧪 Current passage: {selected_opt['current_passage']}")
+                            with info_col2:
+                                st.caption(f"📍 Location: {selected_opt['location'] or 'Not specified'}")
+                                st.caption(f"🔬 Last event: {selected_opt['last_event']}")
+                    else:
+                        # Clear auto-fill when "(none)" selected
+                        if st.session_state.get("last_selected_thaw_id"):
+                            st.session_state["last_selected_thaw_id"] = None
+                            st.session_state["auto_filled_from_thaw"] = False
+                            st.session_state["auto_fill_source"] = None
+                            st.session_state.form_values = {}  # Clear form values
+                else:
+                    st.info("No thawed vials found for the selected cell line.")
+                    # Don't override linked_thaw_id if it was set from Quick Thaw Selection
+                    if not (linked_thaw_id and linked_thaw_id != "(none)"):
+                        linked_thaw_id = "(none)"
+
+        
+        # Additional Details (collapsible)
+        with st.expander("📍 Location & Cell Type", expanded=False):
+            detail_col1, detail_col2 = st.columns(2)
+            
+            with detail_col1:
+                location_refs = get_ref_values(conn, "location")
+                if location_refs:
+                    l_index = 0
+                    if prev and prev.get("location") in location_refs:
+                        l_index = location_refs.index(prev.get("location"))
+                    
+                    location_options = ["+ Add new"] + location_refs
+                    location_selection = st.selectbox("Location", options=location_options, index=l_index + 1 if l_index >= 0 else 0, key="location_detail")
+                    
+                    if location_selection == "+ Add new":
+                        location = st.text_input("New Location", 
+                                               placeholder="Incubator A, Shelf 2",
+                                               key="new_location_manual")
+                        if location and location not in location_refs:
+                            st.caption(f"💡 Will add: {location}")
+                    else:
+                        location = location_selection
+                else:
+                    loc_default = prev.get("location") if prev and prev.get("location") else ""
+                    location = st.text_input("Location", placeholder="Incubator A, Shelf 2", value=loc_default)
+            
+            with detail_col2:
+                ct_refs = get_ref_values(conn, "cell_type")
+                if ct_refs:
+                    ct_index = 0
+                    if prev and prev.get("cell_type") in ct_refs:
+                        ct_index = ct_refs.index(prev.get("cell_type"))
+                    
+                    cell_type_options = ["+ Add new"] + ct_refs
+                    cell_type_selection = st.selectbox("Cell Type", options=cell_type_options, index=ct_index + 1 if ct_index >= 0 else 0, key="cell_type_detail")
+                    
+                    if cell_type_selection == "+ Add new":
+                        cell_type = st.text_input("New Cell Type", 
+                                                placeholder="iPSC, Fibroblast",
+                                                key="new_cell_type_manual")
+                        if cell_type and cell_type not in ct_refs:
+                            st.caption(f"💡 Will add: {cell_type}")
+                    else:
+                        cell_type = cell_type_selection
+                else:
+                    ct_default = prev.get("cell_type") if prev and prev.get("cell_type") else ""
+                    cell_type = st.text_input("Cell Type", placeholder="iPSC, NPC, cardiomyocyte", value=ct_default)
+
+        # Operator and Date (compact row)
+        op_date_col1, op_date_col2 = st.columns(2)
+        
+        with op_date_col1:
+            user_rows = conn.execute("SELECT username FROM users ORDER BY username").fetchall()
+            usernames = [r[0] for r in user_rows]
+            if usernames:
+                # Default to "My name" if set, otherwise first user
+                default_operator_idx = 0
+                my_name_value = st.session_state.get("my_name")
+                weekend_assignee = st.session_state.get("selected_weekend_assignee")
+                
+                # Priority order: Weekend assignee > My name > Previous entry operator
+                if weekend_assignee and weekend_assignee in usernames:
+                    default_operator_idx = usernames.index(weekend_assignee)
+                elif my_name_value and my_name_value in usernames:
+                    default_operator_idx = usernames.index(my_name_value)
+                elif prev and prev.get("operator") in usernames:
+                    # Fall back to copied/previous operator if neither weekend nor My name set
+                    default_operator_idx = usernames.index(prev.get("operator"))
+                
+                operator = st.selectbox("Operator *", options=usernames, index=default_operator_idx)
+                
+                # Show helpful info when auto-populated
+                if weekend_assignee and operator == weekend_assignee:
+                    st.caption("🎯 Auto-filled from Weekend Planning assignee")
+                elif my_name_value and operator == my_name_value and not weekend_assignee:
+                    st.caption("✅ Auto-filled from 'My name' selection")
+            else:
+                st.info("💡 Add operators in Settings tab")
+                # Default to My name if no operators in database yet
+                default_name = st.session_state.get("my_name", "")
+                operator = st.text_input("Operator *", placeholder="Your name", value=default_name)
+        
+        with op_date_col2:
+            # Smart date suggestion based on weekend planning
+            default_date = date.today()
+            
+            # If weekend planning is active, suggest next weekend dates
+            weekend_assignee = st.session_state.get("selected_weekend_assignee")
+            if weekend_assignee:
+                today = date.today()
+                current_weekday = today.weekday()  # Monday=0, Sunday=6
+                
+                if current_weekday < 5:  # Monday to Friday
+                    # Suggest next Saturday
+                    days_to_saturday = 5 - current_weekday
+                    default_date = today + timedelta(days=days_to_saturday)
+                elif current_weekday == 5:  # Saturday
+                    # If it's Saturday, suggest today or tomorrow (Sunday)
+                    default_date = today
+                else:  # Sunday
+                    # If it's Sunday, suggest today
+                    default_date = today
+            
+            log_date = st.date_input("Date *", value=default_date)
+            
+            # Show helpful weekend planning hint and quick weekend selector
+            if weekend_assignee:
+                today = date.today()
+                current_weekday = today.weekday()
+                
+                # Calculate this weekend's Saturday and Sunday
+                if current_weekday < 5:  # Monday to Friday
+                    days_to_saturday = 5 - current_weekday
+                    this_saturday = today + timedelta(days=days_to_saturday)
+                    this_sunday = this_saturday + timedelta(days=1)
+                elif current_weekday == 5:  # Saturday
+                    this_saturday = today
+                    this_sunday = today + timedelta(days=1)
+                else:  # Sunday
+                    this_saturday = today - timedelta(days=1)
+                    this_sunday = today
+                
+                # Quick weekend date selector
+                weekend_options = [
+                    f"📅 Saturday ({this_saturday.strftime('%m/%d')})",
+                    f"📅 Sunday ({this_sunday.strftime('%m/%d')})",
+                    "📅 Custom date (use picker above)"
+                ]
+                
+                selected_weekend = st.radio(
+                    "Quick weekend date:",
+                    weekend_options,
+                    index=2,  # Default to custom
+                    horizontal=True,
+                    key="weekend_date_selector"
+                )
+                
+                # Override date based on selection
+                if "Saturday" in selected_weekend:
+                    log_date = this_saturday
+                elif "Sunday" in selected_weekend:
+                    log_date = this_sunday
+                # If "Custom" is selected, use the date_input value above
+                
+                if log_date.weekday() == 5:  # Saturday
+                    st.caption("📅 Selected: Saturday (weekend planning active)")
+                elif log_date.weekday() == 6:  # Sunday  
+                    st.caption("📅 Selected: Sunday (weekend planning active)")
+                else:
+                    st.caption("📅 Weekend planning active")
+
+        # Notes (always visible but compact)
+        notes = st.text_area("Notes / Observations", height=60, placeholder="Any additional observations or notes...")
+
+        # Experimental Workflow (collapsible)
+        with st.expander("🧬 Experimental Workflow", expanded=False):
+            st.caption("Track experimental procedures beyond basic culture maintenance")
+            
+            exp_col1, exp_col2 = st.columns(2)
+            
+            with exp_col1:
+                try:
+                    experiment_types = get_experiment_types(conn)
+                    exp_categories = sorted(list(set([exp['category'] for exp in experiment_types])))
+                    
+                    experiment_category = st.selectbox(
+                        "Category:",
+                        options=[""] + exp_categories,
+                        help="General experiment category"
+                    )
+                    
+                    filtered_exp_types = []
+                    if experiment_category:
+                        filtered_exp_types = [exp['name'] for exp in experiment_types if exp['category'] == experiment_category]
+                    
+                    experiment_type = st.selectbox(
+                        "Type:",
+                        options=[""] + filtered_exp_types,
+                        help="Specific experimental protocol"
+                    )
+                    
+                    experiment_stage = st.text_input(
+                        "Stage:",
+                        placeholder="e.g., Day 3, Transfection",
+                        value=prev.get("experiment_stage", "") if prev else ""
+                    )
+                    
+                    outcome_status = st.selectbox(
+                        "Status:",
+                        options=["", "In Progress", "Successful", "Failed", "Partial Success", "Needs Optimization"]
+                    )
+                    
+                except ImportError:
+                    experiment_type = st.text_input("Type:", placeholder="CRISPR Editing, Differentiation")
+                    experiment_stage = st.text_input("Stage:", placeholder="Day 3, Selection")
+                    outcome_status = st.selectbox("Status:", options=["", "In Progress", "Successful", "Failed"])
+            
+            with exp_col2:
+                experimental_conditions = st.text_area(
+                    "Conditions:",
+                    placeholder="Temperature, supplements, concentrations...",
+                    height=80,
+                    value=prev.get("experimental_conditions", "") if prev else ""
+                )
+                
+                protocol_reference = st.text_input(
+                    "Protocol:",
+                    placeholder="DOI, SOP number",
+                    value=prev.get("protocol_reference", "") if prev else ""
+                )
+                
+                success_metrics = st.text_input(
+                    "Metrics:",
+                    placeholder="Efficiency %, viability...",
+                    value=prev.get("success_metrics", "") if prev else ""
+                )
+
+        # Task Assignment & Special Features (collapsible)
+        with st.expander("📋 Assignment & Special Features", expanded=False):
+            st.markdown("**Task Assignment**")
+            assign_col1, assign_col2 = st.columns(2)
+            
+            with assign_col1:
+                # Default assignment options with smart defaults
+                assignment_options = ["(unassigned)"] + usernames if usernames else ["(unassigned)"]
+                default_assign_idx = 0
+                
+                # Default to "My name" if set and user wants to assign to themselves
+                my_name_value = st.session_state.get("my_name")
+                if my_name_value and my_name_value in usernames:
+                    # Offer "My name" as default but allow changing
+                    default_assign_idx = assignment_options.index(my_name_value) if my_name_value in assignment_options else 0
+                elif prev and prev.get("assigned_to") in assignment_options:
+                    # Fall back to copied/previous assignment
+                    default_assign_idx = assignment_options.index(prev.get("assigned_to"))
+                
+                assigned_to = st.selectbox("Assigned To", options=assignment_options, index=default_assign_idx)
+                
+                # Show helpful info when auto-populated
+                if my_name_value and assigned_to == my_name_value and not prev:
+                    st.caption("✅ Auto-assigned to you")
+            
+            with assign_col2:
+                next_action_date = st.date_input("Next Action Date", value=None, key="next_action_main")
+
+            st.markdown("**Weekend Quick Setup**")
+            weekend_setup = st.checkbox("🗓️ Schedule as weekend task", value=False, help="Quick weekend scheduling")
+            
+            weekend_assignee_quick = None
+            weekend_day = None
+            
+            if weekend_setup:
+                weekend_col1, weekend_col2 = st.columns(2)
+                
+                with weekend_col1:
+                    today = datetime.now()
+                    days_to_saturday = (5 - today.weekday()) % 7
+                    if days_to_saturday == 0 and today.weekday() == 5:
+                        days_to_saturday = 7
+                    
+                    saturday = today + timedelta(days=days_to_saturday)
+                    sunday = saturday + timedelta(days=1)
+                    
+                    weekend_day = st.selectbox("Weekend Day:", [
+                        f"Saturday ({saturday.strftime('%m-%d')})",
+                        f"Sunday ({sunday.strftime('%m-%d')})"
+                    ])
+                    
+                with weekend_col2:
+                    if usernames:
+                        # Default weekend assignee to "My name"
+                        weekend_default_idx = 0
+                        my_name_value = st.session_state.get("my_name")
+                        if my_name_value and my_name_value in usernames:
+                            weekend_default_idx = usernames.index(my_name_value)
+                        
+                        weekend_assignee_quick = st.selectbox("Weekend Assignee:", usernames, index=weekend_default_idx)
+
+            # Thawing/Linking section
+            if event_type == "Thawing":
+                st.markdown("**Thawing Details**")
+                
+                # Generate enhanced thaw ID based on current form values
+                enhanced_thaw_id = generate_enhanced_thaw_id(conn, log_date, operator, cell_type)
+                
+                # Update session state if values changed
+                if not st.session_state.get("pending_thaw_id") or st.session_state.get("last_thaw_params") != (operator, cell_type, log_date):
+                    st.session_state["pending_thaw_id"] = enhanced_thaw_id
+                    st.session_state["last_thaw_params"] = (operator, cell_type, log_date)
+                
+                thaw_col1, thaw_col2 = st.columns(2)
+                with thaw_col1:
+                    st.text_input("Thaw ID (auto)", value=st.session_state["pending_thaw_id"], disabled=True, key="thaw_display")
+                with thaw_col2:
+                    cryo_vial_position = st.text_input("Cryo Vial Position", placeholder="Box A2, Row 3 Col 5")
+                
+                # Show thaw ID format explanation
+                if operator and cell_type:
+                    st.caption(f"💡 Format: TH-Date-{operator.split()[0][0] if operator.split() else 'X'}{operator.split()[-1][0] if len(operator.split()) > 1 else operator[1:2] if len(operator) > 1 else 'X'}-{cell_type[:5].upper()}-###")
+                elif operator:
+                    st.caption(f"💡 Format: TH-Date-{operator.split()[0][0] if operator.split() else 'X'}{operator.split()[-1][0] if len(operator.split()) > 1 else operator[1:2] if len(operator) > 1 else 'X'}-###")
+                elif cell_type:
+                    st.caption(f"💡 Format: TH-Date-{cell_type[:5].upper()}-###")
+                else:
+                    st.caption("💡 Add Operator and Cell Type for enhanced Thaw ID format")
+                
+                cryo_vial_position = ""
+            else:
+                # For non-thawing events, linked_thaw_id is set in essential section above
+                # Just need to set cryo_vial_position for consistency
+                cryo_vial_position = ""
+                
+                # Smart recommendations based on event type and linked thaw
+                if linked_thaw_id != "(none)" and event_type:
+                    if event_type in ["Split", "Media Change", "Observation"]:
+                        st.success(f"✅ Perfect! Linking {event_type.lower()} to {linked_thaw_id} will maintain the vial lineage.")
+                    elif event_type == "Cryopreservation":
+                        st.info(f"❄️ This will mark {linked_thaw_id} as cryopreserved, ending its active culture.")
+                
+                # Suggest linking if no thaw selected but cell line matches
+                if linked_thaw_id == "(none)" and cell_line_final and event_type in ["Split", "Media Change", "Observation"]:
+                    if cell_line_final:  # Basic suggestion without complex logic
+                        st.warning(f"💡 Consider linking to an active {cell_line_final} vial above to track lineage for this {event_type.lower()}.")
+
+            # Image upload
+            st.markdown("**Colony Image**")
+            uploaded_img = st.file_uploader("Add image (optional)", type=["png", "jpg", "jpeg"], help="Upload colony or culture image")
+
+            # Template saving
+            st.markdown("**Save as Template**")
+            template_col1, template_col2 = st.columns([1, 2])
+            with template_col1:
+                save_template = st.checkbox("Save template", value=False)
+            with template_col2:
+                template_name = ""
+                if save_template:
+                    template_name = st.text_input("Template name:", placeholder="e.g., 'T25 Split'", key="template_name_input")
+
+        # Apply weekend assignment override
+        if weekend_setup and weekend_day and weekend_assignee_quick:
+            today = datetime.now()
+            days_to_saturday = (5 - today.weekday()) % 7
+            if days_to_saturday == 0 and today.weekday() == 5:
+                days_to_saturday = 7
+            
+            saturday = today + timedelta(days=days_to_saturday)
+            sunday = saturday + timedelta(days=1)
+            
+            if "Saturday" in weekend_day:
+                calculated_date = saturday.date()
+            else:
+                calculated_date = sunday.date()
+            
+            st.info(f"✅ Weekend: **{weekend_assignee_quick}** on **{calculated_date.strftime('%A, %b %d')}**")
+            assigned_to = weekend_assignee_quick
+            next_action_date = calculated_date
+
+        # Form submission buttons
+        st.markdown("---")
+        submit_col1, submit_col2, submit_col3 = st.columns([2, 1, 1])
+        
+        with submit_col1:
+            submitted = st.form_submit_button("💾 **Save Entry**", type="primary", use_container_width=True)
+        
+        with submit_col2:
+            if save_template and template_name:
+                save_template_only = st.form_submit_button("⭐ Template Only", use_container_width=True)
+            else:
+                save_template_only = False
+        
+        with submit_col3:
+            if st.form_submit_button("🔄 Clear Form", use_container_width=True):
+                st.session_state.form_values = {}
+                st.rerun()
+        if submitted:
+            if not operator:
+                st.error("Please provide an Operator.")
+                st.stop()
+            img_bytes = uploaded_img.getvalue() if uploaded_img else None
+            thaw_id_val = ""
+            if event_type == "Thawing":
+                # Use enhanced thaw ID with final operator and cell_type values
+                thaw_id_val = st.session_state["pending_thaw_id"] or generate_enhanced_thaw_id(conn, log_date, operator, cell_type)
+                st.session_state["pending_thaw_id"] = ""
+                st.session_state["last_thaw_params"] = None
+            else:
+                thaw_id_val = linked_thaw_id if linked_thaw_id and linked_thaw_id != "(none)" else ""
+
+            image_path = None
+            if img_bytes:
+                ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                ext = os.path.splitext(uploaded_img.name)[1] if uploaded_img and uploaded_img.name else ".jpg"
+                fname = f"{ts}_{(thaw_id_val or 'noThaw').replace('-', '')}{ext}"
+                fpath = os.path.join(IMAGES_DIR, fname)
+                with open(fpath, "wb") as f:
+                    f.write(img_bytes)
+                image_path = fpath
+
+            payload = {
+                "date": log_date.isoformat(),
+                "cell_line": cell_line_final,
+                "event_type": event_type,
+                "passage": int(passage_no) if passage_no else None,
+                "vessel": vessel,
+                "location": location,
+                "medium": medium,
+                "cell_type": cell_type,
+                "volume": float(volume) if volume is not None else None,
+                "notes": notes,
+                "operator": operator,
+                "thaw_id": thaw_id_val,
+                "cryo_vial_position": cryo_vial_position,
+                "image_path": image_path,
+                "assigned_to": None if assigned_to in (None, "(unassigned)") else assigned_to,
+                "next_action_date": next_action_date.isoformat() if next_action_date else None,
+                "created_by": operator,
+                "created_at": datetime.now().isoformat(),
+                # Experimental workflow fields
+                "experiment_type": experiment_type if experiment_type else None,
+                "experiment_stage": experiment_stage if experiment_stage else None,
+                "experimental_conditions": experimental_conditions if experimental_conditions else None,
+                "protocol_reference": protocol_reference if protocol_reference else None,
+                "outcome_status": outcome_status if outcome_status else None,
+                "success_metrics": success_metrics if success_metrics else None,
+                "linked_thaw_id": linked_thaw_id if linked_thaw_id and linked_thaw_id != "(none)" else None,
+            }
+            if event_type == "Thawing":
+                # The final sequence number is reserved atomically by insert_log
+                payload["thaw_id_prefix"] = thaw_id_prefix(log_date, operator, cell_type)
+            
+            # Auto-add new values to reference lists
+            try:
+                # Add new cell line if it doesn't exist
+                if cell_line_final:
+                    existing_cell_lines = get_ref_values(conn, "cell_line")
+                    if cell_line_final not in existing_cell_lines:
+                        pool.run_write(add_ref_value, "cell_line", cell_line_final)
+                        st.success(f"✅ Added new cell line: {cell_line_final}")
+                
+                # Add new event type if it doesn't exist
+                if event_type:
+                    existing_event_types = get_ref_values(conn, "event_type")
+                    if event_type not in existing_event_types:
+                        pool.run_write(add_ref_value, "event_type", event_type)
+                        st.success(f"✅ Added new event type: {event_type}")
+                
+                # Add new vessel if it doesn't exist
+                if vessel:
+                    existing_vessels = get_ref_values(conn, "vessel")
+                    if vessel not in existing_vessels:
+                        pool.run_write(add_ref_value, "vessel", vessel)
+                        st.success(f"✅ Added new vessel: {vessel}")
+                
+                # Add new location if it doesn't exist
+                if location:
+                    existing_locations = get_ref_values(conn, "location")
+                    if location not in existing_locations:
+                        pool.run_write(add_ref_value, "location", location)
+                        st.success(f"✅ Added new location: {location}")
+                
+                # Add new medium if it doesn't exist
+                if medium:
+                    existing_media = get_ref_values(conn, "culture_medium")
+                    if medium not in existing_media:
+                        pool.run_write(add_ref_value, "culture_medium", medium)
+                        st.success(f"✅ Added new medium: {medium}")
+                
+                # Add new cell type if it doesn't exist
+                if cell_type:
+                    existing_cell_types = get_ref_values(conn, "cell_type")
+                    if cell_type not in existing_cell_types:
+                        pool.run_write(add_ref_value, "cell_type", cell_type)
+                        st.success(f"✅ Added new cell type: {cell_type}")
+            except Exception as e:
+                st.warning(f"⚠️ Note: Could not auto-add some values to reference lists: {str(e)}")
+            
+            log_id = pool.run_write(insert_log, payload)
+            if event_type == "Thawing":
+                st.info(f"🧊 Thaw ID assigned: {get_log_by_id(conn, log_id)['thaw_id']}")
+            
+            # Save as template if requested
+            if save_template and template_name and template_name.strip():
+                template_data = {
+                    "cell_line": cell_line_final,
+                    "event_type": event_type,
+                    "vessel": vessel,
+                    "location": location,
+                    "medium": medium,
+                    "cell_type": cell_type,
+                    "volume": float(volume) if volume is not None else None,
+                    "notes": notes,
+                    # Don't save passage, date, or IDs in templates
+                }
+                try:
+                    pool.run_write(save_entry_template, template_name.strip(), template_data, operator)
+                    st.success(f"✅ Log entry saved and template '{template_name}' created!")
+                except Exception as e:
+                    st.success("✅ Log entry saved to database!")
+                    st.warning(f"⚠️ Template save failed: {str(e)}")
+            else:
+                st.success("✅ Log entry saved to database!")
+        
+        # Handle template-only saving
+        if save_template_only and template_name and template_name.strip():
+            if not operator:
+                st.error("Please provide an Operator to save template.")
+            else:
+                template_data = {
+                    "cell_line": cell_line_final,
+                    "event_type": event_type,
+                    "vessel": vessel,
+                    "location": location,
+                    "medium": medium,
+                    "cell_type": cell_type,
+                    "volume": float(volume) if volume is not None else None,
+                    "notes": notes,
+                }
+                try:
+                    pool.run_write(save_entry_template, template_name.strip(), template_data, operator)
+                    st.success(f"⭐ Template '{template_name}' saved successfully!")
+                except Exception as e:
+                    st.error(f"❌ Template save failed: {str(e)}")
@@ -0,0 +1,377 @@
+"""
+Dashboard section of the iPSC Tracker app
+Tasks and schedule, weekend preparation and the active vials overview
+"""
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from db import (
+    evaluate_alerts,
+    get_active_vials,
+    get_task_window,
+    get_weekend_tasks,
+    log_records_frame,
+    query_logs_page,
+)
+from sections import timed_fragment
+
+
+_TASK_COLUMNS = {
+    "cell_line": "Cell Line",
+    "event_type": "Event Type",
+    "assigned_to": "Assigned To",
+    "next_action_date": "Next Action Date",
+    "notes": "Notes",
+}
+
+
+@timed_fragment("dashboard.tasks")
+def _tasks_panel(conn):
+    """Upcoming and overdue tasks by Next Action Date"""
+    st.markdown("### Upcoming & Overdue Tasks")
+    dash_only_mine = st.checkbox("Show only items assigned to me", value=False)
+    
+    # Only the two task lists are read, each capped, and counted only when cut off, so this costs the same at any table size
+    assigned_to = None
+    if dash_only_mine and st.session_state.get("my_name"):
+        assigned_to = st.session_state["my_name"]
+    elif dash_only_mine and not st.session_state.get("my_name"):
+        st.info("Set 'My name' at the top to filter to your items.")
+    window = get_task_window(conn, date.today().isoformat(), assigned_to=assigned_to)
+    if not window["overdue"] and not window["upcoming"] and not assigned_to:
+        st.info("No Next Action Dates yet.")
+        return
+    
+    c1, c2 = st.columns(2)
+    for column, title, key, empty_text in (
+        (c1, "Overdue", "overdue", "No overdue items."),
+        (c2, "Upcoming", "upcoming", "No upcoming items."),
+    ):
+        with column:
+            rows, total = window[key], window[f"{key}_total"]
+            st.markdown(f"**{title}** ({total})" if total else f"**{title}**")
+            if not rows:
+                st.info(empty_text)
+                continue
+            if total > len(rows):
+                st.caption(f"Showing the {len(rows)} nearest to today of {total}.")
+            st.dataframe(
+                pd.DataFrame.from_records(rows, columns=list(_TASK_COLUMNS)).rename(columns=_TASK_COLUMNS),
+                width='stretch',
+            )
+
+
+@timed_fragment("dashboard.weekend_prep")
+def _weekend_preparation(conn):
+    """This weekend's tasks, assignees and resources"""
+    st.markdown("### 🗓️ Weekend Preparation Dashboard")
+    st.caption("Quick overview for Friday planning")
+    
+    # Weekend date calculation
+    today = datetime.now()
+    days_to_saturday = (5 - today.weekday()) % 7
+    if days_to_saturday == 0 and today.weekday() == 5:  # If today is Saturday
+        days_to_saturday = 7
+    
+    saturday = today + timedelta(days=days_to_saturday)
+    sunday = saturday + timedelta(days=1)
+    
+    # Weekend overview
+    weekend_overview_col1, weekend_overview_col2 = st.columns(2)
+    
+    with weekend_overview_col1:
+        st.info(f"""
+        🗓️ **This Weekend:**  
+        📅 Saturday: {saturday.strftime('%B %d, %Y')}  
+        📅 Sunday: {sunday.strftime('%B %d, %Y')}  
+        ⏰ Days until weekend: {days_to_saturday} days
+        """)
+    
+    with weekend_overview_col2:
+        # Quick weekend task statistics
+        weekend_tasks = get_weekend_tasks(conn, saturday.strftime('%Y-%m-%d'), sunday.strftime('%Y-%m-%d'))
+        
+        total_weekend_tasks = len(weekend_tasks)
+        saturday_tasks = len([t for t in weekend_tasks if t['next_action_date'] == saturday.strftime('%Y-%m-%d')])
+        sunday_tasks = len([t for t in weekend_tasks if t['next_action_date'] == sunday.strftime('%Y-%m-%d')])
+        
+        st.metric("Total Weekend Tasks", total_weekend_tasks)
+        if total_weekend_tasks > 0:
+            st.write(f"📅 Saturday: {saturday_tasks} tasks")
+            st.write(f"📅 Sunday: {sunday_tasks} tasks")
+    
+    # Weekend assignments
+    if weekend_tasks:
+        st.markdown("### 👥 Weekend Assignments")
+        
+        # Group by assignee
+        assignee_groups = {}
+        for task in weekend_tasks:
+            assignee = task.get('assigned_to', 'Unassigned')
+            if assignee not in assignee_groups:
+                assignee_groups[assignee] = {'saturday': [], 'sunday': []}
+            
+            if task['next_action_date'] == saturday.strftime('%Y-%m-%d'):
+                assignee_groups[assignee]['saturday'].append(task)
+            else:
+                assignee_groups[assignee]['sunday'].append(task)
+        
+        for assignee, tasks in assignee_groups.items():
+            saturday_count = len(tasks['saturday'])
+            sunday_count = len(tasks['sunday'])
+            
+            with st.expander(f"👤 {assignee} ({saturday_count + sunday_count} tasks)", expanded=True):
+                assign_col1, assign_col2 = st.columns(2)
+                
+                with assign_col1:
+                    st.markdown(f"**📅 Saturday Tasks ({saturday_count}):**")
+                    for task in tasks['saturday']:
+                        st.write(f"• {task['cell_line']} - {task['event_type']}")
+                
+                with assign_col2:
+                    st.markdown(f"**📅 Sunday Tasks ({sunday_count}):**")
+                    for task in tasks['sunday']:
+                        st.write(f"• {task['cell_line']} - {task['event_type']}")
+                
+                # Quick checklist button
+                if st.button(f"📋 Generate Checklist for {assignee}", key=f"checklist_{assignee}"):
+                    st.session_state['selected_weekend_assignee'] = assignee
+                    st.session_state['selected_weekend_saturday'] = saturday.strftime('%Y-%m-%d')
+                    st.session_state['selected_weekend_sunday'] = sunday.strftime('%Y-%m-%d')
+                    st.success(f"✅ Checklist ready! Go to Weekend Tasks tab to view.")
+        
+        # Resource summary for weekend
+        st.markdown("### 🧪 Weekend Resource Requirements")
+        
+        media_needed = set()
+        locations_needed = set()
+        cell_lines = set()
+        
+        for task in weekend_tasks:
+            if task.get('current_medium'):
+                media_needed.add(task['current_medium'])
+            if task.get('current_location'):
+                locations_needed.add(task['current_location'])
+            if task.get('cell_line'):
+                cell_lines.add(task['cell_line'])
+        
+        resource_col1, resource_col2, resource_col3 = st.columns(3)
+        
+        with resource_col1:
+            st.markdown("**📱 Media to Prepare:**")
+            for medium in sorted(media_needed):
+                st.write(f"• {medium}")
+        
+        with resource_col2:
+            st.markdown("**📍 Locations in Use:**")
+            for location in sorted(locations_needed):
+                st.write(f"• {location}")
+        
+        with resource_col3:
+            st.markdown("**🧬 Cell Lines Involved:**")
+            for cell_line in sorted(cell_lines):
+                st.write(f"• {cell_line}")
+    
+    else:
+        st.info("No weekend tasks scheduled yet.")
+        
+        # Quick weekend setup
+        st.markdown("### 🚀 Quick Weekend Setup")
+        st.caption("Quickly schedule weekend tasks from active vials")
+        
+        # Get active vials that might need weekend attention
+        active_vials = get_active_vials(conn, days_threshold=7)
+        
+        if active_vials:
+            st.markdown("**🧪 Active Vials Needing Attention:**")
+            
+            for vial in active_vials[:5]:  # Show top 5
+                thaw_event = vial.get('thaw_event', {})
+                
+                vial_col1, vial_col2 = st.columns([3, 1])
+                
+                with vial_col1:
+                    st.write(f"**{vial['thaw_id']}** - {thaw_event.get('cell_line', 'Unknown')} (P{vial.get('current_passage', 'N/A')}, {vial.get('culture_days', 0)} days)")
+                    st.caption(f"Current: {vial.get('current_vessel', 'N/A')} in {vial.get('current_location', 'N/A')}")
+                
+                with vial_col2:
+                    if st.button("📝 Schedule", key=f"schedule_{vial['thaw_id']}"):
+                        st.info("💡 Go to Add Entry tab to schedule weekend tasks for this vial")
+        
+        else:
+            st.info("No active vials found that need weekend attention.")
+
+
+@timed_fragment("dashboard.active_vials")
+def _active_vials_overview(conn):
+    """Active vial metrics, priority alerts and suggested actions"""
+    st.markdown("### 🧪 Active Vials Summary")
+    
+    # Get active vials
+    active_vials = get_active_vials(conn, days_threshold=30)
+    
+    if active_vials:
+        # Summary metrics
+        total_vials = len(active_vials)
+        avg_culture_days = sum([v.get('culture_days', 0) for v in active_vials]) / total_vials
+        high_passage_vials = len([v for v in active_vials if (v.get('current_passage') or 0) > 8])
+        vial_alerts = evaluate_alerts(conn, [v['thaw_id'] for v in active_vials])
+        vials_with_alerts = len([v for v in active_vials if vial_alerts.get(v['thaw_id'])])
+        
+        # Metrics row
+        metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+        
+        with metric_col1:
+            st.metric("Active Vials", total_vials)
+        with metric_col2:
+            st.metric("Avg Culture Days", f"{avg_culture_days:.1f}")
+        with metric_col3:
+            st.metric("High Passage (>P8)", high_passage_vials, delta=f"{high_passage_vials/total_vials*100:.0f}%" if total_vials > 0 else "0%")
+        with metric_col4:
+            st.metric("Vials with Alerts", vials_with_alerts, delta=f"{vials_with_alerts/total_vials*100:.0f}%" if total_vials > 0 else "0%")
+        
+        # Priority alerts
+        if vials_with_alerts > 0:
+            st.markdown("### 🚨 Priority Alerts")
+            alert_count = 0
+            
+            # Sort vials by alert severity (critical first, then warnings)
+            vials_by_priority = []
+            for vial in active_vials:
+                alerts = vial_alerts.get(vial['thaw_id'], [])
+                if alerts:
+                    critical_alerts = [a for a in alerts if a['type'] == 'critical']
+                    warning_alerts = [a for a in alerts if a['type'] == 'warning']
+                    if critical_alerts:
+                        vials_by_priority.append((vial, critical_alerts[0], 'critical'))
+                    elif warning_alerts:
+                        vials_by_priority.append((vial, warning_alerts[0], 'warning'))
+            
+            # Sort by priority (critical first)
+            vials_by_priority.sort(key=lambda x: 0 if x[2] == 'critical' else 1)
+            
+            for vial, alert, alert_type in vials_by_priority[:5]:  # Show max 5 alerts
+                thaw_event = vial.get('thaw_event', {})
+                if alert_type == 'critical':
+                    st.error(f"**🚨 {vial['thaw_id']}** ({thaw_event.get('cell_line', 'Unknown')}): {alert['message']}")
+                else:
+                    st.warning(f"**⚠️ {vial['thaw_id']}** ({thaw_event.get('cell_line', 'Unknown')}): {alert['message']}")
+                alert_count += 1
+        
+        # Quick overview table
+        st.markdown("### 📋 Quick Overview")
+        overview_data = []
+        for vial in active_vials[:10]:  # Show top 10
+            thaw_event = vial.get('thaw_event', {})
+            latest_event = vial.get('latest_event', {})
+            
+            # Status indicator with critical alerts prioritized
+            alerts = vial_alerts.get(vial['thaw_id'], [])
+            if any(a['type'] == 'critical' for a in alerts):
+                status = "🚨"
+            elif any(a['type'] == 'warning' for a in alerts):
+                status = "⚠️"
+            else:
+                status = "✅"
+            
+            overview_data.append({
+                'Status': status,
+                'Thaw ID': vial['thaw_id'],
+                'Cell Line': thaw_event.get('cell_line', ''),
+                'Days': vial.get('culture_days', 0),
+                'Passage': f"P{vial.get('current_passage', 'N/A')}",
+                'Vessel': vial.get('current_vessel', ''),
+                'Last Event': latest_event.get('event_type', ''),
+                'Last Date': latest_event.get('date', '')[:10] if latest_event.get('date') else ''
+            })
+        
+        if overview_data:
+            overview_df = pd.DataFrame(overview_data)
+            st.dataframe(overview_df, width='stretch')
+        
+        # Action suggestions
+        st.markdown("### 💡 Suggested Actions")
+        suggestions = []
+        
+        # Long culture vials
+        long_culture = [v for v in active_vials if v.get('culture_days', 0) > 21]
+        if long_culture:
+            suggestions.append(f"📅 {len(long_culture)} vials have been in culture >21 days - consider cryopreservation or differentiation")
+        
+        # High passage vials
+        if high_passage_vials > 0:
+            suggestions.append(f"🔬 {high_passage_vials} vials are at high passage (>P8) - plan experimental use or cryopreservation")
+        
+        # Vials needing observation
+        recent_obs_needed = []
+        for vial in active_vials:
+            if not vial.get('has_recent_observation') and vial.get('total_events', 0) > 2:
+                recent_obs_needed.append(vial)
+        
+        if recent_obs_needed:
+            suggestions.append(f"👁️ {len(recent_obs_needed)} vials need recent observation updates")
+        
+        if suggestions:
+            for suggestion in suggestions:
+                st.info(suggestion)
+        else:
+            st.success("🎉 All vials are being well maintained!")
+        
+        # Quick links
+        st.markdown("### 🔗 Quick Links")
+        link_col1, link_col2, link_col3 = st.columns(3)
+        
+        with link_col1:
+            if st.button("📊 View All Active Vials", key="view_all_active"):
+                st.info("💡 Go to 'Vial Lifecycle Tracking' → 'Active Vials' tab for detailed view")
+        
+        with link_col2:
+            if st.button("➕ Add New Entry", key="add_entry_quick"):
+                st.info("💡 Go to 'Add Entry' tab to log new culture events")
+        
+        with link_col3:
+            if st.button("📈 View Analytics", key="view_analytics_quick"):
+                st.info("💡 Go to 'Vial Lifecycle Tracking' → 'Vial Analytics' tab for insights")
+    
+    else:
+        st.info("No active vials found. Add some thawing events to start tracking!")
+        
+        # Show recent activity instead
+        st.markdown("### 📈 Recent Activity")
+        recent_logs, _ = query_logs_page(
+            conn,
+            columns=['date', 'cell_line', 'event_type', 'operator'],
+            page_size=10,
+            descending=True,
+        )
+        if recent_logs:
+            recent_df = log_records_frame(recent_logs[::-1])  # Last 10 entries
+            recent_display = recent_df[['date', 'cell_line', 'event_type', 'operator']].rename(columns={
+                'date': 'Date',
+                'cell_line': 'Cell Line',
+                'event_type': 'Event Type',
+                'operator': 'Operator'
+            })
+            st.dataframe(recent_display, width='stretch')
+        else:
+            st.info("No activity yet - start by adding your first entry!")
+
+
+def render(conn):
+    """Render the Dashboard section"""
+    st.subheader("� Culture Dashboard")
+    
+    # Dashboard tabs
+    dash_tab1, dash_tab2, dash_tab3 = st.tabs(["📅 Tasks & Schedule", "🗓️ Weekend Preparation", "🧪 Active Vials Overview"])
+    
+    with dash_tab1:
+        _tasks_panel(conn)
+    
+    with dash_tab2:
+        _weekend_preparation(conn)
+    
+    with dash_tab3:
+        _active_vials_overview(conn)
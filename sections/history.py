@@ -0,0 +1,796 @@
+"""
+History section of the iPSC Tracker app
+Filtered log history with editing, exports and lab-book formats
+"""
+
+import io
+from contextlib import closing
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from db import (
+    count_logs,
+    delete_log,
+    get_all_users,
+    get_log_by_id,
+    get_pool,
+    get_ref_values,
+    history_page,
+)
+from sections.history_grid import DISPLAY_COLUMNS, grid_page, grid_summary, history_display_frame, save_grid_row
+
+# Sort choices -> (db.HISTORY_SORTS key, descending)
+SORT_OPTIONS = {
+    "Date (newest first)": ("date", True),
+    "Date (oldest first)": ("date", False),
+    "Cell Line (A-Z)": ("cell_line", False),
+    "Cell Line (Z-A)": ("cell_line", True),
+    "Event Type (A-Z)": ("event_type", False),
+    "Event Type (Z-A)": ("event_type", True),
+    "Culture Medium (A-Z)": ("medium", False),
+    "Culture Medium (Z-A)": ("medium", True),
+    "Location (A-Z)": ("location", False),
+    "Location (Z-A)": ("location", True),
+    "Passage (low to high)": ("passage", False),
+    "Passage (high to low)": ("passage", True),
+    "Operator (A-Z)": ("operator", False),
+    "Operator (Z-A)": ("operator", True),
+}
+PAGE_SIZES = [25, 50, 100, 250, 500]
+
+
+def generate_detailed_lab_format(df, include_options):
+    """Generate detailed lab book format with full entry descriptions"""
+    if df.empty:
+        return "No entries to format."
+    
+    output = []
+    output.append("=" * 60)
+    output.append("iPSC CULTURE LOG ENTRIES")
+    output.append("=" * 60)
+    output.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    output.append(f"Total Entries: {len(df)}")
+    output.append("")
+    
+    for idx, row in df.iterrows():
+        output.append("-" * 40)
+        output.append(f"ENTRY #{row.get('ID', 'N/A')}")
+        output.append("-" * 40)
+        
+        # Date and basic info
+        output.append(f"Date: {row.get('Date', 'N/A')}")
+        output.append(f"Cell Line: {row.get('Cell Line', 'N/A')}")
+        output.append(f"Event: {row.get('Event Type', 'N/A')}")
+        
+        # Conditional includes
+        if "📊 Passage numbers" in include_options and row.get('Passage'):
+            output.append(f"Passage: P{row.get('Passage', 'N/A')}")
+        
+        if "🧪 Vessels" in include_options and row.get('Vessel'):
+            output.append(f"Vessel: {row.get('Vessel', 'N/A')}")
+        
+        if "📍 Locations" in include_options and row.get('Location'):
+            output.append(f"Location: {row.get('Location', 'N/A')}")
+        
+        if row.get('Medium'):
+            output.append(f"Medium: {row.get('Medium', 'N/A')}")
+        
+        if "👤 Operators" in include_options and row.get('Operator'):
+            output.append(f"Operator: {row.get('Operator', 'N/A')}")
+        
+        if "🕒 Time stamps" in include_options and row.get('Created'):
+            output.append(f"Time: {row.get('Created', 'N/A')}")
+        
+        # Notes section
+        if "📝 Notes" in include_options and row.get('Notes'):
+            output.append(f"Notes: {row.get('Notes', 'None')}")
+        
+        output.append("")
+    
+    return "\n".join(output)
+
+def generate_compact_format(df, include_options):
+    """Generate compact summary format for quick lab book entries"""
+    if df.empty:
+        return "No entries to format."
+    
+    output = []
+    output.append(f"iPSC Culture Summary - {datetime.now().strftime('%Y-%m-%d')}")
+    output.append("=" * 50)
+    output.append("")
+    
+    for idx, row in df.iterrows():
+        line_parts = []
+        
+        # Basic info
+        line_parts.append(f"{row.get('Date', 'N/A')}")
+        line_parts.append(f"{row.get('Cell Line', 'N/A')}")
+        line_parts.append(f"{row.get('Event Type', 'N/A')}")
+        
+        # Conditional info
+        if "📊 Passage numbers" in include_options and row.get('Passage'):
+            line_parts.append(f"P{row.get('Passage')}")
+        
+        if "🧪 Vessels" in include_options and row.get('Vessel'):
+            line_parts.append(f"[{row.get('Vessel')}]")
+        
+        if "📍 Locations" in include_options and row.get('Location'):
+            line_parts.append(f"@{row.get('Location')}")
+        
+        if "👤 Operators" in include_options and row.get('Operator'):
+            line_parts.append(f"by {row.get('Operator')}")
+        
+        # Join with separators
+        entry_line = " | ".join(line_parts)
+        output.append(f"• {entry_line}")
+        
+        # Add notes on next line if included
+        if "📝 Notes" in include_options and row.get('Notes'):
+            output.append(f"  └─ {row.get('Notes')}")
+        
+        output.append("")
+    
+    return "\n".join(output)
+
+def generate_table_format(df, include_options):
+    """Generate table format for structured lab book entries"""
+    if df.empty:
+        return "No entries to format."
+    
+    output = []
+    output.append(f"iPSC Culture Log Table - {datetime.now().strftime('%Y-%m-%d')}")
+    output.append("=" * 80)
+    output.append("")
+    
+    # Create header
+    headers = ["Date", "Cell Line", "Event"]
+    if "📊 Passage numbers" in include_options:
+        headers.append("Pass.")
+    if "🧪 Vessels" in include_options:
+        headers.append("Vessel")
+    if "📍 Locations" in include_options:
+        headers.append("Location")
+    if "👤 Operators" in include_options:
+        headers.append("Operator")
+    
+    # Calculate column widths
+    col_widths = [max(12, len(h)) for h in headers]
+    
+    # Add header row
+    header_row = " | ".join(h.ljust(w) for h, w in zip(headers, col_widths))
+    output.append(header_row)
+    output.append("-" * len(header_row))
+    
+    # Add data rows
+    for idx, row in df.iterrows():
+        row_data = [
+            str(row.get('Date', 'N/A'))[:col_widths[0]],
+            str(row.get('Cell Line', 'N/A'))[:col_widths[1]],
+            str(row.get('Event Type', 'N/A'))[:col_widths[2]]
+        ]
+        
+        col_idx = 3
+        if "📊 Passage numbers" in include_options:
+            row_data.append(f"P{row.get('Passage', 'N/A')}"[:col_widths[col_idx]])
+            col_idx += 1
+        if "🧪 Vessels" in include_options:
+            row_data.append(str(row.get('Vessel', 'N/A'))[:col_widths[col_idx]])
+            col_idx += 1
+        if "📍 Locations" in include_options:
+            row_data.append(str(row.get('Location', 'N/A'))[:col_widths[col_idx]])
+            col_idx += 1
+        if "👤 Operators" in include_options:
+            row_data.append(str(row.get('Operator', 'N/A'))[:col_widths[col_idx]])
+            col_idx += 1
+        
+        data_row = " | ".join(d.ljust(w) for d, w in zip(row_data, col_widths))
+        output.append(data_row)
+        
+        # Add notes as separate row if included
+        if "📝 Notes" in include_options and row.get('Notes'):
+            notes_line = f"  Notes: {row.get('Notes')}"
+            output.append(notes_line)
+            output.append("")
+    
+    return "\n".join(output)
+
+def generate_simple_list_format(df, include_options):
+    """Generate simple bullet-point list format"""
+    if df.empty:
+        return "No entries to format."
+    
+    output = []
+    output.append(f"iPSC Culture Activities - {datetime.now().strftime('%Y-%m-%d')}")
+    output.append("")
+    
+    for idx, row in df.iterrows():
+        # Basic entry
+        entry = f"• {row.get('Date', 'N/A')}: {row.get('Event Type', 'N/A')} - {row.get('Cell Line', 'N/A')}"
+        
+        # Add additional details
+        details = []
+        if "📊 Passage numbers" in include_options and row.get('Passage'):
+            details.append(f"P{row.get('Passage')}")
+        if "🧪 Vessels" in include_options and row.get('Vessel'):
+            details.append(row.get('Vessel'))
+        if "📍 Locations" in include_options and row.get('Location'):
+            details.append(row.get('Location'))
+        if "👤 Operators" in include_options and row.get('Operator'):
+            details.append(f"({row.get('Operator')})")
+        
+        if details:
+            entry += f" [{', '.join(details)}]"
+        
+        output.append(entry)
+        
+        # Add notes if included
+        if "📝 Notes" in include_options and row.get('Notes'):
+            output.append(f"  └ {row.get('Notes')}")
+    
+    output.append("")
+    output.append(f"Total entries: {len(df)}")
+    
+    return "\n".join(output)
+
+
+def render(conn):
+    """Render the History section"""
+    pool = get_pool()
+    st.subheader("📜 Culture History")
+    
+    # Enhanced Filter & Sort Controls
+    with st.expander("🔍 Advanced Filters & Sorting", expanded=True):
+        st.markdown("**Filter your entries:** Use these controls to find specific entries in your database")
+        
+        # Row 1: Basic filters
+        fcol1, fcol2, fcol3, fcol4 = st.columns([2, 2, 2, 1])
+        with fcol1:
+            f_cell = st.text_input("🧬 Cell line contains", "", help="Find entries containing this cell line name")
+        with fcol2:
+            # Get dynamic event types from database
+            event_types = get_ref_values(conn, "event_type")
+            event_options = ["(any)"] + event_types if event_types else ["(any)", "Observation", "Media Change", "Split", "Thawing", "Cryopreservation", "Other"]
+            f_event = st.selectbox("📋 Event Type", event_options, help="Filter by specific type of lab activity")
+        with fcol3:
+            # Get operators/users from database
+            try:
+                with closing(conn.cursor()) as cur:
+                    cur.execute("SELECT DISTINCT operator FROM logs WHERE operator IS NOT NULL AND operator != '' ORDER BY operator")
+                    operators = [row[0] for row in cur.fetchall()]
+                operator_options = ["(any)"] + operators if operators else ["(any)"]
+            except:
+                operator_options = ["(any)"]
+            f_operator = st.selectbox("👤 Operator", operator_options, help="Select specific person who performed the work")
+        with fcol4:
+            only_mine = st.checkbox("📌 Only mine", value=False, help="Show only entries where you are the operator (set your name at the top first)")
+        
+        # Row 1.5: Additional assignment filter
+        if f_operator == "(any)":
+            assign_col1, assign_col2, assign_col3, assign_col4 = st.columns(4)
+            with assign_col1:
+                f_assigned = st.text_input("👥 Assigned To contains", "", help="Filter by assignment field (different from operator)")
+            with assign_col2:
+                st.empty()  # Placeholder
+            with assign_col3:
+                st.empty()  # Placeholder  
+            with assign_col4:
+                st.empty()  # Placeholder
+        else:
+            f_assigned = ""  # Clear assigned filter when specific operator is selected
+        
+        # Row 2: Culture-specific filters
+        cult_col1, cult_col2, cult_col3, cult_col4 = st.columns(4)
+        with cult_col1:
+            # Get dynamic culture media options
+            media_options = get_ref_values(conn, "culture_medium")
+            media_filter_options = ["(any)"] + media_options if media_options else ["(any)"]
+            f_medium = st.selectbox("🧪 Culture Medium", media_filter_options)
+        with cult_col2:
+            # Get dynamic location options
+            location_options = get_ref_values(conn, "location")
+            location_filter_options = ["(any)"] + location_options if location_options else ["(any)"]
+            f_location = st.selectbox("📍 Location", location_filter_options)
+        with cult_col3:
+            # Get dynamic vessel options
+            vessel_options = get_ref_values(conn, "vessel")
+            vessel_filter_options = ["(any)"] + vessel_options if vessel_options else ["(any)"]
+            f_vessel = st.selectbox("🥼 Vessel", vessel_filter_options)
+        with cult_col4:
+            # Passage range filter
+            f_passage_min = st.number_input("🔢 Min Passage", min_value=0, value=0, step=1)
+            f_passage_max = st.number_input("🔢 Max Passage", min_value=0, value=100, step=1)
+        
+        # Row 3: Date filters and sorting
+        date_col1, date_col2, sort_col1, sort_col2 = st.columns(4)
+        with date_col1:
+            f_start_date = st.date_input("📅 From Date", value=None)
+        with date_col2:
+            f_end_date = st.date_input("📅 To Date", value=None)
+        with sort_col1:
+            sort_by = st.selectbox("📊 Sort by", list(SORT_OPTIONS), index=0)
+        with sort_col2:
+            # Quick filter presets
+            quick_filters = [
+                "All entries",
+                "Today's entries", 
+                "This week",
+                "My entries only",
+                "Weekend entries",
+                "Split events only",
+                "Media changes only",
+                "Active cultures only"
+            ]
+            quick_filter = st.selectbox("⚡ Quick Filter", quick_filters, index=0, help="Quick presets for common filter combinations")
+    
+    # Apply quick filter logic
+    start_date_filter = None
+    end_date_filter = None
+    event_filter = f_event if f_event != "(any)" else None
+    
+    if quick_filter == "Today's entries":
+        today = date.today()
+        start_date_filter = today
+        end_date_filter = today
+    elif quick_filter == "This week":
+        today = date.today()
+        start_of_week = today - timedelta(days=today.weekday())
+        start_date_filter = start_of_week
+        end_date_filter = today
+    elif quick_filter == "Weekend entries":
+        today = date.today()
+        # Get last Saturday and Sunday
+        days_since_monday = today.weekday()
+        last_saturday = today - timedelta(days=days_since_monday + 2)
+        last_sunday = today - timedelta(days=days_since_monday + 1)
+        # For current weekend if it's weekend now
+        if today.weekday() >= 5:  # Saturday=5, Sunday=6
+            start_date_filter = today if today.weekday() == 5 else today - timedelta(days=1)
+            end_date_filter = today if today.weekday() == 6 else today + timedelta(days=1)
+        else:
+            start_date_filter = last_saturday
+            end_date_filter = last_sunday
+    elif quick_filter == "My entries only":
+        # Filter by current user's name
+        pass  # Logic handled in the operator filter section below
+    elif quick_filter == "Split events only":
+        event_filter = "Split"
+    elif quick_filter == "Media changes only":
+        event_filter = "Media Change"
+    elif quick_filter == "Active cultures only":
+        # Show only non-cryopreserved cultures from last 30 days
+        start_date_filter = date.today() - timedelta(days=30)
+        event_filter = None  # Cryopreservation is excluded in the query below
+    
+    # Override with manual date selection if provided
+    if f_start_date:
+        start_date_filter = f_start_date
+    if f_end_date:
+        end_date_filter = f_end_date
+
+    # Every filter becomes part of the SQL WHERE clause
+    my_name = st.session_state.get("my_name")
+    history_filters = {
+        "event_type": event_filter,
+        "start_date": start_date_filter,
+        "end_date": end_date_filter,
+        "cell_line_contains": f_cell or None,
+        "assigned_to_contains": f_assigned or None,
+        "medium": f_medium,
+        "location": f_location,
+        "vessel": f_vessel,
+    }
+    
+    # Quick filter: "My entries only" takes priority over the operator picker
+    if quick_filter == "My entries only":
+        if my_name:
+            history_filters["operator"] = my_name
+        else:
+            st.warning("💡 Set 'My name' at the top of the page to use 'My entries only' filter.")
+    # Operator filter (primary filter for who performed the work)
+    elif f_operator != "(any)":
+        history_filters["operator"] = f_operator
+    
+    # "Only mine" filter - filters by operator field matching user's name
+    operator_conflict = False
+    if only_mine and my_name:
+        operator_conflict = history_filters.get("operator") not in (None, my_name)
+        history_filters["operator"] = my_name
+    elif only_mine and not my_name:
+        st.info("💡 Set 'My name' at the top to enable 'Only mine' filter. This will show entries where you are the operator.")
+    
+    # Passage range filter
+    if f_passage_min > 0 or f_passage_max < 100:
+        history_filters["min_passage"] = f_passage_min
+        history_filters["max_passage"] = f_passage_max
+    
+    # Special filters for quick filter options
+    if quick_filter == "Active cultures only":
+        history_filters["exclude_event_type"] = "Cryopreservation"
+    
+    sort_key, sort_descending = SORT_OPTIONS[sort_by]
+    
+    if operator_conflict:
+        st.info(f"💡 'Only mine' and the operator filter ({f_operator}) exclude each other, so no entries match.")
+        summary = {"total": 0}
+    else:
+        summary = grid_summary(conn, history_filters, sort_key, sort_descending)
+    total = summary["total"]
+
+    if total:
+        # Display summary statistics
+        stats_col1, stats_col2, stats_col3, stats_col4 = st.columns(4)
+        with stats_col1:
+            st.metric("📊 Total Entries", total)
+        with stats_col2:
+            st.metric("🧬 Cell Lines", summary["cell_lines"])
+        with stats_col3:
+            st.metric("👥 Operators", summary["operators"])
+        with stats_col4:
+            st.metric("📅 Date Range", f"{(pd.to_datetime(summary['last_date']) - pd.to_datetime(summary['first_date'])).days + 1} days")
+        
+        # Page controls: only the current page and the next one are read from the database
+        page_col1, page_col2, page_col3 = st.columns([1, 1, 2])
+        with page_col1:
+            page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key="history_page_size")
+        page_count = max(1, -(-total // page_size))
+        if st.session_state.get("history_page", 1) > page_count:
+            st.session_state["history_page"] = page_count
+        with page_col2:
+            page_number = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="history_page")
+        first_row = (page_number - 1) * page_size
+        with page_col3:
+            st.caption(f"Showing entries {first_row + 1}–{min(first_row + page_size, total)} of {total} (page {page_number} of {page_count})")
+        
+        pretty = grid_page(conn, history_filters, sort_key, sort_descending, page_number - 1, page_size)
+        
+        # Display the dataframe; selecting a row offers it for editing
+        grid_event = st.dataframe(pretty, width='stretch', on_select="rerun", selection_mode="single-row", key="history_grid_table")
+        if grid_event.selection.rows:
+            selected_id = int(pretty.iloc[grid_event.selection.rows[0]]["ID"])
+            if st.button(f"✏️ Edit entry {selected_id}", key="history_edit_selected"):
+                st.session_state["editing_log_id"] = selected_id
+                st.rerun()
+        
+        # Action buttons section
+        st.markdown("---")
+        st.subheader("📝 Individual Entry Actions")
+        
+        action_col1, action_col2 = st.columns(2)
+        
+        with action_col1:
+            st.markdown("**Edit Entry**")
+            edit_id = st.number_input("Enter ID to edit", min_value=1, step=1, value=1)
+            if st.button("� Edit Entry"):
+                st.session_state["editing_log_id"] = edit_id
+                st.rerun()
+        
+        with action_col2:
+            st.markdown("**Delete Entry**")
+            delete_id = st.number_input("Enter ID to delete", min_value=1, step=1, value=1)
+            confirm_delete = st.checkbox("I confirm I want to delete this entry")
+            if st.button("🗑️ Delete Entry") and confirm_delete:
+                if pool.run_write(delete_log, delete_id):
+                    st.success(f"✅ Entry {delete_id} deleted successfully!")
+                    st.rerun()
+                else:
+                    st.error(f"❌ Entry {delete_id} not found or could not be deleted.")
+
+        
+        # Edit form (appears when editing)
+        if "editing_log_id" in st.session_state:
+            edit_log_id = st.session_state["editing_log_id"]
+            existing_log = get_log_by_id(conn, edit_log_id)
+            
+            if existing_log:
+                st.markdown("---")
+                st.subheader(f"✏️ Editing Entry ID: {edit_log_id}")
+                
+                with st.form(f"edit_form_{edit_log_id}"):
+                    # Pre-fill form with existing values
+                    edit_cell_line = st.text_input("Cell Line ID", value=existing_log.get("cell_line", ""))
+                    edit_event_type = st.selectbox("Event Type", 
+                        options=["Observation", "Media Change", "Split", "Thawing", "Cryopreservation", "Other"],
+                        index=["Observation", "Media Change", "Split", "Thawing", "Cryopreservation", "Other"].index(existing_log.get("event_type", "Observation")) 
+                        if existing_log.get("event_type") in ["Observation", "Media Change", "Split", "Thawing", "Cryopreservation", "Other"] else 0
+                    )
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        edit_passage = st.number_input("Passage No.", min_value=1, step=1, 
+                                                     value=int(existing_log.get("passage", 1)) if existing_log.get("passage") else 1)
+                    with col2:
+                        edit_vessel = st.text_input("Vessel", value=existing_log.get("vessel", ""))
+                    with col3:
+                        edit_location = st.text_input("Location", value=existing_log.get("location", ""))
+                    
+                    edit_medium = st.text_input("Culture Medium", value=existing_log.get("medium", ""))
+                    edit_cell_type = st.text_input("Cell Type", value=existing_log.get("cell_type", ""))
+                    edit_volume = st.number_input("Volume (mL)", min_value=0.0, step=0.5, 
+                                                value=float(existing_log.get("volume", 0.0)) if existing_log.get("volume") else 0.0)
+                    edit_notes = st.text_area("Notes / Observations", value=existing_log.get("notes", ""))
+                    
+                    # User and date fields
+                    user_rows = conn.execute("SELECT username FROM users ORDER BY username").fetchall()
+                    usernames = [r[0] for r in user_rows]
+                    current_operator = existing_log.get("operator", "")
+                    if usernames and current_operator in usernames:
+                        op_index = usernames.index(current_operator)
+                    else:
+                        op_index = 0
+                    edit_operator = st.selectbox("Operator", options=usernames if usernames else [current_operator], 
+                                               index=op_index if usernames else 0)
+                    
+                    # Parse existing date
+                    try:
+                        existing_date = datetime.fromisoformat(existing_log.get("date", "")).date()
+                    except:
+                        existing_date = date.today()
+                    edit_date = st.date_input("Date", value=existing_date)
+                    
+                    # Assignment fields
+                    all_users = get_all_users(conn)
+                    current_assigned = existing_log.get("assigned_to", "")
+                    assigned_options = ["(unassigned)"] + all_users
+                    assigned_index = 0
+                    if current_assigned and current_assigned in all_users:
+                        assigned_index = assigned_options.index(current_assigned)
+                    
+                    edit_assigned_to = st.selectbox("Assigned To", options=assigned_options, index=assigned_index)
+                    
+                    # Parse existing next action date
+                    existing_next_date = None
+                    if existing_log.get("next_action_date"):
+                        try:
+                            existing_next_date = datetime.fromisoformat(existing_log.get("next_action_date")).date()
+                        except:
+                            pass
+                    edit_next_action_date = st.date_input("Next Action Date", value=existing_next_date)
+                    
+                    # Form buttons
+                    col_save, col_cancel = st.columns(2)
+                    with col_save:
+                        save_changes = st.form_submit_button("💾 Save Changes")
+                    with col_cancel:
+                        cancel_edit = st.form_submit_button("❌ Cancel")
+                    
+                    if save_changes:
+                        # Prepare update payload
+                        update_payload = {
+                            "date": edit_date.isoformat(),
+                            "cell_line": edit_cell_line,
+                            "event_type": edit_event_type,
+                            "passage": int(edit_passage) if edit_passage else None,
+                            "vessel": edit_vessel,
+                            "location": edit_location,
+                            "medium": edit_medium,
+                            "cell_type": edit_cell_type,
+                            "volume": float(edit_volume) if edit_volume is not None else None,
+                            "notes": edit_notes,
+                            "operator": edit_operator,
+                            "assigned_to": None if edit_assigned_to == "(unassigned)" else edit_assigned_to,
+                            "next_action_date": edit_next_action_date.isoformat() if edit_next_action_date else None,
+                        }
+                        
+                        if save_grid_row(conn, edit_log_id, update_payload):
+                            st.success(f"✅ Entry {edit_log_id} updated successfully!")
+                            del st.session_state["editing_log_id"]
+                            st.rerun()
+                        else:
+                            st.error(f"❌ Failed to update entry {edit_log_id}")
+                    
+                    if cancel_edit:
+                        del st.session_state["editing_log_id"]
+                        st.rerun()
+            else:
+                st.error(f"❌ Entry {edit_log_id} not found!")
+                del st.session_state["editing_log_id"]
+        
+        # Export options
+        export_col1, export_col2, export_col3 = st.columns(3)
+        
+        def all_matching_rows():
+            return history_display_frame(history_page(
+                conn, history_filters, sort=sort_key, descending=sort_descending,
+                page_size=total, columns=list(DISPLAY_COLUMNS),
+            ))
+        
+        with export_col1:
+            # CSV download of every matching entry, read when requested
+            if st.button("📂 Export to CSV"):
+                csv = all_matching_rows().to_csv(index=False).encode('utf-8')
+                st.download_button("⬇️ Download CSV", data=csv, file_name="ipsc_culture_log.csv", mime="text/csv", key="history_csv_download")
+        
+        with export_col2:
+            # Excel download
+            if st.button("📊 Export to Excel"):
+                try:
+                    # For Excel export, we'll export every entry matching the filters
+                    excel_buffer = io.BytesIO()
+                    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+                        all_matching_rows().to_excel(writer, sheet_name='iPSC_Logs', index=False)
+                        
+                        # Add filter summary sheet
+                        filter_summary = pd.DataFrame({
+                            'Applied_Filters': [
+                                f'Cell Line: {f_cell if f_cell else "All"}',
+                                f'Event Type: {f_event}',
+                                f'Operator: {f_operator}',
+                                f'Assigned To: {f_assigned if f_assigned else "All"}',
+                                f'Only Mine: {"Yes" if only_mine else "No"}',
+                                f'Medium: {f_medium}',
+                                f'Location: {f_location}',
+                                f'Vessel: {f_vessel}',
+                                f'Passage Range: {f_passage_min}-{f_passage_max}',
+                                f'Date From: {f_start_date if f_start_date else "All"}',
+                                f'Date To: {f_end_date if f_end_date else "All"}',
+                                f'Sort By: {sort_by}',
+                                f'Export Time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
+                            ]
+                        })
+                        filter_summary.to_excel(writer, sheet_name='Filter_Summary', index=False)
+                    
+                    excel_buffer.seek(0)
+                    
+                    st.download_button(
+                        label="⬇️ Download Excel File",
+                        data=excel_buffer.getvalue(),
+                        file_name=f"ipsc_filtered_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        key="history_excel_download"
+                    )
+                    st.success("✅ Excel file ready for download!")
+                except Exception as e:
+                    st.error(f"❌ Excel export failed: {str(e)}")
+        
+        with export_col3:
+            # Lab Book Copy-Paste functionality
+            if st.button("📋 Lab Book Format"):
+                st.session_state["show_lab_format"] = True
+                st.rerun()
+        
+        # Lab Book Format Display (appears when button is clicked)
+        if st.session_state.get("show_lab_format", False):
+            st.markdown("---")
+            st.markdown("### 📋 Lab Book Copy-Paste Formats")
+            
+            format_col1, format_col2 = st.columns(2)
+            
+            with format_col1:
+                format_type = st.selectbox(
+                    "Choose Format Style:",
+                    ["🔬 Detailed Lab Format", "📝 Compact Summary", "📊 Table Format", "📋 Simple List"]
+                )
+            
+            with format_col2:
+                include_options = st.multiselect(
+                    "Include Additional Info:",
+                    ["🕒 Time stamps", "📍 Locations", "🧪 Vessels", "📊 Passage numbers", "👤 Operators", "📝 Notes"],
+                    default=["📍 Locations", "🧪 Vessels", "📊 Passage numbers"]
+                )
+            
+            # Generate formatted text based on selection
+            if format_type == "🔬 Detailed Lab Format":
+                formatted_text = generate_detailed_lab_format(pretty, include_options)
+            elif format_type == "📝 Compact Summary":
+                formatted_text = generate_compact_format(pretty, include_options)
+            elif format_type == "📊 Table Format":
+                formatted_text = generate_table_format(pretty, include_options)
+            else:  # Simple List
+                formatted_text = generate_simple_list_format(pretty, include_options)
+            
+            # Display formatted text with copy button
+            st.markdown("#### 📄 Formatted Output:")
+            st.text_area(
+                "Copy this text to your lab book:",
+                value=formatted_text,
+                height=300,
+                help="Select all text (Ctrl+A) and copy (Ctrl+C) to paste into your lab book"
+            )
+            
+            # Backup copy instructions
+            st.caption("💡 **Manual Copy Instructions:** If the copy button doesn't work, select all text in the box above (Ctrl+A or Cmd+A), then copy (Ctrl+C or Cmd+C) and paste into your lab book.")
+            
+            # Quick action buttons
+            copy_col1, copy_col2, copy_col3 = st.columns(3)
+            with copy_col1:
+                # Simple and reliable copy approach
+                st.markdown("**📋 Copy Options:**")
+                
+                # Option 1: Try pyperclip for direct copying (works locally, not in Docker)
+                clipboard_available = False
+                try:
+                    import pyperclip
+                    # Test if clipboard actually works
+                    pyperclip.copy("")
+                    clipboard_available = True
+                except (ImportError, FileNotFoundError, Exception):
+                    # Clipboard not available (Docker, headless environments, etc.)
+                    clipboard_available = False
+                
+                if clipboard_available:
+                    if st.button("📋 Copy to Clipboard", help="Direct copy using pyperclip", type="primary"):
+                        try:
+                            pyperclip.copy(formatted_text)
+                            st.success("✅ **Copied to clipboard!** You can now paste (Ctrl+V) in your lab book.")
+                            st.balloons()
+                        except Exception:
+                            st.warning("⚠️ Clipboard copy failed. Please use manual copy (Ctrl+A, Ctrl+C)")
+                else:
+                    # Option 2: Show instructions prominently (fallback for Docker/restricted environments)
+                    if st.button("📋 Copy to Clipboard", help="Click to get copy instructions", type="primary"):
+                        st.success("✅ **How to Copy:**")
+                        st.info("1. **Select All**: Click in the text area above and press `Ctrl+A` (or `Cmd+A` on Mac)\n"
+                               "2. **Copy**: Press `Ctrl+C` (or `Cmd+C` on Mac)\n"
+                               "3. **Paste**: Go to your lab book and press `Ctrl+V` (or `Cmd+V` on Mac)")
+                        st.balloons()
+                
+                # Option 3: Auto-select text area (works better in some browsers)
+                auto_select_html = f"""
+                <div style="margin: 5px 0;">
+                    <button onclick="selectAllText()" 
+                            style="background-color: #0066cc; 
+                                   border: none; 
+                                   color: white; 
+                                   padding: 6px 12px; 
+                                   font-size: 12px; 
+                                   border-radius: 3px; 
+                                   cursor: pointer;">
+                        🎯 Select All Text
+                    </button>
+                    <span id="select-status" style="margin-left: 10px; color: blue; font-size: 12px;"></span>
+                </div>
+                
+                <script>
+                function selectAllText() {{
+                    // Find the text area containing the formatted text
+                    const textareas = document.querySelectorAll('textarea');
+                    let targetTextarea = null;
+                    
+                    // Look for the textarea with our content
+                    for (let i = 0; i < textareas.length; i++) {{
+                        if (textareas[i].value && textareas[i].value.length > 100) {{
+                            targetTextarea = textareas[i];
+                            break;
+                        }}
+                    }}
+                    
+                    if (targetTextarea) {{
+                        targetTextarea.focus();
+                        targetTextarea.select();
+                        targetTextarea.setSelectionRange(0, targetTextarea.value.length);
+                        document.getElementById('select-status').innerHTML = '✅ Text selected! Press Ctrl+C to copy';
+                        
+                        setTimeout(() => {{
+                            document.getElementById('select-status').innerHTML = '';
+                        }}, 4000);
+                    }} else {{
+                        document.getElementById('select-status').innerHTML = '⚠️ Please select manually';
+                        setTimeout(() => {{
+                            document.getElementById('select-status').innerHTML = '';
+                        }}, 3000);
+                    }}
+                }}
+                </script>
+                """
+                
+                st.markdown(auto_select_html, unsafe_allow_html=True)
+            
+            with copy_col2:
+                # Save as text file
+                st.download_button(
+                    label="💾 Download as Text",
+                    data=formatted_text.encode('utf-8'),
+                    file_name=f"lab_book_entries_{datetime.now().strftime('%Y%m%d')}.txt",
+                    mime="text/plain"
+                )
+            
+            with copy_col3:
+                if st.button("❌ Close Format"):
+                    st.session_state["show_lab_format"] = False
+                    st.rerun()
+    elif count_logs(conn):
+        st.info("No entries match the current filters.")
+    else:
+        st.info("No entries yet — add your first log in Add Entry tab.")
@@ -0,0 +1,126 @@
+"""
+Paged History grid: only the visible page and a small prefetch window are read from the database
+Pages, keyset cursors and totals stay in the session until the filters, sort or data change
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from db import get_log_by_id, get_pool, history_page, history_sort_key, history_summary, log_records_frame, update_log
+
+# Pages read beyond the visible one, so paging forward is served from the session
+HISTORY_GRID_PREFETCH_PAGES = 1
+# Pages kept per session; the ones farthest from the visible page are dropped first
+HISTORY_GRID_CACHED_PAGES = 8
+
+DISPLAY_COLUMNS = {
+    "id": "ID",
+    "date": "Date",
+    "cell_line": "Cell Line",
+    "event_type": "Event Type",
+    "passage": "Passage",
+    "vessel": "Vessel",
+    "location": "Location",
+    "medium": "Culture Medium",
+    "cell_type": "Cell Type",
+    "volume": "Volume (mL)",
+    "notes": "Notes",
+    "operator": "Operator",
+    "thaw_id": "Thaw ID",
+    "cryo_vial_position": "Cryo Vial Position",
+    "assigned_to": "Assigned To",
+    "next_action_date": "Next Action Date",
+    "created_by": "Created By",
+}
+
+
+def history_display_frame(records):
+    """DataFrame of log records with the History column names"""
+    return log_records_frame(records, columns=list(DISPLAY_COLUMNS)).rename(columns=DISPLAY_COLUMNS)
+
+
+def _grid_state(filters: Dict[str, Any], sort: str, descending: bool) -> Dict[str, Any]:
+    """Session cache for the current query, reset when it or the database changes"""
+    key = (repr(sorted(filters.items())), sort, descending)
+    token = get_pool().data_generation()
+    state = st.session_state.get("history_grid")
+    if state is None or state["key"] != key or state["token"] != token:
+        state = {"key": key, "token": token, "summary": None, "page_size": None, "pages": {}, "cursors": {}}
+        st.session_state["history_grid"] = state
+    return state
+
+
+def grid_summary(conn, filters: Dict[str, Any], sort: str, descending: bool) -> Dict[str, Any]:
+    """history_summary for the grid's query, counted once per query and data version"""
+    state = _grid_state(filters, sort, descending)
+    if state["summary"] is None:
+        state["summary"] = history_summary(conn, filters)
+    return state["summary"]
+
+
+def _store_page(state: Dict[str, Any], page: int, records: List[Any], sort: str, page_size: int) -> None:
+    state["pages"][page] = [r.to_dict() for r in records]
+    if len(records) == page_size:
+        state["cursors"][page] = history_sort_key(records[-1], sort)
+
+
+def grid_page(conn, filters: Dict[str, Any], sort: str, descending: bool, page: int, page_size: int):
+    """Display frame for one page (0-based); a miss reads the page plus the prefetch window.
+
+    A page whose predecessor was read continues from its keyset cursor, so
+    paging forward costs an index seek however deep the page is.
+    """
+    state = _grid_state(filters, sort, descending)
+    if state["page_size"] != page_size:
+        state.update(page_size=page_size, pages={}, cursors={})
+    pages = state["pages"]
+    if page not in pages:
+        records = history_page(
+            conn, filters, sort=sort, descending=descending, page=page, page_size=page_size,
+            columns=list(DISPLAY_COLUMNS), after=state["cursors"].get(page - 1),
+        )
+        _store_page(state, page, records, sort, page_size)
+        for ahead in range(page + 1, page + 1 + HISTORY_GRID_PREFETCH_PAGES):
+            after = state["cursors"].get(ahead - 1)
+            if after is None or ahead in pages:
+                break
+            records = history_page(
+                conn, filters, sort=sort, descending=descending, page_size=page_size,
+                columns=list(DISPLAY_COLUMNS), after=after,
+            )
+            _store_page(state, ahead, records, sort, page_size)
+    for stale in sorted(pages, key=lambda p: abs(p - page), reverse=True)[:max(0, len(pages) - HISTORY_GRID_CACHED_PAGES)]:
+        del pages[stale]
+    return pd.DataFrame.from_records(pages[page], columns=list(DISPLAY_COLUMNS)).rename(columns=DISPLAY_COLUMNS)
+
+
+def save_grid_row(conn, log_id: int, payload: Dict[str, Any]) -> bool:
+    """update_log() an entry, then re-read only that row into the cached pages.
+
+    The generation is read just before and after the edit while holding the
+    writer, so the pages are kept only when this edit is the sole change since
+    they were read; after anyone else's write they are dropped and re-read.
+    The edited row keeps its place until the grid is next re-read.
+    """
+    pool = get_pool()
+    with pool.writer() as writer:
+        before = pool.data_generation()
+        updated = update_log(writer, log_id, payload)
+        after = pool.data_generation()
+    state: Optional[Dict[str, Any]] = st.session_state.get("history_grid")
+    if not updated or not state:
+        return updated
+    if state["token"] != before:
+        state.update(pages={}, cursors={})
+    else:
+        row = get_log_by_id(conn, log_id)
+        for rows in state["pages"].values():
+            for i, cached in enumerate(rows):
+                if cached["id"] == log_id and row:
+                    rows[i] = {c: row.get(c) for c in DISPLAY_COLUMNS}
+    # Totals are recounted because the edit may have moved the date range
+    state["summary"] = None
+    state["token"] = after
+    return updated
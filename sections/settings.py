@@ -0,0 +1,526 @@
+"""
+Settings section of the iPSC Tracker app
+Reference lists, operators, experimental workflows, templates and backups
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+from db import (
+    add_experiment_type,
+    add_experimental_workflow,
+    add_ref_value,
+    backup_now,
+    delete_entry_template,
+    delete_ref_value,
+    delete_user,
+    export_filtered_logs_to_excel,
+    export_to_excel,
+    get_entry_templates,
+    get_experiment_types,
+    get_experimental_workflows,
+    get_or_create_user,
+    get_pool,
+    get_ref_values,
+    import_from_excel,
+    list_distinct_values,
+    rename_ref_value,
+)
+
+
+def render(conn):
+    """Render the Settings section"""
+    pool = get_pool()
+    st.subheader("⚙️ Settings (Reference Lists)")
+    st.caption("Manage dropdown values and backups.")
+    
+    # Settings sub-tabs
+    settings_tab1, settings_tab2, settings_tab3, settings_tab4 = st.tabs(["📋 Reference Lists", "👥 Operators", "🧬 Experimental Workflows", "💾 Backup"])
+    
+    with settings_tab1:
+        manage_kind_label = st.selectbox("Manage list", options=["Cell Lines","Event Types","Vessels","Locations","Cell Types","Culture Media"], index=0)
+        _kind_map = {
+            "Cell Lines": "cell_line",
+            "Event Types": "event_type",
+            "Vessels": "vessel",
+            "Locations": "location",
+            "Cell Types": "cell_type",
+            "Culture Media": "culture_medium",
+        }
+        manage_kind = _kind_map.get(manage_kind_label)
+
+        existing_vals = get_ref_values(conn, manage_kind)
+        st.write(f"Current {manage_kind_label} ({len(existing_vals)}):")
+        if existing_vals:
+            st.dataframe(pd.DataFrame({"Name": existing_vals}), width='stretch')
+        else:
+            st.info("No values yet.")
+
+        st.markdown("---")
+        st.markdown("### Add New")
+        new_val = st.text_input("New name", key=f"new_{manage_kind_label}")
+        if st.button("Add", key=f"btn_add_{manage_kind_label}"):
+            if not new_val or not new_val.strip():
+                st.warning("Enter a name to add.")
+            else:
+                pool.run_write(add_ref_value, manage_kind, new_val.strip())
+                st.success("Added.")
+                st.rerun()
+
+        st.markdown("### Rename")
+        existing_vals = get_ref_values(conn, manage_kind)
+        if existing_vals:
+            old_val = st.selectbox("Select existing", options=existing_vals, key=f"rename_src_{manage_kind_label}")
+            new_name = st.text_input("New name", key=f"rename_dst_{manage_kind_label}")
+            if st.button("Rename", key=f"btn_rename_{manage_kind_label}"):
+                if not new_name or not new_name.strip():
+                    st.warning("Enter a new name.")
+                else:
+                    pool.run_write(rename_ref_value, manage_kind, old_val, new_name)
+                    st.success("Renamed.")
+                    st.rerun()
+        else:
+            st.info("Nothing to rename.")
+
+        st.markdown("### Delete")
+        existing_vals = get_ref_values(conn, manage_kind)
+        if existing_vals:
+            del_val = st.selectbox("Select to delete", options=existing_vals, key=f"del_{manage_kind_label}")
+            confirm = st.checkbox("I understand this will remove the value", key=f"confirm_del_{manage_kind_label}")
+            if st.button("Delete", key=f"btn_del_{manage_kind_label}"):
+                if confirm:
+                    pool.run_write(delete_ref_value, manage_kind, del_val)
+                    st.success("Deleted.")
+                    st.rerun()
+                else:
+                    st.warning("Please confirm before deleting.")
+        else:
+            st.info("Nothing to delete.")
+    
+    with settings_tab2:
+        # Operators management
+        try:
+            _urows = conn.execute("SELECT username, COALESCE(display_name, username) FROM users ORDER BY username").fetchall()
+            ops = [(r[0], r[1]) for r in _urows]
+        except Exception:
+            ops = []
+        st.write(f"Current Operators ({len(ops)}):")
+        if ops:
+            st.dataframe(pd.DataFrame(ops, columns=["Username","Display Name"]), width='stretch')
+        else:
+            st.info("No operators yet.")
+
+        st.markdown("---")
+        st.markdown("### Add Operator")
+        new_username = st.text_input("Username", key="new_operator_username")
+        new_display = st.text_input("Display name (optional)", key="new_operator_display")
+        if st.button("Add Operator", key="btn_add_operator"):
+            if not new_username or not new_username.strip():
+                st.warning("Enter a username.")
+            else:
+                pool.run_write(get_or_create_user, new_username.strip(), new_display.strip() if new_display else None)
+                st.success("Operator added.")
+                st.rerun()
+
+        st.markdown("### Delete Operator")
+        try:
+            _urows2 = conn.execute("SELECT username FROM users ORDER BY username").fetchall()
+            ops2 = [r[0] for r in _urows2]
+        except Exception:
+            ops2 = []
+        if ops2:
+            del_op = st.selectbox("Select operator to delete", options=ops2, key="del_operator")
+            confirm_op = st.checkbox("I understand this will remove the operator", key="confirm_del_operator")
+            if st.button("Delete Operator", key="btn_del_operator"):
+                if confirm_op:
+                    pool.run_write(delete_user, del_op)
+                    st.success("Operator deleted.")
+                    st.rerun()
+                else:
+                    st.warning("Please confirm before deleting.")
+        else:
+            st.info("No operators to delete.")
+    
+    with settings_tab3:
+        st.markdown("### 🧬 Experimental Workflow Management")
+        st.caption("Manage experiment types and workflow templates for research tracking")
+        
+        workflow_subtab1, workflow_subtab2 = st.tabs(["🔬 Experiment Types", "📋 Workflow Templates"])
+        
+        with workflow_subtab1:
+            st.markdown("#### Available Experiment Types")
+            
+            try:
+                experiment_types = get_experiment_types(conn)
+                if experiment_types:
+                    # Group by category for display
+                    exp_categories = {}
+                    for exp in experiment_types:
+                        category = exp['category']
+                        if category not in exp_categories:
+                            exp_categories[category] = []
+                        exp_categories[category].append(exp)
+                    
+                    # Display experiment types by category
+                    for category, exps in exp_categories.items():
+                        with st.expander(f"📂 {category} ({len(exps)} types)", expanded=True):
+                            exp_data = []
+                            for exp in exps:
+                                exp_data.append({
+                                    'Name': exp['name'],
+                                    'Description': exp['description'],
+                                    'Typical Duration': f"{exp['typical_duration_days']} days" if exp['typical_duration_days'] else "Variable",
+                                    'Success Criteria': exp['success_criteria'][:50] + "..." if len(exp['success_criteria']) > 50 else exp['success_criteria']
+                                })
+                            
+                            if exp_data:
+                                exp_df = pd.DataFrame(exp_data)
+                                st.dataframe(exp_df, width='stretch')
+                else:
+                    st.info("No experiment types configured yet.")
+                
+                # Add new experiment type
+                st.markdown("---")
+                st.markdown("#### ➕ Add New Experiment Type")
+                
+                with st.form("add_experiment_type"):
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        exp_name = st.text_input("Experiment Name *", placeholder="e.g., CRISPR Gene Editing")
+                        exp_category = st.selectbox("Category *", options=[
+                            "Genome Editing", "Differentiation", "Cell Line Engineering", 
+                            "Drug Screening", "Functional Analysis", "Quality Control", "Other"
+                        ])
+                        exp_duration = st.number_input("Typical Duration (days)", min_value=1, value=7, step=1)
+                    
+                    with col2:
+                        exp_description = st.text_area("Description", placeholder="Brief description of the experimental procedure...")
+                        exp_success_criteria = st.text_area("Success Criteria", placeholder="How to measure success of this experiment...")
+                    
+                    submit_exp_type = st.form_submit_button("Add Experiment Type")
+                    
+                    if submit_exp_type:
+                        if exp_name and exp_category:
+                            try:
+                                # Add to database
+                                pool.run_write(add_experiment_type, exp_name, exp_category, exp_description, exp_duration, exp_success_criteria)
+                                st.success(f"✅ Added experiment type: {exp_name}")
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"❌ Error adding experiment type: {str(e)}")
+                        else:
+                            st.error("Name and Category are required!")
+                
+            except Exception as e:
+                st.error(f"Error loading experiment types: {str(e)}")
+        
+        with workflow_subtab2:
+            st.markdown("#### 📋 Workflow Templates")
+            st.caption("Predefined experimental workflows with stages and protocols")
+            
+            try:
+                
+                workflows = get_experimental_workflows(conn)
+                if workflows:
+                    st.markdown("**Available Workflow Templates:**")
+                    
+                    workflow_data = []
+                    for wf in workflows:
+                        workflow_data.append({
+                            'Workflow Name': wf['workflow_name'],
+                            'Description': wf['description'][:60] + "..." if len(wf['description']) > 60 else wf['description'],
+                            'Typical Stages': wf['typical_stages'][:50] + "..." if len(wf['typical_stages']) > 50 else wf['typical_stages'],
+                            'Expected Duration': f"{wf['expected_duration_days']} days" if wf['expected_duration_days'] else "Variable",
+                            'Success Criteria': wf['success_criteria'][:40] + "..." if len(wf['success_criteria']) > 40 else wf['success_criteria']
+                        })
+                    
+                    workflow_df = pd.DataFrame(workflow_data)
+                    st.dataframe(workflow_df, width='stretch')
+                else:
+                    st.info("No workflow templates defined yet.")
+                
+                # Add new workflow template
+                st.markdown("---")
+                st.markdown("#### ➕ Add New Workflow Template")
+                
+                with st.form("add_workflow_template"):
+                    wf_name = st.text_input("Workflow Name *", placeholder="e.g., Standard CRISPR Editing Protocol")
+                    wf_description = st.text_area("Description *", placeholder="Detailed description of the complete workflow...")
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        wf_stages = st.text_area("Typical Stages", placeholder="Stage 1: Transfection\nStage 2: Selection\nStage 3: Validation")
+                        wf_duration = st.number_input("Expected Duration (days)", min_value=1, value=14, step=1)
+                    
+                    with col2:
+                        wf_criteria = st.text_area("Success Criteria", placeholder="Criteria for determining successful completion...")
+                    
+                    submit_workflow = st.form_submit_button("Add Workflow Template")
+                    
+                    if submit_workflow:
+                        if wf_name and wf_description:
+                            try:
+                                pool.run_write(add_experimental_workflow, wf_name, wf_description, wf_stages, wf_duration, wf_criteria)
+                                st.success(f"✅ Added workflow template: {wf_name}")
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"❌ Error adding workflow template: {str(e)}")
+                        else:
+                            st.error("Workflow Name and Description are required!")
+                
+            except ImportError:
+                st.error("Workflow template functions not available. Please update the database functions.")
+            except Exception as e:
+                st.error(f"Error loading workflow templates: {str(e)}")
+    
+    with settings_tab4:
+        st.markdown("### 📁 Backup & Data Management")
+        
+        # Entry templates section
+        st.markdown("#### 🎯 Entry Templates")
+        st.caption("Manage your saved entry templates for quick data entry.")
+        
+        # Get current user's templates
+        current_user = st.session_state.get("my_name", None)
+        if current_user:
+            user_templates = get_entry_templates(conn, created_by=current_user)
+            
+            if user_templates:
+                st.write(f"Your saved templates ({len(user_templates)}):")
+                
+                # Display templates in a nice format
+                template_data = []
+                for t in user_templates:
+                    template_info = {
+                        "Name": t['name'],
+                        "Event Type": t['template_data'].get('event_type', ''),
+                        "Vessel": t['template_data'].get('vessel', ''),
+                        "Medium": t['template_data'].get('medium', ''),
+                        "Cell Type": t['template_data'].get('cell_type', ''),
+                        "Usage Count": t['usage_count'],
+                        "Created": t['created_at'][:10]
+                    }
+                    template_data.append(template_info)
+                
+                st.dataframe(pd.DataFrame(template_data), width='stretch')
+                
+                # Delete template option
+                st.markdown("**Delete Template**")
+                template_names = [t['name'] for t in user_templates]
+                del_template = st.selectbox("Select template to delete:", options=template_names, key="del_template_select")
+                confirm_template_del = st.checkbox("I confirm I want to delete this template", key="confirm_template_del")
+                
+                if st.button("🗑️ Delete Template", key="btn_del_template"):
+                    if confirm_template_del:
+                        if pool.run_write(delete_entry_template, del_template, current_user):
+                            st.success(f"✅ Template '{del_template}' deleted!")
+                            st.rerun()
+                        else:
+                            st.error("❌ Failed to delete template.")
+                    else:
+                        st.warning("Please confirm before deleting.")
+            else:
+                st.info("No templates saved yet. Create templates when adding entries by checking 'Save as template'.")
+            
+            # Show all templates (read-only view)
+            st.markdown("**All Templates** (view only)")
+            all_templates = get_entry_templates(conn)
+            if all_templates:
+                all_template_data = []
+                for t in all_templates:
+                    all_info = {
+                        "Name": t['name'],
+                        "Event Type": t['template_data'].get('event_type', ''),
+                        "Vessel": t['template_data'].get('vessel', ''),
+                        "Medium": t['template_data'].get('medium', ''),
+                        "Created By": t['created_by'],
+                        "Usage Count": t['usage_count']
+                    }
+                    all_template_data.append(all_info)
+                
+                st.dataframe(pd.DataFrame(all_template_data), width='stretch')
+            else:
+                st.info("No templates in the system yet.")
+        else:
+            st.info("Set 'My name' at the top to manage your templates.")
+
+        st.markdown("---")
+        st.markdown("#### 📁 Database Backup")
+        
+        # GitHub Auto-Backup Status
+        st.markdown("**☁️ Cloud Auto-Backup (GitHub)**")
+        try:
+            from github_backup import backup_database_now, get_backup_system
+            
+            backup_sys = get_backup_system()
+            
+            # Show backup status
+            if backup_sys.is_cloud_environment():
+                st.info("✅ Auto-backup is ACTIVE - Database changes back up to GitHub every hour in the background")
+                
+                # Show last backup run
+                backup_stats = backup_sys.stats()
+                if backup_stats['last_run_at']:
+                    st.caption(
+                        f"Last auto-backup: {backup_stats['last_run_at']} ({backup_stats['last_result']}, "
+                        f"{backup_stats['total_ms']} ms)"
+                    )
+                
+                # Manual backup button
+                if st.button("🔄 Backup to GitHub Now", help="Immediately backup database to GitHub"):
+                    if backup_database_now(force=True):
+                        st.success("✅ Backup queued - it runs in the background (see Admin → Data Management)")
+                    else:
+                        st.warning("⚠️ Backup could not be queued. Check logs.")
+                
+                st.caption("💡 View backups: [GitHub db-backup branch](https://github.com/Narasimhat/ipsc-tracker-daily-lab/tree/db-backup)")
+            else:
+                st.caption("ℹ️ Cloud auto-backup only active on Streamlit Cloud")
+        except ImportError:
+            st.caption("⚠️ GitHub backup module not available")
+        except Exception as e:
+            st.caption(f"⚠️ Backup system error: {str(e)}")
+        
+        st.markdown("---")
+        
+        backup_col1, backup_col2 = st.columns(2)
+        
+        with backup_col1:
+            st.markdown("**Traditional Backup**")
+            if st.button("Backup database and images"):
+                out_dir = backup_now()
+                st.success(f"Backup created: {out_dir}")
+        
+        with backup_col2:
+            st.markdown("**Excel Export**")
+            if st.button("📊 Export All Data to Excel"):
+                try:
+                    filename = export_to_excel(conn)
+                    st.success(f"✅ Excel export created: {filename}")
+                    
+                    # Provide download link
+                    with open(filename, 'rb') as f:
+                        excel_data = f.read()
+                    
+                    st.download_button(
+                        label="⬇️ Download Excel File",
+                        data=excel_data,
+                        file_name=os.path.basename(filename),
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                except Exception as e:
+                    st.error(f"❌ Export failed: {str(e)}")
+        
+        st.markdown("---")
+        st.markdown("#### 📊 Excel Export & Import")
+        st.caption("Export your data to Excel for backup, analysis, or offline work. Import data back if needed.")
+        
+        # Filtered export section
+        st.markdown("**📋 Filtered Export**")
+        
+        export_col1, export_col2 = st.columns(2)
+        
+        with export_col1:
+            # Filter options
+            export_cell_line = st.selectbox("Cell Line (optional):", ["All"] + list_distinct_values(conn, "cell_line"), key="export_cell_line")
+            export_event_type = st.selectbox("Event Type (optional):", ["All"] + list_distinct_values(conn, "event_type"), key="export_event_type")
+            export_operator = st.selectbox("Operator (optional):", ["All"] + list_distinct_values(conn, "operator"), key="export_operator")
+        
+        with export_col2:
+            export_date_from = st.date_input("From Date (optional):", value=None, key="export_date_from")
+            export_date_to = st.date_input("To Date (optional):", value=None, key="export_date_to")
+            export_thaw_id = st.text_input("Thaw ID (optional):", key="export_thaw_id")
+        
+        if st.button("📊 Export Filtered Data to Excel"):
+            try:
+                filters = {}
+                if export_cell_line != "All":
+                    filters['cell_line'] = export_cell_line
+                if export_event_type != "All":
+                    filters['event_type'] = export_event_type
+                if export_operator != "All":
+                    filters['operator'] = export_operator
+                if export_date_from:
+                    filters['date_from'] = export_date_from.strftime('%Y-%m-%d')
+                if export_date_to:
+                    filters['date_to'] = export_date_to.strftime('%Y-%m-%d')
+                if export_thaw_id.strip():
+                    filters['thaw_id'] = export_thaw_id.strip()
+                
+                filename = export_filtered_logs_to_excel(conn, filters)
+                st.success(f"✅ Filtered export created: {filename}")
+                
+                # Provide download link
+                with open(filename, 'rb') as f:
+                    excel_data = f.read()
+                
+                st.download_button(
+                    label="⬇️ Download Filtered Excel File",
+                    data=excel_data,
+                    file_name=os.path.basename(filename),
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+            except Exception as e:
+                st.error(f"❌ Filtered export failed: {str(e)}")
+        
+        # Import section
+        st.markdown("**📥 Excel Import**")
+        st.caption("⚠️ Use with caution: This will import data back into the database. Existing entries with the same ID will be skipped.")
+        
+        uploaded_file = st.file_uploader("Upload Excel file to import:", type=['xlsx'], key="excel_import")
+        
+        if uploaded_file is not None:
+            if st.button("📥 Import from Excel", type="secondary"):
+                try:
+                    # Save uploaded file temporarily
+                    import tempfile
+                    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
+                        tmp_file.write(uploaded_file.getvalue())
+                        temp_filename = tmp_file.name
+                    
+                    # Import data; batches open their own transactions, so hold the writer instead of queueing
+                    with pool.writer() as writer_conn:
+                        results = import_from_excel(writer_conn, temp_filename)
+                    
+                    # Clean up temp file
+                    os.unlink(temp_filename)
+                    
+                    # Show results
+                    if results['imported'] > 0:
+                        st.success(f"✅ Import completed: {results['imported']} entries imported, {results['skipped']} skipped")
+                    else:
+                        st.info("No new entries were imported.")
+                    
+                    if results['errors'] > 0:
+                        st.error(f"❌ {results['errors']} errors occurred during import")
+                        for msg in results['messages']:
+                            st.caption(msg)
+                    
+                    if results['imported'] > 0:
+                        st.rerun()
+                        
+                except Exception as e:
+                    st.error(f"❌ Import failed: {str(e)}")
+        
+        st.markdown("---")
+        st.markdown("#### 📋 Excel Export Features")
+        st.info("""
+        **What gets exported:**
+        - 🧪 **Culture Logs**: All your iPSC tracking entries
+        - 📋 **Reference Lists**: Cell lines, event types, vessels, etc.
+        - 👥 **User Data**: Operators and their caliber levels
+        - 📅 **Weekend Planning**: Schedule assignments and custom work
+        - 🎯 **Templates**: Your saved entry templates
+        
+        **Multiple sheets** for easy analysis in Excel/Google Sheets
+        
+        **Use cases:**
+        - 📊 Data analysis and charts in Excel
+        - 📁 Offline backup for lab records
+        - 📋 Sharing data with collaborators
+        - 🔄 Data migration between systems
+        - 📈 Custom reporting and visualization
+        """)
@@ -0,0 +1,529 @@
+"""
+Thaw Timeline section of the iPSC Tracker app
+Per-vial timelines, experimental journeys, active vials and vial analytics
+"""
+
+import pandas as pd
+import streamlit as st
+
+from db import (
+    evaluate_alerts,
+    get_active_vials,
+    get_experiment_recommendations,
+    get_experimental_journey,
+    get_vial_alerts,
+    get_vial_analytics,
+    get_vial_lifecycle,
+    list_distinct_thaw_ids,
+)
+
+
+def render(conn):
+    """Render the Thaw Timeline section"""
+    st.subheader("🧊 Vial Lifecycle Tracking")
+    
+    # Tab selection for different tracking views
+    tracking_tab1, tracking_tab2, tracking_tab3, tracking_tab4 = st.tabs(["📊 Vial Timeline", "🧬 Experimental Journey", "📈 Active Vials", "🔍 Vial Analytics"])
+    
+    with tracking_tab1:
+        st.markdown("### Individual Vial Timeline")
+        thaw_ids_list = list_distinct_thaw_ids(conn)
+        
+        if thaw_ids_list:
+            selected_tid = st.selectbox("Select Thaw ID", options=["(choose)"] + thaw_ids_list)
+            
+            if selected_tid != "(choose)":
+                # Get comprehensive lifecycle data
+                lifecycle = get_vial_lifecycle(conn, selected_tid)
+                
+                if lifecycle:
+                    # Vial Summary Cards
+                    col1, col2, col3, col4 = st.columns(4)
+                    
+                    with col1:
+                        st.metric("Culture Days", lifecycle.get('culture_days', 0))
+                    with col2:
+                        st.metric("Current Passage", f"P{lifecycle.get('current_passage', 'N/A')}")
+                    with col3:
+                        st.metric("Total Events", lifecycle.get('total_events', 0))
+                    with col4:
+                        splits = len([e for e in lifecycle.get('events', []) if e.get('event_type') == 'Split'])
+                        st.metric("Total Splits", splits)
+                    
+                    # Current Status
+                    st.markdown("### 📋 Current Status")
+                    status_col1, status_col2 = st.columns(2)
+                    
+                    with status_col1:
+                        st.info(f"""
+                        **Current Vessel:** {lifecycle.get('current_vessel', 'N/A')}  
+                        **Current Medium:** {lifecycle.get('current_medium', 'N/A')}  
+                        **Current Location:** {lifecycle.get('current_location', 'N/A')}
+                        """)
+                    
+                    with status_col2:
+                        # Alerts and recommendations
+                        alerts = get_vial_alerts(conn, selected_tid)
+                        if alerts:
+                            st.markdown("**🚨 Alerts & Recommendations:**")
+                            for alert in alerts:
+                                if alert['type'] == 'critical':
+                                    st.error(f"🚨 {alert['message']}")
+                                elif alert['type'] == 'warning':
+                                    st.warning(alert['message'])
+                                else:
+                                    st.info(alert['message'])
+                        else:
+                            st.success("✅ No alerts for this vial")
+                    
+                    # Passage Progression Visualization
+                    if lifecycle.get('passage_progression'):
+                        st.markdown("### 📈 Passage Progression")
+                        
+                        progression_data = []
+                        for p in lifecycle['passage_progression']:
+                            progression_data.append({
+                                'Date': p['date'][:10],
+                                'Passage': f"P{p['passage']}",
+                                'Event': p['event_type'],
+                                'Vessel': p['vessel'],
+                                'Medium': p['medium']
+                            })
+                        
+                        if progression_data:
+                            prog_df = pd.DataFrame(progression_data)
+                            st.dataframe(prog_df, width='stretch')
+                            
+                            # Simple passage number chart
+                            try:
+                                import matplotlib.pyplot as plt
+                                fig, ax = plt.subplots(figsize=(10, 4))
+                                dates = [p['date'][:10] for p in lifecycle['passage_progression']]
+                                passages = [p['passage'] for p in lifecycle['passage_progression']]
+                                ax.plot(range(len(dates)), passages, marker='o', linewidth=2)
+                                ax.set_xticks(range(len(dates)))
+                                ax.set_xticklabels(dates, rotation=45)
+                                ax.set_ylabel('Passage Number')
+                                ax.set_title(f'Passage Progression for {selected_tid}')
+                                ax.grid(True, alpha=0.3)
+                                plt.tight_layout()
+                                st.pyplot(fig)
+                            except ImportError:
+                                # Fallback if matplotlib not available
+                                st.info("Install matplotlib for passage progression charts")
+                    
+                    # Detailed Event Timeline
+                    st.markdown("### 📅 Detailed Event Timeline")
+                    
+                    # Create enhanced timeline display
+                    events = lifecycle.get('events', [])
+                    if events:
+                        timeline_data = []
+                        for i, event in enumerate(events):
+                            # Add visual indicators
+                            event_icon = {
+                                'Thawing': '🧊',
+                                'Split': '🔄',
+                                'Observation': '👁️',
+                                'Media Change': '🧪',
+                                'Cryopreservation': '❄️'
+                            }.get(event.get('event_type', ''), '📝')
+                            
+                            timeline_data.append({
+                                'Day': i + 1,
+                                'Date': event.get('date', '')[:10],
+                                'Event': f"{event_icon} {event.get('event_type', '')}",
+                                'Passage': f"P{event.get('passage', '')}" if event.get('passage') else "",
+                                'Vessel': event.get('vessel', ''),
+                                'Location': event.get('location', ''),
+                                'Medium': event.get('medium', ''),
+                                'Cell Type': event.get('cell_type', ''),
+                                'Volume (mL)': event.get('volume', ''),
+                                'Notes': (event.get('notes', '') or '')[:50] + "..." if len(event.get('notes', '') or '') > 50 else event.get('notes', ''),
+                                'Operator': event.get('operator', ''),
+                                'Cryo Position': event.get('cryo_vial_position', '')
+                            })
+                        
+                        timeline_df = pd.DataFrame(timeline_data)
+                        st.dataframe(timeline_df, width='stretch')
+                        
+                        # CSV download for this vial
+                        csv_data = timeline_df.to_csv(index=False).encode('utf-8')
+                        st.download_button(
+                            f"📂 Download {selected_tid} Timeline CSV",
+                            data=csv_data,
+                            file_name=f"{selected_tid}_timeline.csv",
+                            mime="text/csv"
+                        )
+                    else:
+                        st.info("No events found for this thaw ID")
+                else:
+                    st.error("No data found for this thaw ID")
+        else:
+            st.info("No thaw IDs found. Add some thawing events first.")
+    
+    with tracking_tab2:
+        st.markdown("### 🧬 Experimental Journey Tracking")
+        
+        thaw_ids_list = list_distinct_thaw_ids(conn)
+        if thaw_ids_list:
+            journey_tid = st.selectbox("Select Thaw ID for Experimental Journey", options=["(choose)"] + thaw_ids_list, key="journey_thaw_select")
+            
+            if journey_tid != "(choose)":
+                try:
+                    
+                    # Get experimental journey data
+                    journey = get_experimental_journey(conn, journey_tid)
+                    
+                    if journey:
+                        # Journey Summary
+                        st.markdown("### 🎯 Experimental Journey Summary")
+                        
+                        journey_col1, journey_col2, journey_col3, journey_col4 = st.columns(4)
+                        
+                        with journey_col1:
+                            st.metric("Experimental Phases", journey.get('total_experimental_phases', 0))
+                        with journey_col2:
+                            st.metric("Active Experiments", len(journey.get('active_experiments', [])))
+                        with journey_col3:
+                            maintenance_count = len(journey.get('maintenance_events', []))
+                            st.metric("Maintenance Events", maintenance_count)
+                        with journey_col4:
+                            total_exp_events = sum([data['total_events'] for data in journey.get('experimental_phases', {}).values()])
+                            st.metric("Total Exp. Events", total_exp_events)
+                        
+                        # Active Experiments
+                        active_experiments = journey.get('active_experiments', [])
+                        if active_experiments:
+                            st.markdown("### 🔬 Currently Active Experiments")
+                            for exp in active_experiments:
+                                exp_data = journey['experimental_phases'][exp]
+                                st.info(f"""
+                                **{exp}**  
+                                📅 Started: {exp_data['start_date'][:10]}  
+                                ⏱️ Duration: {exp_data['duration_days']} days  
+                                📊 Events: {exp_data['total_events']}  
+                                🎯 Stages: {', '.join(exp_data['stages']) if exp_data['stages'] else 'None recorded'}
+                                """)
+                        
+                        # Experimental Phases Details
+                        experimental_phases = journey.get('experimental_phases', {})
+                        if experimental_phases:
+                            st.markdown("### 🧪 Experimental Phases Breakdown")
+                            
+                            for exp_type, exp_data in experimental_phases.items():
+                                with st.expander(f"🔬 {exp_type} ({exp_data['total_events']} events)", expanded=exp_type in active_experiments):
+                                    
+                                    # Phase summary
+                                    phase_col1, phase_col2, phase_col3 = st.columns(3)
+                                    
+                                    with phase_col1:
+                                        st.markdown(f"""
+                                        **📅 Timeline:**  
+                                        Start: {exp_data['start_date'][:10]}  
+                                        End: {exp_data['end_date'][:10]}  
+                                        Duration: {exp_data['duration_days']} days
+                                        """)
+                                    
+                                    with phase_col2:
+                                        completion_status = "✅ Completed" if exp_data['is_completed'] else "🔄 In Progress"
+                                        st.markdown(f"""
+                                        **📊 Progress:**  
+                                        Status: {completion_status}  
+                                        Events: {exp_data['total_events']}  
+                                        Stages: {len(exp_data['stages'])}
+                                        """)
+                                    
+                                    with phase_col3:
+                                        st.markdown(f"""
+                                        **🎯 Stages Covered:**  
+                                        {', '.join(exp_data['stages']) if exp_data['stages'] else 'None recorded'}
+                                        """)
+                                    
+                                    # Success metrics
+                                    if exp_data['success_metrics']:
+                                        st.markdown("**📈 Success Metrics:**")
+                                        for metric in exp_data['success_metrics']:
+                                            if metric:
+                                                st.write(f"• {metric}")
+                                    
+                                    # Detailed events for this experiment
+                                    st.markdown("**📝 Experimental Events:**")
+                                    exp_events_data = []
+                                    for event in exp_data['events']:
+                                        exp_events_data.append({
+                                            'Date': event.get('date', '')[:10],
+                                            'Stage': event.get('experiment_stage', ''),
+                                            'Event Type': event.get('event_type', ''),
+                                            'Conditions': event.get('experimental_conditions', ''),
+                                            'Protocol Ref': event.get('protocol_reference', ''),
+                                            'Outcome': event.get('outcome_status', ''),
+                                            'Success Metrics': event.get('success_metrics', ''),
+                                            'Notes': (event.get('notes', '') or '')[:50] + "..." if len(event.get('notes', '') or '') > 50 else event.get('notes', ''),
+                                            'Operator': event.get('operator', '')
+                                        })
+                                    
+                                    if exp_events_data:
+                                        exp_events_df = pd.DataFrame(exp_events_data)
+                                        st.dataframe(exp_events_df, width='stretch')
+                        
+                        # Experiment Recommendations
+                        st.markdown("### 💡 Experiment Recommendations")
+                        try:
+                            recommendations = get_experiment_recommendations(conn, journey_tid)
+                            if recommendations:
+                                for rec in recommendations:
+                                    if rec['type'] == 'warning':
+                                        st.warning(f"**{rec['category']}:** {rec['message']}")
+                                    elif rec['type'] == 'suggestion':
+                                        st.info(f"**{rec['category']}:** {rec['message']}")
+                                    else:
+                                        st.write(f"**{rec['category']}:** {rec['message']}")
+                            else:
+                                st.success("✅ No specific recommendations at this time")
+                        except Exception as e:
+                            st.info("Recommendations feature unavailable")
+                        
+                        # Maintenance Events Summary
+                        maintenance_events = journey.get('maintenance_events', [])
+                        if maintenance_events:
+                            with st.expander(f"🧪 Culture Maintenance Events ({len(maintenance_events)})", expanded=False):
+                                maintenance_data = []
+                                for event in maintenance_events:
+                                    maintenance_data.append({
+                                        'Date': event.get('date', '')[:10],
+                                        'Event Type': event.get('event_type', ''),
+                                        'Passage': f"P{event.get('passage', '')}" if event.get('passage') else "",
+                                        'Vessel': event.get('vessel', ''),
+                                        'Medium': event.get('medium', ''),
+                                        'Notes': (event.get('notes', '') or '')[:40] + "..." if len(event.get('notes', '') or '') > 40 else event.get('notes', ''),
+                                        'Operator': event.get('operator', '')
+                                    })
+                                
+                                if maintenance_data:
+                                    maintenance_df = pd.DataFrame(maintenance_data)
+                                    st.dataframe(maintenance_df, width='stretch')
+                    
+                    else:
+                        st.info("No experimental journey data found for this vial. Only maintenance events recorded.")
+                        
+                        # Show basic lifecycle as fallback
+                        lifecycle = get_vial_lifecycle(conn, journey_tid)
+                        if lifecycle:
+                            st.markdown("### 🧪 Basic Culture Timeline")
+                            events = lifecycle.get('events', [])
+                            basic_data = []
+                            for event in events:
+                                basic_data.append({
+                                    'Date': event.get('date', '')[:10],
+                                    'Event Type': event.get('event_type', ''),
+                                    'Passage': f"P{event.get('passage', '')}" if event.get('passage') else "",
+                                    'Notes': (event.get('notes', '') or '')[:50] + "..." if len(event.get('notes', '') or '') > 50 else event.get('notes', '')
+                                })
+                            
+                            if basic_data:
+                                basic_df = pd.DataFrame(basic_data)
+                                st.dataframe(basic_df, width='stretch')
+                        
+                except ImportError:
+                    st.error("Experimental journey tracking functions not available. Please update the database functions.")
+            
+        else:
+            st.info("No thaw IDs found. Add some thawing events first to track experimental journeys.")
+    
+    with tracking_tab3:
+        st.markdown("### 🔬 Active Vials Dashboard")
+        
+        # Controls
+        col_days, col_refresh = st.columns([3, 1])
+        with col_days:
+            days_threshold = st.slider("Consider vials active if last event within (days):", 1, 90, 30)
+        with col_refresh:
+            if st.button("🔄 Refresh", key="refresh_active"):
+                st.rerun()
+        
+        # Get active vials
+        active_vials = get_active_vials(conn, days_threshold)
+        
+        if active_vials:
+            st.success(f"Found {len(active_vials)} active vials")
+            vial_alerts = evaluate_alerts(conn, [v['thaw_id'] for v in active_vials])
+            
+            # Summary cards for all active vials
+            active_summary = []
+            for vial in active_vials:
+                thaw_event = vial.get('thaw_event', {})
+                latest_event = vial.get('latest_event', {})
+                
+                # Get analytics for alerts
+                alerts = vial_alerts.get(vial['thaw_id'], [])
+                alert_count = len([a for a in alerts if a['type'] == 'warning'])
+                
+                active_summary.append({
+                    'Thaw ID': vial['thaw_id'],
+                    'Cell Line': thaw_event.get('cell_line', ''),
+                    'Days Active': vial.get('culture_days', 0),
+                    'Current Passage': f"P{vial.get('current_passage', 'N/A')}",
+                    'Current Vessel': vial.get('current_vessel', ''),
+                    'Current Medium': vial.get('current_medium', ''),
+                    'Current Location': vial.get('current_location', ''),
+                    'Total Events': vial.get('total_events', 0),
+                    'Last Event': latest_event.get('date', '')[:10] if latest_event.get('date') else '',
+                    'Last Event Type': latest_event.get('event_type', ''),
+                    'Alerts': '⚠️' if alert_count > 0 else '✅'
+                })
+            
+            # Display active vials table
+            active_df = pd.DataFrame(active_summary)
+            st.dataframe(active_df, width='stretch')
+            
+            # Quick actions section
+            st.markdown("### ⚡ Quick Actions")
+            
+            if active_vials:
+                quick_col1, quick_col2 = st.columns(2)
+                
+                with quick_col1:
+                    st.markdown("**🚨 High Priority Vials:**")
+                    high_priority = [v for v in active_vials if vial_alerts.get(v['thaw_id'])]
+                    
+                    if high_priority:
+                        # Sort vials by alert severity (critical first)
+                        def get_max_alert_priority(vial):
+                            alerts = vial_alerts.get(vial['thaw_id'], [])
+                            if any(a['type'] == 'critical' for a in alerts):
+                                return 3
+                            elif any(a['type'] == 'warning' for a in alerts):
+                                return 2
+                            else:
+                                return 1
+                        
+                        high_priority.sort(key=get_max_alert_priority, reverse=True)
+                        
+                        for vial in high_priority[:3]:  # Show top 3
+                            alerts = vial_alerts.get(vial['thaw_id'], [])
+                            critical_alerts = [a for a in alerts if a['type'] == 'critical']
+                            warning_alerts = [a for a in alerts if a['type'] == 'warning']
+                            
+                            if critical_alerts:
+                                st.error(f"**🚨 {vial['thaw_id']}**: {critical_alerts[0]['message']}")
+                            elif warning_alerts:
+                                st.warning(f"**⚠️ {vial['thaw_id']}**: {warning_alerts[0]['message']}")
+                    else:
+                        st.success("No high priority vials!")
+                
+                with quick_col2:
+                    st.markdown("**📊 Quick Stats:**")
+                    total_passages = sum([v.get('current_passage', 0) or 0 for v in active_vials])
+                    avg_days = sum([v.get('culture_days', 0) for v in active_vials]) / len(active_vials)
+                    
+                    st.info(f"""
+                    **Total Active Vials:** {len(active_vials)}  
+                    **Average Culture Days:** {avg_days:.1f}  
+                    **Highest Passage:** P{max([v.get('current_passage', 0) or 0 for v in active_vials])}  
+                    **Total Culture Events:** {sum([v.get('total_events', 0) for v in active_vials])}
+                    """)
+        else:
+            st.info(f"No active vials found within the last {days_threshold} days.")
+    
+    with tracking_tab3:
+        st.markdown("### 📊 Vial Analytics & Insights")
+        
+        # Select vial for analytics
+        thaw_ids_list = list_distinct_thaw_ids(conn)
+        if thaw_ids_list:
+            analytics_tid = st.selectbox("Select Thaw ID for Analytics", options=["(choose)"] + thaw_ids_list, key="analytics_thaw_select")
+            
+            if analytics_tid != "(choose)":
+                analytics = get_vial_analytics(conn, analytics_tid)
+                
+                if analytics:
+                    # Analytics Summary
+                    st.markdown("### 📈 Culture Performance Metrics")
+                    
+                    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+                    
+                    with metric_col1:
+                        st.metric("Average Split Interval", f"{analytics.get('avg_passage_interval', 0):.1f} days")
+                    with metric_col2:
+                        st.metric("Total Splits", analytics.get('total_splits', 0))
+                    with metric_col3:
+                        st.metric("Media Changes", analytics.get('media_changes', 0))
+                    with metric_col4:
+                        st.metric("Observations", analytics.get('total_observations', 0))
+                    
+                    # Culture Conditions Analysis
+                    st.markdown("### 🧪 Culture Conditions Used")
+                    
+                    cond_col1, cond_col2, cond_col3 = st.columns(3)
+                    
+                    with cond_col1:
+                        st.markdown("**Media Used:**")
+                        for medium in analytics.get('media_used', []):
+                            st.write(f"• {medium}")
+                    
+                    with cond_col2:
+                        st.markdown("**Vessels Used:**")
+                        for vessel in analytics.get('vessels_used', []):
+                            st.write(f"• {vessel}")
+                    
+                    with cond_col3:
+                        st.markdown("**Locations Used:**")
+                        for location in analytics.get('locations_used', []):
+                            st.write(f"• {location}")
+                    
+                    # Event Frequency Analysis
+                    st.markdown("### 📊 Event Frequency Analysis")
+                    
+                    event_freq = analytics.get('event_frequency', {})
+                    if event_freq:
+                        freq_data = []
+                        for event_type, count in event_freq.items():
+                            freq_data.append({'Event Type': event_type, 'Count': count})
+                        
+                        freq_df = pd.DataFrame(freq_data)
+                        st.dataframe(freq_df, width='stretch')
+                        
+                        # Simple bar chart if possible
+                        try:
+                            import matplotlib.pyplot as plt
+                            fig, ax = plt.subplots(figsize=(10, 6))
+                            events = list(event_freq.keys())
+                            counts = list(event_freq.values())
+                            ax.bar(events, counts)
+                            ax.set_title(f'Event Frequency for {analytics_tid}')
+                            ax.set_ylabel('Number of Events')
+                            plt.xticks(rotation=45)
+                            plt.tight_layout()
+                            st.pyplot(fig)
+                        except ImportError:
+                            st.info("Install matplotlib for event frequency charts")
+                    
+                    # Passage Interval Analysis
+                    intervals = analytics.get('passage_intervals', [])
+                    if intervals:
+                        st.markdown("### ⏱️ Passage Interval Analysis")
+                        
+                        interval_col1, interval_col2 = st.columns(2)
+                        
+                        with interval_col1:
+                            st.metric("Average Interval", f"{analytics.get('avg_passage_interval', 0):.1f} days")
+                            st.metric("Shortest Interval", f"{min(intervals)} days" if intervals else "N/A")
+                            st.metric("Longest Interval", f"{max(intervals)} days" if intervals else "N/A")
+                        
+                        with interval_col2:
+                            if len(intervals) > 1:
+                                import statistics
+                                st.metric("Median Interval", f"{statistics.median(intervals):.1f} days")
+                                if len(intervals) > 2:
+                                    st.metric("Std Deviation", f"{statistics.stdev(intervals):.1f} days")
+                                
+                                # Recommendations
+                                if analytics.get('avg_passage_interval', 0) > 7:
+                                    st.warning("⚠️ Long passage intervals detected. Consider more frequent splitting.")
+                                elif analytics.get('avg_passage_interval', 0) < 3:
+                                    st.info("ℹ️ Frequent splitting detected. Monitor cell health.")
+                else:
+                    st.info("No analytics data available for this vial.")
+        else:
+            st.info("No vials available for analytics.")
@@ -0,0 +1,1027 @@
+"""
+Weekend Tasks section of the iPSC Tracker app
+Weekend schedules, task lists, custom work, calibers and media planning
+"""
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from db import (
+    delete_custom_weekend_work,
+    delete_weekend_schedule,
+    get_all_users,
+    get_custom_weekend_work,
+    get_pool,
+    get_ref_values,
+    get_user_calibers,
+    get_weekend_assignee,
+    get_weekend_schedules,
+    get_weekend_task_instructions,
+    get_weekend_tasks,
+    mark_weekend_task_completed,
+    save_custom_weekend_work,
+    save_user_caliber,
+    save_weekend_schedule,
+)
+from sections import timed_fragment
+
+
+@timed_fragment("weekend.schedule_grid")
+def _weekend_schedule_grid(conn):
+    """Weekend Schedule Manager: assignees for the next four weekends"""
+    pool = get_pool()
+    with st.expander("🗓️ Weekend Schedule Manager", expanded=True):
+        st.markdown("**Schedule Weekend Assignments:**")
+        
+        schedule_col1, schedule_col2 = st.columns([2, 1])
+        
+        with schedule_col1:
+            # Get next 4 weekends
+            today = datetime.now()
+            weekends = []
+            
+            for week_offset in range(4):  # Next 4 weekends
+                # Calculate Saturday for this week
+                days_to_saturday = (5 - today.weekday()) % 7
+                if days_to_saturday == 0 and today.weekday() == 5:  # If today is Saturday
+                    days_to_saturday = 7
+                
+                saturday = today + timedelta(days=days_to_saturday + (week_offset * 7))
+                sunday = saturday + timedelta(days=1)
+                
+                weekends.append({
+                    'saturday': saturday,
+                    'sunday': sunday,
+                    'week_num': week_offset + 1
+                })
+            
+            st.markdown("**Weekend Assignments:**")
+            
+            # Load existing weekend schedules from database
+            existing_schedules = get_weekend_schedules(conn)
+            schedule_dict = {s['weekend_date']: s['assignee'] for s in existing_schedules}
+            
+            all_users = get_all_users(conn)
+            current_user = st.session_state.get("my_name", "Unknown")
+            
+            for weekend in weekends:
+                saturday_str = weekend['saturday'].strftime('%Y-%m-%d')
+                sunday_str = weekend['sunday'].strftime('%Y-%m-%d')
+                weekend_key = saturday_str
+                
+                weekend_col1, weekend_col2, weekend_col3 = st.columns([2, 2, 1])
+                
+                with weekend_col1:
+                    st.write(f"**Week {weekend['week_num']}:** {weekend['saturday'].strftime('%b %d')} - {weekend['sunday'].strftime('%b %d')}")
+                
+                with weekend_col2:
+                    if all_users:
+                        assignee_options = ["(unassigned)"] + all_users
+                        # Get current assignee from database
+                        current_assignee = schedule_dict.get(weekend_key, "(unassigned)")
+                        
+                        selected_assignee = st.selectbox(
+                            "Assignee:",
+                            options=assignee_options,
+                            index=assignee_options.index(current_assignee) if current_assignee in assignee_options else 0,
+                            key=f"weekend_assignee_{weekend_key}"
+                        )
+                        
+                        # Save to database when selection changes
+                        if selected_assignee != current_assignee and selected_assignee != "(unassigned)":
+                            if pool.run_write(save_weekend_schedule, weekend_key, selected_assignee, current_user):
+                                st.success(f"✅ Saved {selected_assignee} for {weekend['saturday'].strftime('%b %d')}")
+                                st.rerun()  # Refresh to show updated assignment
+                    else:
+                        st.write("No users available")
+                
+                with weekend_col3:
+                    if st.button("📝 Plan", key=f"plan_{weekend_key}"):
+                        # Get the saved assignee from database
+                        saved_assignee = get_weekend_assignee(conn, weekend_key)
+                        if saved_assignee:
+                            st.session_state['selected_weekend_assignee'] = saved_assignee
+                            st.session_state['selected_weekend_saturday'] = saturday_str
+                            st.session_state['selected_weekend_sunday'] = sunday_str
+                            st.success(f"✅ Planning mode set for {saved_assignee}")
+                        else:
+                            st.warning("Please assign someone first")
+        
+        with schedule_col2:
+            st.markdown("**Current Week:**")
+            # Show current active weekend assignment
+            active_assignee = st.session_state.get('selected_weekend_assignee')
+            active_saturday = st.session_state.get('selected_weekend_saturday')
+            
+            if active_assignee and active_saturday:
+                st.info(f"""
+                **Active Planning:**  
+                👤 **{active_assignee}**  
+                📅 **{active_saturday}**
+                """)
+                st.caption("This assignee will auto-fill in Add Entry tab")
+                
+                # Clear weekend planning button
+                if st.button("🔄 Clear Weekend Planning", key="clear_weekend_planning"):
+                    st.session_state['selected_weekend_assignee'] = None
+                    st.session_state['selected_weekend_saturday'] = None
+                    st.session_state['selected_weekend_sunday'] = None
+                    st.success("✅ Weekend planning cleared")
+                    st.rerun()
+            else:
+                st.info("No active weekend planning set")
+
+
+@timed_fragment("weekend.caliber_editor")
+def _caliber_editor(conn):
+    """User caliber levels and per-user weekend performance"""
+    pool = get_pool()
+    with st.expander("📊 User Caliber & Performance", expanded=True):
+        st.markdown("**Weekend Performance Tracking:**")
+        
+        caliber_col1, caliber_col2 = st.columns(2)
+        
+        with caliber_col1:
+            # User caliber settings
+            st.markdown("**Set User Caliber Levels:**")
+            all_users = get_all_users(conn)
+            current_user = st.session_state.get("my_name", "Unknown")
+            
+            # Load existing calibers from database
+            existing_calibers = get_user_calibers(conn)
+            
+            for user in all_users:
+                current_caliber = existing_calibers.get(user, "Standard")
+                caliber_levels = ["Trainee", "Standard", "Advanced", "Expert", "Lead"]
+                
+                user_caliber = st.selectbox(
+                    f"Caliber for {user}:",
+                    options=caliber_levels,
+                    index=caliber_levels.index(current_caliber),
+                    key=f"caliber_{user}"
+                )
+                
+                # Save to database when caliber changes
+                if user_caliber != current_caliber:
+                    if pool.run_write(save_user_caliber, user, user_caliber, current_user):
+                        st.success(f"✅ Updated caliber for {user}: {user_caliber}")
+                        st.rerun()  # Refresh to show updated caliber
+        
+        with caliber_col2:
+            # Performance metrics
+            st.markdown("**Performance Metrics:**")
+            selected_user = st.selectbox("Select user for metrics:", options=all_users if all_users else ["No users"])
+            
+            if selected_user and selected_user != "No users":
+                # Get caliber from database
+                user_calibers_db = get_user_calibers(conn)
+                user_caliber = user_calibers_db.get(selected_user, "Standard")
+                st.info(f"**{selected_user}** - Caliber: **{user_caliber}**")
+                
+                # Calculate user's weekend work (last 4 weeks)
+                four_weeks_ago = date.today() - timedelta(days=28)
+                user_tasks = get_weekend_tasks(conn, four_weeks_ago.isoformat(), date.today().isoformat())
+                user_weekend_tasks = [t for t in user_tasks if t.get('assigned_to') == selected_user]
+                
+                performance_col1, performance_col2 = st.columns(2)
+                
+                with performance_col1:
+                    st.metric("Weekend Tasks (4 weeks)", len(user_weekend_tasks))
+                    completed_user_tasks = [t for t in user_weekend_tasks if not t.get('next_action_date')]
+                    completion_rate = (len(completed_user_tasks) / len(user_weekend_tasks) * 100) if user_weekend_tasks else 0
+                    st.metric("Completion Rate", f"{completion_rate:.1f}%")
+                
+                with performance_col2:
+                    # Calculate estimated hours based on caliber
+                    caliber_multipliers = {"Trainee": 1.5, "Standard": 1.0, "Advanced": 0.8, "Expert": 0.6, "Lead": 0.5}
+                    base_hours_per_task = 0.5  # Base estimate
+                    multiplier = caliber_multipliers.get(user_caliber, 1.0)
+                    estimated_hours = len(user_weekend_tasks) * base_hours_per_task * multiplier
+                    st.metric("Estimated Hours", f"{estimated_hours:.1f}h")
+                    
+                    # Add custom work hours from database
+                    four_weeks_ago_str = four_weeks_ago.isoformat()
+                    today_str = date.today().isoformat()
+                    user_custom_work = get_custom_weekend_work(conn, four_weeks_ago_str, today_str)
+                    user_custom_hours = sum([w["hours"] for w in user_custom_work if w.get("assignee") == selected_user])
+                    st.metric("Custom Work Hours", f"{user_custom_hours:.1f}h")
+
+
+@timed_fragment("weekend.custom_work_log")
+def _custom_work_log(conn):
+    """Logged custom weekend work with deletion"""
+    pool = get_pool()
+    with st.expander("📋 Custom Work Log", expanded=False):
+        # Get custom work from database
+        custom_work = get_custom_weekend_work(conn)
+        
+        if custom_work:
+            st.markdown("**Logged Custom Work:**")
+            
+            custom_data = []
+            for work in custom_work:
+                custom_data.append({
+                    'Date': work['date'],
+                    'Type': work['type'],
+                    'Description': work['description'][:50] + "..." if len(work['description']) > 50 else work['description'],
+                    'Hours': work['hours'],
+                    'Assignee': work['assignee'],
+                    'Priority': work['priority'],
+                    'Created By': work['created_by']
+                })
+            
+            custom_df = pd.DataFrame(custom_data)
+            st.dataframe(custom_df, width='stretch')
+            
+            # Delete specific work items
+            if custom_work:
+                delete_col1, delete_col2 = st.columns(2)
+                
+                with delete_col1:
+                    work_to_delete = st.selectbox(
+                        "Select work to delete:",
+                        options=[f"{w['date']} - {w['type']} ({w['assignee']})" for w in custom_work],
+                        key="delete_custom_work_select"
+                    )
+                
+                with delete_col2:
+                    if st.button("🗑️ Delete Selected", key="delete_custom_work"):
+                        # Find the work ID to delete
+                        work_index = [f"{w['date']} - {w['type']} ({w['assignee']})" for w in custom_work].index(work_to_delete)
+                        work_id = custom_work[work_index]['id']
+                        
+                        if pool.run_write(delete_custom_weekend_work, work_id):
+                            st.success("✅ Custom work deleted")
+                            st.rerun()
+                        else:
+                            st.error("Failed to delete custom work")
+        else:
+            st.info("No custom work logged yet. Use the Multi-Weekend Planning tab to add custom work.")
+
+
+def render(conn):
+    """Render the Weekend Tasks section"""
+    pool = get_pool()
+    st.subheader("🗓️ Weekend Task Management & Multi-Weekend Scheduling")
+    st.caption("Advanced weekend planning with caliber tracking, multi-weekend scheduling, and extra work calculation")
+    
+    # Weekend task tabs
+    weekend_tab1, weekend_tab2, weekend_tab3, weekend_tab4, weekend_tab5 = st.tabs([
+        "🎯 Multi-Weekend Planning", 
+        "📊 Weekend Analytics", 
+        "⚡ Quick Actions",
+        "🏆 Caliber & Extra Work",
+        "📅 Yearly Calendar"
+    ])
+    
+    with weekend_tab1:
+        st.markdown("### 📅 Multi-Weekend Planning System")
+        st.caption("Schedule different users for different weekends and track custom work")
+        
+        # Multi-weekend scheduling
+        _weekend_schedule_grid(conn)
+        
+        all_users = get_all_users(conn)
+        
+        # Custom work tracker
+        with st.expander("📋 Custom Work Tracker", expanded=False):
+            st.markdown("**Add Custom Weekend Work:**")
+            st.caption("Track extra tasks beyond regular culture maintenance")
+            
+            custom_col1, custom_col2 = st.columns(2)
+            
+            with custom_col1:
+                custom_task_type = st.selectbox(
+                    "Task Type:",
+                    ["Equipment Maintenance", "Lab Cleanup", "Inventory Count", "Training", "Documentation", "Protocol Development", "Other"],
+                    key="custom_task_type"
+                )
+                
+                if custom_task_type == "Other":
+                    custom_task_type = st.text_input("Specify task type:", key="custom_task_other")
+                
+                custom_description = st.text_area("Task Description:", height=80, key="custom_task_desc")
+                custom_hours = st.number_input("Estimated Hours:", min_value=0.5, max_value=8.0, step=0.5, key="custom_task_hours")
+            
+            with custom_col2:
+                custom_assignee = st.selectbox("Assigned To:", options=all_users if all_users else ["No users"], key="custom_task_assignee")
+                custom_date = st.date_input("Date:", key="custom_task_date")
+                custom_priority = st.selectbox("Priority:", ["Low", "Medium", "High", "Critical"], key="custom_task_priority")
+                
+                if st.button("➕ Add Custom Work", key="add_custom_work"):
+                    if custom_task_type and custom_description and custom_assignee != "No users":
+                        # Store custom work in database
+                        current_user = st.session_state.get("my_name", "Unknown")
+                        
+                        custom_work = {
+                            "type": custom_task_type,
+                            "description": custom_description,
+                            "hours": custom_hours,
+                            "assignee": custom_assignee,
+                            "date": custom_date.isoformat(),
+                            "priority": custom_priority
+                        }
+                        
+                        if pool.run_write(save_custom_weekend_work, custom_work, current_user):
+                            st.success(f"✅ Added custom work: {custom_task_type} for {custom_assignee}")
+                            st.rerun()  # Refresh to show updated custom work
+                        else:
+                            st.error("Failed to save custom work")
+                    else:
+                        st.error("Please fill in all required fields")
+        
+        # Quick Friday setup
+        with st.expander("🚀 Quick Friday Setup", expanded=True):
+            st.markdown("**Fast track for creating weekend entries on Friday:**")
+            
+            quick_col1, quick_col2, quick_col3 = st.columns(3)
+            
+            with quick_col1:
+                # Get upcoming weekend dates
+                today = datetime.now()
+                days_to_saturday = (5 - today.weekday()) % 7
+                if days_to_saturday == 0 and today.weekday() == 5:  # If today is Saturday
+                    days_to_saturday = 7
+                
+                saturday = today + timedelta(days=days_to_saturday)
+                sunday = saturday + timedelta(days=1)
+                
+                st.info(f"""
+                **This Weekend:**  
+                📅 Saturday: {saturday.strftime('%Y-%m-%d')} ({saturday.strftime('%B %d')})  
+                📅 Sunday: {sunday.strftime('%Y-%m-%d')} ({sunday.strftime('%B %d')})
+                """)
+            
+            with quick_col2:
+                st.markdown("**Weekend Assignees:**")
+                all_users = get_all_users(conn)
+                
+                if all_users:
+                    weekend_assignee = st.selectbox("Who's working this weekend?", options=all_users, key="weekend_assignee")
+                    # Auto-set the session state when assignee is selected
+                    if weekend_assignee:
+                        st.session_state['selected_weekend_assignee'] = weekend_assignee
+                        st.session_state['selected_weekend_saturday'] = saturday.strftime('%Y-%m-%d')
+                        st.session_state['selected_weekend_sunday'] = sunday.strftime('%Y-%m-%d')
+                        st.success(f"✅ Weekend assignee set: {weekend_assignee}")
+                        st.info("💡 This assignee will auto-fill in Add Entry tab for faster logging!")
+                else:
+                    weekend_assignee = st.text_input("Weekend assignee:", key="weekend_assignee_manual")
+                    # Auto-set the session state when assignee is entered
+                    if weekend_assignee:
+                        st.session_state['selected_weekend_assignee'] = weekend_assignee
+                        st.session_state['selected_weekend_saturday'] = saturday.strftime('%Y-%m-%d')
+                        st.session_state['selected_weekend_sunday'] = sunday.strftime('%Y-%m-%d')
+            
+            with quick_col3:
+                st.markdown("**Quick Actions:**")
+                
+                if st.button("📋 View Current Tasks", key="view_current_weekend"):
+                    st.session_state['show_current_weekend'] = True
+                    st.rerun()
+        
+        # Display current weekend tasks if requested
+        if st.session_state.get('show_current_weekend'):
+            st.markdown("---")
+            st.markdown("### 📋 Current Weekend Tasks")
+            
+            weekend_tasks = get_weekend_tasks(conn, saturday.strftime('%Y-%m-%d'), sunday.strftime('%Y-%m-%d'))
+            
+            if weekend_tasks:
+                # Group by assignee
+                assignees = {}
+                for task in weekend_tasks:
+                    assignee = task.get('assigned_to', 'Unassigned')
+                    if assignee not in assignees:
+                        assignees[assignee] = []
+                    assignees[assignee].append(task)
+                
+                for assignee, tasks in assignees.items():
+                    with st.expander(f"👤 {assignee} ({len(tasks)} tasks)", expanded=True):
+                        task_data = []
+                        for task in tasks:
+                            task_data.append({
+                                'Date': task['next_action_date'],
+                                'Cell Line': task['cell_line'],
+                                'Task': task['event_type'],
+                                'Current Vessel': task.get('current_vessel', 'N/A'),
+                                'Current Medium': task.get('current_medium', 'N/A'),
+                                'Current Passage': f"P{task.get('current_passage', 'N/A')}",
+                                'Location': task.get('current_location', 'N/A'),
+                                'Notes': (task.get('notes', '') or '')[:50] + "..." if len(task.get('notes', '') or '') > 50 else task.get('notes', '')
+                            })
+                        
+                        if task_data:
+                            task_df = pd.DataFrame(task_data)
+                            st.dataframe(task_df, width='stretch')
+            else:
+                st.info("No weekend tasks scheduled yet. Use the Add Entry tab to schedule tasks.")
+
+        # Media Volume Calculator
+        st.markdown("---")
+        with st.expander("🧪 Weekend Media Volume Calculator", expanded=False):
+            st.markdown("**Calculate total media volumes needed for weekend culture maintenance**")
+            
+            calc_col1, calc_col2 = st.columns(2)
+            
+            with calc_col1:
+                st.markdown("**📅 Weekend Date Range:**")
+                calc_start_date = st.date_input("Start Date (Saturday):", value=saturday.date(), key="media_calc_start")
+                calc_end_date = st.date_input("End Date (Sunday):", value=sunday.date(), key="media_calc_end")
+                
+                st.markdown("**🧬 Filter Options:**")
+                calc_cell_lines = st.text_input("Cell lines (comma-separated, leave empty for all):", key="calc_cell_lines")
+                calc_locations = st.text_input("Locations (comma-separated, leave empty for all):", key="calc_locations")
+            
+            with calc_col2:
+                st.markdown("**⚗️ Media Types to Calculate:**")
+                
+                # Get all culture media from database
+                media_options = get_ref_values(conn, "culture_medium")
+                if not media_options:
+                    media_options = ["E8", "mTeSR1", "TeSR-E8", "DMEM/F12", "Custom"]
+                
+                selected_media = st.multiselect("Select media types:", media_options, default=media_options[:3], key="calc_media")
+                
+                st.markdown("**📊 Safety Margins:**")
+                safety_margin = st.slider("Safety margin (%)", min_value=0, max_value=50, value=20, key="calc_margin")
+                extra_days = st.number_input("Extra prep days", min_value=0, max_value=3, value=1, key="calc_extra")
+            
+            if st.button("🧮 Calculate Media Volumes", key="calc_volumes"):
+                try:
+                    # Query active cultures and upcoming weekend tasks
+                    weekend_calc_query = """
+                    SELECT DISTINCT 
+                        l.cell_line,
+                        l.medium,
+                        l.volume,
+                        l.location,
+                        l.vessel,
+                        l.event_type,
+                        l.assigned_to,
+                        l.next_action_date
+                    FROM logs l
+                    WHERE (
+                        (l.next_action_date BETWEEN ? AND ?) OR
+                        (l.event_type IN ('Media Change', 'Split', 'Observation') AND 
+                         l.date >= date('now', '-7 days'))
+                    )
+                    AND l.medium IS NOT NULL 
+                    AND l.volume > 0
+                    ORDER BY l.cell_line, l.medium
+                    """
+                    
+                    results = conn.execute(weekend_calc_query, (calc_start_date.isoformat(), calc_end_date.isoformat())).fetchall()
+                    
+                    if results:
+                        # Filter by cell lines if specified
+                        if calc_cell_lines.strip():
+                            filter_cell_lines = [cl.strip() for cl in calc_cell_lines.split(',')]
+                            results = [r for r in results if any(fcl in r[0] for fcl in filter_cell_lines)]
+                        
+                        # Filter by locations if specified
+                        if calc_locations.strip():
+                            filter_locations = [loc.strip() for loc in calc_locations.split(',')]
+                            results = [r for r in results if any(floc in r[3] for floc in filter_locations)]
+                        
+                        # Calculate volumes by media type
+                        media_volumes = {}
+                        culture_details = []
+                        
+                        for row in results:
+                            cell_line, medium, volume, location, vessel, event_type, assigned_to, next_action = row
+                            
+                            if medium in selected_media:
+                                # Estimate daily volume needs based on event type
+                                daily_volume = volume
+                                if event_type == 'Media Change':
+                                    daily_volume = volume * 1.0  # Full media change
+                                elif event_type == 'Split':
+                                    daily_volume = volume * 1.5  # Additional volume for splitting
+                                else:
+                                    daily_volume = volume * 0.5  # Partial change for observation
+                                
+                                # Calculate weekend needs (2 days + extra days)
+                                weekend_volume = daily_volume * (2 + extra_days)
+                                
+                                if medium not in media_volumes:
+                                    media_volumes[medium] = 0
+                                media_volumes[medium] += weekend_volume
+                                
+                                culture_details.append({
+                                    'Cell Line': cell_line,
+                                    'Medium': medium,
+                                    'Location': location,
+                                    'Current Volume': f"{volume} mL",
+                                    'Est. Weekend Need': f"{weekend_volume:.1f} mL",
+                                    'Next Action': next_action or 'TBD',
+                                    'Assigned To': assigned_to or 'Unassigned'
+                                })
+                        
+                        if media_volumes:
+                            st.markdown("### 📊 Weekend Media Volume Summary")
+                            
+                            # Display summary metrics
+                            summary_col1, summary_col2, summary_col3 = st.columns(3)
+                            
+                            total_volume = sum(media_volumes.values())
+                            total_with_margin = total_volume * (1 + safety_margin/100)
+                            
+                            with summary_col1:
+                                st.metric("Total Base Volume", f"{total_volume:.1f} mL")
+                            with summary_col2:
+                                st.metric("With Safety Margin", f"{total_with_margin:.1f} mL")
+                            with summary_col3:
+                                st.metric("Media Types", len(media_volumes))
+                            
+                            # Volume breakdown by media type
+                            st.markdown("### 🧪 Volume Breakdown by Media Type")
+                            
+                            media_summary = []
+                            for medium, base_vol in media_volumes.items():
+                                vol_with_margin = base_vol * (1 + safety_margin/100)
+                                media_summary.append({
+                                    'Media Type': medium,
+                                    'Base Volume (mL)': f"{base_vol:.1f}",
+                                    f'With {safety_margin}% Margin (mL)': f"{vol_with_margin:.1f}",
+                                    'Recommended Prep (mL)': f"{int(vol_with_margin/50)*50 + 50}"  # Round up to nearest 50mL
+                                })
+                            
+                            media_df = pd.DataFrame(media_summary)
+                            st.dataframe(media_df, width='stretch')
+                            
+                            # Detailed culture breakdown
+                            st.markdown("### 📋 Detailed Culture Requirements")
+                            if culture_details:
+                                culture_df = pd.DataFrame(culture_details)
+                                st.dataframe(culture_df, width='stretch')
+                            
+                            # Preparation checklist
+                            st.markdown("### ✅ Preparation Checklist")
+                            st.markdown("**Friday Media Preparation:**")
+                            for medium, base_vol in media_volumes.items():
+                                vol_with_margin = base_vol * (1 + safety_margin/100)
+                                prep_vol = int(vol_with_margin/50)*50 + 50
+                                st.markdown(f"- [ ] **{medium}**: Prepare {prep_vol} mL (includes {safety_margin}% safety margin)")
+                            
+                            st.markdown("**Additional Reminders:**")
+                            st.markdown("- [ ] Check media expiration dates")
+                            st.markdown("- [ ] Ensure adequate incubator space")
+                            st.markdown("- [ ] Prepare sterile plasticware")
+                            st.markdown("- [ ] Warm media to 37°C before use")
+                            
+                        else:
+                            st.warning("No cultures found requiring the selected media types for the specified weekend.")
+                    else:
+                        st.info("No cultures found for the specified weekend period. Add some weekend tasks first!")
+                        
+                except Exception as e:
+                    st.error(f"Error calculating media volumes: {str(e)}")
+
+    with weekend_tab2:
+        st.markdown("### ✅ Execute Weekend Tasks")
+        st.caption("Mark tasks as completed and add notes")
+        
+        # Select date and assignee for task execution
+        exec_col1, exec_col2 = st.columns(2)
+        
+        with exec_col1:
+            exec_date = st.date_input("Select Date:", value=date.today(), key="exec_date")
+        
+        with exec_col2:
+            all_users = get_all_users(conn)
+            
+            if all_users:
+                exec_assignee = st.selectbox("Assignee:", options=["All"] + all_users, key="exec_assignee")
+            else:
+                exec_assignee = st.text_input("Assignee:", key="exec_assignee_manual")
+        
+        # Get tasks for the selected date
+        if exec_assignee and exec_assignee != "All":
+            tasks = get_weekend_tasks(conn, exec_date.isoformat(), exec_date.isoformat(), exec_assignee)
+        else:
+            tasks = get_weekend_tasks(conn, exec_date.isoformat(), exec_date.isoformat())
+        
+        if tasks:
+            st.markdown(f"### 📋 Tasks for {exec_date.strftime('%A, %B %d, %Y')}")
+            
+            for i, task in enumerate(tasks):
+                with st.expander(f"🧬 {task['cell_line']} - {task['event_type']} (P{task.get('current_passage', 'N/A')})", expanded=True):
+                    # Task details
+                    detail_col1, detail_col2 = st.columns(2)
+                    
+                    with detail_col1:
+                        st.markdown(f"""
+                        **Assignee:** {task.get('assigned_to', 'N/A')}  
+                        **Current Vessel:** {task.get('current_vessel', 'N/A')}  
+                        **Current Medium:** {task.get('current_medium', 'N/A')}  
+                        **Location:** {task.get('current_location', 'N/A')}
+                        """)
+                    
+                    with detail_col2:
+                        st.markdown(f"""
+                        **Thaw ID:** {task.get('thaw_id', 'N/A')}  
+                        **Culture Days:** {task.get('culture_days', 'N/A')}  
+                        **Original Notes:** {task.get('notes', 'None')}
+                        """)
+                    
+                    # Task instructions
+                    instructions = get_weekend_task_instructions(task['event_type'], task.get('current_passage'))
+                    
+                    inst_col1, inst_col2 = st.columns(2)
+                    
+                    with inst_col1:
+                        st.markdown("**📋 Instructions:**")
+                        st.info(f"**Summary:** {instructions['summary']}")
+                        st.caption(f"**Time:** {instructions['time_estimate']}")
+                        
+                        with st.expander("📝 Detailed Steps", expanded=False):
+                            for step in instructions['steps']:
+                                st.write(step)
+                            
+                            if instructions.get('critical_notes'):
+                                st.warning(f"⚠️ {instructions['critical_notes']}")
+                    
+                    with inst_col2:
+                        st.markdown("**✅ Mark as Completed:**")
+                        
+                        completion_notes = st.text_area(
+                            "Completion Notes:",
+                            placeholder="Add observations, issues, or modifications made...",
+                            key=f"completion_notes_{task['id']}"
+                        )
+                        
+                        if st.button(f"Mark Completed ✅", key=f"complete_{task['id']}"):
+                            if pool.run_write(mark_weekend_task_completed, task['id'], completion_notes):
+                                st.success("✅ Task marked as completed!")
+                                st.rerun()
+                            else:
+                                st.error("❌ Failed to mark task as completed")
+        else:
+            if exec_assignee:
+                st.info(f"No tasks found for {exec_assignee} on {exec_date.strftime('%A, %B %d, %Y')}")
+            else:
+                st.info("Select an assignee to view their tasks")
+    
+    with weekend_tab3:
+        st.markdown("### 📊 Weekend Summary & Analytics")
+        
+        # Summary date range
+        summary_col1, summary_col2 = st.columns(2)
+        
+        with summary_col1:
+            summary_start = st.date_input("From Date:", value=date.today() - timedelta(days=7), key="summary_start")
+        
+        with summary_col2:
+            summary_end = st.date_input("To Date:", value=date.today(), key="summary_end")
+        
+        # Get weekend tasks in range
+        all_weekend_tasks = get_weekend_tasks(conn, summary_start.isoformat(), summary_end.isoformat())
+        
+        if all_weekend_tasks:
+            # Summary metrics
+            total_tasks = len(all_weekend_tasks)
+            completed_tasks = len([t for t in all_weekend_tasks if not t.get('next_action_date')])
+            pending_tasks = total_tasks - completed_tasks
+            
+            metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+            
+            with metric_col1:
+                st.metric("Total Tasks", total_tasks)
+            with metric_col2:
+                st.metric("Completed", completed_tasks)
+            with metric_col3:
+                st.metric("Pending", pending_tasks)
+            with metric_col4:
+                completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+                st.metric("Completion Rate", f"{completion_rate:.1f}%")
+            
+            # Task breakdown by assignee
+            st.markdown("### 👥 Tasks by Assignee")
+            
+            assignee_stats = {}
+            for task in all_weekend_tasks:
+                assignee = task.get('assigned_to', 'Unassigned')
+                if assignee not in assignee_stats:
+                    assignee_stats[assignee] = {'total': 0, 'completed': 0}
+                assignee_stats[assignee]['total'] += 1
+                if not task.get('next_action_date'):
+                    assignee_stats[assignee]['completed'] += 1
+            
+            assignee_data = []
+            for assignee, stats in assignee_stats.items():
+                completion_rate = (stats['completed'] / stats['total'] * 100) if stats['total'] > 0 else 0
+                assignee_data.append({
+                    'Assignee': assignee,
+                    'Total Tasks': stats['total'],
+                    'Completed': stats['completed'],
+                    'Pending': stats['total'] - stats['completed'],
+                    'Completion Rate': f"{completion_rate:.1f}%"
+                })
+            
+            if assignee_data:
+                assignee_df = pd.DataFrame(assignee_data)
+                st.dataframe(assignee_df, width='stretch')
+            
+            # Task type breakdown
+            st.markdown("### 📋 Tasks by Type")
+            
+            task_types = {}
+            for task in all_weekend_tasks:
+                task_type = task.get('event_type', 'Unknown')
+                if task_type not in task_types:
+                    task_types[task_type] = 0
+                task_types[task_type] += 1
+            
+            if task_types:
+                type_data = [{'Task Type': k, 'Count': v} for k, v in task_types.items()]
+                type_df = pd.DataFrame(type_data)
+                st.dataframe(type_df, width='stretch')
+            
+            # Recent weekend activity
+            st.markdown("### 📅 Recent Weekend Activity")
+            
+            # Group by date
+            activity_by_date = {}
+            for task in all_weekend_tasks:
+                task_date = task.get('next_action_date', 'Unknown')
+                if task_date not in activity_by_date:
+                    activity_by_date[task_date] = []
+                activity_by_date[task_date].append(task)
+            
+            for task_date in sorted(activity_by_date.keys(), reverse=True)[:5]:  # Show last 5 dates
+                tasks_on_date = activity_by_date[task_date]
+                completed_on_date = len([t for t in tasks_on_date if not t.get('next_action_date')])
+                
+                with st.expander(f"📅 {task_date} ({len(tasks_on_date)} tasks, {completed_on_date} completed)", expanded=False):
+                    date_data = []
+                    for task in tasks_on_date:
+                        status = "✅ Completed" if not task.get('next_action_date') else "⏳ Pending"
+                        date_data.append({
+                            'Status': status,
+                            'Assignee': task.get('assigned_to', 'N/A'),
+                            'Cell Line': task['cell_line'],
+                            'Task': task['event_type'],
+                            'Vessel': task.get('current_vessel', 'N/A'),
+                            'Notes': (task.get('notes', '') or '')[:50] + "..." if len(task.get('notes', '') or '') > 50 else task.get('notes', '')
+                        })
+                    
+                    if date_data:
+                        date_df = pd.DataFrame(date_data)
+                        st.dataframe(date_df, width='stretch')
+        else:
+            st.info("No weekend tasks found in the selected date range.")
+    
+    with weekend_tab4:
+        st.markdown("### 🏆 Caliber System & Extra Work Tracking")
+        st.caption("Track user performance, extra work hours, and calculate weekend contributions")
+        
+        # Caliber tracking section
+        _caliber_editor(conn)
+        
+        # Extra work calculation
+        with st.expander("📈 Extra Work & Overtime Calculation", expanded=True):
+            st.markdown("**Weekend Work Summary:**")
+            
+            calc_col1, calc_col2 = st.columns(2)
+            
+            with calc_col1:
+                # Date range for calculation
+                calc_start = st.date_input("Calculate from:", value=date.today() - timedelta(days=30), key="calc_start")
+                calc_end = st.date_input("Calculate to:", value=date.today(), key="calc_end")
+                
+                if st.button("🧮 Calculate Extra Work"):
+                    # Get all weekend tasks in range
+                    range_tasks = get_weekend_tasks(conn, calc_start.isoformat(), calc_end.isoformat())
+                    
+                    # Get custom work from database in date range
+                    custom_work = get_custom_weekend_work(conn, calc_start.isoformat(), calc_end.isoformat())
+                    
+                    # Get user calibers from database
+                    user_calibers_db = get_user_calibers(conn)
+                    
+                    # Calculate by user
+                    user_summaries = {}
+                    
+                    # Regular weekend tasks
+                    for task in range_tasks:
+                        assignee = task.get('assigned_to', 'Unassigned')
+                        if assignee not in user_summaries:
+                            user_summaries[assignee] = {
+                                'regular_tasks': 0,
+                                'custom_hours': 0,
+                                'estimated_hours': 0,
+                                'caliber': user_calibers_db.get(assignee, "Standard")
+                            }
+                        user_summaries[assignee]['regular_tasks'] += 1
+                    
+                    # Custom work hours
+                    for work in custom_work:
+                        assignee = work.get('assignee', 'Unassigned')
+                        if assignee not in user_summaries:
+                            user_summaries[assignee] = {
+                                'regular_tasks': 0,
+                                'custom_hours': 0,
+                                'estimated_hours': 0,
+                                'caliber': user_calibers_db.get(assignee, "Standard")
+                            }
+                        user_summaries[assignee]['custom_hours'] += work.get('hours', 0)
+                    
+                    # Calculate estimated hours
+                    caliber_multipliers = {"Trainee": 1.5, "Standard": 1.0, "Advanced": 0.8, "Expert": 0.6, "Lead": 0.5}
+                    base_hours_per_task = 0.5
+                    
+                    for user, summary in user_summaries.items():
+                        multiplier = caliber_multipliers.get(summary['caliber'], 1.0)
+                        summary['estimated_hours'] = summary['regular_tasks'] * base_hours_per_task * multiplier
+                    
+                    # Store results
+                    st.session_state["work_calculation_results"] = user_summaries
+                    st.session_state["calculation_period"] = f"{calc_start} to {calc_end}"
+            
+            with calc_col2:
+                # Display results
+                if "work_calculation_results" in st.session_state:
+                    st.markdown(f"**Results for {st.session_state['calculation_period']}:**")
+                    
+                    results_data = []
+                    total_hours = 0
+                    
+                    for user, summary in st.session_state["work_calculation_results"].items():
+                        total_user_hours = summary['estimated_hours'] + summary['custom_hours']
+                        total_hours += total_user_hours
+                        
+                        results_data.append({
+                            'User': user,
+                            'Caliber': summary['caliber'],
+                            'Tasks': summary['regular_tasks'],
+                            'Task Hours': f"{summary['estimated_hours']:.1f}",
+                            'Custom Hours': f"{summary['custom_hours']:.1f}",
+                            'Total Hours': f"{total_user_hours:.1f}"
+                        })
+                    
+                    if results_data:
+                        results_df = pd.DataFrame(results_data)
+                        st.dataframe(results_df, width='stretch')
+                        
+                        st.success(f"**Total Weekend Work: {total_hours:.1f} hours**")
+                        
+                        # Export option
+                        if st.button("📊 Export Results"):
+                            csv = results_df.to_csv(index=False)
+                            st.download_button(
+                                label="💾 Download CSV",
+                                data=csv,
+                                file_name=f"weekend_work_summary_{calc_start}_{calc_end}.csv",
+                                mime="text/csv"
+                            )
+                else:
+                    st.info("Click 'Calculate Extra Work' to see results")
+        
+        # Custom work display
+        _custom_work_log(conn)
+    
+    with weekend_tab5:
+        st.markdown("### 📅 Yearly Weekend Calendar")
+        st.caption("Plan and manage weekend assignments for the entire year")
+        
+        # Year selection
+        current_year = date.today().year
+        selected_year = st.selectbox("Select Year:", options=[current_year, current_year + 1], index=0, key="calendar_year")
+        
+        # Calendar view controls
+        cal_col1, cal_col2 = st.columns([3, 1])
+        
+        with cal_col1:
+            st.markdown(f"**Weekend Schedule for {selected_year}:**")
+        
+        with cal_col2:
+            if st.button("🔄 Refresh Calendar", key="refresh_calendar"):
+                st.rerun()
+        
+        # Create yearly calendar grid
+        import calendar
+        
+        # Get all weekend schedules for the year
+        year_start = f"{selected_year}-01-01"
+        year_end = f"{selected_year}-12-31"
+        all_schedules = get_weekend_schedules(conn)
+        schedule_dict = {s['weekend_date']: s['assignee'] for s in all_schedules}
+        
+        all_users = get_all_users(conn)
+        current_user = st.session_state.get("my_name", "Unknown")
+        
+        # Create monthly calendar grids
+        for month in range(1, 13):
+            month_name = calendar.month_name[month]
+            
+            with st.expander(f"📅 {month_name} {selected_year}", expanded=month == date.today().month if selected_year == current_year else False):
+                st.markdown(f"**Weekend Assignments for {month_name}:**")
+                
+                # Get all Saturdays in the month
+                cal = calendar.Calendar(firstweekday=calendar.MONDAY)
+                month_days = list(cal.itermonthdates(selected_year, month))
+                saturdays = [d for d in month_days if d.weekday() == 5 and d.month == month]
+                
+                if saturdays:
+                    # Create a grid for the month's weekends
+                    weekend_cols = st.columns(min(len(saturdays), 4))  # Max 4 columns
+                    
+                    for i, saturday in enumerate(saturdays):
+                        col_index = i % 4
+                        
+                        with weekend_cols[col_index]:
+                            saturday_str = saturday.strftime('%Y-%m-%d')
+                            sunday = saturday + timedelta(days=1)
+                            
+                            # Weekend date display
+                            st.write(f"**{saturday.strftime('%b %d')} - {sunday.strftime('%b %d')}**")
+                            st.caption(f"Week {saturday.isocalendar()[1]}")
+                            
+                            # Current assignee
+                            current_assignee = schedule_dict.get(saturday_str, "(unassigned)")
+                            
+                            # Assignment selector
+                            if all_users:
+                                assignee_options = ["(unassigned)"] + all_users
+                                
+                                selected_assignee = st.selectbox(
+                                    "Assignee:",
+                                    options=assignee_options,
+                                    index=assignee_options.index(current_assignee) if current_assignee in assignee_options else 0,
+                                    key=f"cal_assignee_{saturday_str}"
+                                )
+                                
+                                # Save to database when selection changes
+                                if selected_assignee != current_assignee:
+                                    if selected_assignee != "(unassigned)":
+                                        # Assigning someone new or changing assignment
+                                        if pool.run_write(save_weekend_schedule, saturday_str, selected_assignee, current_user):
+                                            st.success(f"✅ Assigned {selected_assignee} to {saturday_str}")
+                                            # Update the schedule dict for immediate UI feedback
+                                            schedule_dict[saturday_str] = selected_assignee
+                                            st.rerun()
+                                    else:
+                                        # Removing assignment - implement deletion
+                                        try:
+                                            if pool.run_write(delete_weekend_schedule, saturday_str):
+                                                st.success(f"✅ Removed assignment for {saturday_str}")
+                                                # Update the schedule dict for immediate UI feedback
+                                                if saturday_str in schedule_dict:
+                                                    del schedule_dict[saturday_str]
+                                                st.rerun()
+                                        except:
+                                            st.info("Assignment removal not yet implemented")
+                            else:
+                                st.write("No users available")
+                            
+                            # Quick planning button
+                            if st.button("📝 Set Active", key=f"cal_plan_{saturday_str}"):
+                                if current_assignee != "(unassigned)":
+                                    st.session_state['selected_weekend_assignee'] = current_assignee
+                                    st.session_state['selected_weekend_saturday'] = saturday_str
+                                    st.session_state['selected_weekend_sunday'] = sunday.strftime('%Y-%m-%d')
+                                    st.success(f"✅ Set {current_assignee} as active weekend assignee")
+                                else:
+                                    st.warning("Please assign someone first")
+                else:
+                    st.info("No weekends in this month")
+        
+        # Summary section
+        st.markdown("### 📊 Year Summary")
+        
+        # Count assignments by user
+        year_assignments = {}
+        year_schedules = [s for s in all_schedules if s['weekend_date'].startswith(str(selected_year))]
+        
+        for schedule in year_schedules:
+            assignee = schedule['assignee']
+            if assignee not in year_assignments:
+                year_assignments[assignee] = 0
+            year_assignments[assignee] += 1
+        
+        if year_assignments:
+            summary_data = []
+            for assignee, count in year_assignments.items():
+                summary_data.append({
+                    'User': assignee,
+                    'Weekend Assignments': count,
+                    'Percentage': f"{count/len(year_schedules)*100:.1f}%" if year_schedules else "0%"
+                })
+            
+            summary_df = pd.DataFrame(summary_data)
+            st.dataframe(summary_df, width='stretch')
+            
+            # Export option
+            if st.button("📊 Export Year Schedule"):
+                csv = summary_df.to_csv(index=False)
+                st.download_button(
+                    label="💾 Download Year Summary CSV",
+                    data=csv,
+                    file_name=f"weekend_schedule_{selected_year}.csv",
+                    mime="text/csv"
+                )
+        else:
+            st.info(f"No weekend assignments scheduled for {selected_year}")
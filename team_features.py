@@ -7,7 +7,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
 from auth import get_current_user, get_user_team, is_admin, is_pro_user
-from db import get_conn, query_logs
+from db import read_connection, query_logs, log_records_frame
 
 def apply_team_filter(logs, user_info=None):
     """Apply team-based filtering to logs based on user permissions"""
@@ -71,8 +71,8 @@ def show_team_dashboard():
     
     with col3:
         # Team activity (last 7 days)
-        conn = get_conn()
-        recent_logs = query_logs(conn, start_date=date.today() - timedelta(days=7))
+        with read_connection() as conn:
+            recent_logs = query_logs(conn, start_date=date.today() - timedelta(days=7), columns=['operator'])
         team_logs = apply_team_filter(recent_logs, user_info)
         st.metric("Team Activity (7d)", len(team_logs))
     
@@ -100,7 +100,6 @@ def show_team_activity(user_info):
     """Show team activity overview"""
     st.subheader("📊 Team Activity Overview")
     
-    conn = get_conn()
     user_team = get_user_team(user_info)
     
     if not user_team:
@@ -115,14 +114,15 @@ def show_team_activity(user_info):
         end_date = st.date_input("End Date", value=date.today())
     
     # Get team data
-    logs = query_logs(conn, start_date=start_date, end_date=end_date)
+    with read_connection() as conn:
+        logs = query_logs(conn, start_date=start_date, end_date=end_date)
     team_logs = apply_team_filter(logs, user_info)
     
     if not team_logs:
         st.info("No team activity in the selected date range")
         return
     
-    df = pd.DataFrame(team_logs)
+    df = log_records_frame(team_logs)
     df['date'] = pd.to_datetime(df['date'])
     
     # Team member activity breakdown
@@ -162,12 +162,12 @@ def show_shared_experiments(user_info):
     """Show shared experiments within the team"""
     st.subheader("🧬 Shared Experiments")
     
-    conn = get_conn()
-    logs = query_logs(conn)
+    with read_connection() as conn:
+        logs = query_logs(conn)
     team_logs = apply_team_filter(logs, user_info)
     
     # Find experiments with multiple contributors
-    df = pd.DataFrame(team_logs)
+    df = log_records_frame(team_logs)
     
     if 'thaw_id' not in df.columns or df['thaw_id'].isna().all():
         st.info("No shared experiments found")
@@ -224,7 +224,6 @@ def show_team_performance(user_info):
         st.warning("Team performance metrics are available for Pro users")
         return
     
-    conn = get_conn()
     user_team = get_user_team(user_info)
     
     if not user_team:
@@ -232,14 +231,15 @@ def show_team_performance(user_info):
         return
     
     # Get team data for last 90 days
-    logs = query_logs(conn, start_date=date.today() - timedelta(days=90))
+    with read_connection() as conn:
+        logs = query_logs(conn, start_date=date.today() - timedelta(days=90))
     team_logs = apply_team_filter(logs, user_info)
     
     if not team_logs:
         st.info("No team data available")
         return
     
-    df = pd.DataFrame(team_logs)
+    df = log_records_frame(team_logs)
     df['date'] = pd.to_datetime(df['date'])
     
     # Performance metrics
@@ -335,8 +335,12 @@ def show_collaboration_features(user_info):
     # Recent team activity feed
     st.write("### 🔄 Recent Team Activity")
     
-    conn = get_conn()
-    recent_logs = query_logs(conn, start_date=date.today() - timedelta(days=7))
+    with read_connection() as conn:
+        recent_logs = query_logs(
+            conn,
+            start_date=date.today() - timedelta(days=7),
+            columns=['date', 'operator', 'event_type', 'cell_line'],
+        )
     team_logs = apply_team_filter(recent_logs, user_info)
     
     if team_logs:
@@ -387,10 +391,9 @@ def get_team_filtered_data(table_name, user_info=None):
     if not user_info:
         return []
     
-    conn = get_conn()
-    
     if table_name == 'logs':
-        logs = query_logs(conn)
+        with read_connection() as conn:
+            logs = query_logs(conn)
         return apply_team_filter(logs, user_info)
     
     # For other tables, implement similar filtering logic
@@ -406,5 +409,9 @@ def show_team_selector():
     
     return selected_team if selected_team != 'All Teams' else None
 
+def render(conn=None):
+    """Section entry point for the app navigation; reads check out their own pooled readers"""
+    show_team_dashboard()
+
 if __name__ == "__main__":
     show_team_dashboard()
\ No newline at end of file
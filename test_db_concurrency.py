@@ -0,0 +1,253 @@
+"""
+Tests for the shared-connection machinery in db.py: the pool's writer
+ownership, WriteQueue group commits, the cached_read layer, the changes
+feed and the database/image backup round trip.
+
+Each test runs against its own temporary database.
+Run with: python -m pytest test_db_concurrency.py
+"""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+import db
+
+
+def _log(day, thaw_id, event_type="Observation", **extra):
+    payload = {
+        "date": day, "cell_line": "WTC-11", "event_type": event_type, "passage": 3, "thaw_id": thaw_id,
+        "operator": "alice", "created_by": "alice", "created_at": f"{day}T09:00:00",
+    }
+    payload.update(extra)
+    return payload
+
+
+def _names(pool, table="cell_lines"):
+    with pool.reader() as conn:
+        return sorted(r[0] for r in conn.execute(f"SELECT name FROM {table}"))
+
+
+@pytest.fixture
+def pool(tmp_path):
+    path = str(tmp_path / "live.db")
+    pool = db.ConnectionPool(path, readers=2)
+    with pool.writer() as conn:
+        db.init_db(conn)
+    yield pool
+    pool.close()
+    # backup_database() snapshots through the process-wide pool for its path
+    db.close_pools()
+
+
+@pytest.fixture
+def queued_pool(tmp_path):
+    path = str(tmp_path / "queued.db")
+    pool = db.ConnectionPool(path, readers=2, use_write_queue=True)
+    with pool.writer() as conn:
+        db.init_db(conn)
+    yield pool
+    pool.close()
+
+
+def test_bare_writer_use_cannot_commit_another_threads_transaction(pool):
+    inside, release = threading.Event(), threading.Event()
+
+    def half_written():
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO cell_lines (name, created_at) VALUES ('half', 'now')")
+            inside.set()
+            release.wait(5)
+            raise RuntimeError("failed after the first statement")
+
+    worker = threading.Thread(target=lambda: pytest.raises(RuntimeError, half_written))
+    worker.start()
+    assert inside.wait(5)
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.add_ref_value(pool.writer_connection, "cell_line", "other")
+    release.set()
+    worker.join(5)
+    assert "half" not in _names(pool)
+    pool.run_write(db.add_ref_value, "cell_line", "other")
+    assert "other" in _names(pool)
+
+
+def test_reader_is_shared_by_nested_blocks_on_one_thread(pool):
+    with pool.reader() as outer:
+        with pool.reader() as inner:
+            assert inner is outer
+        with pytest.raises(sqlite3.OperationalError):
+            outer.execute("INSERT INTO cell_lines (name, created_at) VALUES ('x', 'now')")
+    assert pool.stats()["reader_checkouts"] == 1
+
+
+def test_reader_checkout_times_out_when_every_reader_is_busy(tmp_path):
+    pool = db.ConnectionPool(str(tmp_path / "busy.db"), readers=1, reader_timeout_ms=50)
+    with pool.writer() as conn:
+        db.init_db(conn)
+    holding, release = threading.Event(), threading.Event()
+
+    def hold_reader():
+        with pool.reader():
+            holding.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=hold_reader)
+    worker.start()
+    assert holding.wait(5)
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="DB_POOL_READERS"):
+            with pool.reader():
+                pass
+    finally:
+        release.set()
+        worker.join(5)
+    with pool.reader() as conn:
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+    assert pool.stats()["reader_timeouts"] == 1
+    pool.close()
+
+
+def test_write_queue_commits_a_group_and_undoes_only_the_failing_write(queued_pool):
+    def failing(conn):
+        conn.execute("INSERT INTO cell_lines (name, created_at) VALUES ('doomed', 'now')")
+        raise ValueError("rejected")
+
+    queue = queued_pool.write_queue()
+    futures = [queue.submit(db.add_ref_value, "cell_line", f"line-{i}") for i in range(20)]
+    futures.insert(10, queue.submit(failing))
+    for future in futures[:10] + futures[11:]:
+        future.result(5)
+    with pytest.raises(ValueError):
+        futures[10].result(5)
+    assert _names(queued_pool) == sorted(f"line-{i}" for i in range(20))
+    stats = queue.stats()
+    assert stats["completed"] == 20 and stats["failed"] == 1
+    assert stats["groups"] <= 21
+
+
+def test_other_threads_cannot_roll_back_an_open_group(queued_pool):
+    inside, release = threading.Event(), threading.Event()
+
+    def slow(conn):
+        conn.execute("INSERT INTO cell_lines (name, created_at) VALUES ('slow', 'now')")
+        inside.set()
+        release.wait(5)
+
+    queue = queued_pool.write_queue()
+    first = queue.submit(slow)
+    second = queue.submit(db.add_ref_value, "cell_line", "second")
+    assert inside.wait(5)
+    conn = queued_pool.writer_connection
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.rollback()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.commit()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("INSERT INTO cell_lines (name, created_at) VALUES ('sneaked', 'now')")
+    release.set()
+    first.result(5)
+    second.result(5)
+    assert _names(queued_pool) == ["second", "slow"]
+
+
+def test_cached_read_is_invalidated_by_any_commit(pool, tmp_path):
+    with pool.reader() as conn:
+        assert db.get_ref_values(conn, "vessel") == []
+        assert db.get_ref_values(conn, "vessel") == []
+    assert pool.read_cache.stats()["hits"] == 1
+
+    pool.run_write(db.add_ref_value, "vessel", "T75")
+    with pool.reader() as conn:
+        assert db.get_ref_values(conn, "vessel") == ["T75"]
+
+    # A commit from another connection (another process) moves data_version
+    other = sqlite3.connect(pool.db_path)
+    db.add_ref_value(other, "vessel", "Flask")
+    other.close()
+    with pool.reader() as conn:
+        assert db.get_ref_values(conn, "vessel") == ["Flask", "T75"]
+
+
+def test_changes_feed_replays_inserts_updates_and_deletes(pool):
+    start = pool.run_write(db.latest_change_seq)
+    log_id = pool.run_write(db.insert_log, _log("2025-03-01", "TH-A", "Thawing"))
+    pool.run_write(db.update_log, log_id, {"notes": "healthy"})
+    pool.run_write(db.delete_log, log_id)
+    with pool.reader() as conn:
+        changes = db.changes_since(conn, start, tables=["logs"])
+    assert [(c["op"], c["row_id"]) for c in changes] == [("insert", log_id), ("update", log_id), ("delete", log_id)]
+    assert changes[1]["payload"]["notes"] == "healthy"
+
+    removed = pool.run_write(db.compact_changes)
+    with pool.reader() as conn:
+        assert [c["op"] for c in db.changes_since(conn, start, tables=["logs"])] == ["delete"]
+    assert removed >= 2
+
+
+def test_database_and_image_backups_round_trip(pool, tmp_path):
+    dest = str(tmp_path / "backups")
+    images = tmp_path / "images"
+    images.mkdir()
+    (images / "a.png").write_bytes(b"first image")
+    (images / "b.png").write_bytes(b"second image")
+    pool.run_write(db.insert_log, _log("2025-03-01", "TH-A", "Thawing"))
+
+    report = db.backup_database(dest, pool.db_path, pages_per_step=1, step_sleep_ms=0)
+    assert all(r["ok"] for r in db.verify_backups(dest))
+    assert report["page_count"] > 0
+
+    first = db.backup_images(dest, str(images), prune=False)
+    assert first["new_objects"] == 2
+    (images / "c.png").write_bytes(b"third image")
+    second = db.backup_images(dest, str(images), prune=False)
+    assert second["new_objects"] == 1 and second["hashed"] == 1
+
+    target = tmp_path / "restored"
+    result = db.restore_images(str(target), dest_root=dest)
+    assert result["restored"] == 3 and not result["missing"]
+    for name in ("a.png", "b.png", "c.png"):
+        assert (target / name).read_bytes() == (images / name).read_bytes()
+
+    # Only the newest generation is retained; its objects must survive the prune
+    os.remove(images / "a.png")
+    db.backup_images(dest, str(images), prune=False)
+    db.prune_image_backups(dest, hourly=1, daily=0, weekly=0)
+    restored = db.restore_images(str(tmp_path / "after-prune"), dest_root=dest)
+    assert restored["restored"] == 2 and not restored["missing"]
+
+
+def test_prune_waits_for_a_backup_in_progress(tmp_path, monkeypatch):
+    dest = str(tmp_path / "backups")
+    images = tmp_path / "images"
+    images.mkdir()
+    (images / "old.png").write_bytes(b"old image")
+    db.backup_images(dest, str(images), prune=False)
+    os.remove(images / "old.png")
+    (images / "new.png").write_bytes(b"new image")
+
+    hashing, release = threading.Event(), threading.Event()
+    real_sha256 = db._file_sha256
+
+    def slow_sha256(path):
+        hashing.set()
+        release.wait(5)
+        return real_sha256(path)
+
+    monkeypatch.setattr(db, "_file_sha256", slow_sha256)
+    backup = threading.Thread(target=db.backup_images, args=(dest, str(images)), kwargs={"prune": False})
+    backup.start()
+    assert hashing.wait(5)
+    pruned = []
+    prune = threading.Thread(target=lambda: pruned.extend(db.prune_image_backups(dest, hourly=1, daily=0, weekly=0)))
+    prune.start()
+    prune.join(0.2)
+    assert prune.is_alive()
+    release.set()
+    backup.join(5)
+    prune.join(5)
+    assert len(pruned) == 1
+    restored = db.restore_images(str(tmp_path / "restored"), dest_root=dest)
+    assert restored["restored"] == 1 and not restored["missing"]
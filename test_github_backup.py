@@ -0,0 +1,160 @@
+"""
+Tests for the incremental GitHub backup against a local bare repository.
+
+A temporary database is backed up into a bare repo, changed, backed up again,
+and rebuilt from the branch. The rebuilt tables must match the source.
+Run with: python -m pytest test_github_backup.py
+"""
+
+import shutil
+import sqlite3
+import subprocess
+import time
+
+import pytest
+
+import db
+from github_backup import CHANGE_TRACKED_TABLES, SNAPSHOT_TABLES, GitHubBackup
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _log(day, thaw_id, event_type="Observation", **extra):
+    payload = {
+        "date": day, "cell_line": "WTC-11", "event_type": event_type, "passage": 3, "thaw_id": thaw_id,
+        "operator": "alice", "created_by": "alice", "created_at": f"{day}T09:00:00",
+    }
+    payload.update(extra)
+    return payload
+
+
+def _table_dump(path):
+    conn = sqlite3.connect(path)
+    try:
+        dump = {}
+        for table in tuple(CHANGE_TRACKED_TABLES) + SNAPSHOT_TABLES + ("vial_state",):
+            columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+            dump[table] = sorted(conn.execute(f"SELECT {', '.join(columns)} FROM {table}"), key=repr)
+        return dump
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def setup(tmp_path):
+    remote = tmp_path / "remote.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    path = str(tmp_path / "live.db")
+    pool = db.ConnectionPool(path, readers=0)
+    db.init_db(pool.writer_connection)
+    db.insert_logs_many(pool.writer_connection, [_log("2025-03-01", "TH-A", "Thawing"), _log("2025-03-02", "TH-A")])
+    db.add_ref_value(pool.writer_connection, "location", "Incubator 1")
+    backup = GitHubBackup(path, repo_url=str(remote), clone_dir=str(tmp_path / "clone"))
+    yield tmp_path, remote, path, pool, backup
+    backup.stop(timeout=5)
+    pool.close()
+    # Change-log compaction writes through the process-wide pool for the path
+    db.close_pools()
+
+
+def _branch_files(remote, branch="db-backup"):
+    out = subprocess.run(
+        ["git", "--git-dir", str(remote), "ls-tree", "-r", "--name-only", branch],
+        check=True, capture_output=True, text=True,
+    )
+    return out.stdout.split()
+
+
+def test_base_then_delta_then_unchanged(setup):
+    tmp_path, remote, path, pool, backup = setup
+    assert backup.backup_to_github(force=True)
+    assert backup.stats()["last_result"] == "base"
+    assert _branch_files(remote) == ["BACKUP.json", "base.ndjson.gz"]
+
+    conn = pool.writer_connection
+    log_id = db.insert_log(conn, _log("2025-03-04", "TH-A", "Split", notes="split 1:6"))
+    db.update_log(conn, log_id, {"notes": "split 1:8"})
+    db.add_ref_value(conn, "vessel", "T75")
+    assert backup.backup_to_github(force=True)
+    stats = backup.stats()
+    assert stats["last_result"] == "delta"
+    assert stats["changes"] == 3
+    assert [f for f in _branch_files(remote) if f.startswith("deltas/")]
+
+    assert backup.backup_to_github(force=True)
+    assert backup.stats()["last_result"] == "unchanged"
+    for key in ("snapshot_ms", "delta_ms", "git_ms", "total_ms"):
+        assert backup.stats()[key] is not None
+
+
+def _change_seqs(conn):
+    return [r[0] for r in conn.execute("SELECT seq FROM changes ORDER BY seq")]
+
+
+def test_pushed_changes_are_compacted_and_deltas_continue(setup):
+    tmp_path, remote, path, pool, backup = setup
+    conn = pool.writer_connection
+    assert _change_seqs(conn)
+    assert backup.backup_to_github(force=True)
+    assert _change_seqs(conn) == []
+    assert backup.stats()["compacted"] > 0
+
+    log_id = db.insert_log(conn, _log("2025-03-04", "TH-A", "Split"))
+    pushed = db.latest_change_seq(conn)
+    assert backup.backup_to_github(force=True)
+    assert backup.stats()["last_result"] == "delta" and backup.stats()["changes"] == 1
+    assert _change_seqs(conn) == []
+
+    # Rows written after the push stay until a later run backs them up
+    db.update_log(conn, log_id, {"notes": "not yet pushed"})
+    assert _change_seqs(conn) == [pushed + 1]
+    assert backup.backup_to_github(force=True)
+    assert backup.stats()["last_result"] == "delta"
+
+    restored = str(tmp_path / "restored.db")
+    GitHubBackup(restored, repo_url=str(remote), clone_dir=str(tmp_path / "clone2")).restore_snapshot()
+    assert _table_dump(restored) == _table_dump(path)
+
+
+def test_restore_rebuilds_tables_and_continues_the_change_log(setup):
+    tmp_path, remote, path, pool, backup = setup
+    conn = pool.writer_connection
+    assert backup.backup_to_github(force=True)
+    first = db.query_logs(conn)[0]["id"]
+    db.insert_log(conn, _log("2025-03-05", "TH-B", "Thawing", notes="fresh vial"))
+    db.update_log(conn, first, {"notes": "edited after the base"})
+    db.rename_ref_value(conn, "location", "Incubator 1", "Incubator 9")
+    db.save_user_caliber(conn, "bob", "Pro", "alice")
+    assert backup.backup_to_github(force=True)
+    db.delete_log(conn, first)
+    assert backup.backup_to_github(force=True)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    restored = str(tmp_path / "restored.db")
+    fresh = GitHubBackup(restored, repo_url=str(remote), clone_dir=str(tmp_path / "clone2"))
+    report = fresh.restore_snapshot()
+    assert report["deltas"] == 2
+    assert _table_dump(restored) == _table_dump(path)
+
+    check = sqlite3.connect(restored)
+    check.row_factory = sqlite3.Row
+    assert db.search_logs(check, "fresh")[0]["thaw_id"] == "TH-B"
+    assert db.latest_change_seq(check) == db.latest_change_seq(conn)
+    db.add_ref_value(check, "vessel", "Flask")
+    check.close()
+    assert fresh.backup_to_github(force=True)
+    assert fresh.stats()["last_result"] == "delta"
+
+
+def test_worker_runs_off_the_calling_thread(setup):
+    tmp_path, remote, path, pool, backup = setup
+    started = time.perf_counter()
+    backup.start(interval_minutes=60)
+    backup.request_backup()
+    assert time.perf_counter() - started < 1
+    deadline = time.time() + 30
+    while backup.stats()["runs"] == 0 and time.time() < deadline:
+        time.sleep(0.05)
+    stats = backup.stats()
+    assert stats["running"]
+    assert stats["last_result"] == "base", stats["last_error"]
@@ -0,0 +1,45 @@
+"""
+Tests for the History section's lab-book text formats.
+Run with: python -m pytest test_history_formats.py
+"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+
+from sections import history  # noqa: E402
+
+INCLUDE_ALL = ["📊 Passage numbers", "🧪 Vessels", "📍 Locations", "👤 Operators", "📝 Notes", "🕒 Time stamps"]
+FORMATS = [
+    history.generate_detailed_lab_format,
+    history.generate_compact_format,
+    history.generate_table_format,
+    history.generate_simple_list_format,
+]
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame([
+        {"ID": 1, "Date": "2025-03-01", "Cell Line": "WTC-11", "Event Type": "Thawing", "Passage": 3,
+         "Vessel": "T25", "Location": "Incubator 1", "Medium": "mTeSR1", "Operator": "alice",
+         "Notes": "healthy colonies", "Created": "2025-03-01T09:00:00"},
+        {"ID": 2, "Date": "2025-03-03", "Cell Line": "PGP1", "Event Type": "Split", "Passage": 4,
+         "Vessel": "T75", "Location": "Incubator 2", "Medium": "E8", "Operator": "bob",
+         "Notes": "", "Created": "2025-03-03T10:30:00"},
+    ])
+
+
+@pytest.mark.parametrize("fmt", FORMATS, ids=lambda f: f.__name__)
+def test_format_lists_every_entry(fmt, frame):
+    text = fmt(frame, INCLUDE_ALL)
+    assert isinstance(text, str)
+    for line, event in (("WTC-11", "Thawing"), ("PGP1", "Split")):
+        assert line in text and event in text
+    assert "healthy colonies" in text
+
+
+@pytest.mark.parametrize("fmt", FORMATS, ids=lambda f: f.__name__)
+def test_format_of_an_empty_frame(fmt):
+    assert fmt(pd.DataFrame(), INCLUDE_ALL) == "No entries to format."
@@ -0,0 +1,93 @@
+"""
+Tests for insert_logs_many(): per-row rejection, id mapping and the
+deferred vial_state refresh, against a temporary database.
+Run with: python -m pytest test_insert_logs_many.py
+"""
+
+import sqlite3
+
+import pytest
+
+import db
+
+
+def _log(day, thaw_id, event_type="Observation", **extra):
+    payload = {
+        "date": day, "cell_line": "WTC-11", "event_type": event_type, "passage": 3, "thaw_id": thaw_id,
+        "operator": "alice", "created_by": "alice", "created_at": f"{day}T09:00:00",
+    }
+    payload.update(extra)
+    return payload
+
+
+@pytest.fixture
+def conn(tmp_path):
+    pool = db.ConnectionPool(str(tmp_path / "bulk.db"), readers=0)
+    with pool.writer() as conn:
+        db.init_db(conn)
+        yield conn
+    pool.close()
+
+
+def test_unbindable_and_invalid_rows_are_reported_and_the_rest_inserted(conn):
+    payloads = [
+        _log("2025-03-01", "TH-A", "Thawing"),
+        _log("2025-03-02", "TH-A", passage=[1]),
+        _log("2025-03-03", "TH-A", notes="fine"),
+        {"date": "2025-03-04"},
+        _log("2025-03-05", "TH-B", "Thawing"),
+    ]
+    report = db.insert_logs_many(conn, payloads, batch_size=2)
+    assert report["inserted"] == 3
+    assert [e["index"] for e in report["errors"]] == [1, 3]
+    assert "passage" in report["errors"][0]["error"]
+    assert report["ids"][1] is None and report["ids"][3] is None
+
+
+def test_ids_map_to_their_own_rows(conn):
+    conn.execute("INSERT INTO logs (date, created_by, created_at) VALUES ('2025-01-01', 'x', 'x')")
+    conn.execute("DELETE FROM logs")
+    conn.commit()
+    payloads = [_log(f"2025-03-{d:02d}", "TH-A", notes=f"row {d}") for d in range(1, 8)]
+    report = db.insert_logs_many(conn, payloads, batch_size=3)
+    for payload, log_id in zip(payloads, report["ids"]):
+        assert db.get_log_by_id(conn, log_id)["notes"] == payload["notes"]
+
+
+def test_batches_refresh_vial_state_without_schema_changes(conn):
+    schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    db.insert_logs_many(conn, [
+        _log("2025-03-01", "TH-A", "Thawing", passage=4),
+        _log("2025-03-03", "TH-A", "Split", passage=5, vessel="T75"),
+    ])
+    assert conn.execute("PRAGMA schema_version").fetchone()[0] == schema_version
+    assert conn.execute("SELECT COUNT(*) FROM vial_state_deferred").fetchone()[0] == 0
+    state = conn.execute("SELECT last_passage, last_vessel FROM vial_state WHERE thaw_id = 'TH-A'").fetchone()
+    assert tuple(state) == (5, "T75")
+
+    # Single inserts still go through the per-row trigger
+    db.insert_log(conn, _log("2025-03-04", "TH-A", "Split", passage=6))
+    assert conn.execute("SELECT last_passage FROM vial_state WHERE thaw_id = 'TH-A'").fetchone()[0] == 6
+
+
+def test_an_open_transaction_is_not_committed_on_the_callers_behalf(conn):
+    conn.execute("INSERT INTO cell_lines (name, created_at) VALUES ('pending', 'now')")
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.insert_logs_many(conn, [_log("2025-03-01", "TH-A", "Thawing")])
+    conn.rollback()
+    assert conn.execute("SELECT COUNT(*) FROM cell_lines WHERE name = 'pending'").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0] == 0
+
+
+def test_payloads_are_not_modified(conn):
+    single = _log("2025-03-01", None, "Thawing", thaw_id_prefix="TH-20250301-AL-IP")
+    batch = [_log("2025-03-02", None, "Thawing", thaw_id_prefix="TH-20250302-AL-IP") for _ in range(2)]
+    before = [dict(single)] + [dict(p) for p in batch]
+
+    log_id = db.insert_log(conn, single)
+    report = db.insert_logs_many(conn, batch)
+    assert [single] + batch == before
+    assert db.get_log_by_id(conn, log_id)["thaw_id"] == "TH-20250301-AL-IP-001"
+    assert [db.get_log_by_id(conn, i)["thaw_id"] for i in report["ids"]] == [
+        "TH-20250302-AL-IP-001", "TH-20250302-AL-IP-002",
+    ]
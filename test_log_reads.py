@@ -0,0 +1,140 @@
+"""
+Tests for the log read paths: keyset paging, chunked streaming and the
+LogRecord rows they return, against a temporary database.
+Run with: python -m pytest test_log_reads.py
+"""
+
+import pickle
+from collections.abc import Mapping
+from datetime import date
+
+import pytest
+
+import db
+
+
+def _log(day, created_at, event_type="Observation", **extra):
+    payload = {
+        "date": day, "cell_line": "WTC-11", "event_type": event_type, "passage": 3, "thaw_id": "TH-A",
+        "operator": "alice", "created_by": "alice", "created_at": created_at,
+    }
+    payload.update(extra)
+    return payload
+
+
+@pytest.fixture
+def conn(tmp_path):
+    pool = db.ConnectionPool(str(tmp_path / "reads.db"), readers=0)
+    with pool.writer() as conn:
+        db.init_db(conn)
+        # Many rows per date and several per (date, created_at), inserted out of order
+        payloads = []
+        for n in range(60):
+            day = f"2025-03-{(n * 7) % 5 + 1:02d}"
+            created_at = f"{day}T09:00:0{n % 3}"
+            payloads.append(_log(day, created_at, ["Observation", "Split"][n % 2], notes=f"row {n}"))
+        db.insert_logs_many(conn, payloads)
+        yield conn
+    pool.close()
+
+
+def _keyset_order(conn, descending=False, **filters):
+    rows = db.query_logs(conn, **filters)
+    return sorted((r["id"] for r in rows), key=lambda i: _key(conn, i), reverse=descending)
+
+
+def _key(conn, log_id):
+    row = db.get_log_by_id(conn, log_id)
+    return (row["date"], row["created_at"], row["id"])
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("page_size", [1, 4, 7, 60, 100])
+def test_cursor_pages_have_no_duplicates_or_gaps(conn, descending, page_size):
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = db.query_logs_page(
+            conn, columns=["notes"], page_size=page_size, cursor=cursor, descending=descending
+        )
+        assert len(rows) <= page_size
+        seen.extend(r["id"] for r in rows)
+        if cursor is None:
+            break
+    assert seen == _keyset_order(conn, descending)
+
+
+def test_cursor_pages_with_a_filter(conn):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = db.query_logs_page(conn, page_size=5, cursor=cursor, event_type="Split")
+        assert all(r["event_type"] == "Split" for r in rows)
+        seen.extend(r["id"] for r in rows)
+        if cursor is None:
+            break
+    assert seen == _keyset_order(conn, event_type="Split")
+    assert len(seen) == 30
+
+
+def _values(records):
+    return [r.to_dict() for r in records]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 60, 5000])
+@pytest.mark.parametrize("filters", [None, {"event_type": "Split"}, {"start_date": date(2025, 3, 2), "end_date": date(2025, 3, 4)}])
+def test_iter_logs_yields_the_rows_of_query_logs(conn, chunk_size, filters):
+    chunks = list(db.iter_logs(conn, filters, chunk_size=chunk_size))
+    assert all(0 < len(chunk) <= chunk_size for chunk in chunks)
+    streamed = [record for chunk in chunks for record in chunk]
+    assert _values(streamed) == _values(db.query_logs(conn, **(filters or {})))
+
+
+def test_iter_logs_with_columns_and_no_matches(conn):
+    streamed = [r for chunk in db.iter_logs(conn, columns=["id", "notes"], chunk_size=9) for r in chunk]
+    assert _values(streamed) == _values(db.query_logs(conn, columns=["id", "notes"]))
+    assert list(db.iter_logs(conn, {"thaw_id": "TH-missing"})) == []
+    with pytest.raises(ValueError):
+        next(db.iter_logs(conn, chunk_size=0))
+
+
+@pytest.mark.parametrize("chunk_size", [7, 5000])
+def test_read_logs_frame_matches_query_logs(conn, chunk_size):
+    pd = pytest.importorskip("pandas")
+    names = ["id", "date", "cell_line", "event_type", "operator", "passage", "notes"]
+    frame = db.read_logs_frame(conn, {"event_type": "Split"}, columns=names, chunk_size=chunk_size)
+    assert str(frame["event_type"].dtype) == "category"
+    expected = db.log_records_frame(db.query_logs(conn, event_type="Split", columns=names), names)
+    pd.testing.assert_frame_equal(frame.astype(object), expected.astype(object))
+    assert db.read_logs_frame(conn, {"thaw_id": "TH-missing"}, columns=names).empty
+
+
+def test_log_record_reads_like_a_read_only_mapping(conn):
+    record = db.query_logs(conn, columns=["id", "date", "notes"], event_type="Split")[0]
+    row = dict(conn.execute("SELECT id, date, notes FROM logs WHERE id = ?", (record["id"],)).fetchone())
+
+    assert isinstance(record, Mapping)
+    assert dict(record) == record.to_dict() == row
+    assert list(record) == ["id", "date", "notes"] and len(record) == 3
+    assert record.date == record["date"] == record.get("date") == row["date"]
+    assert "notes" in record and "cell_line" not in record
+    assert record.get("cell_line") is None and record.get("cell_line", "n/a") == "n/a"
+    assert record == row
+    with pytest.raises(KeyError):
+        record["cell_line"]
+    with pytest.raises(AttributeError):
+        record.cell_line
+    with pytest.raises(TypeError):
+        record["notes"] = "edited"
+    assert not hasattr(record, "__dict__")
+
+
+def test_log_records_pickle_and_share_a_type_per_column_list(conn):
+    records = db.query_logs(conn, columns=["id", "notes"])
+    assert type(records[0]) is type(records[-1])
+    assert type(records[0]) is not type(db.query_logs(conn, columns=["id", "date"])[0])
+
+    copy = pickle.loads(pickle.dumps(records[0]))
+    assert copy.to_dict() == records[0].to_dict() and copy.notes == records[0].notes
+    full = db.query_logs(conn)[0]
+    assert list(full) == list(db.LOG_COLUMNS)
+    assert repr(records[0]).startswith("LogRecord({")
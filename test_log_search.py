@@ -0,0 +1,114 @@
+"""
+Tests for the full-text log search (logs_fts) behind search_logs() and the
+`text` filter of query_logs()/count_logs(), against a temporary database.
+Run with: python -m pytest test_log_search.py
+"""
+
+import re
+
+import pytest
+
+import db
+
+NOTES = [
+    "Contamination spotted in well B2",
+    "looks contaminated, discarded",
+    "Bacterial film on the lid",
+    "fungus near the edge",
+    "healthy colonies, no issues",
+    "Fungus-free after the media change",
+    None,
+    "",
+    "Split 1:6 with ReLeSR",
+]
+
+
+def _log(day, notes, **extra):
+    payload = {
+        "date": day, "cell_line": "WTC-11", "event_type": "Observation", "passage": 3,
+        "operator": "alice", "created_by": "alice", "created_at": f"{day}T09:00:00", "notes": notes,
+    }
+    payload.update(extra)
+    return payload
+
+
+@pytest.fixture
+def conn(tmp_path):
+    pool = db.ConnectionPool(str(tmp_path / "search.db"), readers=0)
+    with pool.writer() as conn:
+        db.init_db(conn)
+        yield conn
+    pool.close()
+
+
+def test_contamination_count_matches_notes_substring_search(conn):
+    payloads = [_log(f"2025-03-{i + 1:02d}", notes) for i, notes in enumerate(NOTES)]
+    # Keywords in other indexed columns must not count
+    payloads.append(_log("2025-03-20", "routine feed", cell_line="bacteria-reporter"))
+    payloads.append(_log("2025-03-21", "routine feed", protocol_reference="Fungus screen v2"))
+    payloads.append(_log("2025-03-22", "routine feed", experimental_conditions="contamination control"))
+    db.insert_logs_many(conn, payloads)
+
+    keywords = ['contamination', 'contaminated', 'bacteria', 'fungus']
+    expected = sum(
+        1 for p in payloads if p["notes"] and re.search("|".join(keywords), p["notes"], re.IGNORECASE)
+    )
+    assert db.count_logs(conn, text=" OR ".join(keywords), text_column="notes") == expected == 5
+
+
+def test_text_column_must_be_indexed():
+    with pytest.raises(ValueError):
+        db._fts_query("fungus", "operator")
+
+
+@pytest.fixture
+def notes_conn(conn):
+    db.insert_logs_many(conn, [_log(f"2025-03-{i + 1:02d}", notes) for i, notes in enumerate(NOTES)])
+    return conn
+
+
+def _hits(conn, query, **filters):
+    return sorted(r["notes"] for r in db.search_logs(conn, query, filters or None))
+
+
+def test_words_are_prefix_terms_and_anded(notes_conn):
+    assert _hits(notes_conn, "contam") == ["Contamination spotted in well B2", "looks contaminated, discarded"]
+    assert _hits(notes_conn, "CONTAM discard") == ["looks contaminated, discarded"]
+    assert _hits(notes_conn, "bacteria") == ["Bacterial film on the lid"]
+
+
+def test_quoted_phrases_match_their_words(notes_conn):
+    assert _hits(notes_conn, '"well B2"') == ["Contamination spotted in well B2"]
+    assert _hits(notes_conn, '"media change') == ["Fungus-free after the media change"]
+
+
+def test_or_and_not_operators(notes_conn):
+    assert _hits(notes_conn, "fungus OR bacterial") == [
+        "Bacterial film on the lid", "Fungus-free after the media change", "fungus near the edge",
+    ]
+    assert _hits(notes_conn, "fungus NOT free") == ["fungus near the edge"]
+    # Lower-case or/not and operators without a left-hand term are plain words
+    assert _hits(notes_conn, "fungus or edge") == []
+    assert _hits(notes_conn, "NOT healthy") == []
+    assert _hits(notes_conn, "healthy OR") == ["healthy colonies, no issues"]
+
+
+@pytest.mark.parametrize("query", [
+    "1:6", "B2)", "(fungus", '"', '""', "''", "*", "fungus*", "-fungus", "+healthy", "^lid",
+    "NEAR(fungus edge)", "notes: fungus", "cell_line:WTC", "OR", "NOT", "AND", "OR OR NOT", "fungus AND",
+    "Fungus-free", "a/b\\c", "{col}", "[x]", "100%", "µl", "Ø", "é", "#$@!", "   ", "", ";DROP TABLE logs;--",
+])
+def test_punctuation_heavy_input_never_reaches_fts5_as_syntax(notes_conn, query):
+    # Each of these would be a syntax error if passed to MATCH unescaped
+    db.search_logs(notes_conn, query)
+    db.search_logs(notes_conn, query, {"event_type": "Observation"})
+    db.query_logs(notes_conn, text=query)
+    db.count_logs(notes_conn, text=query)
+    db.count_logs(notes_conn, text=query, text_column="notes")
+    assert db.count_logs(notes_conn) == len(NOTES)
+
+
+def test_search_text_filter_agrees_with_search_logs(notes_conn):
+    for query in ("contam", "fungus OR bacterial", '"well B2"', "1:6 ReLeSR"):
+        assert sorted(r["notes"] for r in db.query_logs(notes_conn, text=query)) == _hits(notes_conn, query)
+        assert db.count_logs(notes_conn, text=query) == len(_hits(notes_conn, query))
@@ -0,0 +1,70 @@
+"""
+Tests for the numbered schema migrations: a database stopped at any step must
+keep working, and upgrading it must give the schema of a fresh database.
+Run with: python -m pytest test_migrations.py
+"""
+
+import sqlite3
+
+import pytest
+
+import db
+
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _insert_raw_log(conn, day, thaw_id, event_type, passage):
+    conn.execute(
+        "INSERT INTO logs (date, cell_line, event_type, passage, thaw_id, created_by, created_at)"
+        " VALUES (?, 'WTC-11', ?, ?, ?, 'alice', ?)",
+        (day, event_type, passage, thaw_id, f"{day}T09:00:00"),
+    )
+    conn.commit()
+
+
+def _schema(conn):
+    columns = [r["name"] for r in conn.execute("PRAGMA table_info(vial_state)")]
+    triggers = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'logs' ORDER BY name"
+    ).fetchall())
+    return sorted(columns), triggers
+
+
+def _vial_state(conn):
+    return [tuple(r) for r in conn.execute("SELECT * FROM vial_state ORDER BY thaw_id")]
+
+
+@pytest.mark.parametrize("stop_at", [3, 6, 11])
+def test_database_stopped_at_a_step_keeps_working_and_upgrades(tmp_path, monkeypatch, stop_at):
+    conn = _connect(str(tmp_path / "old.db"))
+    monkeypatch.setattr(db, "MIGRATIONS", db.MIGRATIONS[:stop_at])
+    db._run_migrations(conn)
+    assert db.get_schema_version(conn) == stop_at
+    _insert_raw_log(conn, "2025-03-01", "TH-A", "Thawing", 3)
+    assert conn.execute("SELECT current_passage FROM vial_state WHERE thaw_id = 'TH-A'").fetchone()[0] == 3
+
+    monkeypatch.undo()
+    db.init_db(conn)
+    assert db.get_schema_version(conn) == db.SCHEMA_VERSION
+    _insert_raw_log(conn, "2025-03-04", "TH-A", "Split", 4)
+    upgraded = _vial_state(conn)
+    db.rebuild_vial_state(conn)
+    assert _vial_state(conn) == upgraded
+
+    fresh = _connect(str(tmp_path / "fresh.db"))
+    db.init_db(fresh)
+    assert _schema(conn) == _schema(fresh)
+    fresh.close()
+    conn.close()
+
+
+def test_migrations_do_not_print(tmp_path, capsys):
+    conn = _connect(str(tmp_path / "quiet.db"))
+    db.init_db(conn)
+    conn.close()
+    assert capsys.readouterr().out == ""
+    assert [m["version"] for m in db.get_migration_report()["applied"]] == [m[0] for m in db.MIGRATIONS]
@@ -0,0 +1,216 @@
+"""
+EXPLAIN QUERY PLAN regression tests for the query functions in db.py.
+
+Each case calls a public db function against a seeded temporary database,
+captures the SQL it runs and fails when a statement reading logs or
+vial_state scans the whole table or sorts through a temp B-tree.
+Run with: python -m pytest test_query_plans.py
+"""
+
+import random
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import db
+
+TODAY = date.today()
+WINDOW_START = (TODAY - timedelta(days=3)).isoformat()
+WINDOW_END = (TODAY + timedelta(days=3)).isoformat()
+
+
+def _seed_payloads(vials: int = 40, events_per_vial: int = 12):
+    rnd = random.Random(13)
+    payloads = []
+    for v in range(vials):
+        thaw_id = f"TH-20250101-{v:03d}"
+        cell_line = rnd.choice(["WTC-11", "KOLF2.1J", "PGP1"])
+        day = TODAY - timedelta(days=rnd.randint(10, 90))
+        created = datetime(2025, 1, 1) + timedelta(minutes=v)
+        payloads.append({
+            "date": day.isoformat(), "cell_line": cell_line, "event_type": "Thawing", "passage": 1,
+            "thaw_id": thaw_id, "operator": "alice", "created_by": "alice", "created_at": created.isoformat(),
+        })
+        for i in range(events_per_vial):
+            day += timedelta(days=rnd.randint(0, 3))
+            payloads.append({
+                "date": day.isoformat(),
+                "cell_line": cell_line,
+                "event_type": rnd.choice(["Observation", "Media Change", "Split", "Protocol Completion"]),
+                "passage": rnd.randint(1, 20),
+                "vessel": rnd.choice(["T25", "6-well"]),
+                "medium": rnd.choice(["E8", "mTeSR1"]),
+                "location": rnd.choice(["Incubator 1", "Incubator 2"]),
+                "operator": rnd.choice(["alice", "bob"]),
+                "thaw_id": thaw_id,
+                "assigned_to": rnd.choice([None, "alice", "bob"]),
+                "next_action_date": (TODAY + timedelta(days=rnd.randint(-5, 5))).isoformat(),
+                "experiment_type": rnd.choice([None, "Cardiac Differentiation"]),
+                "notes": rnd.choice(["healthy colonies", "some spontaneous differentiation", None]),
+                "created_by": "alice",
+                "created_at": (created + timedelta(hours=i + 1)).isoformat(),
+            })
+    return payloads
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("plans") / "plans.db")
+    pool = db.ConnectionPool(path, readers=0)
+    db.init_db(pool.writer_connection)
+    db.insert_logs_many(pool.writer_connection, _seed_payloads())
+    db.save_custom_weekend_work(pool.writer_connection, {
+        "type": "Media prep", "description": "", "hours": 1, "assignee": "bob",
+        "date": TODAY.isoformat(), "priority": "Low",
+    }, "alice")
+    pool.close()
+    # A plain connection bypasses the read cache, so every call really runs its SQL
+    plain = sqlite3.connect(path)
+    plain.row_factory = sqlite3.Row
+    yield plain
+    plain.close()
+
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+(logs|vial_state)\b(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_NOT_ALIASES = {"WHERE", "JOIN", "LEFT", "INNER", "ON", "ORDER", "GROUP", "LIMIT", "USING", "AS"}
+
+
+def _captured_plans(conn, func, *args, **kwargs):
+    """(sql, plan lines, table names/aliases) for every logs/vial_state read the call runs."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        func(conn, *args, **kwargs)
+    finally:
+        conn.set_trace_callback(None)
+    plans = []
+    for sql in statements:
+        if not re.match(r"\s*(SELECT|WITH)\b", sql, re.IGNORECASE):
+            continue
+        names = set()
+        for table, alias in _TABLE_REF.findall(sql):
+            names.add(table)
+            if alias and alias.upper() not in _NOT_ALIASES:
+                names.add(alias)
+        if not names:
+            continue
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        plans.append((sql, plan, names))
+    return plans
+
+
+def _problems(plan, names, allow):
+    problems = []
+    for line in plan:
+        scan = re.match(r"SCAN (\w+)(.*)$", line)
+        if scan and scan.group(1) in names and "USING" not in scan.group(2) and "scan" not in allow:
+            problems.append(line)
+        if "USE TEMP B-TREE" in line and "sort" not in allow:
+            problems.append(line)
+    return problems
+
+
+# (id, function name, args, kwargs, allow). allow names what is inherent to the
+# query: "sort" for ordering by an aggregate, a relevance score or FTS hits (or
+# grouping one vial's events, or merging the seeks of a "contains" filter's
+# matching values), and "scan" for reads that visit every row.
+CASES = [
+    ("query_logs-all", "query_logs", (), {}, ""),
+    ("query_logs-dates", "query_logs", (), {"start_date": TODAY - timedelta(days=30), "end_date": TODAY}, ""),
+    ("query_logs-event", "query_logs", (), {"event_type": "Split"}, ""),
+    ("query_logs-user", "query_logs", (), {"user": "alice"}, ""),
+    ("query_logs-thaw", "query_logs", (), {"thaw_id": "TH-20250101-001"}, ""),
+    ("query_logs-text", "query_logs", (), {"text": "spontaneous"}, "sort"),
+    ("count_logs-dates", "count_logs", (), {"start_date": TODAY - timedelta(days=7)}, ""),
+    ("query_logs_page-desc", "query_logs_page", (), {"descending": True, "page_size": 20}, ""),
+    ("query_logs_page-cursor", "query_logs_page", (), {"cursor": (WINDOW_START, "2025-01-01T00:00:00", 5)}, ""),
+    ("iter_logs-dates", "iter_logs", (), {}, ""),
+    ("history_page", "history_page", (), {}, ""),
+    ("history_page-operator", "history_page", ({"operator": "bob"},), {}, ""),
+    ("history_page-medium", "history_page", ({"medium": "mTeSR1", "min_passage": 3},), {"page": 2}, ""),
+    ("history_page-location", "history_page", ({"location": "Incubator 1"},), {}, ""),
+    ("history_page-vessel", "history_page", ({"vessel": "T25", "exclude_event_type": "Cryopreservation"},), {}, ""),
+    ("history_page-sort-passage", "history_page", (), {"sort": "passage", "descending": False}, ""),
+    ("history_page-sort-line-after", "history_page", (), {"sort": "cell_line", "after": ("PGP1", WINDOW_START, "2025-01-01T00:00:00", 5)}, ""),
+    ("history_page-sort-medium-after-null", "history_page", (), {"sort": "medium", "descending": False, "after": (None, WINDOW_START, "2025-01-01T00:00:00", 5)}, ""),
+    ("history_page-cell-line-contains", "history_page", ({"cell_line_contains": "wtc"},), {}, "sort"),
+    ("history_page-assigned-contains", "history_page", ({"assigned_to_contains": "bo", "cell_line_contains": "1"},), {}, "sort"),
+    ("history_summary-cell-line-contains", "history_summary", ({"cell_line_contains": "pgp"},), {}, "sort"),
+    ("history_summary-event", "history_summary", ({"event_type": "Split", "start_date": TODAY - timedelta(days=30)},), {}, "sort"),
+    ("search_logs", "search_logs", ("healthy",), {"filters": {"event_type": "Split"}}, "sort"),
+    ("list_distinct_thaw_ids", "list_distinct_thaw_ids", (), {}, ""),
+    ("get_active_thaw_options", "get_active_thaw_options", (), {}, ""),
+    ("get_active_thaw_options-line", "get_active_thaw_options", ("WTC-11",), {}, ""),
+    ("get_thaw_latest_info", "get_thaw_latest_info", ("TH-20250101-002",), {}, ""),
+    ("get_last_log_for_cell_line", "get_last_log_for_cell_line", ("WTC-11",), {}, ""),
+    ("get_last_log_for_line_event", "get_last_log_for_line_event", ("WTC-11", "Split"), {}, ""),
+    ("get_recent_logs_for_cell_line", "get_recent_logs_for_cell_line", ("PGP1",), {}, ""),
+    ("predict_next_passage", "predict_next_passage", ("PGP1",), {}, ""),
+    ("suggest_next_event", "suggest_next_event", ("PGP1",), {}, ""),
+    ("list_distinct_values-line", "list_distinct_values", ("vessel",), {"cell_line": "WTC-11"}, "sort"),
+    ("top_values", "top_values", ("medium",), {"cell_line": "PGP1"}, "sort"),
+    ("get_recent_entries_by_operator", "get_recent_entries_by_operator", ("bob",), {}, ""),
+    ("get_log_by_id", "get_log_by_id", (3,), {}, ""),
+    ("get_template_entries", "get_template_entries", ("WTC-11", "Split"), {}, "sort"),
+    ("get_entries_by_pattern", "get_entries_by_pattern", (), {"cell_line": "WTC-11", "vessel": "T25"}, ""),
+    ("get_vial_lifecycle", "get_vial_lifecycle", ("TH-20250101-003",), {}, ""),
+    ("get_vial_analytics", "get_vial_analytics", ("TH-20250101-003",), {}, ""),
+    ("get_experimental_journey", "get_experimental_journey", ("TH-20250101-003",), {}, "sort"),
+    ("get_experiment_recommendations", "get_experiment_recommendations", ("TH-20250101-003",), {}, "sort"),
+    ("get_vial_state", "get_vial_state", ("TH-20250101-004",), {}, ""),
+    ("get_active_vials", "get_active_vials", (), {"days_threshold": 30}, ""),
+    ("get_vial_alerts", "get_vial_alerts", ("TH-20250101-004",), {}, ""),
+    ("evaluate_alerts-all", "evaluate_alerts", (), {}, "scan"),
+    ("evaluate_alerts-some", "evaluate_alerts", (["TH-20250101-004", "TH-20250101-005"],), {}, ""),
+    ("get_experiment_statistics", "get_experiment_statistics", (), {}, "sort"),
+    ("get_experiment_success_rate", "get_experiment_success_rate", ("Cardiac Differentiation",), {}, "sort"),
+    ("get_weekend_tasks", "get_weekend_tasks", (WINDOW_START, WINDOW_END), {}, "sort"),
+    ("get_weekend_tasks-assignee", "get_weekend_tasks", (WINDOW_START, WINDOW_END, "bob"), {}, "sort"),
+    ("get_task_window", "get_task_window", (TODAY.isoformat(),), {}, ""),
+    ("get_task_window-range", "get_task_window", (WINDOW_START, WINDOW_END), {}, ""),
+    ("get_task_window-assignee", "get_task_window", (TODAY.isoformat(), None, "bob"), {}, ""),
+    ("get_task_window-capped", "get_task_window", (WINDOW_START, WINDOW_END, "bob"), {"limit": 5}, ""),
+    ("get_weekend_task_summary", "get_weekend_task_summary", ("bob", TODAY.isoformat()), {}, "sort"),
+    ("create_weekend_checklist", "create_weekend_checklist", ("bob", TODAY.isoformat()), {}, "sort"),
+]
+
+
+@pytest.mark.parametrize("func_name,args,kwargs,allow", [c[1:] for c in CASES], ids=[c[0] for c in CASES])
+def test_hot_query_uses_indexes(conn, func_name, args, kwargs, allow):
+    func = getattr(db, func_name)
+    if func_name == "iter_logs":
+        func = lambda c: list(db.iter_logs(c, {"start_date": TODAY - timedelta(days=14)}, chunk_size=50))
+    plans = _captured_plans(conn, func, *args, **kwargs)
+    assert plans, f"{func_name} ran no query against logs or vial_state"
+    for sql, plan, names in plans:
+        problems = _problems(plan, names, allow)
+        assert not problems, f"{func_name}: {problems}\nSQL: {sql.strip()}\nPLAN: {plan}"
+
+
+def test_superseded_indexes_are_gone(conn):
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    superseded = set(db._SUPERSEDED_INDEXES) | set(db._SUPERSEDED_DAY_INDEXES)
+    expected = {name for name, _ in db._QUERY_INDEXES + db._DAY_COLUMN_INDEXES + db._HISTORY_INDEXES + db._HISTORY_SORT_INDEXES} - superseded
+    assert expected <= names
+    assert not names & superseded
+
+
+@pytest.mark.parametrize("assigned_to", [None, "bob"])
+def test_task_window_totals_count_past_the_cap(conn, assigned_to):
+    owner = " AND assigned_to = ?" if assigned_to else ""
+    params = (assigned_to,) if assigned_to else ()
+    overdue = conn.execute(
+        f"SELECT COUNT(*) FROM logs WHERE next_action_date < ?{owner}", (TODAY.isoformat(),) + params
+    ).fetchone()[0]
+    upcoming = conn.execute(
+        f"SELECT COUNT(*) FROM logs WHERE next_action_date >= ?{owner}", (TODAY.isoformat(),) + params
+    ).fetchone()[0]
+    assert overdue > 5 and upcoming > 5
+
+    capped = db.get_task_window(conn, TODAY.isoformat(), assigned_to=assigned_to, limit=5)
+    assert len(capped["overdue"]) == len(capped["upcoming"]) == 5
+    assert (capped["overdue_total"], capped["upcoming_total"]) == (overdue, upcoming)
+    full = db.get_task_window(conn, TODAY.isoformat(), assigned_to=assigned_to, limit=10000)
+    assert (full["overdue_total"], full["upcoming_total"]) == (len(full["overdue"]), len(full["upcoming"])) == (overdue, upcoming)
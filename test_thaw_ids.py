@@ -0,0 +1,72 @@
+"""
+Tests for thaw ID allocation: IDs reserved by concurrent writers through
+thaw_id_sequences must never collide or skip numbers.
+Run with: python -m pytest test_thaw_ids.py
+"""
+
+import sqlite3
+import threading
+from datetime import date
+
+import db
+
+PREFIX = db.thaw_id_prefix(date(2025, 3, 1), "Alice Smith", "iPSC")
+
+
+def _thaw(prefix=PREFIX):
+    return {
+        "date": "2025-03-01", "cell_line": "WTC-11", "event_type": "Thawing", "passage": 3,
+        "operator": "Alice Smith", "created_by": "alice", "created_at": "2025-03-01T09:00:00",
+        "thaw_id_prefix": prefix,
+    }
+
+
+def test_concurrent_writers_get_unique_consecutive_thaw_ids(tmp_path):
+    path = str(tmp_path / "thaw.db")
+    setup = sqlite3.connect(path)
+    db.init_db(setup)
+    setup.close()
+
+    start = threading.Barrier(6)
+    failures = []
+
+    def single_inserts():
+        # A connection of its own, like a second app process
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            start.wait()
+            for _ in range(15):
+                db.insert_log(conn, _thaw())
+        except Exception as e:
+            failures.append(e)
+        finally:
+            conn.close()
+
+    def batch_inserts():
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            start.wait()
+            for _ in range(3):
+                report = db.insert_logs_many(conn, [_thaw() for _ in range(5)], batch_size=2)
+                assert not report["errors"]
+        except Exception as e:
+            failures.append(e)
+        finally:
+            conn.close()
+
+    workers = [threading.Thread(target=single_inserts) for _ in range(4)]
+    workers += [threading.Thread(target=batch_inserts) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    assert not failures
+
+    check = sqlite3.connect(path)
+    thaw_ids = [r[0] for r in check.execute("SELECT thaw_id FROM logs")]
+    next_value = check.execute("SELECT next_value FROM thaw_id_sequences WHERE prefix = ?", (PREFIX,)).fetchone()[0]
+    check.close()
+    total = 4 * 15 + 2 * 3 * 5
+    assert len(thaw_ids) == len(set(thaw_ids)) == total
+    assert sorted(thaw_ids) == [f"{PREFIX}-{n:03d}" for n in range(1, total + 1)]
+    assert next_value == total + 1
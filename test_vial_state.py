@@ -0,0 +1,157 @@
+"""
+Tests for the trigger-maintained vial_state summary and evaluate_alerts():
+both must agree with recomputing from the logs, against a temporary database
+filled with randomized culture histories.
+Run with: python -m pytest test_vial_state.py
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import db
+
+EVENTS = ["Observation", "Split", "Media Change", "Split", "Observation", "Cryopreservation"]
+VESSELS = ["T25", "T75", "6-well", "", None]
+MEDIA = ["mTeSR1", "E8", "StemFlex", None]
+LOCATIONS = ["Incubator 1", "Incubator 2", "", None]
+
+
+def _random_log(rng, thaw_id, serial, event_type=None):
+    day = date(2025, 1, 1) + timedelta(days=rng.randrange(120))
+    return {
+        "date": day.isoformat(),
+        "cell_line": rng.choice(["WTC-11", "PGP1", "KOLF2.1J"]),
+        "event_type": event_type or rng.choice(EVENTS),
+        "passage": rng.choice([None, 0] + list(range(1, 16))),
+        "vessel": rng.choice(VESSELS),
+        "medium": rng.choice(MEDIA),
+        "location": rng.choice(LOCATIONS),
+        "thaw_id": thaw_id,
+        "operator": "alice",
+        "created_by": "alice",
+        # Unique per row, so every ordering of a vial's events is unambiguous
+        "created_at": f"{day.isoformat()}T{serial // 3600 % 24:02d}:{serial // 60 % 60:02d}:{serial % 60:02d}",
+    }
+
+
+def _seed(conn, rng, vials=25, events=400):
+    thaw_ids = [f"TH-20250101-{n:03d}" for n in range(1, vials + 1)]
+    serial = iter(range(100000))
+    payloads = [_random_log(rng, t, next(serial), "Thawing") for t in thaw_ids]
+    payloads += [_random_log(rng, rng.choice(thaw_ids + [None, ""]), next(serial)) for _ in range(events)]
+    rng.shuffle(payloads)
+    half = len(payloads) // 2
+    ids = [db.insert_log(conn, p) for p in payloads[:half]]
+    ids += db.insert_logs_many(conn, payloads[half:], batch_size=50)["ids"]
+    return thaw_ids, ids, serial
+
+
+@pytest.fixture
+def conn(tmp_path):
+    pool = db.ConnectionPool(str(tmp_path / "vials.db"), readers=0)
+    with pool.writer() as conn:
+        db.init_db(conn)
+        yield conn
+    pool.close()
+
+
+def _vial_state(conn):
+    return [dict(r) for r in conn.execute("SELECT * FROM vial_state ORDER BY thaw_id")]
+
+
+def test_triggers_match_a_rebuild_after_inserts_updates_and_deletes(conn):
+    rng = random.Random(1234)
+    thaw_ids, ids, serial = _seed(conn, rng)
+    assert len(_vial_state(conn)) == len(thaw_ids)
+
+    for log_id in rng.sample(ids, 80):
+        changes = rng.choice([
+            {"passage": rng.randrange(1, 20)},
+            {"event_type": rng.choice(EVENTS)},
+            {"date": (date(2025, 1, 1) + timedelta(days=rng.randrange(120))).isoformat()},
+            {"vessel": rng.choice(VESSELS), "medium": rng.choice(MEDIA), "location": rng.choice(LOCATIONS)},
+            # Moves the event to another vial, or off every vial
+            {"thaw_id": rng.choice(thaw_ids + [None])},
+            {"notes": "untracked column"},
+        ])
+        db.update_log(conn, log_id, changes)
+    for log_id in rng.sample(ids, 60):
+        db.delete_log(conn, log_id)
+    for _ in range(20):
+        db.insert_log(conn, _random_log(rng, rng.choice(thaw_ids), next(serial)))
+
+    maintained = _vial_state(conn)
+    db.rebuild_vial_state(conn)
+    assert maintained == _vial_state(conn)
+
+
+def _baseline_vial_alerts(conn, thaw_id):
+    """The per-vial alert rules as get_vial_alerts computed them from each vial's events."""
+    events = [dict(r) for r in conn.execute(
+        "SELECT * FROM logs WHERE thaw_id = ? ORDER BY date ASC, created_at ASC", (thaw_id,)
+    )]
+    if not events:
+        return []
+    thaw_event = None
+    for event in events:
+        if event["event_type"] == "Thawing":
+            thaw_event = event
+    latest_event = events[-1]
+    culture_days = 0
+    if thaw_event:
+        culture_days = (datetime.fromisoformat(latest_event["date"]) - datetime.fromisoformat(thaw_event["date"])).days
+    splits = [e for e in events if e["event_type"] == "Split" and e["passage"]]
+    intervals = [
+        (datetime.fromisoformat(b["date"]) - datetime.fromisoformat(a["date"])).days
+        for a, b in zip(splits, splits[1:])
+    ]
+    avg_interval = sum(intervals) / len(intervals) if intervals else 0
+
+    alerts = []
+    current_passage = latest_event["passage"]
+    if current_passage and current_passage > 10:
+        alerts.append({
+            'type': 'warning',
+            'message': f'High passage number (P{current_passage}). Consider cryopreservation or differentiation.'
+        })
+    split_count = sum(1 for e in events if e["event_type"] == "Split")
+    if split_count > 10:
+        alerts.append({
+            'type': 'critical',
+            'message': f'⚠️ CRITICAL: {split_count} splits since thawing! Consider: 1) Thaw fresh vial, 2) Karyotype analysis for genetic stability, 3) Cryopreserve if healthy.'
+        })
+    elif split_count > 8:
+        alerts.append({
+            'type': 'warning',
+            'message': f'Approaching split limit ({split_count}/10). Plan to thaw new vial or check karyotype soon.'
+        })
+    if avg_interval > 0 and culture_days > avg_interval * 1.5:
+        alerts.append({
+            'type': 'info',
+            'message': f'Culture duration ({culture_days} days) exceeds average split interval. Consider splitting.'
+        })
+    has_recent_observation = any(e["event_type"] == "Observation" for e in events[-3:])
+    if not has_recent_observation and len(events) > 2:
+        alerts.append({
+            'type': 'info',
+            'message': 'No recent observations recorded. Consider adding culture status update.'
+        })
+    return alerts
+
+
+@pytest.mark.parametrize("seed", [7, 99])
+def test_evaluate_alerts_matches_the_per_vial_rules(conn, seed):
+    rng = random.Random(seed)
+    thaw_ids, ids, _ = _seed(conn, rng, vials=15, events=500)
+    for log_id in rng.sample(ids, 40):
+        db.delete_log(conn, log_id)
+
+    alerts = db.evaluate_alerts(conn)
+    expected = {t: _baseline_vial_alerts(conn, t) for t in thaw_ids}
+    assert {t: alerts.get(t, []) for t in thaw_ids} == expected
+    assert any(expected.values())
+    some = rng.sample(thaw_ids, 4)
+    assert db.evaluate_alerts(conn, some) == {t: expected[t] for t in some if t in alerts}
+    assert db.get_vial_alerts(conn, some[0]) == expected[some[0]]